@@ -0,0 +1,39 @@
+"""add dashboard listing indexes
+
+Revision ID: a2d4f6b8c0e1
+Revises: f3b8d6a1c4e2
+Create Date: 2026-10-18 00:00:00.000000
+
+Backs the keyset-paginated GET /api/dashboards summary listing: the
+(user_id, created_at, id) walk and the per-dashboard widget count.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "a2d4f6b8c0e1"
+down_revision: Union[str, None] = "f3b8d6a1c4e2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_dashboards_user_created",
+        "dashboards",
+        ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+    )
+    op.create_index(
+        "ix_dashboard_widgets_dashboard_id",
+        "dashboard_widgets",
+        ["dashboard_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_dashboard_widgets_dashboard_id", table_name="dashboard_widgets"
+    )
+    op.drop_index("ix_dashboards_user_created", table_name="dashboards")
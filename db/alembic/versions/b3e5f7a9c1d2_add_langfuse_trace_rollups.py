@@ -0,0 +1,83 @@
+"""add langfuse trace rollups
+
+Revision ID: b3e5f7a9c1d2
+Revises: a2d4f6b8c0e1
+Create Date: 2026-10-18 12:00:00.000000
+
+Hourly/daily pre-aggregates of langfuse_traces behind GET /api/traces/analytics
+and /analytics/by-turn (see src/api/services/langfuse/rollups.py). Schema
+only: the tables start empty and without a state row, so the endpoints keep
+scanning langfuse_traces until the out-of-band ``rebuild-trace-rollups`` CLI
+command has run.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "b3e5f7a9c1d2"
+down_revision: Union[str, None] = "a2d4f6b8c0e1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    small_ints = sa.ARRAY(sa.SmallInteger())
+    op.create_table(
+        "langfuse_trace_rollups",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("grain", sa.String(), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("environment", sa.String(), nullable=True),
+        sa.Column("outcome", sa.String(), nullable=True),
+        sa.Column("turn_index", sa.Integer(), nullable=True),
+        sa.Column("turn_min", sa.Integer(), nullable=True),
+        sa.Column("turn_max", sa.Integer(), nullable=True),
+        sa.Column("traces", sa.Integer(), nullable=False),
+        sa.Column("lat_count", sa.Integer(), nullable=False),
+        sa.Column("lat_sum", sa.Float(), nullable=False),
+        sa.Column("lat_hist_idx", small_ints, nullable=False),
+        sa.Column("lat_hist_cnt", sa.ARRAY(sa.Integer()), nullable=False),
+        sa.Column("cost_count", sa.Integer(), nullable=False),
+        sa.Column("cost_sum", sa.Float(), nullable=False),
+        sa.Column("cost_hist_idx", small_ints, nullable=False),
+        sa.Column("cost_hist_cnt", sa.ARRAY(sa.Integer()), nullable=False),
+        sa.Column("tok_count", sa.Integer(), nullable=False),
+        sa.Column("tok_sum", sa.BigInteger(), nullable=False),
+        sa.Column("tool_count", sa.Integer(), nullable=False),
+        sa.Column("tool_sum", sa.BigInteger(), nullable=False),
+        sa.Column("tool_error_traces", sa.Integer(), nullable=False),
+        sa.Column(
+            "aoi_types",
+            postgresql.JSONB(astext_type=sa.Text()),
+            nullable=False,
+        ),
+        sa.Column("session_hll_idx", small_ints, nullable=False),
+        sa.Column("session_hll_rho", small_ints, nullable=False),
+        sa.Column("user_hll_idx", small_ints, nullable=False),
+        sa.Column("user_hll_rho", small_ints, nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_langfuse_trace_rollups_grain_bucket",
+        "langfuse_trace_rollups",
+        ["grain", "bucket_start"],
+    )
+    op.create_table(
+        "langfuse_trace_rollup_state",
+        sa.Column("id", sa.SmallInteger(), nullable=False),
+        sa.Column("sketch_version", sa.Integer(), nullable=False),
+        sa.Column("rebuilt_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("langfuse_trace_rollup_state")
+    op.drop_index(
+        "ix_langfuse_trace_rollups_grain_bucket",
+        table_name="langfuse_trace_rollups",
+    )
+    op.drop_table("langfuse_trace_rollups")
@@ -0,0 +1,68 @@
+"""add keyset indexes to langfuse_traces
+
+Revision ID: c4f6a8b0d2e3
+Revises: b3e5f7a9c1d2
+Create Date: 2026-10-18 14:00:00.000000
+
+Back the keyset-paginated GET /api/traces and /api/traces/sessions listings:
+(trace_timestamp, id) is the trace listing order, (trace_timestamp,
+session_id) the session walk, and (session_id, trace_timestamp, id) answers
+its "no later turn in this session" probe. The first and last replace the
+single-column trace_timestamp and session_id indexes, which are their
+prefixes.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "c4f6a8b0d2e3"
+down_revision: Union[str, None] = "b3e5f7a9c1d2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_langfuse_traces_timestamp_id",
+        "langfuse_traces",
+        ["trace_timestamp", "id"],
+    )
+    op.create_index(
+        "ix_langfuse_traces_timestamp_session",
+        "langfuse_traces",
+        ["trace_timestamp", "session_id"],
+        postgresql_where=sa.text("session_id IS NOT NULL"),
+    )
+    op.create_index(
+        "ix_langfuse_traces_session_timestamp",
+        "langfuse_traces",
+        ["session_id", "trace_timestamp", "id"],
+    )
+    op.drop_index(
+        "ix_langfuse_traces_trace_timestamp", table_name="langfuse_traces"
+    )
+    op.drop_index(
+        "ix_langfuse_traces_session_id", table_name="langfuse_traces"
+    )
+
+
+def downgrade() -> None:
+    op.create_index(
+        "ix_langfuse_traces_session_id", "langfuse_traces", ["session_id"]
+    )
+    op.create_index(
+        "ix_langfuse_traces_trace_timestamp",
+        "langfuse_traces",
+        ["trace_timestamp"],
+    )
+    op.drop_index(
+        "ix_langfuse_traces_session_timestamp", table_name="langfuse_traces"
+    )
+    op.drop_index(
+        "ix_langfuse_traces_timestamp_session", table_name="langfuse_traces"
+    )
+    op.drop_index(
+        "ix_langfuse_traces_timestamp_id", table_name="langfuse_traces"
+    )
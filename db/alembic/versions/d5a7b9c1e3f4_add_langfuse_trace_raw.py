@@ -0,0 +1,46 @@
+"""add langfuse trace raw copies
+
+Revision ID: d5a7b9c1e3f4
+Revises: c4f6a8b0d2e3
+Create Date: 2026-10-18 15:00:00.000000
+
+Compressed raw Langfuse traces kept by ``ingest-langfuse-traces --store-raw``
+and served by GET /api/traces/{id} (see
+src/api/services/langfuse/raw_store.py). Starts empty: traces without a copy
+are still fetched live from Langfuse.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "d5a7b9c1e3f4"
+down_revision: Union[str, None] = "c4f6a8b0d2e3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "langfuse_trace_raw",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("encoding", sa.String(), nullable=False),
+        sa.Column("payload", sa.LargeBinary(), nullable=False),
+        sa.Column("raw_bytes", sa.Integer(), nullable=False),
+        sa.Column(
+            "stored_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    # Already compressed: skip TOAST's own pglz pass over the payload.
+    op.execute(
+        "ALTER TABLE langfuse_trace_raw ALTER COLUMN payload SET STORAGE EXTERNAL"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("langfuse_trace_raw")
@@ -0,0 +1,129 @@
+"""add full-text search vector to insights
+
+Revision ID: e5a9c2f7b3d1
+Revises: d4f7b1e9a3c2
+Create Date: 2026-10-18 00:00:00.000000
+
+Replaces the ILIKE scan behind the search_insights tool with a maintained
+tsvector over the insight summary (weight A), chart titles (B) and chart_data
+string values (C), GIN-indexed. Triggers on insights and insight_charts keep
+it current; existing rows are backfilled here.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "e5a9c2f7b3d1"
+down_revision: Union[str, None] = "d4f7b1e9a3c2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "insights",
+        sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True),
+    )
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION insight_search_vector(
+            target uuid, body text
+        ) RETURNS tsvector AS $$
+            SELECT setweight(to_tsvector('english', coalesce(body, '')), 'A')
+                || setweight(
+                    to_tsvector(
+                        'english', coalesce(string_agg(c.title, ' '), '')
+                    ),
+                    'B'
+                )
+                || setweight(
+                    coalesce(
+                        jsonb_to_tsvector(
+                            'simple', jsonb_agg(c.chart_data), '["string"]'
+                        ),
+                        ''::tsvector
+                    ),
+                    'C'
+                )
+            FROM insight_charts c
+            WHERE c.insight_id = target
+        $$ LANGUAGE sql STABLE;
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION insights_search_vector_trigger()
+        RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := insight_search_vector(
+                NEW.id, NEW.insight_text
+            );
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql;
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION insight_charts_search_vector_trigger()
+        RETURNS trigger AS $$
+        DECLARE
+            target uuid;
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                target := OLD.insight_id;
+            ELSE
+                target := NEW.insight_id;
+            END IF;
+            UPDATE insights
+            SET search_vector = insight_search_vector(id, insight_text)
+            WHERE id = target;
+            IF TG_OP = 'UPDATE' AND OLD.insight_id IS DISTINCT FROM target THEN
+                UPDATE insights
+                SET search_vector = insight_search_vector(id, insight_text)
+                WHERE id = OLD.insight_id;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql;
+    """)
+
+    op.execute("""
+        CREATE TRIGGER insights_search_vector_update
+        BEFORE INSERT OR UPDATE OF insight_text ON insights
+        FOR EACH ROW EXECUTE FUNCTION insights_search_vector_trigger();
+    """)
+
+    op.execute("""
+        CREATE TRIGGER insight_charts_search_vector_update
+        AFTER INSERT OR UPDATE OR DELETE ON insight_charts
+        FOR EACH ROW EXECUTE FUNCTION insight_charts_search_vector_trigger();
+    """)
+
+    op.execute(
+        "UPDATE insights "
+        "SET search_vector = insight_search_vector(id, insight_text);"
+    )
+
+    op.create_index(
+        "ix_insights_search_vector",
+        "insights",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_insights_search_vector", table_name="insights")
+    op.execute(
+        "DROP TRIGGER IF EXISTS insight_charts_search_vector_update "
+        "ON insight_charts;"
+    )
+    op.execute(
+        "DROP TRIGGER IF EXISTS insights_search_vector_update ON insights;"
+    )
+    op.execute("DROP FUNCTION IF EXISTS insight_charts_search_vector_trigger;")
+    op.execute("DROP FUNCTION IF EXISTS insights_search_vector_trigger;")
+    op.execute("DROP FUNCTION IF EXISTS insight_search_vector;")
+    op.drop_column("insights", "search_vector")
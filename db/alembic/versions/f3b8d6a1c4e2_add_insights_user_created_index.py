@@ -0,0 +1,30 @@
+"""add (user_id, created_at, id) index to insights
+
+Revision ID: f3b8d6a1c4e2
+Revises: e5a9c2f7b3d1
+Create Date: 2026-10-18 00:00:00.000000
+
+Backs the keyset-paginated GET /api/insights listing, newest first.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "f3b8d6a1c4e2"
+down_revision: Union[str, None] = "e5a9c2f7b3d1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_insights_user_created",
+        "insights",
+        ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_insights_user_created", table_name="insights")
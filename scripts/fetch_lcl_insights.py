@@ -21,10 +21,29 @@ def main() -> None:
     parser.add_argument(
         "--force",
         action="store_true",
-        help="Re-fetch articles even if they already exist",
+        help="Re-fetch articles even if they are unchanged",
+    )
+    parser.add_argument(
+        "--delay",
+        type=float,
+        default=0.25,
+        help="Minimum seconds between requests to the same host",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Concurrent requests",
     )
     args = parser.parse_args()
-    print(sync_articles(limit=args.limit, force=args.force))
+    print(
+        sync_articles(
+            limit=args.limit,
+            force=args.force,
+            delay_s=args.delay,
+            workers=args.workers,
+        )
+    )
 
 
 if __name__ == "__main__":
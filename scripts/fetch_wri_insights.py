@@ -27,13 +27,13 @@ def main() -> None:
         "--delay",
         type=float,
         default=0.25,
-        help="Delay between requests in seconds",
+        help="Minimum seconds between requests to the same host",
     )
     parser.add_argument(
         "--workers",
         type=int,
         default=1,
-        help="Parallel fetch workers",
+        help="Concurrent requests",
     )
     args = parser.parse_args()
 
@@ -32,7 +32,8 @@ from src.agent.tool_spec import ToolCategory, ToolSpec
 from src.agent.utils.sgrep import (
     DEFAULT_INDEX_DIR,
     TAG_RE,
-    query_index,
+    hybrid_query,
+    load_article,
 )
 from src.shared.logging_config import get_logger
 
@@ -58,15 +59,14 @@ Do ONE round of searching, shortlist, read only what's promising, then answer.
 Do NOT run repeated series of lookups.
 
 1. **Understand the query** — identify the key topics, entities, and intent.
-2. **Search (required)** — you MUST use BOTH tools:
-   - `sgrep` — semantic search; finds paragraphs by meaning even when exact
-     keywords don't match. Run it ONCE (~5 results).
-   - `grep_articles` — exact/regex keyword search; best for specific terms,
-     names, acronyms, or numbers. Run it 2-3 times MAX with different
-     phrasings. Pass `slugs` from sgrep results to restrict the search to
-     those articles (much faster); only omit `slugs` for a full-corpus search
-     when sgrep returned no useful candidates. Do NOT use the generic `grep`
-     tool.
+2. **Search (required)** — run `search_articles` ONCE with a query that
+   combines the topic in plain words with its key names, places, datasets or
+   acronyms. It ranks paragraphs by meaning and by exact keywords together,
+   so you do not need separate semantic and keyword searches. Run it a second
+   time only if the first returned nothing useful, with a different phrasing.
+   - `grep_articles` — regex search; use it only to check an exact phrase,
+     number or pattern, passing `slugs` from the search results to restrict
+     it to those articles. Do NOT use the generic `grep` tool.
 3. **Shortlist & read** — use `article_meta` on the candidate slugs to check
    titles/abstracts and decide which are genuinely relevant, then
    `read_paragraphs` with the §N numbers from the search results (raise
@@ -179,7 +179,7 @@ def article_meta(slugs: list[str]) -> str:
 
     Use this to decide whether an article is worth reading in full, instead of
     opening the large index.json yourself. Accepts article slugs or filenames
-    (the "<slug>.md" paths returned by sgrep/grep).
+    (the "<slug>.md" paths returned by search_articles/grep_articles).
 
     Args:
         slugs: Article slugs or "<slug>.md" filenames to look up.
@@ -206,22 +206,22 @@ def _snippet(text: str, max_words: int = 30) -> str:
 
 
 @tool
-def sgrep(query: str, top: int = 5) -> str:
-    """Semantic search over the WRI blog articles.
+def search_articles(query: str, top: int = 8) -> str:
+    """Search the Insights articles by meaning and by exact keywords at once.
 
-    Finds the most relevant paragraphs by meaning, even when exact keywords
-    don't match. Returns matches as "<file> §N (<score>): <snippet>" lines,
-    where <file> is the article path you can pass to read_file and §N the
-    paragraph number within it.
+    Ranks paragraphs semantically (finding paraphrases) and by keyword
+    (BM25, for names, places, datasets, acronyms) and fuses the two
+    rankings. Returns matches as "<file> §N (<matched by>): <snippet>"
+    lines, where <file> is the article path and §N the paragraph number to
+    pass to read_paragraphs.
 
     Args:
-        query: Natural-language search query.
-        top: Maximum number of paragraphs to return (default: 5).
+        query: Search query: natural language, keywords, or both.
+        top: Maximum number of paragraphs to return (default: 8).
     """
-    results = query_index(DEFAULT_INDEX_DIR, query, k=top)
+    results = hybrid_query(DEFAULT_INDEX_DIR, query, k=top)
     logger.debug(
-        f"sgrep query={query!r} top={top} -> {len(results)} hits"
-        + (f" (best {results[0]['score']:.2f})" if results else "")
+        f"search_articles query={query!r} top={top} -> {len(results)} hits"
     )
     if not results:
         return "No matching paragraphs found."
@@ -230,7 +230,8 @@ def sgrep(query: str, top: int = 5) -> str:
         loc = f"§{r['para']}" if r.get("para") else f":{r['line']}"
         section = f" [{r['section']}]" if r.get("section") else ""
         lines.append(
-            f"{r['file']} {loc} ({r['score']:.2f}){section}: {_snippet(r['text'])}"
+            f"{r['file']} {loc} ({'+'.join(r['matched'])}){section}: "
+            f"{_snippet(r['text'])}"
         )
     return "\n".join(lines)
 
@@ -247,7 +248,7 @@ def read_paragraphs(slug: str, paras: list[int], context: int = 1) -> str:
 
     Much cheaper than read_file: returns only the requested paragraphs plus
     `context` neighbours on each side, along with the article title and URL.
-    Use the §N numbers returned by sgrep and grep_articles.
+    Use the §N numbers returned by search_articles and grep_articles.
 
     Args:
         slug: Article slug or "<slug>.md" filename.
@@ -261,45 +262,34 @@ def read_paragraphs(slug: str, paras: list[int], context: int = 1) -> str:
         logger.warning(f"read_paragraphs slug={key!r} -> article not found")
         return f"{key}: article not found"
 
-    title = url = ""
-    by_num: dict[int, tuple[str | None, str]] = {}
-    for line in path.read_text(encoding="utf-8").splitlines():
-        if line.startswith("# ") and not title:
-            title = line[2:].strip()
-        elif line.startswith("**URL:**") and not url:
-            url = _md_link_target(line.removeprefix("**URL:**").strip())
-        else:
-            m = TAG_RE.match(line)
-            if m:
-                by_num[int(m.group("para"))] = (
-                    m.group("section"),
-                    m.group("text"),
-                )
-
+    article = load_article(path)
     wanted = sorted(
         {
             n
             for p in paras
             for n in range(p - context, p + context + 1)
-            if n in by_num
+            if n in article.chunks
         }
     )
     if not wanted:
+        last = max(
+            (n for n in article.chunks if isinstance(n, int)), default=0
+        )
         logger.debug(
             f"read_paragraphs slug={key!r} paras={paras} -> none in range "
-            f"(article has §1-§{max(by_num, default=0)})"
+            f"(article has §1-§{last})"
         )
-        return f"{key}: no such paragraphs (article has §1-§{max(by_num, default=0)})"
+        return f"{key}: no such paragraphs (article has §1-§{last})"
 
     logger.debug(
         f"read_paragraphs slug={key!r} paras={paras} context={context} "
         f"-> {len(wanted)} paragraphs"
     )
-    out = [title, f"URL: {url}", ""]
+    out = [article.title, f"URL: {_md_link_target(article.url)}", ""]
     prev_n: int | None = None
     prev_section: str | None = None
     for n in wanted:
-        section, text = by_num[n]
+        _, section, text = article.chunks[n]
         if prev_n is not None and n > prev_n + 1:
             out.append("[...]")
         if section and section != prev_section:
@@ -336,7 +326,7 @@ def grep_articles(
     Args:
         pattern: Regular expression (or plain keywords) to search for.
         slugs: Optional list of article slugs to restrict the search to (e.g.
-            from sgrep results). Omit to search the full corpus.
+            from search_articles results). Omit to search the full corpus.
         max_results: Maximum number of matching paragraphs (default: 10).
     """
     try:
@@ -389,7 +379,7 @@ def create_search_agent(
     """Create a deep agent backed by the local articles directory."""
     return create_deep_agent(
         model=model,
-        tools=[sgrep, grep_articles, read_paragraphs, article_meta],
+        tools=[search_articles, grep_articles, read_paragraphs, article_meta],
         backend=FilesystemBackend(
             root_dir=str(DATA_DIR),
             virtual_mode=True,
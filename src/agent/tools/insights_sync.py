@@ -0,0 +1,213 @@
+"""Async fetch engine shared by the WRI and LCL insights stores.
+
+* One ``httpx.AsyncClient`` per sync, shared by every request, with at most
+  ``concurrency`` requests in flight, and request starts to each host
+  spaced ``delay_s`` apart however many are in flight.
+* Article pages are fetched conditionally: the ``ETag`` and
+  ``Last-Modified`` of the last fetch are kept in the article's index entry
+  (``etag``, ``last_modified``) and sent back as ``If-None-Match`` /
+  ``If-Modified-Since``, so an unchanged page costs a 304 and no parsing
+  or writing.
+* 429 (honouring ``Retry-After``), 5xx and network errors are retried with
+  backoff; other errors raise ``httpx.HTTPStatusError``.
+* Index entries are written incrementally: each fetched article is
+  appended to a per-source journal next to index.json as soon as its
+  markdown is on disk, and the journal is folded into index.json once at
+  the end of the sync (or at the start of the next one, if the sync was
+  interrupted). A sync that changes nothing leaves index.json untouched.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import random
+import time
+from pathlib import Path
+from typing import IO
+from urllib.parse import urlsplit
+
+import httpx
+
+USER_AGENT = "Mozilla/5.0 (compatible; project-zeno/1.0)"
+MAX_RETRIES = 3
+
+
+def _backoff(attempt: int) -> float:
+    # exponential with jitter, capped
+    return min(30.0, 0.5 * 2**attempt + random.uniform(0, 0.5))
+
+
+def _retry_after(resp: httpx.Response) -> float | None:
+    try:
+        return max(0.0, float(resp.headers["Retry-After"]))
+    except (KeyError, ValueError):
+        return None
+
+
+def conditional_headers(entry: dict | None) -> dict[str, str]:
+    """If-None-Match / If-Modified-Since from an entry's recorded validators."""
+    headers = {}
+    if entry and entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry and entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def validators(resp: httpx.Response) -> dict[str, str]:
+    """The validators of a response, as recorded in an index entry; empty
+    strings when the server sends none."""
+    return {
+        "etag": resp.headers.get("ETag", ""),
+        "last_modified": resp.headers.get("Last-Modified", ""),
+    }
+
+
+class HostRateLimiter:
+    """Spaces request starts to each host at least ``interval`` seconds
+    apart, across all the tasks of one event loop."""
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._next: dict[str, float] = {}
+
+    async def wait(self, url: str) -> None:
+        if self.interval <= 0:
+            return
+        host = urlsplit(url).netloc
+        now = time.monotonic()
+        start = max(now, self._next.get(host, now))
+        self._next[host] = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+class InsightsFetcher:
+    """The shared client of one sync; use as ``async with``."""
+
+    def __init__(
+        self,
+        *,
+        concurrency: int = 4,
+        delay_s: float = 0.25,
+        timeout: float = 30.0,
+        max_retries: int = MAX_RETRIES,
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError("concurrency must be >= 1")
+        self.max_retries = max_retries
+        self._slots = asyncio.Semaphore(concurrency)
+        self._limiter = HostRateLimiter(delay_s)
+        self._client = httpx.AsyncClient(
+            headers={"User-Agent": USER_AGENT},
+            timeout=timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=concurrency),
+        )
+
+    async def __aenter__(self) -> InsightsFetcher:
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self._client.aclose()
+
+    async def get(self, url: str, entry: dict | None = None) -> httpx.Response:
+        """GET ``url``, conditionally on ``entry``'s validators if given.
+
+        Returns a 2xx response, or a 304 when the page is unchanged.
+        """
+        headers = conditional_headers(entry)
+        attempt = 0
+        while True:
+            async with self._slots:
+                await self._limiter.wait(url)
+                try:
+                    resp = await self._client.get(url, headers=headers)
+                except httpx.RequestError:
+                    if attempt >= self.max_retries:
+                        raise
+                    resp = None
+            if resp is not None and resp.status_code == 304:
+                return resp
+            if resp is not None and not (
+                resp.status_code == 429 or resp.status_code >= 500
+            ):
+                return resp.raise_for_status()
+            if attempt >= self.max_retries:
+                assert resp is not None
+                return resp.raise_for_status()
+            attempt += 1
+            delay = _retry_after(resp) if resp is not None else None
+            await asyncio.sleep(_backoff(attempt) if delay is None else delay)
+
+
+def merge_index(index_path: Path, entries: list[dict]) -> None:
+    """Upsert ``entries`` into index.json by id, keeping the order of the
+    articles already there, and replace the file atomically."""
+    articles: list[dict] = []
+    if index_path.exists():
+        articles = json.loads(index_path.read_text(encoding="utf-8")).get(
+            "articles", []
+        )
+    position = {a.get("id"): i for i, a in enumerate(articles)}
+    for entry in entries:
+        i = position.get(entry["id"])
+        if i is None:
+            position[entry["id"]] = len(articles)
+            articles.append(entry)
+        else:
+            articles[i] = entry
+    payload = {
+        "articles": articles,
+        "updated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = index_path.with_name(index_path.name + ".tmp")
+    tmp.write_text(
+        json.dumps(payload, indent=2, ensure_ascii=False) + "\n",
+        encoding="utf-8",
+    )
+    os.replace(tmp, index_path)
+
+
+class IndexJournal:
+    """Index entries of one source written since index.json was last
+    merged, one JSON line each (``index.<source>.journal.jsonl``)."""
+
+    def __init__(self, index_path: Path, source: str) -> None:
+        self.index_path = index_path
+        self.path = index_path.with_name(f"index.{source}.journal.jsonl")
+        self._file: IO[str] | None = None
+
+    def append(self, entry: dict) -> None:
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open("a", encoding="utf-8")
+        line = json.dumps(
+            {k: v for k, v in entry.items() if k != "path"},
+            ensure_ascii=False,
+        )
+        self._file.write(line + "\n")
+        self._file.flush()
+
+    def commit(self) -> int:
+        """Merge the journal into index.json and remove it; returns the
+        number of entries merged. A line torn by an interrupted write is
+        dropped (its article is fetched again next time)."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if not self.path.exists():
+            return 0
+        entries = []
+        for line in self.path.read_text(encoding="utf-8").splitlines():
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+        if entries:
+            merge_index(self.index_path, entries)
+        self.path.unlink()
+        return len(entries)
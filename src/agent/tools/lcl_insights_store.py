@@ -2,9 +2,9 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import re
-import time
 from pathlib import Path
 from urllib.parse import urljoin
 
@@ -12,9 +12,14 @@ import httpx
 import trafilatura
 from bs4 import BeautifulSoup
 
+from src.agent.tools.insights_sync import (
+    IndexJournal,
+    InsightsFetcher,
+    validators,
+)
+
 INSIGHTS_INDEX_URL = "https://landcarbonlab.org/insights/"
 INSIGHTS_URL_RE = re.compile(r"^https://landcarbonlab\.org/insights/[^/]+/?$")
-USER_AGENT = "Mozilla/5.0 (compatible; project-zeno/1.0)"
 
 _SOURCE = "lcl"
 _CORPUS_ROOT = Path(__file__).resolve().parents[3] / "data" / "insights"
@@ -22,12 +27,6 @@ _DATA_DIR = _CORPUS_ROOT / _SOURCE
 _INDEX_PATH = _CORPUS_ROOT / "index.json"
 
 
-def _make_client() -> httpx.Client:
-    return httpx.Client(
-        headers={"User-Agent": USER_AGENT}, timeout=30.0, follow_redirects=True
-    )
-
-
 def slug_from_url(url: str) -> str:
     return url.rstrip("/").rsplit("/", 1)[-1]
 
@@ -79,28 +78,20 @@ def _tag_paragraphs(markdown_body: str, url: str) -> str:
     return "\n".join(out).strip()
 
 
-def list_insight_urls(client: httpx.Client | None = None) -> list[str]:
-    own_client = client is None
-    if own_client:
-        client = _make_client()
-    assert client is not None
-    try:
-        html = client.get(INSIGHTS_INDEX_URL).text
-        soup = BeautifulSoup(html, "html.parser")
-        seen: set[str] = set()
-        urls: list[str] = []
-        for a in soup.select("a[href]"):
-            href = (a.get("href") or "").strip()
-            if not href:
-                continue
-            full = urljoin(INSIGHTS_INDEX_URL, href).rstrip("/")
-            if INSIGHTS_URL_RE.match(full) and full not in seen:
-                seen.add(full)
-                urls.append(full)
-        return urls
-    finally:
-        if own_client:
-            client.close()
+async def list_insight_urls(fetcher: InsightsFetcher) -> list[str]:
+    html = (await fetcher.get(INSIGHTS_INDEX_URL)).text
+    soup = BeautifulSoup(html, "html.parser")
+    seen: set[str] = set()
+    urls: list[str] = []
+    for a in soup.select("a[href]"):
+        href = (a.get("href") or "").strip()
+        if not href:
+            continue
+        full = urljoin(INSIGHTS_INDEX_URL, href).rstrip("/")
+        if INSIGHTS_URL_RE.match(full) and full not in seen:
+            seen.add(full)
+            urls.append(full)
+    return urls
 
 
 def article_to_markdown(
@@ -143,75 +134,133 @@ def load_index() -> list[dict]:
     return out
 
 
-def save_index(articles: list[dict]) -> None:
-    _CORPUS_ROOT.mkdir(parents=True, exist_ok=True)
-    _DATA_DIR.mkdir(parents=True, exist_ok=True)
-    existing: list[dict] = []
-    if _INDEX_PATH.exists():
-        existing = json.loads(_INDEX_PATH.read_text(encoding="utf-8")).get(
-            "articles", []
-        )
-    keep = [a for a in existing if a.get("source") != _SOURCE]
-    merged = keep + [
-        {
-            **{k: v for k, v in art.items() if k != "path"},
-            "source": _SOURCE,
-            "id": f"{_SOURCE}/{art['slug']}",
-        }
-        for art in articles
-    ]
-    payload = {
-        "articles": merged,
-        "updated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-    }
-    _INDEX_PATH.write_text(
-        json.dumps(payload, indent=2, ensure_ascii=False) + "\n",
-        encoding="utf-8",
+def _article_from_html(url: str, html: str) -> tuple[str, dict]:
+    slug = slug_from_url(url)
+    meta = _parse_meta(html)
+    markdown = article_to_markdown(
+        url=url,
+        html=html,
+        title=meta["title"],
+        abstract=meta["abstract"],
+        lastmod=meta["lastmod"],
     )
+    entry = {
+        "id": f"{_SOURCE}/{slug}",
+        "source": _SOURCE,
+        "slug": slug,
+        "title": meta["title"],
+        "abstract": meta["abstract"],
+        "url": url,
+        "lastmod": meta["lastmod"],
+        "image": meta["image"],
+        "image_alt": meta["image_alt"],
+    }
+    return markdown, entry
 
 
-def sync_articles(
-    limit: int | None = None, force: bool = False
+def _plan(
+    url: str, *, force: bool, existing: dict[str, dict]
+) -> tuple[bool, dict | None]:
+    """(fetch?, entry to fetch conditionally against) for one article.
+
+    The listing has no lastmod, so stored articles are revalidated with
+    their recorded validators, which costs a 304 when unchanged. Entries
+    from before validators were recorded are fetched once to record them;
+    if the site sent none, the article is kept as it is.
+    """
+    slug = slug_from_url(url)
+    prev = existing.get(slug)
+    if force or prev is None or not (_DATA_DIR / f"{slug}.md").exists():
+        return True, None
+    if "etag" not in prev and "last_modified" not in prev:
+        return True, None
+    if prev.get("etag") or prev.get("last_modified"):
+        return True, prev
+    return False, None
+
+
+async def _sync_article(
+    fetcher: InsightsFetcher,
+    url: str,
+    *,
+    prev: dict | None,
+    journal: IndexJournal,
+    stats: dict[str, int],
+) -> None:
+    path = _DATA_DIR / f"{slug_from_url(url)}.md"
+    try:
+        response = await fetcher.get(url, prev)
+        if response.status_code == httpx.codes.NOT_MODIFIED:
+            stats["not_modified"] += 1
+            return
+        markdown, entry = await asyncio.to_thread(
+            _article_from_html, url, response.text
+        )
+    except Exception:
+        stats["failed"] += 1
+        return
+    path.write_text(markdown, encoding="utf-8")
+    journal.append({**entry, **validators(response)})
+    stats["fetched"] += 1
+
+
+async def sync_articles_async(
+    limit: int | None = None,
+    force: bool = False,
+    delay_s: float = 0.25,
+    workers: int = 1,
 ) -> dict[str, int]:
+    """Fetch new and changed insights into data/insights/lcl/ (see _plan).
+
+    ``workers`` requests are in flight at most, ``delay_s`` apart.
+    """
     _DATA_DIR.mkdir(parents=True, exist_ok=True)
+    journal = IndexJournal(_INDEX_PATH, _SOURCE)
+    journal.commit()  # entries left by an interrupted sync
     existing = {a["slug"]: a for a in load_index()}
-    stats = {"fetched": 0, "skipped": 0, "failed": 0, "total_listed": 0}
-    with _make_client() as client:
-        urls = list_insight_urls(client)
+    stats = {
+        "fetched": 0,
+        "not_modified": 0,
+        "skipped": 0,
+        "failed": 0,
+        "total_listed": 0,
+    }
+    async with InsightsFetcher(
+        concurrency=workers, delay_s=delay_s
+    ) as fetcher:
+        urls = await list_insight_urls(fetcher)
         stats["total_listed"] = len(urls)
         if limit is not None:
             urls = urls[:limit]
+        jobs = []
         for url in urls:
-            slug = slug_from_url(url)
-            path = _DATA_DIR / f"{slug}.md"
-            if not force and path.exists() and slug in existing:
-                stats["skipped"] += 1
-                continue
-            try:
-                html = client.get(url).text
-                meta = _parse_meta(html)
-                markdown = article_to_markdown(
-                    url=url,
-                    html=html,
-                    title=meta["title"],
-                    abstract=meta["abstract"],
-                    lastmod=meta["lastmod"],
+            fetch, prev = _plan(url, force=force, existing=existing)
+            if fetch:
+                jobs.append(
+                    _sync_article(
+                        fetcher, url, prev=prev, journal=journal, stats=stats
+                    )
                 )
-                path.write_text(markdown, encoding="utf-8")
-                existing[slug] = {
-                    "id": f"{_SOURCE}/{slug}",
-                    "source": _SOURCE,
-                    "slug": slug,
-                    "title": meta["title"],
-                    "abstract": meta["abstract"],
-                    "url": url,
-                    "lastmod": meta["lastmod"],
-                    "image": meta["image"],
-                    "image_alt": meta["image_alt"],
-                    "path": path,
-                }
-                stats["fetched"] += 1
-            except Exception:
-                stats["failed"] += 1
-    save_index(list(existing.values()))
+            else:
+                stats["skipped"] += 1
+        try:
+            await asyncio.gather(*jobs)
+        finally:
+            journal.commit()
     return stats
+
+
+def sync_articles(
+    limit: int | None = None,
+    force: bool = False,
+    delay_s: float = 0.25,
+    workers: int = 1,
+) -> dict[str, int]:
+    """Run sync_articles_async to completion."""
+    if workers < 1:
+        raise ValueError("workers must be >= 1")
+    return asyncio.run(
+        sync_articles_async(
+            limit=limit, force=force, delay_s=delay_s, workers=workers
+        )
+    )
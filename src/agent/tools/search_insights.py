@@ -2,9 +2,10 @@
 
 Digs up an insight produced earlier (this thread or any the user owns, or a
 public one) and puts it back on screen. It does not generate anything — it
-searches the persisted `InsightOrm` rows by their summary text, picks the best
-match, and pushes it into state in the same shape `generate_insights` uses, so
-the frontend renders it as a normal insight card.
+searches the persisted `InsightOrm` rows by their summary text, chart titles
+and chart data, picks the best match, and pushes it into state in the same
+shape `generate_insights` uses, so the frontend renders it as a normal insight
+card.
 """
 
 import re
@@ -14,7 +15,7 @@ from langchain_core.messages import ToolMessage
 from langchain_core.tools import tool
 from langchain_core.tools.base import InjectedToolCallId
 from langgraph.types import Command
-from sqlalchemy import Text, cast, or_, select
+from sqlalchemy import case, func, select
 from sqlalchemy.orm import selectinload
 
 from src.agent.subagents.analyst.charts.model import Insight
@@ -24,13 +25,17 @@ from src.agent.tools.common import (
     insight_updated_command,
     require_current_user_id,
 )
-from src.api.data_models import InsightChartOrm, InsightOrm
+from src.api.data_models import InsightOrm
 from src.api.repositories.insight_access import visible_insights_clause
 from src.shared.database import get_session_from_pool
 from src.shared.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# ts_rank_cd normalisation 32: rank / (rank + 1), keeping it below the phrase
+# bonus.
+_RANK_NORMALIZATION = 32
+
 
 def _terms(query: str) -> list[str]:
     """Split a query into lowercased terms, dropping punctuation and tokens
@@ -38,95 +43,67 @@ def _terms(query: str) -> list[str]:
     return [t for t in re.split(r"\W+", query.lower()) if len(t) > 2]
 
 
-def _escape_like(text: str) -> str:
-    """Escape ILIKE metacharacters so user text matches literally."""
-    return text.replace("\\", "\\\\").replace("%", r"\%").replace("_", r"\_")
-
-
-def _haystack(row: InsightOrm) -> str:
-    """All searchable text for a row: summary + chart titles + chart data.
+def _match_query(query: str):
+    """tsquery matching any query term.
 
-    Place names and dataset/metric names live in the chart titles and in the
-    chart_data values (e.g. {"country": "Brazil"}), not just the summary — so
-    they are all folded in here.
+    The summary and chart titles are indexed with the English configuration
+    (stemmed: "fires" finds "fire") and chart_data values with the simple one
+    (place names verbatim), so the terms are parsed both ways and OR'd.
+    Queries with no term of 3+ characters fall back to the whole phrase.
     """
-    parts = [row.insight_text or ""]
-    for chart in row.charts or []:
-        parts.append(chart.title or "")
-        parts.append(str(chart.chart_data or ""))
-    return " ".join(parts).lower()
-
-
-def _score(row: InsightOrm, terms: list[str], phrase: str) -> int:
-    """Rough relevance: term hits across all searchable text, phrase bonus."""
-    haystack = _haystack(row)
-    score = sum(1 for t in terms if t in haystack)
-    if phrase and phrase.lower() in haystack:
-        score += len(terms) + 1  # full-phrase match outranks scattered terms
-    return score
-
-
-def _like_patterns(query: str) -> list[str]:
-    """ILIKE patterns for a query: one per term, plus the full phrase."""
-    patterns = [f"%{_escape_like(t)}%" for t in _terms(query)]
-    if query.strip():
-        patterns.append(f"%{_escape_like(query.strip())}%")
-    return patterns
-
-
-def _text_match_clause(patterns: list[str]):
-    """SQL clause matching any pattern against the summary, the chart titles
-    or the chart data text — so place names and datasets that only show up in
-    a title or a data value are still found."""
-    return or_(
-        *[
-            cond
-            for p in patterns
-            for cond in (
-                InsightOrm.insight_text.ilike(p, escape="\\"),
-                InsightOrm.charts.any(
-                    InsightChartOrm.title.ilike(p, escape="\\")
-                ),
-                InsightOrm.charts.any(
-                    cast(InsightChartOrm.chart_data, Text).ilike(
-                        p, escape="\\"
-                    )
-                ),
-            )
-        ]
+    terms = _terms(query)
+    if terms:
+        source = " | ".join(terms)
+        english = func.to_tsquery("english", source)
+        simple = func.to_tsquery("simple", source)
+    else:
+        english = func.plainto_tsquery("english", query)
+        simple = func.plainto_tsquery("simple", query)
+    return english.op("||")(simple)
+
+
+def _rank(query: str, match):
+    """Relevance: cover-density rank over the weighted document (summary >
+    titles > chart data), normalised to [0, 1), plus a bonus when the whole
+    query appears as a phrase so it outranks scattered term hits."""
+    phrase = func.phraseto_tsquery("english", query)
+    return func.ts_rank_cd(
+        InsightOrm.search_vector, match, _RANK_NORMALIZATION
+    ) + case((InsightOrm.search_vector.bool_op("@@")(phrase), 1.0), else_=0.0)
+
+
+def _search_statement(query: str, user_id: Optional[str], limit: int):
+    """SELECT for the insights `user_id` may see that match `query`, best
+    first. Matching goes through the GIN-indexed `search_vector`; ranking and
+    LIMIT happen in the database, ties going to the most recent insight."""
+    match = _match_query(query)
+    return (
+        select(InsightOrm)
+        .options(selectinload(InsightOrm.charts))
+        .where(
+            visible_insights_clause(user_id),
+            InsightOrm.search_vector.bool_op("@@")(match),
+        )
+        .order_by(_rank(query, match).desc(), InsightOrm.created_at.desc())
+        .limit(limit)
     )
 
 
-async def _search_insights(query: str, limit: int = 25) -> list[InsightOrm]:
-    """Fetch candidate insights the user may see whose summary matches `query`.
+async def _search_insights(query: str, limit: int = 10) -> list[InsightOrm]:
+    """Fetch the insights the user may see that match `query`, best first.
 
     Search spans ALL of the user's conversations — it is deliberately not scoped
     to the current thread. Visibility is the shared rule from `insight_access`
     (own + public), applied in SQL so invisible rows never consume the limit.
-    Ranking is in Python.
     """
+    statement = _search_statement(
+        query, require_current_user_id("search_insights"), limit
+    )
     async with get_session_from_pool() as session:
-        result = await session.execute(
-            select(InsightOrm)
-            .options(selectinload(InsightOrm.charts))
-            .where(
-                visible_insights_clause(
-                    require_current_user_id("search_insights")
-                ),
-                _text_match_clause(_like_patterns(query)),
-            )
-            .order_by(InsightOrm.created_at.desc())
-            .limit(limit)
-        )
+        result = await session.execute(statement)
         return list(result.scalars().all())
 
 
-def _best_match(rows: list[InsightOrm], query: str) -> InsightOrm:
-    """The highest-scoring candidate; ties go to the most recent insight."""
-    terms = _terms(query)
-    return max(rows, key=lambda r: (_score(r, terms, query), r.created_at))
-
-
 def _recalled_message(insight_id, insight: Insight, query: str) -> str:
     """The recall report to the model — including the stop instruction, since
     the recalled insight is already on screen and terminal for this turn."""
@@ -157,8 +134,8 @@ async def search_insights(
     """
     logger.info("search_insights tool called", query=query)
 
-    # Without at least one usable pattern the ILIKE degenerates to '%%' and
-    # "matches" every insight — refuse instead of recalling an arbitrary one.
+    # Without at least one usable term there is nothing to match on —
+    # refuse instead of recalling an arbitrary insight.
     if not _terms(query) and len(query.strip()) < 3:
         return error_command(
             "Query too short to search past insights. Describe the insight "
@@ -180,7 +157,7 @@ async def search_insights(
             }
         )
 
-    best = _best_match(rows, query)
+    best = rows[0]
     logger.info(
         "search_insights matched",
         insight_id=str(best.id),
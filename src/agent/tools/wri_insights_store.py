@@ -2,11 +2,9 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import re
-import threading
-import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from xml.etree import ElementTree as ET
 
@@ -14,6 +12,12 @@ import httpx
 import trafilatura
 from bs4 import BeautifulSoup
 
+from src.agent.tools.insights_sync import (
+    IndexJournal,
+    InsightsFetcher,
+    validators,
+)
+
 SITEMAP_INDEX = "https://www.wri.org/sitemap.xml"
 INSIGHTS_URL_RE = re.compile(r"^https://www\.wri\.org/insights/[^/]+$")
 _CITE_TAG_RE = re.compile(r'\[(§\d+(?:\s*\|\s*Section:\s*"[^"]*")?)\](?!\()')
@@ -21,7 +25,6 @@ _URL_HEADER_RE = re.compile(
     r"^\*\*URL:\*\*\s+(https?://\S+)\s*$", re.MULTILINE
 )
 SITEMAP_NS = {"sm": "http://www.sitemaps.org/schemas/sitemap/0.9"}
-USER_AGENT = "Mozilla/5.0 (compatible; project-zeno/1.0)"
 
 _CORPUS_ROOT = Path(__file__).resolve().parents[3] / "data" / "insights"
 _SOURCE = "wri"
@@ -37,50 +40,38 @@ def index_path() -> Path:
     return _INDEX_PATH
 
 
-def list_insight_urls(
-    client: httpx.Client | None = None,
+async def list_insight_urls(
+    fetcher: InsightsFetcher,
 ) -> list[tuple[str, str]]:
     """Return (url, lastmod) for every /insights/ page in the WRI sitemap."""
-    own_client = client is None
-    if own_client:
-        client = httpx.Client(
-            headers={"User-Agent": USER_AGENT},
-            timeout=30.0,
-            follow_redirects=True,
-        )
-    assert client is not None
-    try:
-        index_xml = client.get(SITEMAP_INDEX).content
-        root = ET.fromstring(index_xml)
-        sub_sitemaps = [
-            loc.text
-            for loc in root.findall(".//sm:sitemap/sm:loc", SITEMAP_NS)
-            if loc.text
-        ]
+    index_xml = (await fetcher.get(SITEMAP_INDEX)).content
+    root = ET.fromstring(index_xml)
+    sub_sitemaps = [
+        loc.text
+        for loc in root.findall(".//sm:sitemap/sm:loc", SITEMAP_NS)
+        if loc.text
+    ]
+    responses = await asyncio.gather(
+        *(fetcher.get(sm_url) for sm_url in sub_sitemaps)
+    )
 
-        all_urls: list[tuple[str, str]] = []
-        for sm_url in sub_sitemaps:
-            sitemap_xml = client.get(sm_url).content
-            sm_root = ET.fromstring(sitemap_xml)
-            for url_el in sm_root.findall(".//sm:url", SITEMAP_NS):
-                loc = url_el.findtext(
-                    "sm:loc", default="", namespaces=SITEMAP_NS
-                )
-                lastmod = url_el.findtext(
-                    "sm:lastmod", default="", namespaces=SITEMAP_NS
-                )
-                if loc and INSIGHTS_URL_RE.match(loc):
-                    all_urls.append((loc, lastmod))
+    all_urls: list[tuple[str, str]] = []
+    for response in responses:
+        sm_root = ET.fromstring(response.content)
+        for url_el in sm_root.findall(".//sm:url", SITEMAP_NS):
+            loc = url_el.findtext("sm:loc", default="", namespaces=SITEMAP_NS)
+            lastmod = url_el.findtext(
+                "sm:lastmod", default="", namespaces=SITEMAP_NS
+            )
+            if loc and INSIGHTS_URL_RE.match(loc):
+                all_urls.append((loc, lastmod))
 
-        by_url: dict[str, str] = {}
-        for url, lastmod in all_urls:
-            if url not in by_url or lastmod > by_url[url]:
-                by_url[url] = lastmod
+    by_url: dict[str, str] = {}
+    for url, lastmod in all_urls:
+        if url not in by_url or lastmod > by_url[url]:
+            by_url[url] = lastmod
 
-        return sorted(by_url.items(), key=lambda x: x[1], reverse=True)
-    finally:
-        if own_client:
-            client.close()
+    return sorted(by_url.items(), key=lambda x: x[1], reverse=True)
 
 
 def slug_from_url(url: str) -> str:
@@ -186,14 +177,8 @@ def article_to_markdown(
     return "\n".join(header) + tagged + "\n"
 
 
-def fetch_article(
-    client: httpx.Client, url: str, lastmod: str
-) -> tuple[str, dict]:
-    """Download one article and return (markdown, index entry)."""
+def _article_from_html(url: str, lastmod: str, html: str) -> tuple[str, dict]:
     slug = slug_from_url(url)
-    response = client.get(url)
-    response.raise_for_status()
-    html = response.text
     meta = _parse_meta(html)
     markdown = article_to_markdown(
         url=url,
@@ -216,6 +201,26 @@ def fetch_article(
     return markdown, entry
 
 
+async def fetch_article(
+    fetcher: InsightsFetcher,
+    url: str,
+    lastmod: str,
+    prev: dict | None = None,
+) -> tuple[str, dict] | None:
+    """Download one article and return (markdown, index entry), or None
+    if it is unchanged since ``prev`` (a conditional fetch on its
+    validators)."""
+    response = await fetcher.get(url, prev)
+    if response.status_code == httpx.codes.NOT_MODIFIED:
+        return None
+    # Extraction is CPU-bound; keep it off the event loop.
+    markdown, entry = await asyncio.to_thread(
+        _article_from_html, url, lastmod, response.text
+    )
+    entry.update(validators(response))
+    return markdown, entry
+
+
 def load_index() -> list[dict]:
     if _INDEX_PATH.exists():
         data = json.loads(_INDEX_PATH.read_text(encoding="utf-8"))
@@ -259,58 +264,6 @@ def load_index() -> list[dict]:
     return index
 
 
-def save_index(articles: list[dict]) -> None:
-    _DATA_DIR.mkdir(parents=True, exist_ok=True)
-    _CORPUS_ROOT.mkdir(parents=True, exist_ok=True)
-    existing: list[dict] = []
-    if _INDEX_PATH.exists():
-        existing = json.loads(_INDEX_PATH.read_text(encoding="utf-8")).get(
-            "articles", []
-        )
-    keep = [a for a in existing if a.get("source", "wri") != _SOURCE]
-    merged = keep + [
-        {
-            **{k: v for k, v in art.items() if k != "path"},
-            "source": _SOURCE,
-            "id": f"{_SOURCE}/{art['slug']}",
-        }
-        for art in articles
-    ]
-    payload = {
-        "articles": merged,
-        "updated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-    }
-    _INDEX_PATH.write_text(
-        json.dumps(payload, indent=2, ensure_ascii=False) + "\n",
-        encoding="utf-8",
-    )
-
-
-def _make_client() -> httpx.Client:
-    return httpx.Client(
-        headers={"User-Agent": USER_AGENT}, timeout=30.0, follow_redirects=True
-    )
-
-
-_thread_local = threading.local()
-_worker_clients: list[httpx.Client] = []
-_worker_clients_lock = threading.Lock()
-
-
-def _init_fetch_worker() -> None:
-    client = _make_client()
-    _thread_local.client = client
-    with _worker_clients_lock:
-        _worker_clients.append(client)
-
-
-def _close_worker_clients() -> None:
-    with _worker_clients_lock:
-        for client in _worker_clients:
-            client.close()
-        _worker_clients.clear()
-
-
 def _pending_jobs(
     urls: list[tuple[str, str]],
     *,
@@ -338,86 +291,117 @@ def _pending_jobs(
     return pending, skipped
 
 
-def _fetch_and_save(
-    url: str, lastmod: str, *, delay_s: float
-) -> tuple[str, dict]:
-    if delay_s:
-        time.sleep(delay_s)
-    client: httpx.Client = _thread_local.client
+def _revalidatable(url: str, existing: dict[str, dict]) -> dict | None:
+    """The entry to fetch ``url`` conditionally against: only one whose
+    file is on disk and that needs no backfill (see _pending_jobs)."""
+    slug = slug_from_url(url)
+    prev = existing.get(slug)
+    if prev and "image" in prev and (_DATA_DIR / f"{slug}.md").exists():
+        return prev
+    return None
+
+
+async def _sync_article(
+    fetcher: InsightsFetcher,
+    url: str,
+    lastmod: str,
+    *,
+    prev: dict | None,
+    journal: IndexJournal,
+    stats: dict[str, int],
+) -> None:
     slug = slug_from_url(url)
     path = _DATA_DIR / f"{slug}.md"
-    markdown, entry = fetch_article(client, url, lastmod)
+    try:
+        fetched = await fetch_article(fetcher, url, lastmod, prev)
+    except Exception:
+        stats["failed"] += 1
+        return
+    if fetched is None:
+        assert prev is not None
+        journal.append(
+            {
+                **prev,
+                "id": f"{_SOURCE}/{slug}",
+                "source": _SOURCE,
+                "lastmod": lastmod,
+            }
+        )
+        stats["not_modified"] += 1
+        return
+    markdown, entry = fetched
     path.write_text(markdown, encoding="utf-8")
-    entry["path"] = path
-    return slug, entry
+    journal.append(entry)
+    stats["fetched"] += 1
 
 
-def sync_articles(
+async def sync_articles_async(
     *,
     limit: int | None = None,
     force: bool = False,
     delay_s: float = 0.25,
     workers: int = 1,
 ) -> dict[str, int]:
-    """Fetch insights from the sitemap into data/wri_insights/."""
-    if workers < 1:
-        raise ValueError("workers must be >= 1")
+    """Fetch new and changed insights from the sitemap into data/insights/wri/.
 
+    Articles whose sitemap lastmod is unchanged are skipped without a
+    request; changed ones are fetched conditionally (unless ``force``), so
+    a page whose lastmod moved but whose content did not costs a 304.
+    ``workers`` requests are in flight at most, ``delay_s`` apart per host.
+    """
     _DATA_DIR.mkdir(parents=True, exist_ok=True)
+    journal = IndexJournal(_INDEX_PATH, _SOURCE)
+    journal.commit()  # entries left by an interrupted sync
     existing = {a["slug"]: a for a in load_index()}
-    stats = {"fetched": 0, "skipped": 0, "failed": 0, "total_listed": 0}
-    stats_lock = threading.Lock()
+    stats = {
+        "fetched": 0,
+        "not_modified": 0,
+        "skipped": 0,
+        "failed": 0,
+        "total_listed": 0,
+    }
 
-    with _make_client() as client:
-        urls = list_insight_urls(client)
+    async with InsightsFetcher(
+        concurrency=workers, delay_s=delay_s
+    ) as fetcher:
+        urls = await list_insight_urls(fetcher)
         stats["total_listed"] = len(urls)
         if limit is not None:
             urls = urls[:limit]
 
-    pending, skipped = _pending_jobs(urls, force=force, existing=existing)
-    stats["skipped"] = skipped
-
-    if workers == 1:
-        with _make_client() as client:
-            for url, lastmod in pending:
-                slug = slug_from_url(url)
-                path = _DATA_DIR / f"{slug}.md"
-                try:
-                    markdown, entry = fetch_article(client, url, lastmod)
-                    path.write_text(markdown, encoding="utf-8")
-                    entry["path"] = path
-                    existing[slug] = entry
-                    stats["fetched"] += 1
-                except Exception:
-                    stats["failed"] += 1
-                if delay_s:
-                    time.sleep(delay_s)
-    else:
+        pending, skipped = _pending_jobs(urls, force=force, existing=existing)
+        stats["skipped"] = skipped
         try:
-            with ThreadPoolExecutor(
-                max_workers=workers, initializer=_init_fetch_worker
-            ) as pool:
-                futures = {
-                    pool.submit(
-                        _fetch_and_save, url, lastmod, delay_s=delay_s
-                    ): (
+            await asyncio.gather(
+                *(
+                    _sync_article(
+                        fetcher,
                         url,
                         lastmod,
+                        prev=None if force else _revalidatable(url, existing),
+                        journal=journal,
+                        stats=stats,
                     )
                     for url, lastmod in pending
-                }
-                for future in as_completed(futures):
-                    try:
-                        slug, entry = future.result()
-                    except Exception:
-                        with stats_lock:
-                            stats["failed"] += 1
-                        continue
-                    existing[slug] = entry
-                    with stats_lock:
-                        stats["fetched"] += 1
+                )
+            )
         finally:
-            _close_worker_clients()
-
-    save_index(list(existing.values()))
+            journal.commit()
     return stats
+
+
+def sync_articles(
+    *,
+    limit: int | None = None,
+    force: bool = False,
+    delay_s: float = 0.25,
+    workers: int = 1,
+) -> dict[str, int]:
+    """Run sync_articles_async to completion."""
+    if workers < 1:
+        raise ValueError("workers must be >= 1")
+    return asyncio.run(
+        sync_articles_async(
+            limit=limit, force=force, delay_s=delay_s, workers=workers
+        )
+    )
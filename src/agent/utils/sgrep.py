@@ -3,8 +3,14 @@ sgrep - semantic grep for markdown.
 
     sgrep index              index default data dir
     sgrep index --data DIR   index a custom data dir
+    sgrep index --full       re-embed everything instead of updating
+    sgrep index --compact    drop tombstoned rows while updating
+    sgrep index --ivf        build the IVF index regardless of size
     sgrep "query"            search default index
     sgrep "query" --top N    return top N results (default: 10)
+    sgrep "query" --nprobe N IVF lists searched (default: 32)
+    sgrep "query" --mode M   semantic (default), keyword (BM25) or hybrid
+    sgrep --batch < queries  one query per stdin line, JSON lines out
 
 Defaults:
     --data   data/insights
@@ -12,21 +18,64 @@ Defaults:
 """
 
 import argparse
+import hashlib
 import json
+import os
 import re
 import sys
+import threading
+from collections.abc import Sequence
+from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
 
 import numpy as np
+from cachetools import LRUCache
 from model2vec import StaticModel
 
+from src.agent.utils import sgrep_bm25, sgrep_ivf
+
 _ROOT = Path(__file__).resolve().parents[3]
 DEFAULT_DATA_DIR = _ROOT / "data" / "insights"
 DEFAULT_INDEX_DIR = _ROOT / "data" / "insights_index"
 LEGACY_DEFAULT_DATA_DIR = _ROOT / "data" / "wri_insights"
 LEGACY_DEFAULT_INDEX_DIR = _ROOT / "data" / "wri_insights_index"
 MODEL_NAME = "minishlab/potion-retrieval-32M"
+# Queries scored together in query_batch (their float32 scores are ~256 MB
+# at 1M chunks), and index rows widened per step: one block of the int8
+# matrix at a time, small enough (8 MB at 512 dims) to stay in cache
+# between the conversion and the multiply.
+QUERY_BLOCK = 64
+SCORE_BLOCK = 4096
+# Incremental builds append a segment of newly embedded chunks and
+# tombstone replaced ones; the next build compacts the index into one
+# segment once tombstones pass this share of rows or segments this count.
+COMPACT_DELETED_FRACTION = 0.2
+COMPACT_MAX_SEGMENTS = 8
+# Indexes with at least this many live rows get an IVF coarse quantizer
+# (see sgrep_ivf), and queries search IVF_NPROBE of its ~sqrt(rows) lists
+# instead of every row. Brute force takes ~60 ms per query at this size;
+# see tests/benchmarks/test_sgrep_ivf.py for recall and latency by nprobe.
+# Centroids are retrained when the index has grown this many times over
+# since they were trained; in between, new rows join the nearest list.
+IVF_MIN_ROWS = 200_000
+IVF_NPROBE = 32
+IVF_RETRAIN_GROWTH = 2.0
+# hybrid_query fuses the top HYBRID_DEPTH semantic and keyword matches by
+# reciprocal rank fusion: each ranking a chunk appears in adds
+# 1 / (RRF_K + rank), with the customary RRF_K of 60.
+HYBRID_DEPTH = 50
+RRF_K = 60
+# Parsed source articles kept by load_article, per process, bounded by the
+# total size of their files.
+ARTICLE_CACHE_MAX_BYTES = 64 << 20
+# Files build_index owns in an index dir (the model copy aside), current
+# layout and pre-segment; unreferenced ones are deleted after a swap.
+_INDEX_FILE_RE = re.compile(
+    r"^(seg-\d+(\.scales|\.postings)?\.npy|seg-\d+\.terms\.npz"
+    r"|meta-\d+\.jsonl|files-\d+\.json"
+    r"|ivf-\d+\.npz|embeddings\.npy|scales\.npy|meta\.jsonl)$"
+)
 
 # Citation-tagged paragraph: [§N] or [§N | Section: "..."], optionally
 # linkified as [...](url#pN)
@@ -59,18 +108,68 @@ def normalize(v):
     return v / np.clip(np.linalg.norm(v, axis=-1, keepdims=True), 1e-12, None)
 
 
+def quantize_rows(v: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Symmetric int8 quantization with one float32 scale per row."""
+    scales = (np.abs(v).max(axis=-1) / 127.0).astype(np.float32)
+    scales[scales == 0] = 1.0
+    q8 = np.round(v / scales[:, None]).clip(-127, 127).astype(np.int8)
+    return q8, scales
+
+
+def _paragraph_spans(text):
+    """Yield (start_line, start, end) for each blank-line-separated block,
+    with the character span of its lines in ``text``."""
+    offset, first, end = 0, None, 0
+    for n, line in enumerate(text.split("\n"), 1):
+        if line.strip():
+            first = first or (n, offset)
+            end = offset + len(line)
+        elif first:
+            yield first[0], first[1], end
+            first = None
+        offset += len(line) + 1
+    if first:
+        yield first[0], first[1], end
+
+
+def _source_text(raw: bytes) -> str:
+    """A source file's text with CRLF line endings read as LF, as
+    ``read_text`` would; spans index into this, not the raw bytes."""
+    return raw.decode("utf-8").replace("\r\n", "\n")
+
+
+def _span_text(text: str, start: int, end: int) -> str:
+    return text[start:end].replace("\n", " ")
+
+
 def paragraphs(text):
     """Yield (start_line, paragraph) for each blank-line-separated block."""
-    para, start = [], None
+    for line, start, end in _paragraph_spans(text):
+        yield line, _span_text(text, start, end)
+
+
+def _chunk_spans(text):
+    """Yield (line, para, section, start, end) for each chunk of chunks(),
+    with the character span of its text in ``text`` (see _span_text)."""
+    tagged, offset = [], 0
     for n, line in enumerate(text.split("\n"), 1):
-        if line.strip():
-            start = start or n
-            para.append(line)
-        elif para:
-            yield start, " ".join(para)
-            para, start = [], None
-    if para:
-        yield start, " ".join(para)
+        m = TAG_RE.match(line)
+        if m and m.group("text").strip():
+            tagged.append(
+                (
+                    n,
+                    int(m.group("para")),
+                    m.group("section"),
+                    offset + m.start("text"),
+                    offset + m.end("text"),
+                )
+            )
+        offset += len(line) + 1
+    if tagged:
+        yield from tagged
+    else:
+        for line, start, end in _paragraph_spans(text):
+            yield line, None, None, start, end
 
 
 def chunks(text):
@@ -82,18 +181,27 @@ def chunks(text):
     abstract) are skipped. Documents without tags fall back to
     blank-line-separated paragraphs with para/section set to None.
     """
-    tagged = []
-    for n, line in enumerate(text.split("\n"), 1):
-        m = TAG_RE.match(line)
-        if m and m.group("text").strip():
-            tagged.append(
-                (n, int(m.group("para")), m.group("section"), m.group("text"))
-            )
-    if tagged:
-        yield from tagged
-    else:
-        for line, para_text in paragraphs(text):
-            yield line, None, None, para_text
+    for line, para, section, start, end in _chunk_spans(text):
+        yield line, para, section, _span_text(text, start, end)
+
+
+def _header(text: str) -> dict[str, str]:
+    """The title (first '# ' line) and raw URL (first '**URL:**' line) of
+    an article."""
+    title = url = ""
+    for line in text.split("\n"):
+        if line.startswith("# ") and not title:
+            title = line[2:].strip()
+        elif line.startswith("**URL:**") and not url:
+            url = line.removeprefix("**URL:**").strip()
+        if title and url:
+            break
+    return {"title": title, "url": url}
+
+
+def _chunk_key(m: dict) -> int | str:
+    """A chunk's key within its file: its para, or 'L<line>' if untagged."""
+    return m["para"] if m.get("para") is not None else f"L{m['line']}"
 
 
 def _portable_path(path: Path) -> str:
@@ -118,6 +226,53 @@ def _resolve_data_dir(raw: str) -> Path:
     return data_dir
 
 
+def _read_config(index_dir: Path) -> dict | None:
+    path = index_dir / "config.json"
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _layout(
+    config: dict,
+) -> tuple[list[tuple[str, str | None, int | None]], str]:
+    """(embeddings, scales, rows) file names per segment, and the meta file.
+
+    Indexes built before incremental updates are one unnamed segment:
+    embeddings.npy, scales.npy (absent before per-row scales) and
+    meta.jsonl.
+    """
+    if "segments" in config:
+        return [
+            (seg["embeddings"], seg["scales"], seg["rows"])
+            for seg in config["segments"]
+        ], config["meta"]
+    return [("embeddings.npy", "scales.npy", None)], "meta.jsonl"
+
+
+def _referenced(config: dict) -> set[str]:
+    segments, meta = _layout(config)
+    names = {meta, *(n for e, s, _ in segments for n in (e, s) if n)}
+    for seg in config.get("segments", []):
+        names.update(
+            seg.get(key) for key in ("postings", "terms") if key in seg
+        )
+    if "files" in config:
+        names.add(config["files"])
+    if "ivf" in config:
+        names.add(config["ivf"]["file"])
+    return names
+
+
+def _read_meta(path: Path) -> list[dict | None]:
+    """Index metadata, one entry per row; None marks a tombstoned row."""
+    return [
+        json.loads(line)
+        for line in path.read_text(encoding="utf-8").splitlines()
+        if line.strip()
+    ]
+
+
 def data_status(
     data_dir: Path = DEFAULT_DATA_DIR,
     index_dir: Path = DEFAULT_INDEX_DIR,
@@ -146,73 +301,395 @@ def data_status(
             f"corpus at {data_dir} has {n_articles} articles "
             f"(expected >= {min_articles})"
         )
-    for name in ("embeddings.npy", "meta.jsonl", "config.json"):
+    config = _read_config(index_dir)
+    if config is None:
+        return False, f"missing sgrep index file {index_dir / 'config.json'}"
+    segments, meta_name = _layout(config)
+    optional = {scales for _, scales, _ in segments} - {None}
+    for name in sorted(_referenced(config) - optional):
         if not (index_dir / name).exists():
             return False, f"missing sgrep index file {index_dir / name}"
-    n_chunks = np.load(index_dir / "embeddings.npy", mmap_mode="r").shape[0]
-    n_meta = sum(
-        1
-        for line in (index_dir / "meta.jsonl")
-        .read_text(encoding="utf-8")
-        .splitlines()
-        if line.strip()
-    )
-    if n_chunks != n_meta:
+    n_chunks = 0
+    for emb_name, scales_name, _ in segments:
+        n_rows = np.load(index_dir / emb_name, mmap_mode="r").shape[0]
+        n_chunks += n_rows
+        if (
+            scales_name
+            and (index_dir / scales_name).exists()
+            and np.load(index_dir / scales_name, mmap_mode="r").shape[0]
+            != n_rows
+        ):
+            return False, (
+                f"sgrep index inconsistent: {n_rows} embeddings in "
+                f"{emb_name} vs a different number of row scales in {index_dir}"
+            )
+    meta = _read_meta(index_dir / meta_name)
+    if n_chunks != len(meta):
         return False, (
             f"sgrep index inconsistent: {n_chunks} embeddings "
-            f"vs {n_meta} meta entries in {index_dir}"
+            f"vs {len(meta)} meta entries in {index_dir}"
         )
+    n_live = sum(m is not None for m in meta)
     return True, (
         f"{n_articles} articles in {data_dir}, "
-        f"{n_chunks} indexed paragraphs in {index_dir}"
+        f"{n_live} indexed paragraphs in {index_dir}"
     )
 
 
-def build_index(data_dir: Path, index_dir: Path):
-    meta, texts = [], []
-    for path in sorted(data_dir.rglob("*.md")):
-        for line, para, section, text in chunks(
-            path.read_text(encoding="utf-8")
-        ):
-            rel_path = path.relative_to(data_dir)
-            source = rel_path.parts[0] if len(rel_path.parts) > 1 else "wri"
-            meta.append(
+def _chunk_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _file_chunks(rel_path: Path, text: str) -> list[tuple[dict, str]]:
+    """(meta, text) for each chunk of one source file. The meta records
+    the chunk's character span in the file, which load_article slices."""
+    source = rel_path.parts[0] if len(rel_path.parts) > 1 else "wri"
+    out = []
+    for line, para, section, start, end in _chunk_spans(text):
+        chunk = _span_text(text, start, end)
+        out.append(
+            (
                 {
                     "file": str(rel_path),
                     "source": source,
                     "line": line,
                     "para": para,
                     "section": section,
-                }
+                    "hash": _chunk_hash(chunk),
+                    "span": [start, end],
+                },
+                chunk,
             )
-            texts.append(text)
+        )
+    return out
 
-    model = get_model()
-    emb = normalize(model.encode(texts)).astype("float32")
-    # int8-quantize with a single symmetric scale; chunk text is not stored
-    # (it is reconstructed from the source files at query time).
-    scale = float(np.abs(emb).max() / 127.0) or 1.0
-    q8 = np.round(emb / scale).clip(-127, 127).astype(np.int8)
 
+def _can_update(config: dict | None, data_dir: Path) -> bool:
+    """Whether an existing index can be updated in place: it must have the
+    segmented layout (chunk hashes, a file manifest and keyword postings),
+    and have been built from the same data dir with the same model."""
+    return (
+        config is not None
+        and "files" in config
+        and all("postings" in seg for seg in config["segments"])
+        and config.get("model") == MODEL_NAME
+        and _resolve_data_dir(config["data_dir"]) == data_dir
+    )
+
+
+def _write_segment(
+    index_dir: Path,
+    name: str,
+    q8: np.ndarray,
+    scales: np.ndarray,
+    texts: list[str],
+) -> dict:
+    """Write a segment of new rows and return its config entry."""
+    np.save(index_dir / f"{name}.npy", q8)
+    np.save(index_dir / f"{name}.scales.npy", scales)
+    return {
+        "embeddings": f"{name}.npy",
+        "scales": f"{name}.scales.npy",
+        "rows": len(q8),
+        **sgrep_bm25.save(index_dir / name, sgrep_bm25.build(texts)),
+    }
+
+
+def _write_compacted(
+    index_dir: Path,
+    config: dict,
+    meta: list[dict | None],
+    new_q8: np.ndarray,
+    new_scales: np.ndarray,
+    new_texts: list[str],
+    name: str,
+) -> dict:
+    """Copy the live rows of every segment, then the new rows, into one
+    segment without re-embedding anything, and return its config entry."""
+    live = np.array([m is not None for m in meta], dtype=bool)
+    n_rows = int(live.sum()) + len(new_q8)
+    out = np.lib.format.open_memmap(
+        index_dir / f"{name}.npy",
+        mode="w+",
+        dtype=np.int8,
+        shape=(n_rows, new_q8.shape[1]),
+    )
+    scales_out, keywords, pos, offset = [], [], 0, 0
+    for seg in config["segments"]:
+        keep = live[offset : offset + seg["rows"]]
+        emb = np.load(index_dir / seg["embeddings"], mmap_mode="r")
+        out[pos : pos + keep.sum()] = emb[keep]
+        scales_out.append(np.load(index_dir / seg["scales"])[keep])
+        keywords.append((sgrep_bm25.load(index_dir, seg), keep))
+        pos += int(keep.sum())
+        offset += seg["rows"]
+    out[pos:] = new_q8
+    out.flush()
+    del out
+    np.save(
+        index_dir / f"{name}.scales.npy",
+        np.concatenate(scales_out + [new_scales]).astype(np.float32),
+    )
+    keywords.append(
+        (sgrep_bm25.build(new_texts), np.ones(len(new_texts), dtype=bool))
+    )
+    return {
+        "embeddings": f"{name}.npy",
+        "scales": f"{name}.scales.npy",
+        "rows": n_rows,
+        **sgrep_bm25.save(index_dir / name, sgrep_bm25.merge(keywords)),
+    }
+
+
+def _gather(
+    segments: Sequence[
+        tuple[np.ndarray, np.ndarray | float, np.ndarray | None]
+    ],
+    rows: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """The int8 vectors and scales of the sorted global ``rows`` of a
+    segmented index."""
+    q8, scales, start = [], [], 0
+    for emb, seg_scales, _ in segments:
+        lo, hi = np.searchsorted(rows, [start, start + len(emb)])
+        local = rows[lo:hi] - start
+        q8.append(emb[local])
+        scales.append(np.broadcast_to(seg_scales, (len(emb),))[local])
+        start += len(emb)
+    return np.concatenate(q8), np.concatenate(scales)
+
+
+def _write_ivf(
+    index_dir: Path,
+    generation: int,
+    segments: list[dict],
+    meta: list[dict | None],
+    config: dict | None,
+    carried: np.ndarray,
+    new_q8: np.ndarray,
+    ivf: bool | None,
+) -> dict | None:
+    """Write the IVF lists of a build and return their config entry, or
+    None when the index is to be searched by brute force.
+
+    ``config`` is the index being updated (None for a full build), whose
+    rows ``carried`` precede the ``new_q8`` rows in the new one. Its
+    centroids are kept until the index outgrows them by
+    IVF_RETRAIN_GROWTH; the carried rows keep their lists and new rows
+    join their nearest.
+    """
+    live = np.flatnonzero([m is not None for m in meta])
+    previous = (config or {}).get("ivf")
+    if ivf is None:
+        ivf = bool(previous) or len(live) >= IVF_MIN_ROWS
+    if not ivf or not len(live):
+        return None
+    arrays = [
+        (
+            np.load(index_dir / seg["embeddings"], mmap_mode="r"),
+            np.load(index_dir / seg["scales"], mmap_mode="r"),
+            None,
+        )
+        for seg in segments
+    ]
+    if previous and len(meta) <= IVF_RETRAIN_GROWTH * previous["trained_rows"]:
+        with np.load(index_dir / previous["file"]) as old:
+            centroids = old["centroids"]
+            labels = np.concatenate(
+                [old["labels"][carried], sgrep_ivf.assign(new_q8, centroids)]
+            )
+        trained_rows = previous["trained_rows"]
+    else:
+        nlist = sgrep_ivf.n_lists(len(live))
+        sample = np.sort(
+            np.random.default_rng(generation).choice(
+                live,
+                min(len(live), nlist * sgrep_ivf.SAMPLE_PER_LIST),
+                replace=False,
+            )
+        )
+        centroids = sgrep_ivf.train(_gather(arrays, sample)[0], nlist)
+        labels = np.concatenate(
+            [sgrep_ivf.assign(emb, centroids) for emb, _, _ in arrays]
+        )
+        trained_rows = len(meta)
+    rows, offsets = sgrep_ivf.inverted_lists(labels, len(centroids))
+    name = f"ivf-{generation}.npz"
+    np.savez(
+        index_dir / name,
+        centroids=centroids,
+        labels=labels,
+        rows=rows,
+        offsets=offsets,
+    )
+    return {
+        "file": name,
+        "lists": len(centroids),
+        "trained_rows": trained_rows,
+    }
+
+
+def build_index(
+    data_dir: Path,
+    index_dir: Path,
+    full: bool = False,
+    compact: bool = False,
+    ivf: bool | None = None,
+):
+    """Build or update the index of ``data_dir`` in ``index_dir``.
+
+    Updates are incremental: files whose size and mtime match the manifest
+    of the previous build are skipped, and chunks of changed files keep
+    their vectors when their text hash is unchanged. Only new chunk texts
+    are embedded, into a new segment; rows of deleted or changed chunks
+    are tombstoned (a null meta line) until the index is compacted, which
+    happens once they pass COMPACT_DELETED_FRACTION of the rows, segments
+    pass COMPACT_MAX_SEGMENTS, or ``compact`` is set. ``full`` re-embeds
+    everything, as does updating an index from before this layout or built
+    with another model or data dir.
+
+    Indexes of IVF_MIN_ROWS live rows or more get IVF lists (see
+    _write_ivf), and keep them through updates; ``ivf`` turns them on or
+    off regardless.
+
+    Each build writes new generation-numbered files only, then swaps
+    config.json, which names the files in use, with an atomic rename:
+    readers see either the old index or the new one, never a partial
+    build. Files of the previous generation are kept for readers that
+    loaded its config just before the swap; older ones are deleted.
+    """
     index_dir.mkdir(parents=True, exist_ok=True)
-    model.save_pretrained(index_dir / "model")
-    np.save(index_dir / "embeddings.npy", q8)
-    (index_dir / "config.json").write_text(
-        json.dumps(
-            {
-                "scale": scale,
-                "dim": int(emb.shape[1]),
-                "data_dir": _portable_path(data_dir),
-            }
-        ),
-        encoding="utf-8",
+    previous = _read_config(index_dir)
+    generation = (previous or {}).get("generation", 0) + 1
+    if not full and previous is not None and _can_update(previous, data_dir):
+        config = previous
+        meta = _read_meta(index_dir / config["meta"])
+        files = json.loads(
+            (index_dir / config["files"]).read_text(encoding="utf-8")
+        )
+    else:
+        config, meta, files = None, [], {}
+
+    paths = {
+        path.relative_to(data_dir): path
+        for path in sorted(data_dir.rglob("*.md"))
+    }
+    rows_by_file: dict[str, list[int]] = {}
+    for row, m in enumerate(meta):
+        if m is not None:
+            rows_by_file.setdefault(m["file"], []).append(row)
+    gone = set(files) - {str(rel) for rel in paths}
+    for name in gone:
+        for row in rows_by_file.get(name, []):
+            meta[row] = None
+
+    manifest, new_meta, new_texts, reused = {}, [], [], 0
+    for rel_path, path in paths.items():
+        name = str(rel_path)
+        stat = path.stat()
+        known = files.get(name)
+        if (
+            known
+            and known["size"] == stat.st_size
+            and known["mtime_ns"] == stat.st_mtime_ns
+        ):
+            manifest[name] = known
+            continue
+        raw = path.read_bytes()
+        text = _source_text(raw)
+        manifest[name] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": hashlib.sha256(raw).hexdigest(),
+            **_header(text),
+        }
+        if known and known["sha256"] == manifest[name]["sha256"]:
+            continue
+        reusable: dict[str, list[int]] = {}
+        for row in rows_by_file.get(name, []):
+            reusable.setdefault(meta[row]["hash"], []).append(row)  # type: ignore[index]
+            meta[row] = None
+        for m, chunk in _file_chunks(rel_path, text):
+            if reusable.get(m["hash"]):
+                meta[reusable[m["hash"]].pop(0)] = m
+                reused += 1
+            else:
+                new_meta.append(m)
+                new_texts.append(chunk)
+
+    model = get_model()
+    if new_texts or config is None:
+        emb = normalize(model.encode(new_texts)).astype("float32")
+        # int8-quantize with a symmetric scale per row; chunk text is not
+        # stored (it is reconstructed from the source files at query time).
+        q8, scales = quantize_rows(emb)
+    else:
+        q8 = np.empty((0, config["dim"]), dtype=np.int8)
+        scales = np.empty(0, dtype=np.float32)
+
+    segments = list(config["segments"]) if config else []
+    n_deleted = sum(m is None for m in meta)
+    segment = f"seg-{generation}"
+    carried = np.arange(len(meta))
+    if config is not None and (
+        compact
+        or n_deleted > COMPACT_DELETED_FRACTION * (len(meta) + len(new_meta))
+        or len(segments) + bool(new_texts) > COMPACT_MAX_SEGMENTS
+    ):
+        segments = [
+            _write_compacted(
+                index_dir, config, meta, q8, scales, new_texts, segment
+            )
+        ]
+        carried = np.flatnonzero([m is not None for m in meta])
+        meta = [m for m in meta if m is not None]
+    elif len(q8) or config is None:
+        segments.append(
+            _write_segment(index_dir, segment, q8, scales, new_texts)
+        )
+    meta += new_meta
+    ivf_config = _write_ivf(
+        index_dir, generation, segments, meta, config, carried, q8, ivf
     )
-    (index_dir / "meta.jsonl").write_text(
+
+    if config is None or not (index_dir / "model").is_dir():
+        model.save_pretrained(index_dir / "model")
+    (index_dir / f"meta-{generation}.jsonl").write_text(
         "\n".join(json.dumps(m, ensure_ascii=False) for m in meta),
         encoding="utf-8",
     )
+    (index_dir / f"files-{generation}.json").write_text(
+        json.dumps(manifest), encoding="utf-8"
+    )
+    new_config = {
+        "quantization": "row",
+        "dim": int(q8.shape[1]),
+        "data_dir": _portable_path(data_dir),
+        "model": MODEL_NAME,
+        "generation": generation,
+        "segments": segments,
+        "meta": f"meta-{generation}.jsonl",
+        "files": f"files-{generation}.json",
+    }
+    if ivf_config:
+        new_config["ivf"] = ivf_config
+    tmp = index_dir / "config.json.tmp"
+    tmp.write_text(json.dumps(new_config), encoding="utf-8")
+    os.replace(tmp, index_dir / "config.json")
+
+    keep = _referenced(new_config) | (
+        _referenced(previous) if previous else set()
+    )
+    for path in index_dir.iterdir():
+        if _INDEX_FILE_RE.match(path.name) and path.name not in keep:
+            path.unlink()
+
+    n_live = sum(m is not None for m in meta)
     print(
-        f"indexed {len(texts)} paragraphs from {len({m['file'] for m in meta})} files -> {index_dir}"
+        f"indexed {n_live} paragraphs from {len(manifest)} files -> {index_dir} "
+        f"({len(new_texts)} embedded, {reused} reused, "
+        f"{n_deleted} tombstoned, {len(segments)} segments"
+        + (f", {ivf_config['lists']} IVF lists)" if ivf_config else ")")
     )
 
 
@@ -220,78 +697,430 @@ def paint(s, code):
     return f"\033[{code}m{s}\033[0m" if sys.stdout.isatty() else str(s)
 
 
-@lru_cache(maxsize=256)
-def _chunk_texts(path_str: str) -> dict:
-    """Map a source file's chunk key (para or 'L<line>') to its text."""
-    out = {}
-    for line, para, _section, text in chunks(
-        Path(path_str).read_text(encoding="utf-8")
-    ):
-        out[para if para is not None else f"L{line}"] = text
-    return out
+@dataclass(frozen=True)
+class Article:
+    """A source file parsed for reading: its title and raw URL header, and
+    its chunks by key (see _chunk_key) as (line, section, text), in file
+    order."""
+
+    title: str
+    url: str
+    chunks: dict[int | str, tuple[int, str | None, str]]
+
+
+def parse_article(text: str) -> Article:
+    header = _header(text)
+    return Article(
+        title=header["title"],
+        url=header["url"],
+        chunks={
+            _chunk_key({"para": para, "line": line}): (
+                line,
+                section,
+                _span_text(text, start, end),
+            )
+            for line, para, section, start, end in _chunk_spans(text)
+        },
+    )
+
 
+_articles: LRUCache = LRUCache(
+    maxsize=ARTICLE_CACHE_MAX_BYTES, getsizeof=lambda entry: entry[0][1]
+)
+_articles_lock = threading.Lock()
 
-def _chunk_text(data_dir: Path, m: dict) -> str:
-    key = m["para"] if m.get("para") is not None else f"L{m['line']}"
-    return _chunk_texts(str(data_dir / m["file"])).get(key, "")
+
+def load_article(
+    path: Path, index_dir: Path | None = DEFAULT_INDEX_DIR
+) -> Article:
+    """Parse a source file, through a cache keyed on its path, mtime and
+    size, so an edited file is parsed again on its next read.
+
+    On a miss, a file the index at ``index_dir`` recorded at its current
+    mtime and size is not re-chunked: its header comes from the index's
+    file manifest and each chunk's text is sliced at the span in its meta.
+    """
+    key = str(path)
+    with path.open("rb") as f:
+        stat = os.fstat(f.fileno())
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with _articles_lock:
+            cached = _articles.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        # Decoded as build_index decodes it, so the recorded spans line up.
+        text = _source_text(f.read())
+    recorded = _offset_table(index_dir).get(key) if index_dir else None
+    if recorded and (recorded[0]["mtime_ns"], recorded[0]["size"]) == stamp:
+        entry, rows = recorded
+        article = Article(
+            title=entry["title"],
+            url=entry["url"],
+            chunks={
+                _chunk_key(m): (
+                    m["line"],
+                    m.get("section"),
+                    _span_text(text, *m["span"]),
+                )
+                for m in rows
+            },
+        )
+    else:
+        article = parse_article(text)
+    if stat.st_size <= ARTICLE_CACHE_MAX_BYTES:
+        with _articles_lock:
+            _articles[key] = (stamp, article)
+    return article
+
+
+def _chunk_text(data_dir: Path, m: dict, index_dir: Path | None) -> str:
+    chunk = load_article(data_dir / m["file"], index_dir).chunks.get(
+        _chunk_key(m)
+    )
+    return chunk[2] if chunk else ""
+
+
+def _index_stamp(index_dir: Path) -> tuple[int, int]:
+    """Identity of the index generation in use: build_index swaps
+    config.json by rename, so its inode and mtime change with each build."""
+    stat = (index_dir / "config.json").stat()
+    return stat.st_ino, stat.st_mtime_ns
 
 
 @lru_cache(maxsize=4)
 def _load_index(
-    index_dir_str: str,
-) -> tuple[np.ndarray, list[dict], float, Path]:
-    """Load and cache the embedding matrix, metadata, and config for an index.
+    index_dir_str: str, stamp: tuple[int, int] | None = None
+) -> tuple[
+    list[tuple[np.ndarray, np.ndarray | float, np.ndarray]],
+    list[dict | None],
+    Path,
+    tuple[np.ndarray, np.ndarray, np.ndarray] | None,
+]:
+    """Load and cache the segments, metadata, data dir and IVF lists
+    (centroids, row ids, offsets; None without) of an index.
 
-    Converts int8 → float32 once so every query_index call avoids the 123 MB
-    per-call allocation that mmap + asarray would otherwise produce.
+    Each segment is its int8 embedding matrix, its scales, and the indices
+    of its tombstoned rows. The matrices stay memory-mapped: pages load on
+    first use and live in the page cache, shared by every worker process on
+    the host, instead of a float32 copy (4x the file) private to each.
+    Indexes built before per-row scales carry a single ``scale`` in
+    config.json. Callers pass the ``_index_stamp`` of the index, so a
+    rebuilt index is loaded afresh instead of served from the cache.
     """
     index_dir = Path(index_dir_str)
-    emb = np.load(index_dir / "embeddings.npy").astype("float32")
     config = json.loads(
         (index_dir / "config.json").read_text(encoding="utf-8")
     )
-    meta = [
-        json.loads(line)
-        for line in (index_dir / "meta.jsonl")
-        .read_text(encoding="utf-8")
-        .splitlines()
-        if line.strip()
+    layout, meta_name = _layout(config)
+    meta = _read_meta(index_dir / meta_name)
+    deleted = np.flatnonzero([m is None for m in meta])
+    segments, offset = [], 0
+    for emb_name, scales_name, _ in layout:
+        emb = np.load(index_dir / emb_name, mmap_mode="r")
+        scales = (
+            np.load(index_dir / scales_name, mmap_mode="r")
+            if scales_name and (index_dir / scales_name).exists()
+            else float(config["scale"])
+        )
+        dead = deleted[(deleted >= offset) & (deleted < offset + len(emb))]
+        segments.append((emb, scales, dead - offset))
+        offset += len(emb)
+    ivf = None
+    if "ivf" in config:
+        with np.load(index_dir / config["ivf"]["file"]) as lists:
+            ivf = lists["centroids"], lists["rows"], lists["offsets"]
+    return segments, meta, _resolve_data_dir(config["data_dir"]), ivf
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` highest scores in each row, best first.
+
+    argpartition selects in O(n); only the k survivors are sorted.
+    """
+    k = min(k, scores.shape[-1])
+    if k <= 0:
+        return np.empty(scores.shape[:-1] + (0,), dtype=np.intp)
+    top = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+    order = np.argsort(-np.take_along_axis(scores, top, axis=-1), axis=-1)
+    return np.take_along_axis(top, order, axis=-1)
+
+
+def rank(
+    emb: np.ndarray,
+    scales: np.ndarray | float,
+    qvs: np.ndarray,
+    k: int = 10,
+    threshold: float = 0.3,
+    deleted: np.ndarray | None = None,
+) -> list[list[tuple[int, float]]]:
+    """(row, score) of the top-k chunks for each query vector in ``qvs``,
+    best first, dropping scores below ``threshold`` and the rows in
+    ``deleted``.
+
+    ``emb`` is the int8 matrix (typically memory-mapped) with per-row
+    ``scales`` (or one scale for all rows). Queries are int8-quantized too
+    and scored SCORE_BLOCK rows at a time as int8 x int8 dot products,
+    then corrected by the row and query scales. The products are widened
+    to float32 for BLAS, which sums them exactly while ``dim * 127**2``
+    stays under 2**24 (dim <= 1040); wider vectors use float64.
+    """
+    if deleted is not None and len(deleted):
+        k = min(k, len(emb) - len(deleted))
+    if not len(emb) or k <= 0:
+        return [[] for _ in qvs]
+    wide = np.float32 if emb.shape[1] * 127**2 < 2**24 else np.float64
+    q8, qscales = quantize_rows(np.asarray(qvs, dtype=np.float32))
+    out = []
+    for qs in range(0, len(q8), QUERY_BLOCK):
+        qb = q8[qs : qs + QUERY_BLOCK].astype(wide)
+        scores = np.empty((len(qb), len(emb)), dtype=wide)
+        for start in range(0, len(emb), SCORE_BLOCK):
+            block = np.asarray(emb[start : start + SCORE_BLOCK], dtype=wide)
+            np.matmul(qb, block.T, out=scores[:, start : start + len(block)])
+        scores *= qscales[qs : qs + QUERY_BLOCK, None]
+        scores *= scales
+        if deleted is not None:
+            scores[:, deleted] = -np.inf
+        for row, top in zip(scores, _top_k(scores, k)):
+            out.append(
+                [(int(i), float(row[i])) for i in top if row[i] >= threshold]
+            )
+    return out
+
+
+def _rank_segments(
+    segments: list[tuple[np.ndarray, np.ndarray | float, np.ndarray]],
+    qvs: np.ndarray,
+    k: int,
+    threshold: float,
+) -> list[list[tuple[int, float]]]:
+    """rank over every segment of an index, with rows numbered across
+    segments in meta order."""
+    merged: list[list[tuple[int, float]]] = [[] for _ in qvs]
+    offset = 0
+    for emb, scales, deleted in segments:
+        for hits, seg_hits in zip(
+            merged, rank(emb, scales, qvs, k, threshold, deleted)
+        ):
+            hits.extend((offset + i, score) for i, score in seg_hits)
+        offset += len(emb)
+    return [sorted(hits, key=lambda h: -h[1])[:k] for hits in merged]
+
+
+def _rank_ivf(
+    segments: list[tuple[np.ndarray, np.ndarray | float, np.ndarray]],
+    ivf: tuple[np.ndarray, np.ndarray, np.ndarray],
+    qvs: np.ndarray,
+    k: int,
+    threshold: float,
+    nprobe: int,
+) -> list[list[tuple[int, float]]]:
+    """_rank_segments over only the rows in each query's ``nprobe``
+    nearest IVF lists."""
+    centroids, rows, offsets = ivf
+    deleted, start = [], 0
+    for emb, _, dead in segments:
+        deleted.append(dead + start)
+        start += len(emb)
+    deleted_rows = np.concatenate(deleted)
+    out = []
+    for qv in qvs:
+        cand = sgrep_ivf.candidates(centroids, rows, offsets, qv, nprobe)
+        q8, scales = _gather(segments, cand)
+        dead = np.flatnonzero(np.isin(cand, deleted_rows))
+        hits = rank(q8, scales, qv[None], k, threshold, dead)[0]
+        out.append([(int(cand[i]), score) for i, score in hits])
+    return out
+
+
+@lru_cache(maxsize=4)
+def _load_keywords(
+    index_dir_str: str, stamp: tuple[int, int] | None = None
+) -> list[tuple[dict[str, np.ndarray], np.ndarray]] | None:
+    """Load and cache the keyword postings of each segment of an index,
+    with its tombstoned rows; None for indexes built without them."""
+    index_dir = Path(index_dir_str)
+    config = json.loads(
+        (index_dir / "config.json").read_text(encoding="utf-8")
+    )
+    segments = _load_index(index_dir_str, stamp)[0]
+    if (
+        "segments" not in config
+        or not all("postings" in seg for seg in config["segments"])
+        or [seg["rows"] for seg in config["segments"]]
+        != [len(emb) for emb, _, _ in segments]
+    ):
+        return None
+    return [
+        (sgrep_bm25.load(index_dir, seg), deleted)
+        for seg, (_, _, deleted) in zip(config["segments"], segments)
+    ]
+
+
+@lru_cache(maxsize=4)
+def _article_table(
+    index_dir_str: str, stamp: tuple[int, int] | None = None
+) -> dict[str, tuple[dict, list[dict]]]:
+    """The offset table of an index: each source file's manifest entry and
+    chunk meta (with spans), in line order, by absolute path. Files indexed
+    before spans were recorded are left out."""
+    index_dir = Path(index_dir_str)
+    config = _read_config(index_dir)
+    if config is None or "files" not in config:
+        return {}
+    _, meta, data_dir, _ = _load_index(index_dir_str, stamp)
+    rows: dict[str, list[dict]] = {}
+    for m in meta:
+        if m is not None:
+            rows.setdefault(m["file"], []).append(m)
+    files = json.loads(
+        (index_dir / config["files"]).read_text(encoding="utf-8")
+    )
+    return {
+        str(data_dir / name): (
+            entry,
+            sorted(rows.get(name, []), key=lambda m: m["line"]),
+        )
+        for name, entry in files.items()
+        if "title" in entry and all("span" in m for m in rows.get(name, []))
+    }
+
+
+def _offset_table(index_dir: Path) -> dict[str, tuple[dict, list[dict]]]:
+    try:
+        stamp = _index_stamp(index_dir)
+    except FileNotFoundError:
+        return {}
+    return _article_table(str(index_dir), stamp)
+
+
+def _result(m: dict, score: float, data_dir: Path, index_dir: Path) -> dict:
+    return {
+        "file": m["file"],
+        "source": m.get("source", "wri"),
+        "line": m["line"],
+        "para": m.get("para"),
+        "section": m.get("section"),
+        "score": score,
+        "text": _chunk_text(data_dir, m, index_dir),
+    }
+
+
+def query_batch(
+    index_dir: Path,
+    queries: list[str],
+    k: int = 10,
+    threshold: float = 0.3,
+    nprobe: int = IVF_NPROBE,
+) -> list[list[dict]]:
+    """query_index for many queries at once: one encode call, and one
+    matrix multiply per QUERY_BLOCK queries instead of one per query.
+
+    Indexes with IVF lists are searched in the ``nprobe`` lists nearest
+    each query; an ``nprobe`` of at least the list count searches all rows.
+    """
+    if not queries:
+        return []
+    segments, meta, data_dir, ivf = _load_index(
+        str(index_dir), _index_stamp(index_dir)
+    )
+    qvs = normalize(_index_model(index_dir).encode(list(queries))).astype(
+        "float32"
+    )
+    if ivf is not None and nprobe < len(ivf[0]):
+        ranked = _rank_ivf(segments, ivf, qvs, k, threshold, nprobe)
+    else:
+        ranked = _rank_segments(segments, qvs, k, threshold)
+    return [
+        [_result(meta[i], score, data_dir, index_dir) for i, score in hits]  # type: ignore[arg-type]
+        for hits in ranked
     ]
-    return emb, meta, config["scale"], _resolve_data_dir(config["data_dir"])
 
 
 def query_index(
-    index_dir: Path, query: str, k: int = 10, threshold: float = 0.3
+    index_dir: Path,
+    query: str,
+    k: int = 10,
+    threshold: float = 0.3,
+    nprobe: int = IVF_NPROBE,
 ) -> list[dict]:
     """Return the top-k matching paragraphs as a list of result dicts."""
-    emb, meta, scale, data_dir = _load_index(str(index_dir))
-    qv = normalize(_index_model(index_dir).encode([query])[0]).astype(
-        "float32"
-    )
-    scores = (emb @ qv) * scale
+    return query_batch(
+        index_dir, [query], k=k, threshold=threshold, nprobe=nprobe
+    )[0]
 
-    results = []
-    for i in np.argsort(-scores)[:k]:
-        if scores[i] < threshold:
-            break
-        m = meta[i]
-        results.append(
-            {
-                "file": m["file"],
-                "source": m.get("source", "wri"),
-                "line": m["line"],
-                "para": m.get("para"),
-                "section": m.get("section"),
-                "score": float(scores[i]),
-                "text": _chunk_text(data_dir, m),
-            }
-        )
-    return results
+
+def keyword_query(index_dir: Path, query: str, k: int = 10) -> list[dict]:
+    """Return the top-k paragraphs by BM25 over the query's word tokens;
+    empty for indexes built without keyword postings."""
+    stamp = _index_stamp(index_dir)
+    keywords = _load_keywords(str(index_dir), stamp)
+    if keywords is None:
+        return []
+    _, meta, data_dir, _ = _load_index(str(index_dir), stamp)
+    return [
+        _result(meta[i], score, data_dir, index_dir)  # type: ignore[arg-type]
+        for i, score in sgrep_bm25.score(keywords, query, k)
+    ]
 
 
-def search(index_dir: Path, query: str, k: int = 10, threshold: float = 0.3):
+def hybrid_query(
+    index_dir: Path,
+    query: str,
+    k: int = 10,
+    threshold: float = 0.3,
+    nprobe: int = IVF_NPROBE,
+) -> list[dict]:
+    """Return the top-k paragraphs by reciprocal rank fusion of the
+    semantic and keyword rankings.
+
+    ``score`` is the fused score, and ``matched`` lists the rankings
+    ("semantic", "keyword") a paragraph came from. Indexes without keyword
+    postings fuse the semantic ranking alone.
+    """
+    fused: dict[tuple[str, int], dict] = {}
+    for source, results in (
+        (
+            "semantic",
+            query_index(
+                index_dir,
+                query,
+                k=HYBRID_DEPTH,
+                threshold=threshold,
+                nprobe=nprobe,
+            ),
+        ),
+        ("keyword", keyword_query(index_dir, query, k=HYBRID_DEPTH)),
+    ):
+        for position, r in enumerate(results, 1):
+            entry = fused.setdefault(
+                (r["file"], r["line"]), {**r, "score": 0.0, "matched": []}
+            )
+            entry["score"] += 1 / (RRF_K + position)
+            entry["matched"].append(source)
+    return sorted(fused.values(), key=lambda r: -r["score"])[:k]
+
+
+def search(
+    index_dir: Path,
+    query: str,
+    k: int = 10,
+    threshold: float = 0.3,
+    nprobe: int = IVF_NPROBE,
+    mode: str = "semantic",
+):
+    if mode == "keyword":
+        results = keyword_query(index_dir, query, k=k)
+    elif mode == "hybrid":
+        results = hybrid_query(
+            index_dir, query, k=k, threshold=threshold, nprobe=nprobe
+        )
+    else:
+        results = query_index(
+            index_dir, query, k=k, threshold=threshold, nprobe=nprobe
+        )
     last = None
-    for r in query_index(index_dir, query, k=k, threshold=threshold):
+    for r in results:
         if r["file"] != last:
             print(f"\n{paint(r['file'], 35)}")
             last = r["file"]
@@ -301,6 +1130,24 @@ def search(index_dir: Path, query: str, k: int = 10, threshold: float = 0.3):
         )
 
 
+def search_batch(
+    index_dir: Path,
+    lines,
+    k: int = 10,
+    threshold: float = 0.3,
+    nprobe: int = IVF_NPROBE,
+) -> None:
+    """Answer one query per input line, printing a JSON line per query."""
+    queries = [q.strip() for q in lines if q.strip()]
+    for query, results in zip(
+        queries,
+        query_batch(
+            index_dir, queries, k=k, threshold=threshold, nprobe=nprobe
+        ),
+    ):
+        print(json.dumps({"query": query, "results": results}))
+
+
 def main():
     parser = argparse.ArgumentParser(
         prog="sgrep",
@@ -323,9 +1170,31 @@ def main():
         metavar="INDEX_DIR",
         help=f"index storage directory (default: {DEFAULT_INDEX_DIR})",
     )
+    idx.add_argument(
+        "--full",
+        action="store_true",
+        help="re-embed every article instead of updating the index",
+    )
+    idx.add_argument(
+        "--compact",
+        action="store_true",
+        help="drop tombstoned rows into a single segment",
+    )
+    idx.add_argument(
+        "--ivf",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help=f"build IVF lists for approximate search (default: keep "
+        f"the index's choice; new at {IVF_MIN_ROWS} paragraphs or more)",
+    )
 
     srch = sub.add_parser("search", help="search the index")
-    srch.add_argument("query", help="search query")
+    srch.add_argument("query", nargs="?", help="search query")
+    srch.add_argument(
+        "--batch",
+        action="store_true",
+        help="read one query per line from stdin; print JSON lines",
+    )
     srch.add_argument(
         "--index",
         type=Path,
@@ -346,6 +1215,20 @@ def main():
         default=0.3,
         help="minimum similarity score (default: 0.3)",
     )
+    srch.add_argument(
+        "--nprobe",
+        type=int,
+        default=IVF_NPROBE,
+        metavar="N",
+        help=f"IVF lists searched per query, when the index has them "
+        f"(default: {IVF_NPROBE})",
+    )
+    srch.add_argument(
+        "--mode",
+        choices=["semantic", "keyword", "hybrid"],
+        default="semantic",
+        help="ranking: embeddings, BM25, or both fused (default: semantic)",
+    )
 
     # allow bare `sgrep "query"` without the search subcommand
     if len(sys.argv) > 1 and sys.argv[1] not in (
@@ -359,13 +1242,29 @@ def main():
     args = parser.parse_args()
 
     if args.cmd == "index":
-        build_index(args.data.resolve(), args.index.resolve())
-    elif args.cmd == "search":
+        build_index(
+            args.data.resolve(),
+            args.index.resolve(),
+            full=args.full,
+            compact=args.compact,
+            ivf=args.ivf,
+        )
+    elif args.cmd == "search" and args.batch:
+        search_batch(
+            args.index.resolve(),
+            sys.stdin,
+            k=args.top,
+            threshold=args.threshold,
+            nprobe=args.nprobe,
+        )
+    elif args.cmd == "search" and args.query:
         search(
             args.index.resolve(),
             args.query,
             k=args.top,
             threshold=args.threshold,
+            nprobe=args.nprobe,
+            mode=args.mode,
         )
     else:
         parser.print_help()
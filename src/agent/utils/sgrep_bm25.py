@@ -0,0 +1,177 @@
+"""
+BM25 keyword index for sgrep indexes.
+
+Each index segment carries the postings of its rows next to its vectors:
+one (row, tf) record per distinct term of a row, grouped by term, in
+seg-<generation>.postings.npy (memory-mapped like the vectors), and the
+segment's sorted term table, list offsets and row lengths in
+seg-<generation>.terms.npz. Terms are 64-bit hashes of lowercased word
+tokens, so segments share no vocabulary and are written, compacted and
+dropped independently. Document frequencies and the average row length
+are computed per query over live rows, so tombstoned rows neither match
+nor skew the scores.
+"""
+
+import hashlib
+import re
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+TOKEN_RE = re.compile(r"\w+")
+POSTING = np.dtype([("row", "<i4"), ("tf", "<u2")])
+K1 = 1.2
+B = 0.75
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+@lru_cache(maxsize=1 << 18)
+def term_id(token: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(),
+        "little",
+    )
+
+
+def _group(
+    terms: np.ndarray, postings: np.ndarray, lengths: np.ndarray
+) -> dict[str, np.ndarray]:
+    order = np.lexsort((postings["row"], terms))
+    terms, postings = terms[order], postings[order]
+    vocab, starts = np.unique(terms, return_index=True)
+    return {
+        "postings": postings,
+        "terms": vocab,
+        "starts": np.append(starts, len(terms)).astype(np.int64),
+        "lengths": lengths.astype(np.int32),
+    }
+
+
+def build(texts: list[str]) -> dict[str, np.ndarray]:
+    """Postings, term table, list starts and row lengths of ``texts``."""
+    terms, rows, tfs = [], [], []
+    lengths = np.empty(len(texts), dtype=np.int32)
+    for row, text in enumerate(texts):
+        tokens = tokenize(text)
+        lengths[row] = len(tokens)
+        for token, tf in Counter(tokens).items():
+            terms.append(term_id(token))
+            rows.append(row)
+            tfs.append(min(tf, 65535))
+    postings = np.empty(len(rows), dtype=POSTING)
+    postings["row"], postings["tf"] = rows, tfs
+    return _group(np.array(terms, dtype=np.uint64), postings, lengths)
+
+
+def merge(
+    parts: list[tuple[dict[str, np.ndarray], np.ndarray]],
+) -> dict[str, np.ndarray]:
+    """Concatenate segments, keeping the rows of each where its mask is
+    set and renumbering them in order; the compaction of ``build``."""
+    terms, postings, lengths, offset = [], [], [], 0
+    for part, keep in parts:
+        renumber = np.cumsum(keep) - 1 + offset
+        counts = np.diff(part["starts"])
+        seg_terms = np.repeat(part["terms"], counts)
+        seg_postings = np.asarray(part["postings"])
+        live = keep[seg_postings["row"]]
+        moved = seg_postings[live].copy()
+        moved["row"] = renumber[moved["row"]]
+        terms.append(seg_terms[live])
+        postings.append(moved)
+        lengths.append(part["lengths"][keep])
+        offset += int(keep.sum())
+    return _group(
+        np.concatenate(terms),
+        np.concatenate(postings),
+        np.concatenate(lengths),
+    )
+
+
+def save(prefix: Path, index: dict[str, np.ndarray]) -> dict[str, str]:
+    """Write ``index`` as <prefix>.postings.npy and <prefix>.terms.npz and
+    return their names, as stored in a segment's config entry."""
+    postings = prefix.with_name(f"{prefix.name}.postings.npy")
+    terms = prefix.with_name(f"{prefix.name}.terms.npz")
+    np.save(postings, index["postings"])
+    np.savez(
+        terms,
+        terms=index["terms"],
+        starts=index["starts"],
+        lengths=index["lengths"],
+    )
+    return {"postings": postings.name, "terms": terms.name}
+
+
+def load(index_dir: Path, segment: dict) -> dict[str, np.ndarray]:
+    with np.load(index_dir / segment["terms"]) as table:
+        index = {name: table[name] for name in ("terms", "starts", "lengths")}
+    index["postings"] = np.load(index_dir / segment["postings"], mmap_mode="r")
+    return index
+
+
+def score(
+    segments: list[tuple[dict[str, np.ndarray], np.ndarray]],
+    query: str,
+    k: int,
+) -> list[tuple[int, float]]:
+    """(row, BM25 score) of the top-k rows for ``query``, best first, with
+    rows numbered across ``segments`` (each with its tombstoned rows)."""
+    ids = sorted({term_id(token) for token in tokenize(query)})
+    n_live = total_length = 0
+    for index, deleted in segments:
+        n_live += len(index["lengths"]) - len(deleted)
+        total_length += int(index["lengths"].sum())
+        total_length -= int(index["lengths"][deleted].sum())
+    if not ids or not n_live:
+        return []
+    avgdl = max(total_length / n_live, 1.0)
+
+    matches: list[list[tuple[np.ndarray, np.ndarray, np.ndarray]]] = [
+        [] for _ in ids
+    ]
+    offset = 0
+    for index, deleted in segments:
+        pos = np.searchsorted(index["terms"], np.array(ids, dtype=np.uint64))
+        for i, (term, p) in enumerate(zip(ids, pos)):
+            if p == len(index["terms"]) or index["terms"][p] != term:
+                continue
+            hits = np.asarray(
+                index["postings"][index["starts"][p] : index["starts"][p + 1]]
+            )
+            hits = hits[~np.isin(hits["row"], deleted)]
+            matches[i].append(
+                (
+                    hits["row"] + offset,
+                    hits["tf"].astype(np.float64),
+                    index["lengths"][hits["row"]],
+                )
+            )
+        offset += len(index["lengths"])
+
+    rows, contributions = [], []
+    for parts in matches:
+        if not parts:
+            continue
+        term_rows = np.concatenate([r for r, _, _ in parts])
+        tf = np.concatenate([t for _, t, _ in parts])
+        dl = np.concatenate([d for _, _, d in parts])
+        df = len(term_rows)
+        idf = np.log1p((n_live - df + 0.5) / (df + 0.5))
+        rows.append(term_rows)
+        contributions.append(
+            idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * dl / avgdl))
+        )
+    if not rows:
+        return []
+    unique, inverse = np.unique(np.concatenate(rows), return_inverse=True)
+    totals = np.bincount(inverse, weights=np.concatenate(contributions))
+    k = min(k, len(unique))
+    top = np.argpartition(-totals, k - 1)[:k]
+    top = top[np.argsort(-totals[top], kind="stable")]
+    return [(int(unique[i]), float(totals[i])) for i in top]
@@ -0,0 +1,95 @@
+"""
+IVF coarse quantizer for sgrep indexes.
+
+Spherical k-means centroids over the index rows, and an inverted list of
+the rows nearest each centroid. A query scores the centroids, then only
+the rows in its ``nprobe`` best lists instead of every row, trading a
+little recall for latency that grows with ~sqrt(rows) instead of rows.
+Numpy only; sgrep.build_index decides when an index gets one and
+sgrep.query_batch searches it.
+
+Rows are int8 with a positive scale per row, and only their direction
+matters for assignment (argmax of a dot product), so the quantized rows
+are used as they are, without the scales.
+"""
+
+import numpy as np
+
+KMEANS_ITERATIONS = 12
+# k-means trains on a uniform sample of at most this many rows per list,
+# which bounds build memory and time independently of the index size.
+SAMPLE_PER_LIST = 64
+# Rows assigned per matrix multiply (64 MB of float32 at 1024 lists).
+ASSIGN_BLOCK = 16384
+
+
+def n_lists(n_rows: int) -> int:
+    """sqrt(n) lists: a query then scores sqrt(n) centroids and, at
+    ``nprobe`` lists, about nprobe * sqrt(n) rows."""
+    return max(1, int(np.sqrt(n_rows)))
+
+
+def _unit(v: np.ndarray) -> np.ndarray:
+    v = np.asarray(v, dtype=np.float32)
+    return v / np.clip(np.linalg.norm(v, axis=-1, keepdims=True), 1e-12, None)
+
+
+def assign(rows: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """The nearest centroid (by cosine) of each row, as int32 list ids."""
+    out = np.empty(len(rows), dtype=np.int32)
+    for start in range(0, len(rows), ASSIGN_BLOCK):
+        block = np.asarray(rows[start : start + ASSIGN_BLOCK], np.float32)
+        out[start : start + len(block)] = np.argmax(block @ centroids.T, 1)
+    return out
+
+
+def train(
+    sample: np.ndarray,
+    nlist: int,
+    iterations: int = KMEANS_ITERATIONS,
+    seed: int = 0,
+) -> np.ndarray:
+    """Spherical k-means: (nlist, dim) float32 unit centroids.
+
+    Starts from distinct sample rows; a list left empty by an iteration is
+    re-seeded with a random sample row.
+    """
+    rng = np.random.default_rng(seed)
+    sample = _unit(sample)
+    nlist = min(nlist, len(sample))
+    centroids = sample[rng.choice(len(sample), nlist, replace=False)]
+    for _ in range(iterations):
+        labels = assign(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, sample)
+        empty = np.bincount(labels, minlength=nlist) == 0
+        sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+        centroids = _unit(sums)
+    return centroids
+
+
+def inverted_lists(
+    labels: np.ndarray, nlist: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Row ids grouped by list, and the offsets of each list in them:
+    list ``l`` is ``rows[offsets[l]:offsets[l + 1]]``, in row order."""
+    rows = np.argsort(labels, kind="stable").astype(np.int64)
+    offsets = np.zeros(nlist + 1, dtype=np.int64)
+    np.cumsum(np.bincount(labels, minlength=nlist), out=offsets[1:])
+    return rows, offsets
+
+
+def candidates(
+    centroids: np.ndarray,
+    rows: np.ndarray,
+    offsets: np.ndarray,
+    qv: np.ndarray,
+    nprobe: int,
+) -> np.ndarray:
+    """Sorted ids of the rows in the ``nprobe`` lists nearest ``qv``."""
+    nprobe = min(nprobe, len(centroids))
+    scores = centroids @ np.asarray(qv, dtype=np.float32)
+    probe = np.argpartition(-scores, nprobe - 1)[:nprobe]
+    return np.sort(
+        np.concatenate([rows[offsets[i] : offsets[i + 1]] for i in probe])
+    )
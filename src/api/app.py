@@ -9,6 +9,10 @@ from fastapi.responses import JSONResponse
 
 from src.agent.graph import close_checkpointer_pool, get_checkpointer_pool
 from src.agent.utils.sgrep import data_status
+from src.api.auth.dependencies import close_rw_api_client
+from src.api.auth.machine_user import last_used_recorder
+from src.api.config import APISettings
+from src.api.loop_lag import loop_lag_monitor
 from src.api.routers import (
     admin,
     analyze,
@@ -26,6 +30,7 @@ from src.api.routers import (
     traces,
     users,
 )
+from src.api.services.quota import quota_counters
 from src.shared.config import SharedSettings
 from src.shared.database import close_global_pool, initialize_global_pool
 from src.shared.logging_config import get_logger
@@ -69,7 +74,16 @@ async def lifespan(app: FastAPI):
         )
     await initialize_global_pool()
     await get_checkpointer_pool()
+    if APISettings.enable_event_loop_lag_monitor:
+        loop_lag_monitor.start()
+    last_used_recorder.start()
+    quota_counters.start()
     yield
+    await loop_lag_monitor.stop()
+    await last_used_recorder.stop()
+    await quota_counters.stop()
+    await thumbnails.close_http_client()
+    await close_rw_api_client()
     await close_global_pool()
     await close_checkpointer_pool()
 
@@ -14,6 +14,7 @@ from src.api.auth.machine_user import (
     MACHINE_USER_PREFIX,
     validate_machine_user_token,
 )
+from src.api.config import APISettings
 from src.api.data_models import UserOrm, UserType
 from src.api.schemas import UserModel
 from src.shared.database import get_session_from_pool_dependency
@@ -29,6 +30,41 @@ _user_info_cache: cachetools.TTLCache = cachetools.TTLCache(
     maxsize=1024, ttl=60 * 60 * 24
 )  # 1 day
 
+# Resolved app users (the users row as a UserModel), keyed by user id. Saves
+# the users lookup on every authenticated request; see
+# invalidate_resolved_user for the write paths that drop entries.
+_resolved_user_cache: cachetools.TTLCache = cachetools.TTLCache(
+    maxsize=4096, ttl=APISettings.resolved_user_cache_ttl_seconds
+)
+
+_rw_api_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _rw_api_client() -> httpx.AsyncClient:
+    """Shared, pooled client for RW API lookups (created on first use)."""
+    global _rw_api_http_client
+    if _rw_api_http_client is None or _rw_api_http_client.is_closed:
+        _rw_api_http_client = httpx.AsyncClient(
+            timeout=10.0,
+            limits=httpx.Limits(
+                max_connections=50, max_keepalive_connections=20
+            ),
+        )
+    return _rw_api_http_client
+
+
+async def close_rw_api_client() -> None:
+    global _rw_api_http_client
+    if _rw_api_http_client is not None:
+        await _rw_api_http_client.aclose()
+        _rw_api_http_client = None
+
+
+def invalidate_resolved_user(user_id: str) -> None:
+    """Drop a cached resolved user. Call after committing any change to the
+    users row (profile update, user type change, deletion)."""
+    _resolved_user_cache.pop(user_id, None)
+
 
 async def fetch_user_from_rw_api(
     request: Request,
@@ -47,15 +83,13 @@ async def fetch_user_from_rw_api(
         return _user_info_cache[token]
 
     try:
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                "https://api.resourcewatch.org/auth/user/me",
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {token}",
-                },
-                timeout=10,
-            )
+        resp = await _rw_api_client().get(
+            f"{APISettings.rw_api_base_url}/auth/user/me",
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {token}",
+            },
+        )
     except Exception as e:
         logger.exception(f"Error contacting Resource Watch: {e}")
         raise HTTPException(
@@ -122,6 +156,20 @@ async def _get_or_create_user(
     return user
 
 
+async def _resolve_user(
+    user_info: UserModel, session: AsyncSession
+) -> UserModel:
+    """The app user for an authenticated identity, from cache when
+    possible, else from the database (created on first sight)."""
+    cached = _resolved_user_cache.get(user_info.id)
+    if cached is None:
+        user = await _get_or_create_user(user_info, session)
+        cached = _orm_to_user_model(user)
+        _resolved_user_cache[user_info.id] = cached
+    # Callers get their own copy; the cached model is shared.
+    return cached.model_copy()
+
+
 async def require_auth(
     user_info: UserModel = Depends(fetch_user_from_rw_api),
     session: AsyncSession = Depends(get_session_from_pool_dependency),
@@ -133,10 +181,10 @@ async def require_auth(
             detail="Missing Bearer token in Authorization header",
         )
 
-    user = await _get_or_create_user(user_info, session)
+    user = await _resolve_user(user_info, session)
     bind_request_logging_context(user_id=user.id)
     set_current_user_id(user.id)
-    return _orm_to_user_model(user)
+    return user
 
 
 async def optional_auth(
@@ -147,10 +195,10 @@ async def optional_auth(
     if not user_info:
         return None
 
-    user = await _get_or_create_user(user_info, session)
+    user = await _resolve_user(user_info, session)
     bind_request_logging_context(user_id=user.id)
     set_current_user_id(user.id)
-    return _orm_to_user_model(user)
+    return user
 
 
 async def require_superuser(
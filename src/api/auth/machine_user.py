@@ -1,19 +1,153 @@
+"""Machine-user API key validation.
+
+Keys look like ``zeno-key:<prefix>:<secret>``; the prefix finds the key row
+and the secret is checked against its bcrypt hash. bcrypt is deliberately
+slow (~100-300 ms), so:
+
+* ``checkpw`` runs on a small dedicated thread pool, never on the event loop.
+* A verified (prefix, key hash, secret digest) triple is remembered for
+  ``machine_key_cache_ttl_seconds``; repeat calls with the same key skip
+  bcrypt. The key row is still looked up on every call, so revoking a key
+  (``is_active = False``) or rotating it (new hash) takes effect at once.
+* ``last_used_at`` is recorded in memory and written in one batch every
+  ``machine_key_last_used_flush_seconds`` instead of a commit per request.
+"""
+
+import asyncio
+import functools
+import hashlib
+import hmac
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import Optional
 
 import bcrypt
 import structlog
+from cachetools import TTLCache
 from fastapi import HTTPException, Request
-from sqlalchemy import select
+from sqlalchemy import bindparam, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import noload
 
+from src.api.config import APISettings
 from src.api.data_models import MachineUserKeyOrm, UserOrm, UserType
 from src.api.schemas import UserModel
+from src.shared.database import get_session_from_pool
 
 logger = structlog.get_logger()
 
 MACHINE_USER_PREFIX = "zeno-key"
 
+# key_prefix -> (key_hash, sha256 of the secret) of a verified key.
+_verified_keys: TTLCache = TTLCache(
+    maxsize=1024, ttl=APISettings.machine_key_cache_ttl_seconds
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _bcrypt_executor() -> ThreadPoolExecutor:
+    # Bounded so a burst of uncached keys queues here instead of taking
+    # every default-pool thread; bcrypt releases the GIL while hashing.
+    return ThreadPoolExecutor(
+        max_workers=APISettings.machine_key_bcrypt_workers,
+        thread_name_prefix="bcrypt",
+    )
+
+
+def _secret_digest(secret: str) -> bytes:
+    return hashlib.sha256(secret.encode("utf-8")).digest()
+
+
+async def _verify_secret(key_prefix: str, secret: str, key_hash: str) -> bool:
+    digest = _secret_digest(secret)
+    cached = _verified_keys.get(key_prefix)
+    if (
+        cached is not None
+        and cached[0] == key_hash
+        and hmac.compare_digest(cached[1], digest)
+    ):
+        return True
+
+    loop = asyncio.get_running_loop()
+    ok = await loop.run_in_executor(
+        _bcrypt_executor(),
+        bcrypt.checkpw,
+        secret.encode("utf-8"),
+        key_hash.encode("utf-8"),
+    )
+    if ok:
+        _verified_keys[key_prefix] = (key_hash, digest)
+    return ok
+
+
+def invalidate_machine_key(key_prefix: str) -> None:
+    """Forget a verified key (revoke/rotate in this process). Other
+    processes stop accepting it on their next lookup of the key row."""
+    _verified_keys.pop(key_prefix, None)
+
+
+class LastUsedRecorder:
+    """Coalesces ``last_used_at`` updates and writes them in batches."""
+
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self._pending: dict = {}  # key id -> latest use
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, key_id, used_at: datetime) -> None:
+        self._pending[key_id] = used_at
+
+    async def flush(self) -> int:
+        """Write pending timestamps in one statement; return rows written."""
+        if not self._pending:
+            return 0
+        pending, self._pending = self._pending, {}
+        try:
+            async with get_session_from_pool() as session:
+                # Core executemany; keys deleted meanwhile just match nothing.
+                keys = MachineUserKeyOrm.__table__
+                await session.execute(
+                    update(keys)
+                    .where(keys.c.id == bindparam("key_id"))
+                    .values(last_used_at=bindparam("used_at")),
+                    [
+                        {"key_id": key_id, "used_at": used_at}
+                        for key_id, used_at in pending.items()
+                    ],
+                )
+                await session.commit()
+        except Exception:
+            # Put them back (newer uses win) so the next flush retries.
+            for key_id, used_at in pending.items():
+                self._pending.setdefault(key_id, used_at)
+            logger.exception("Machine key last_used_at flush failed")
+            return 0
+        return len(pending)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            await self.flush()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+last_used_recorder = LastUsedRecorder(
+    interval_seconds=APISettings.machine_key_last_used_flush_seconds
+)
+
 
 async def validate_machine_user_token(
     token: str, session: AsyncSession, request: Request
@@ -31,11 +165,11 @@ async def validate_machine_user_token(
     key_prefix = parts[1]
     secret = parts[2]
 
-    # Find active key by prefix
+    # Find active key by prefix. The user's threads are never needed here.
     stmt = (
         select(MachineUserKeyOrm, UserOrm)
         .join(UserOrm)
-        .options(selectinload(UserOrm.threads))
+        .options(noload(UserOrm.threads))
         .where(
             MachineUserKeyOrm.key_prefix == key_prefix,
             MachineUserKeyOrm.is_active == True,  # noqa: E712
@@ -47,6 +181,7 @@ async def validate_machine_user_token(
     row = result.first()
 
     if not row:
+        invalidate_machine_key(key_prefix)
         raise HTTPException(
             status_code=401, detail="Invalid or inactive machine user key"
         )
@@ -54,9 +189,7 @@ async def validate_machine_user_token(
     key_record, user_record = row
 
     # Verify the secret matches the stored hash
-    if not bcrypt.checkpw(
-        secret.encode("utf-8"), key_record.key_hash.encode("utf-8")
-    ):
+    if not await _verify_secret(key_prefix, secret, key_record.key_hash):
         raise HTTPException(status_code=401, detail="Invalid machine user key")
 
     # Check if key has expired
@@ -68,9 +201,7 @@ async def validate_machine_user_token(
     # Expose the key's scopes for downstream authorization (require_scope).
     request.state.token_scopes = list(key_record.scopes or [])
 
-    # Update last_used_at timestamp
-    key_record.last_used_at = datetime.now()
-    await session.commit()
+    last_used_recorder.record(key_record.id, datetime.now())
 
     logger.info(
         "Machine user authenticated",
@@ -29,7 +29,10 @@ from sqlalchemy import func, select, text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
-from src.api.auth.machine_user import MACHINE_USER_PREFIX
+from src.api.auth.machine_user import (
+    MACHINE_USER_PREFIX,
+    invalidate_machine_key,
+)
 from src.api.auth.scopes import KNOWN_SCOPES
 from src.api.data_models import (
     MachineUserKeyOrm,
@@ -211,6 +214,7 @@ async def rotate_api_key(
 
     await session.commit()
     await session.refresh(key)
+    invalidate_machine_key(key.key_prefix)
 
     return full_token, key
 
@@ -234,6 +238,7 @@ async def revoke_api_key(
 
     await session.commit()
     await session.refresh(key)
+    invalidate_machine_key(key.key_prefix)
 
     return key
 
@@ -700,6 +705,23 @@ def _parse_cli_dt(s: str) -> datetime:
     default=300,
     help="Fetch page / upsert batch size.",
 )
+@click.option(
+    "--concurrency",
+    type=int,
+    default=4,
+    help="Langfuse list pages fetched in parallel per chunk.",
+)
+@click.option(
+    "--parse-workers",
+    type=int,
+    default=0,
+    help="Parse traces on this many worker processes (0 = inline).",
+)
+@click.option(
+    "--store-raw",
+    is_flag=True,
+    help="Also keep each trace's compressed raw copy for the detail view.",
+)
 @click.option(
     "--dry-run", is_flag=True, help="Fetch + parse but do not write."
 )
@@ -711,6 +733,9 @@ def ingest_langfuse_traces_command(
     overlap_hours: int,
     chunk_hours: int,
     batch_size: int,
+    concurrency: int,
+    parse_workers: int,
+    store_raw: bool,
     dry_run: bool,
 ):
     """Ingest Langfuse traces into Postgres (idempotent upsert)."""
@@ -753,6 +778,9 @@ def ingest_langfuse_traces_command(
                         chunk_hours=chunk_hours,
                         batch_size=batch_size,
                         dry_run=dry_run,
+                        concurrency=concurrency,
+                        parse_workers=parse_workers,
+                        keep_raw=store_raw,
                     )
                     click.echo(
                         f"[{env or 'all'}] {since_dt.isoformat()} → {until_dt.isoformat()} | "
@@ -802,6 +830,36 @@ def backfill_turn_fields_command(batch_size: int, dry_run: bool):
     asyncio.run(_run())
 
 
+@cli.command("rebuild-trace-rollups")
+@click.option(
+    "--batch-days",
+    type=int,
+    default=7,
+    help="Days of traces re-rolled per committed batch.",
+)
+def rebuild_trace_rollups_command(batch_days: int):
+    """Rebuild the hourly/daily trace-analytics rollups from langfuse_traces.
+
+    Run once after deploying the rollup migration, after backfill-turn-fields,
+    and after a sketch-parameter change. Ingestion keeps them current after
+    that. The analytics endpoints scan langfuse_traces while it runs.
+    """
+    from src.api.services.langfuse.rollups import rebuild_rollups
+
+    async def _run():
+        db = DatabaseManager()
+        try:
+            async with db.async_session() as session:
+                written = await rebuild_rollups(session, batch_days=batch_days)
+                click.echo(
+                    f"rebuild-trace-rollups: wrote {written} rollup row(s)"
+                )
+        finally:
+            await db.close()
+
+    asyncio.run(_run())
+
+
 # ---------------------------------------------------------------------------
 # build-aois: populate the unified `aois` / `user_aois` tables
 # ---------------------------------------------------------------------------
@@ -1,3 +1,6 @@
+import os
+import tempfile
+
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
 
@@ -8,6 +11,25 @@ class _APISettings(BaseSettings):
     """API-specific settings for quotas, authentication, and access control."""
 
     mapbox_api_token: str = ""
+    mapbox_api_base_url: str = "https://api.mapbox.com"
+
+    # On-disk thumbnail cache (fitted overlays + rendered PNGs), shared by
+    # all workers on a host and evicted LRU past the size bound.
+    thumbnail_cache_dir: str = os.path.join(
+        tempfile.gettempdir(), "zeno-thumbnails"
+    )
+    thumbnail_cache_max_mb: int = 256
+
+    # Rendered public dashboards, per worker. Every hit is revalidated
+    # against the dashboard's (updated_at, is_public); a positive
+    # `fresh_seconds` opts into serving entries unchecked for that long,
+    # which lets other workers show a dashboard just made private.
+    dashboard_render_cache_size: int = 1024
+    dashboard_render_cache_fresh_seconds: float = 0
+
+    # Serialized latest agent state per thread, per worker (see
+    # src.api.services.thread_state); revalidated on every read.
+    thread_state_cache_size: int = 256
 
     # Quota settings
     daily_quota_warning_threshold: int = 5
@@ -16,6 +38,44 @@ class _APISettings(BaseSettings):
     pro_user_daily_quota: int = 50
     machine_user_daily_quota: int = 99999
     enable_quota_checking: bool = True
+    # Per-worker prompt counters in front of daily_usage (see
+    # src/api/services/quota.py). A worker admits up to
+    # quota_counter_tolerance prompts per user between writes, so a user
+    # can overshoot the quota by at most that many per worker; 0 writes
+    # every prompt through. Buffered counts are flushed every interval.
+    quota_counter_tolerance: int = 2
+    quota_counter_flush_seconds: float = 5
+
+    # Resource Watch identity lookups (bearer token -> user), and the
+    # per-worker cache of resolved app users behind require_auth. Writes to
+    # a user invalidate this worker's entry; other workers catch up within
+    # the TTL.
+    rw_api_base_url: str = "https://api.resourcewatch.org"
+    resolved_user_cache_ttl_seconds: float = 60
+
+    # Machine-user API keys (see src/api/auth/machine_user.py): bcrypt runs
+    # on a small dedicated pool; verified secrets skip it for the TTL;
+    # last_used_at is written in batches every flush interval.
+    machine_key_bcrypt_workers: int = 4
+    machine_key_cache_ttl_seconds: float = 60
+    machine_key_last_used_flush_seconds: float = 30
+
+    # Event-loop lag monitor (see src/api/loop_lag.py)
+    enable_event_loop_lag_monitor: bool = True
+    event_loop_lag_interval_seconds: float = 0.5
+    event_loop_lag_warn_ms: float = 250
+    # One summary line (samples, stalls, max/mean lag) per worker this often;
+    # 0 disables it.
+    event_loop_lag_report_seconds: float = 60
+
+    # Trace/session listing totals (see src/api/routers/traces.py) are
+    # estimated from the rollups or planner statistics unless exact_total is
+    # requested; estimates under this many rows are replaced by the exact
+    # count, which is cheap at that size.
+    traces_exact_count_below: int = 10_000
+    # Trace detail falls back to one live Langfuse fetch, bounded by this,
+    # for traces ingested without a stored raw copy.
+    trace_detail_langfuse_timeout_seconds: float = 10
 
     model_config = {
         "env_file": ".env",
@@ -7,6 +7,8 @@ from typing import Any
 
 from sqlalchemy import (
     ARRAY,
+    DDL,
+    BigInteger,
     Boolean,
     Column,
     Date,
@@ -16,14 +18,16 @@ from sqlalchemy import (
     ForeignKey,
     Index,
     Integer,
+    LargeBinary,
     SmallInteger,
     String,
     UniqueConstraint,
+    event,
     text,
 )
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
-from sqlalchemy.orm import declarative_base, relationship
+from sqlalchemy.orm import declarative_base, deferred, relationship
 
 # Add Any declaration so mypy knows Base is a class.
 Base: Any = declarative_base()
@@ -370,6 +374,27 @@ class InsightOrm(Base):
     is_public = Column(Boolean, nullable=False, server_default="false")
     created_at = Column(DateTime, nullable=False, default=datetime.now)
 
+    # Full-text search document over the summary (weight A), chart titles (B)
+    # and chart_data string values (C). Maintained by the triggers in
+    # INSIGHT_SEARCH_DDL — never written by the application, and deferred so
+    # ordinary insight loads don't drag it along.
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
+
+    __table_args__ = (
+        # Serves the per-user listing and its (created_at, id) keyset cursor.
+        Index(
+            "ix_insights_user_created",
+            "user_id",
+            text("created_at DESC"),
+            text("id DESC"),
+        ),
+        Index(
+            "ix_insights_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+        ),
+    )
+
     charts = relationship(
         "InsightChartOrm",
         back_populates="insight",
@@ -409,8 +434,94 @@ class InsightChartOrm(Base):
     insight = relationship("InsightOrm", back_populates="charts")
 
 
+# Keeps insights.search_vector current. Titles and chart data live on the
+# child table, so chart writes refresh the parent row too. Mirrored by the
+# alembic migration that introduced the column; attached to the metadata here
+# so `create_all` (tests, fresh dev databases) gets the same triggers.
+INSIGHT_SEARCH_DDL = (
+    """
+    CREATE OR REPLACE FUNCTION insight_search_vector(
+        target uuid, body text
+    ) RETURNS tsvector AS $$
+        SELECT setweight(to_tsvector('english', coalesce(body, '')), 'A')
+            || setweight(
+                to_tsvector('english', coalesce(string_agg(c.title, ' '), '')),
+                'B'
+            )
+            || setweight(
+                coalesce(
+                    jsonb_to_tsvector(
+                        'simple', jsonb_agg(c.chart_data), '["string"]'
+                    ),
+                    ''::tsvector
+                ),
+                'C'
+            )
+        FROM insight_charts c
+        WHERE c.insight_id = target
+    $$ LANGUAGE sql STABLE
+    """,
+    """
+    CREATE OR REPLACE FUNCTION insights_search_vector_trigger()
+    RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := insight_search_vector(NEW.id, NEW.insight_text);
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION insight_charts_search_vector_trigger()
+    RETURNS trigger AS $$
+    DECLARE
+        target uuid;
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            target := OLD.insight_id;
+        ELSE
+            target := NEW.insight_id;
+        END IF;
+        UPDATE insights
+        SET search_vector = insight_search_vector(id, insight_text)
+        WHERE id = target;
+        IF TG_OP = 'UPDATE' AND OLD.insight_id IS DISTINCT FROM target THEN
+            UPDATE insights
+            SET search_vector = insight_search_vector(id, insight_text)
+            WHERE id = OLD.insight_id;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER insights_search_vector_update
+    BEFORE INSERT OR UPDATE OF insight_text ON insights
+    FOR EACH ROW EXECUTE FUNCTION insights_search_vector_trigger()
+    """,
+    """
+    CREATE TRIGGER insight_charts_search_vector_update
+    AFTER INSERT OR UPDATE OR DELETE ON insight_charts
+    FOR EACH ROW EXECUTE FUNCTION insight_charts_search_vector_trigger()
+    """,
+)
+
+# The SQL function reads insight_charts, so everything is created once both
+# tables exist (insight_charts is created after insights: it holds the FK).
+for _statement in INSIGHT_SEARCH_DDL:
+    event.listen(InsightChartOrm.__table__, "after_create", DDL(_statement))
+
+
 class DashboardOrm(Base):
     __tablename__ = "dashboards"
+    __table_args__ = (
+        # Serves the per-user listing and its (created_at, id) keyset cursor.
+        Index(
+            "ix_dashboards_user_created",
+            "user_id",
+            text("created_at DESC"),
+            text("id DESC"),
+        ),
+    )
 
     id = Column(
         PostgresUUID,
@@ -493,6 +604,9 @@ class DashboardWidgetOrm(Base):
             unique=True,
             postgresql_where=text("widget_type = 'insight'"),
         ),
+        # Per-dashboard widget counts on the listing; the partial index above
+        # only covers insight widgets.
+        Index("ix_dashboard_widgets_dashboard_id", "dashboard_id"),
     )
 
     id = Column(
@@ -521,6 +635,8 @@ class DashboardWidgetOrm(Base):
     created_at = Column(DateTime, nullable=False, default=datetime.now)
 
     dashboard = relationship("DashboardOrm", back_populates="widgets")
+    # Read-side only (dashboard expansion); writes go through insight_id.
+    insight = relationship("InsightOrm", viewonly=True)
 
 
 class JobOrm(Base):
@@ -654,9 +770,22 @@ class LangfuseTraceOrm(Base):
     recognized_contract = Column(Boolean, nullable=True)
 
     __table_args__ = (
-        Index("ix_langfuse_traces_trace_timestamp", "trace_timestamp"),
+        # Keyset orders of GET /api/traces and /sessions (see the router);
+        # the session-first index answers "latest turn of this session".
+        Index("ix_langfuse_traces_timestamp_id", "trace_timestamp", "id"),
+        Index(
+            "ix_langfuse_traces_timestamp_session",
+            "trace_timestamp",
+            "session_id",
+            postgresql_where=text("session_id IS NOT NULL"),
+        ),
+        Index(
+            "ix_langfuse_traces_session_timestamp",
+            "session_id",
+            "trace_timestamp",
+            "id",
+        ),
         Index("ix_langfuse_traces_user_id", "user_id"),
-        Index("ix_langfuse_traces_session_id", "session_id"),
         Index("ix_langfuse_traces_insight_id", "insight_id"),
         Index("ix_langfuse_traces_env_ts", "environment", "trace_timestamp"),
         Index("ix_langfuse_traces_turn_index", "turn_index"),
@@ -669,6 +798,28 @@ class LangfuseTraceOrm(Base):
     )
 
 
+class LangfuseTraceRawOrm(Base):
+    """The raw Langfuse trace (input/output, i.e. the AgentState snapshot) as
+    zlib-compressed JSON, kept by ingestion runs with ``--store-raw`` so the
+    trace detail view doesn't have to reach Langfuse. Separate from
+    ``langfuse_traces`` so its scans never touch the payloads; a missing row
+    just means the detail view falls back to a live fetch."""
+
+    __tablename__ = "langfuse_trace_raw"
+
+    # == langfuse_traces.id (no FK: written in the same batch, any order)
+    id = Column(String, primary_key=True, nullable=False)
+    encoding = Column(String, nullable=False)
+    payload = Column(LargeBinary, nullable=False)
+    # Uncompressed JSON size, for the compression ratio and storage estimates.
+    raw_bytes = Column(Integer, nullable=False)
+    stored_at = Column(
+        DateTime(timezone=True),
+        server_default=text("now()"),
+        nullable=False,
+    )
+
+
 class LangfuseIngestionRunOrm(Base):
     """One ingestion run (or backfill chunk): watermark bookkeeping + drift
     observability. ``fill_rates``/``fk_resolve_rates``/``unrecognized_contract_rate``
@@ -705,3 +856,62 @@ class LangfuseIngestionRunOrm(Base):
     fill_rates = Column(JSONB, nullable=True)
     fk_resolve_rates = Column(JSONB, nullable=True)
     unrecognized_contract_rate = Column(Float, nullable=True)
+
+
+class LangfuseTraceRollupOrm(Base):
+    """Pre-aggregated ``langfuse_traces`` cell: one row per (grain, bucket,
+    environment, outcome, turn position), with counts, sums, sparse
+    log-histograms of latency/cost and sparse HyperLogLog registers over
+    sessions/users. Maintained by ingestion and ``rebuild-trace-rollups``;
+    see src/api/services/langfuse/rollups.py for the sketch encodings."""
+
+    __tablename__ = "langfuse_trace_rollups"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    grain = Column(String, nullable=False)  # "hour" | "day"
+    bucket_start = Column(DateTime(timezone=True), nullable=False)
+    environment = Column(String, nullable=True)
+    outcome = Column(String, nullable=True)
+    # min(turn_index, ROLLUP_TURN_CAP + 1); NULL for traces without one.
+    turn_index = Column(Integer, nullable=True)
+    turn_min = Column(Integer, nullable=True)
+    turn_max = Column(Integer, nullable=True)
+
+    traces = Column(Integer, nullable=False)
+    lat_count = Column(Integer, nullable=False)
+    lat_sum = Column(Float, nullable=False)
+    lat_hist_idx = Column(ARRAY(SmallInteger), nullable=False)
+    lat_hist_cnt = Column(ARRAY(Integer), nullable=False)
+    cost_count = Column(Integer, nullable=False)
+    cost_sum = Column(Float, nullable=False)
+    cost_hist_idx = Column(ARRAY(SmallInteger), nullable=False)
+    cost_hist_cnt = Column(ARRAY(Integer), nullable=False)
+    tok_count = Column(Integer, nullable=False)
+    tok_sum = Column(BigInteger, nullable=False)
+    tool_count = Column(Integer, nullable=False)
+    tool_sum = Column(BigInteger, nullable=False)
+    tool_error_traces = Column(Integer, nullable=False)
+    aoi_types = Column(JSONB, nullable=False)  # {aoi_type: count}
+    session_hll_idx = Column(ARRAY(SmallInteger), nullable=False)
+    session_hll_rho = Column(ARRAY(SmallInteger), nullable=False)
+    user_hll_idx = Column(ARRAY(SmallInteger), nullable=False)
+    user_hll_rho = Column(ARRAY(SmallInteger), nullable=False)
+
+    __table_args__ = (
+        Index(
+            "ix_langfuse_trace_rollups_grain_bucket", "grain", "bucket_start"
+        ),
+    )
+
+
+class LangfuseTraceRollupStateOrm(Base):
+    """Single row (id=1) written by a completed rollup rebuild. The analytics
+    endpoints only read rollups whose ``sketch_version`` matches the code's."""
+
+    __tablename__ = "langfuse_trace_rollup_state"
+
+    id = Column(SmallInteger, primary_key=True)
+    sketch_version = Column(Integer, nullable=False)
+    rebuilt_at = Column(
+        DateTime(timezone=True), nullable=False, default=_utcnow
+    )
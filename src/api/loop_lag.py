@@ -0,0 +1,107 @@
+"""Event-loop lag monitor.
+
+A background task sleeps for a fixed interval and measures how late it wakes
+up. Any lateness is time the loop spent running something else without
+yielding (CPU-bound work, blocking I/O), i.e. time every other request on the
+worker was stalled. Stalls above the warning threshold are logged as they
+happen, and every ``report_seconds`` the monitor logs one "Event loop lag"
+line summarising the samples since the previous one (count, stalls, max and
+mean lag), so a healthy worker still reports how healthy it is.
+"""
+
+import asyncio
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from src.api.config import APISettings
+from src.shared.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class LoopLagStats:
+    samples: int = 0
+    stalls: int = 0
+    last_lag_ms: float = 0.0
+    max_lag_ms: float = 0.0
+    total_lag_ms: float = 0.0
+
+    @property
+    def mean_lag_ms(self) -> float:
+        return self.total_lag_ms / self.samples if self.samples else 0.0
+
+
+class LoopLagMonitor:
+    def __init__(
+        self,
+        interval_seconds: float,
+        warn_ms: float,
+        report_seconds: float = 0,
+    ):
+        self.interval_seconds = interval_seconds
+        self.warn_ms = warn_ms
+        self.report_seconds = report_seconds
+        # Samples since the last report.
+        self.stats = LoopLagStats()
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, lag_ms: float) -> None:
+        lag_ms = max(lag_ms, 0.0)
+        self.stats.samples += 1
+        self.stats.last_lag_ms = lag_ms
+        self.stats.total_lag_ms += lag_ms
+        self.stats.max_lag_ms = max(self.stats.max_lag_ms, lag_ms)
+        if lag_ms >= self.warn_ms:
+            self.stats.stalls += 1
+            logger.warning("Event loop stalled", lag_ms=round(lag_ms, 1))
+
+    def report(self) -> None:
+        """Log the stats since the last report and start a new window."""
+        logger.info(
+            "Event loop lag",
+            **{k: round(v, 1) for k, v in self.snapshot().items()},
+        )
+        self.stats = LoopLagStats()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        reported = loop.time()
+        while True:
+            expected = loop.time() + self.interval_seconds
+            await asyncio.sleep(self.interval_seconds)
+            now = loop.time()
+            self.record((now - expected) * 1000)
+            if (
+                self.report_seconds > 0
+                and now - reported >= self.report_seconds
+            ):
+                self.report()
+                reported = now
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def snapshot(self) -> dict[str, float]:
+        return {
+            **asdict(self.stats),
+            "mean_lag_ms": self.stats.mean_lag_ms,
+        }
+
+
+loop_lag_monitor = LoopLagMonitor(
+    interval_seconds=APISettings.event_loop_lag_interval_seconds,
+    warn_ms=APISettings.event_loop_lag_warn_ms,
+    report_seconds=APISettings.event_loop_lag_report_seconds,
+)
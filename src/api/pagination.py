@@ -0,0 +1,62 @@
+"""Keyset cursors for newest-first listings.
+
+Listings order by ``(created_at DESC, id DESC)`` and page with a row-value
+comparison against the last row of the previous page, so deep pages cost the
+same as the first and rows inserted mid-walk never shift the window. The
+cursor travels in the ``X-Next-Cursor`` response header (same header as the
+threads listing) and back in the ``cursor`` query param.
+"""
+
+from datetime import datetime
+from typing import Any, Optional
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import literal, tuple_
+from sqlalchemy.sql.elements import ColumnElement
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: Optional[datetime], row_id: Any) -> str:
+    """A NULL ``created_at`` (rows sorted after every dated row) encodes as
+    an empty timestamp; see `decode_text_cursor`."""
+    return f"{created_at.isoformat() if created_at else ''}|{row_id}"
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Parse a cursor produced by `encode_cursor`; 400 if malformed."""
+    try:
+        created_at, row_id = cursor.split("|")
+        return datetime.fromisoformat(created_at), UUID(row_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def decode_text_cursor(cursor: str) -> tuple[Optional[datetime], str]:
+    """Parse a cursor over a nullable timestamp and a free-text id (which may
+    itself contain ``|``); 400 if malformed."""
+    created_at, sep, row_id = cursor.partition("|")
+    try:
+        if not sep or not row_id:
+            raise ValueError(cursor)
+        return (
+            datetime.fromisoformat(created_at) if created_at else None
+        ), row_id
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def after_cursor(created_at_col, id_col, cursor: str) -> ColumnElement:
+    """WHERE clause selecting rows strictly after `cursor` in
+    ``(created_at DESC, id DESC)`` order."""
+    created_at, row_id = decode_cursor(cursor)
+    return tuple_(created_at_col, id_col) < tuple_(
+        literal(created_at), literal(row_id)
+    )
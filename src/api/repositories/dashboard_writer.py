@@ -5,14 +5,20 @@ Both paths write the same ``DashboardOrm`` / ``DashboardAoiOrm`` /
 Ownership checks live in the callers (router/tools) via ``dashboard_access``
 — the same split as insights. Malformed UUIDs are treated as not-found
 (None/False) rather than raising.
+
+Every write that changes how a dashboard renders bumps its ``updated_at``
+(the render cache's version stamp) in the same transaction and drops the
+local render-cache entry once committed.
 """
 
+from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
 from sqlalchemy import func, select, update
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
 
 from src.api.data_models import (
     DashboardAoiOrm,
@@ -20,6 +26,7 @@ from src.api.data_models import (
     DashboardWidgetOrm,
     InsightOrm,
 )
+from src.api.services.dashboard_cache import dashboard_render_cache
 from src.shared.database import get_session_from_pool
 from src.shared.logging_config import get_logger
 from src.shared.tile_urls import relativize_widget_config
@@ -51,6 +58,36 @@ def _parse_uuid(value) -> Optional[UUID]:
         return None
 
 
+async def _touch(session: AsyncSession, dashboard_id) -> None:
+    """Bump a dashboard's version stamp inside the caller's transaction."""
+    await session.execute(
+        update(DashboardOrm)
+        .where(DashboardOrm.id == dashboard_id)
+        .values(updated_at=datetime.now())
+    )
+
+
+async def touch_dashboards_with_insight(
+    session: AsyncSession, insight_id
+) -> list[UUID]:
+    """Bump every dashboard with a widget on `insight_id`; return their ids.
+
+    For insight writes (restyle, visibility) that change how those dashboards
+    render. Runs in the caller's transaction; the caller invalidates the
+    returned ids in the render cache after committing.
+    """
+    referencing = select(DashboardWidgetOrm.dashboard_id).where(
+        DashboardWidgetOrm.insight_id == insight_id
+    )
+    result = await session.execute(
+        update(DashboardOrm)
+        .where(DashboardOrm.id.in_(referencing))
+        .values(updated_at=datetime.now())
+        .returning(DashboardOrm.id)
+    )
+    return list(result.scalars())
+
+
 async def create_dashboard(
     *,
     user_id: str,
@@ -113,6 +150,48 @@ async def get_dashboard(dashboard_id) -> Optional[DashboardOrm]:
         return result.scalar_one_or_none()
 
 
+async def get_dashboard_expanded(dashboard_id) -> Optional[DashboardOrm]:
+    """Load a dashboard with AOIs, widgets and each widget's insight + charts
+    in a single round trip; caller applies access and visibility checks.
+
+    Joined eager loads multiply rows (AOIs x widgets x charts); dashboards
+    carry one AOI today, so this stays at widgets x charts.
+    """
+    target = _parse_uuid(dashboard_id)
+    if target is None:
+        return None
+    async with get_session_from_pool() as session:
+        result = await session.execute(
+            select(DashboardOrm)
+            .options(
+                joinedload(DashboardOrm.aois),
+                joinedload(DashboardOrm.widgets)
+                .joinedload(DashboardWidgetOrm.insight)
+                .joinedload(InsightOrm.charts),
+            )
+            .where(DashboardOrm.id == target)
+        )
+        return result.unique().scalar_one_or_none()
+
+
+async def get_dashboard_version(
+    dashboard_id,
+) -> Optional[tuple[datetime, bool]]:
+    """``(updated_at, is_public)`` for a dashboard, or None if it is gone."""
+    target = _parse_uuid(dashboard_id)
+    if target is None:
+        return None
+    async with get_session_from_pool() as session:
+        row = (
+            await session.execute(
+                select(DashboardOrm.updated_at, DashboardOrm.is_public).where(
+                    DashboardOrm.id == target
+                )
+            )
+        ).one_or_none()
+    return (row.updated_at, row.is_public) if row else None
+
+
 async def get_widget(widget_id) -> Optional[DashboardWidgetOrm]:
     """Load a single widget by id; the caller applies access checks via the
     owning dashboard. Malformed ids are not-found (None), never an error."""
@@ -168,6 +247,7 @@ async def add_widget(
             position=position,
         )
         session.add(widget)
+        await _touch(session, target)
         try:
             await session.commit()
         except IntegrityError as exc:
@@ -182,6 +262,7 @@ async def add_widget(
                 str(target), str(insight_id)
             ) from exc
         widget_id = str(widget.id)
+    dashboard_render_cache.invalidate(target)
 
     logger.info(
         "dashboard_widget_added",
@@ -211,7 +292,10 @@ async def update_widget(
             widget.position = position
         if config is not None:
             widget.config = relativize_widget_config(config)
+        dashboard_id = widget.dashboard_id
+        await _touch(session, dashboard_id)
         await session.commit()
+    dashboard_render_cache.invalidate(dashboard_id)
 
     logger.info("dashboard_widget_updated", widget_id=str(target))
     return True
@@ -226,8 +310,11 @@ async def remove_widget(widget_id) -> bool:
         widget = await session.get(DashboardWidgetOrm, target)
         if widget is None:
             return False
+        dashboard_id = widget.dashboard_id
         await session.delete(widget)
+        await _touch(session, dashboard_id)
         await session.commit()
+    dashboard_render_cache.invalidate(dashboard_id)
 
     logger.info("dashboard_widget_removed", widget_id=str(target))
     return True
@@ -252,6 +339,7 @@ async def update_dashboard(
         if description is not None:
             dashboard.description = description
         await session.commit()
+    dashboard_render_cache.invalidate(target)
 
     logger.info("dashboard_updated", dashboard_id=str(target))
     return True
@@ -276,6 +364,7 @@ async def delete_dashboard(dashboard_id) -> bool:
             return False
         await session.delete(dashboard)
         await session.commit()
+    dashboard_render_cache.invalidate(target)
 
     logger.info("dashboard_deleted", dashboard_id=str(target))
     return True
@@ -320,7 +409,9 @@ async def set_dashboard_public(
             )
             publicized = [str(row_id) for row_id in result.scalars()]
 
+        await _touch(session, target)
         await session.commit()
+    dashboard_render_cache.invalidate(target)
 
     logger.info(
         "dashboard_public_set",
@@ -13,6 +13,8 @@ from sqlalchemy.orm import selectinload
 
 from src.agent.subagents.analyst.charts.model import Insight
 from src.api.data_models import InsightChartOrm, InsightOrm
+from src.api.repositories import dashboard_writer
+from src.api.services.dashboard_cache import dashboard_render_cache
 from src.shared.database import get_session_from_pool
 from src.shared.logging_config import get_logger
 
@@ -101,8 +103,12 @@ async def update_insight(insight_id: str, insight: Insight) -> bool:
             InsightChartOrm(**chart.to_orm_kwargs())
             for chart in insight.charts
         ]
+        dashboard_ids = await dashboard_writer.touch_dashboards_with_insight(
+            session, target
+        )
 
         await session.commit()
+    dashboard_render_cache.invalidate(*dashboard_ids)
 
     logger.info(
         "insight_updated",
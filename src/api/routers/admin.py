@@ -2,20 +2,29 @@
 
 import csv
 import io
+import json
 from datetime import datetime, timezone
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.api.auth.dependencies import _orm_to_user_model, require_superuser
+from src.api.auth.dependencies import (
+    _orm_to_user_model,
+    invalidate_resolved_user,
+    require_superuser,
+)
 from src.api.data_models import UserOrm, UserType
 from src.api.schemas import (
     UserModel,
     UserTypeUpdateRequest,
 )
-from src.shared.database import get_session_from_pool_dependency
+from src.shared.database import (
+    get_session_from_pool,
+    get_session_from_pool_dependency,
+)
 
 router = APIRouter()
 
@@ -54,6 +63,60 @@ def _csv_cell(value: Any) -> str:
     return str(value)
 
 
+# format -> (media type, file extension)
+_EXPORT_FORMATS: dict[str, tuple[str, str]] = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+}
+_EXPORT_BATCH_SIZE = 2000
+
+
+def _json_cell(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+async def stream_user_export(
+    session: AsyncSession, format: str
+) -> AsyncIterator[str]:
+    """Yield the users export in `format`, one chunk per cursor batch.
+
+    Selects plain columns (no ORM identity map) through a server-side cursor
+    and renders each batch into a fresh buffer, so memory is bounded by
+    `_EXPORT_BATCH_SIZE` rows regardless of table size.
+    """
+    columns = [UserOrm.__table__.c[name] for name in _EXPORT_COLUMNS]
+    result = await session.stream(
+        select(*columns)
+        .order_by(UserOrm.created_at.desc(), UserOrm.id.asc())
+        .execution_options(yield_per=_EXPORT_BATCH_SIZE)
+    )
+
+    if format == "csv":
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        writer.writerow(_EXPORT_COLUMNS)
+        yield buf.getvalue()
+        async for rows in result.partitions():
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            writer.writerows([_csv_cell(v) for v in row] for row in rows)
+            yield buf.getvalue()
+    else:
+        async for rows in result.partitions():
+            yield "".join(
+                json.dumps(
+                    {
+                        name: _json_cell(value)
+                        for name, value in zip(_EXPORT_COLUMNS, row)
+                    }
+                )
+                + "\n"
+                for row in rows
+            )
+
+
 @router.get("/api/admin/users", response_model=list[UserModel])
 async def list_users(
     email: Optional[str] = Query(None),
@@ -105,6 +168,7 @@ async def update_user_type(
     target.updated_at = datetime.now()
 
     await session.commit()
+    invalidate_resolved_user(user_id)
     await session.refresh(target)
 
     return _orm_to_user_model(target)
@@ -114,36 +178,34 @@ async def update_user_type(
 async def export_users(
     format: str = Query("csv"),
     _superuser: UserModel = Depends(require_superuser),
-    session: AsyncSession = Depends(get_session_from_pool_dependency),
 ):
     """Superuser-only full export of the users table.
 
-    Currently supports `format=csv` only; the `format` param exists so other
-    serializations (e.g. JSON) can be added without changing the URL.
+    Supports `format=csv` (default) and `format=ndjson` (one JSON object per
+    line, same columns). The body is streamed: rows are read through a
+    server-side cursor `_EXPORT_BATCH_SIZE` at a time and each batch is
+    flushed as one chunk, so memory stays flat however large the table is.
     """
-    if format != "csv":
+    if format not in _EXPORT_FORMATS:
         raise HTTPException(
             status_code=400,
             detail=(
-                f"Unsupported format {format!r}; only 'csv' is currently "
-                "supported"
+                f"Unsupported format {format!r}; supported formats: "
+                f"{', '.join(_EXPORT_FORMATS)}"
             ),
         )
-
-    result = await session.execute(
-        select(UserOrm).order_by(UserOrm.created_at.desc(), UserOrm.id.asc())
-    )
-    users = result.scalars().all()
-
-    buf = io.StringIO()
-    writer = csv.writer(buf)
-    writer.writerow(_EXPORT_COLUMNS)
-    for u in users:
-        writer.writerow([_csv_cell(getattr(u, c)) for c in _EXPORT_COLUMNS])
-
-    filename = f"gnw-users-{datetime.now(timezone.utc).date().isoformat()}.csv"
-    return Response(
-        content=buf.getvalue(),
-        media_type="text/csv",
+    media_type, extension = _EXPORT_FORMATS[format]
+
+    async def body() -> AsyncIterator[str]:
+        # Own session: the response outlives the request's dependencies.
+        async with get_session_from_pool() as session:
+            async for chunk in stream_user_export(session, format):
+                yield chunk
+
+    date = datetime.now(timezone.utc).date().isoformat()
+    filename = f"gnw-users-{date}.{extension}"
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
         headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
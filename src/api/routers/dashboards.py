@@ -10,16 +10,24 @@ publishing a dashboard cascades ``is_public=True`` to its referenced insights,
 otherwise a public dashboard renders empty for viewers.
 """
 
-from typing import Optional
+from typing import Any, Optional, Union
+from urllib.parse import quote
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import func, select, true
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from src.api.auth.dependencies import optional_auth, require_auth
-from src.api.data_models import DashboardOrm, InsightOrm, UserType
+from src.api.data_models import (
+    DashboardAoiOrm,
+    DashboardOrm,
+    DashboardWidgetOrm,
+    InsightOrm,
+    UserType,
+)
+from src.api.pagination import NEXT_CURSOR_HEADER, after_cursor, encode_cursor
 from src.api.repositories import dashboard_writer
 from src.api.repositories.insight_access import (
     is_visible_to_user as insight_is_visible_to_user,
@@ -28,17 +36,20 @@ from src.api.routers.insights import (
     _row_to_response as _insight_row_to_response,
 )
 from src.api.schemas import (
+    DashboardAoi,
     DashboardAoiResponse,
     DashboardCreateRequest,
     DashboardPublicToggleRequest,
     DashboardPublicToggleResponse,
     DashboardResponse,
+    DashboardSummaryResponse,
     DashboardUpdateRequest,
     DashboardWidgetCreateRequest,
     DashboardWidgetResponse,
     DashboardWidgetUpdateRequest,
     UserModel,
 )
+from src.api.services.dashboard_cache import dashboard_render_cache
 from src.shared.database import get_session_from_pool_dependency
 from src.shared.logging_config import get_logger
 from src.shared.tile_urls import absolutize_widget_config
@@ -133,29 +144,149 @@ async def create_dashboard(
     return _row_to_response(await _refetch_dashboard(dashboard_id))
 
 
-@router.get("/api/dashboards", response_model=list[DashboardResponse])
+def _thumbnail_path(source: str, src_id: str) -> str:
+    """Path of the AOI thumbnail endpoint (`thumbnails.py`) for an AOI."""
+    source, src_id = quote(source, safe=""), quote(src_id, safe="")
+    return f"/api/geometry/{source}/{src_id}/thumbnail"
+
+
+def _summary_statement(user_id: str):
+    """Dashboards with per-row AOI/widget counts and the first AOI, in one
+    query — the collections themselves are never loaded."""
+    widget_count = (
+        select(func.count())
+        .where(DashboardWidgetOrm.dashboard_id == DashboardOrm.id)
+        .scalar_subquery()
+    )
+    aoi_count = (
+        select(func.count())
+        .where(DashboardAoiOrm.dashboard_id == DashboardOrm.id)
+        .scalar_subquery()
+    )
+    primary_aoi = (
+        select(
+            DashboardAoiOrm.source,
+            DashboardAoiOrm.src_id,
+            DashboardAoiOrm.subtype,
+            DashboardAoiOrm.name,
+        )
+        .where(DashboardAoiOrm.dashboard_id == DashboardOrm.id)
+        .order_by(DashboardAoiOrm.position, DashboardAoiOrm.id)
+        .limit(1)
+        .lateral("primary_aoi")
+    )
+    return (
+        select(
+            DashboardOrm.id,
+            DashboardOrm.user_id,
+            DashboardOrm.name,
+            DashboardOrm.description,
+            DashboardOrm.is_public,
+            DashboardOrm.created_at,
+            DashboardOrm.updated_at,
+            aoi_count.label("aoi_count"),
+            widget_count.label("widget_count"),
+            primary_aoi.c.source,
+            primary_aoi.c.src_id,
+            primary_aoi.c.subtype,
+            primary_aoi.c.name.label("aoi_name"),
+        )
+        .outerjoin(primary_aoi, true())
+        .where(DashboardOrm.user_id == user_id)
+    )
+
+
+def _summary_from_row(row) -> DashboardSummaryResponse:
+    primary_aoi = None
+    thumbnail_path = None
+    if row.source is not None:
+        primary_aoi = DashboardAoi(
+            source=row.source,
+            src_id=row.src_id,
+            subtype=row.subtype,
+            name=row.aoi_name,
+        )
+        thumbnail_path = _thumbnail_path(row.source, row.src_id)
+    return DashboardSummaryResponse(
+        id=row.id,
+        user_id=row.user_id,
+        name=row.name,
+        description=row.description,
+        is_public=row.is_public,
+        created_at=row.created_at,
+        updated_at=row.updated_at,
+        aoi_count=row.aoi_count,
+        widget_count=row.widget_count,
+        primary_aoi=primary_aoi,
+        thumbnail_path=thumbnail_path,
+    )
+
+
+@router.get(
+    "/api/dashboards",
+    response_model=list[Union[DashboardResponse, DashboardSummaryResponse]],
+)
 async def list_dashboards(
+    response: Response,
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: Optional[str] = Query(default=None),
+    full: bool = Query(
+        default=False,
+        description="Include the AOI and widget collections on every item.",
+    ),
     user: UserModel = Depends(require_auth),
     session: AsyncSession = Depends(get_session_from_pool_dependency),
 ):
-    """List the authenticated user's dashboards, newest first."""
-    result = await session.execute(
-        select(DashboardOrm)
-        .options(
-            selectinload(DashboardOrm.aois),
-            selectinload(DashboardOrm.widgets),
+    """List the authenticated user's dashboards, newest first.
+
+    Items are summaries — AOI/widget counts, the primary AOI and its
+    thumbnail path — unless ``full=true``, which adds the AOI and widget
+    collections (still without expanded insight payloads; those come only
+    from ``GET /api/dashboards/{dashboard_id}``).
+
+    Paginated by keyset on ``(created_at, id)``: when more results exist the
+    ``X-Next-Cursor`` response header carries the value to pass back as
+    ``cursor`` for the next page.
+    """
+    if full:
+        stmt = (
+            select(DashboardOrm)
+            .options(
+                selectinload(DashboardOrm.aois),
+                selectinload(DashboardOrm.widgets),
+            )
+            .where(DashboardOrm.user_id == user.id)
         )
-        .where(DashboardOrm.user_id == user.id)
-        .order_by(DashboardOrm.created_at.desc())
-    )
-    return [_row_to_response(row) for row in result.scalars().all()]
+    else:
+        stmt = _summary_statement(user.id)
+
+    if cursor:
+        stmt = stmt.where(
+            after_cursor(DashboardOrm.created_at, DashboardOrm.id, cursor)
+        )
+    stmt = stmt.order_by(
+        DashboardOrm.created_at.desc(), DashboardOrm.id.desc()
+    ).limit(limit + 1)
+
+    result = await session.execute(stmt)
+    rows: list[Any] = list(result.scalars().all() if full else result.all())
+
+    has_more = len(rows) > limit
+    if has_more:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            rows[-1].created_at, rows[-1].id
+        )
+
+    if full:
+        return [_row_to_response(row) for row in rows]
+    return [_summary_from_row(row) for row in rows]
 
 
 @router.get("/api/dashboards/{dashboard_id}", response_model=DashboardResponse)
 async def get_dashboard(
     dashboard_id: UUID,
     user: Optional[UserModel] = Depends(optional_auth),
-    session: AsyncSession = Depends(get_session_from_pool_dependency),
 ):
     """
     Get a single dashboard with widget insight payloads expanded.
@@ -164,8 +295,31 @@ async def get_dashboard(
     authentication and ownership. Same read rule as
     `src.api.repositories.dashboard_access` (used by the agent tools), plus
     the admin/superuser override and HTTP error semantics.
+
+    The dashboard, its AOIs, widgets and widget insights load in one query.
+    Public renders are cached per worker (see
+    `src.api.services.dashboard_cache`) and shared by every viewer who sees
+    only the public insights; each hit is revalidated against the
+    dashboard's (updated_at, is_public). Owners and privileged users always
+    get a fresh build.
     """
-    row = await dashboard_writer.get_dashboard(dashboard_id)
+    user_id = user.id if user else None
+    privileged = _is_privileged(user)
+    cache = dashboard_render_cache
+
+    entry = None if privileged else cache.get(dashboard_id)
+    if entry is not None and entry.servable_to(user_id):
+        if cache.is_fresh(entry):
+            cache.stats.hits += 1
+            return entry.response
+        current = await dashboard_writer.get_dashboard_version(dashboard_id)
+        if current == (entry.version, True):
+            cache.mark_checked(entry)
+            cache.stats.revalidated += 1
+            return entry.response
+        cache.invalidate(dashboard_id)
+
+    row = await dashboard_writer.get_dashboard_expanded(dashboard_id)
     if not row:
         raise HTTPException(status_code=404, detail="Dashboard not found")
 
@@ -175,28 +329,36 @@ async def get_dashboard(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Authentication required",
             )
-        if row.user_id != user.id and not _is_privileged(user):
+        if row.user_id != user.id and not privileged:
             raise HTTPException(status_code=404, detail="Dashboard not found")
 
     # Expand widget insights the viewer may see (own + public; read-through
     # access for private insights on public dashboards is deliberately not
     # granted). Privileged users see everything.
-    insight_ids = [w.insight_id for w in row.widgets if w.insight_id]
-    insights_by_id = {}
-    if insight_ids:
-        result = await session.execute(
-            select(InsightOrm)
-            .options(selectinload(InsightOrm.charts))
-            .where(InsightOrm.id.in_(insight_ids))
-        )
-        user_id = user.id if user else None
-        insights_by_id = {
-            insight.id: insight
-            for insight in result.scalars().all()
-            if insight_is_visible_to_user(insight, user_id)
-            or _is_privileged(user)
+    insights = [w.insight for w in row.widgets if w.insight is not None]
+    insights_by_id = {
+        insight.id: insight
+        for insight in insights
+        if insight_is_visible_to_user(insight, user_id) or privileged
+    }
+    response = _row_to_response(row, insights_by_id)
+
+    if row.is_public and not privileged:
+        private_insight_owners = {
+            insight.user_id for insight in insights if not insight.is_public
         }
-    return _row_to_response(row, insights_by_id)
+        # Only cache the shared view: the owner (or the owner of a private
+        # insight on it) sees more than everyone else.
+        if user_id != row.user_id and user_id not in private_insight_owners:
+            cache.put(
+                row.id,
+                version=row.updated_at,
+                response=response,
+                owner_id=row.user_id,
+                private_insight_owners=private_insight_owners,
+            )
+            cache.stats.misses += 1
+    return response
 
 
 @router.patch(
@@ -1,21 +1,31 @@
 """Insight retrieval and management endpoints."""
 
-from typing import Optional
+from typing import Optional, Union
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy import String, cast, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import defer, selectinload
 
 from src.api.auth.dependencies import optional_auth, require_auth
-from src.api.data_models import InsightOrm, StatisticsOrm, UserType
+from src.api.data_models import (
+    InsightChartOrm,
+    InsightOrm,
+    StatisticsOrm,
+    UserType,
+)
+from src.api.pagination import NEXT_CURSOR_HEADER, after_cursor, encode_cursor
+from src.api.repositories import dashboard_writer
 from src.api.schemas import (
     InsightChartResponse,
+    InsightChartSummaryResponse,
     InsightPublicToggleRequest,
     InsightResponse,
+    InsightSummaryResponse,
     UserModel,
 )
+from src.api.services.dashboard_cache import dashboard_render_cache
 from src.shared.database import get_session_from_pool_dependency
 from src.shared.logging_config import get_logger
 
@@ -24,6 +34,45 @@ logger = get_logger(__name__)
 router = APIRouter()
 
 
+def _chart_spec(chart: InsightChartOrm) -> dict:
+    """Everything about a chart except its data rows."""
+    return dict(
+        id=chart.id,
+        position=chart.position,
+        title=chart.title,
+        chart_type=chart.chart_type,
+        x_axis=chart.x_axis,
+        y_axis=chart.y_axis,
+        color_field=chart.color_field,
+        stack_field=chart.stack_field,
+        group_field=chart.group_field,
+        series_fields=chart.series_fields or [],
+        dataset_id=chart.dataset_id,
+        color_map=chart.color_map or {},
+        series_color=chart.series_color,
+        divergent_colors=chart.divergent_colors,
+    )
+
+
+def _row_to_summary(row: InsightOrm) -> InsightSummaryResponse:
+    """List-view projection. Must only touch columns `_SUMMARY_LOAD` loads:
+    chart_data and the codeact columns are deferred there."""
+    return InsightSummaryResponse(
+        id=row.id,
+        user_id=row.user_id,
+        thread_id=row.thread_id,
+        insight_text=row.insight_text,
+        follow_up_suggestions=row.follow_up_suggestions or [],
+        statistics_ids=row.statistics_ids or [],
+        charts=[
+            InsightChartSummaryResponse(**_chart_spec(chart))
+            for chart in (row.charts or [])
+        ],
+        is_public=row.is_public,
+        created_at=row.created_at,
+    )
+
+
 def _row_to_response(row: InsightOrm) -> InsightResponse:
     return InsightResponse(
         id=row.id,
@@ -34,21 +83,7 @@ def _row_to_response(row: InsightOrm) -> InsightResponse:
         statistics_ids=row.statistics_ids or [],
         charts=[
             InsightChartResponse(
-                id=chart.id,
-                position=chart.position,
-                title=chart.title,
-                chart_type=chart.chart_type,
-                x_axis=chart.x_axis,
-                y_axis=chart.y_axis,
-                color_field=chart.color_field,
-                stack_field=chart.stack_field,
-                group_field=chart.group_field,
-                series_fields=chart.series_fields or [],
-                chart_data=chart.chart_data or [],
-                dataset_id=chart.dataset_id,
-                color_map=chart.color_map or {},
-                series_color=chart.series_color,
-                divergent_colors=chart.divergent_colors,
+                **_chart_spec(chart), chart_data=chart.chart_data or []
             )
             for chart in (row.charts or [])
         ],
@@ -63,6 +98,15 @@ def _row_to_response(row: InsightOrm) -> InsightResponse:
     )
 
 
+# Summary listing: chart rows without their data, no codeact payloads.
+_SUMMARY_LOAD = (
+    defer(InsightOrm.codeact_types),
+    defer(InsightOrm.codeact_contents),
+    selectinload(InsightOrm.charts).defer(InsightChartOrm.chart_data),
+)
+_FULL_LOAD = (selectinload(InsightOrm.charts),)
+
+
 def _aoi_pair_match(aoi_source: str, aoi_id: str):
     """Match a (source, src_id) pair against the parallel
     ``StatisticsOrm.aoi_sources``/``aoi_ids`` JSONB arrays.
@@ -84,16 +128,34 @@ def _aoi_pair_match(aoi_source: str, aoi_id: str):
     ).bindparams(aoi_id=aoi_id, aoi_source=aoi_source)
 
 
-@router.get("/api/insights", response_model=list[InsightResponse])
+@router.get(
+    "/api/insights",
+    response_model=list[Union[InsightResponse, InsightSummaryResponse]],
+)
 async def list_insights(
+    response: Response,
     thread_id: Optional[str] = None,
     dataset_id: Optional[int] = None,
     aoi_source: Optional[str] = None,
     aoi_id: Optional[str] = None,
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: Optional[str] = Query(default=None),
+    full: bool = Query(
+        default=False,
+        description="Include chart_data and codeact_parts on every item.",
+    ),
     user: UserModel = Depends(require_auth),
     session: AsyncSession = Depends(get_session_from_pool_dependency),
 ):
-    """List insights belonging to the authenticated user.
+    """List insights belonging to the authenticated user, newest first.
+
+    Items are summaries — chart specs without ``chart_data``, no
+    ``codeact_parts`` — unless ``full=true``. Fetch a single insight's full
+    payload from ``GET /api/insights/{insight_id}``.
+
+    Paginated by keyset on ``(created_at, id)``: when more results exist the
+    ``X-Next-Cursor`` response header carries the value to pass back as
+    ``cursor`` for the next page.
 
     Optional filters:
     - ``thread_id``: only insights from the given thread.
@@ -115,7 +177,7 @@ async def list_insights(
 
     stmt = (
         select(InsightOrm)
-        .options(selectinload(InsightOrm.charts))
+        .options(*(_FULL_LOAD if full else _SUMMARY_LOAD))
         .where(InsightOrm.user_id == user.id)
     )
     if thread_id:
@@ -133,11 +195,27 @@ async def list_insights(
             stat_match = stat_match.where(_aoi_pair_match(aoi_source, aoi_id))
         stmt = stmt.where(stat_match.exists())
 
-    stmt = stmt.order_by(InsightOrm.created_at.desc())
+    if cursor:
+        stmt = stmt.where(
+            after_cursor(InsightOrm.created_at, InsightOrm.id, cursor)
+        )
+
+    stmt = stmt.order_by(
+        InsightOrm.created_at.desc(), InsightOrm.id.desc()
+    ).limit(limit + 1)
 
     result = await session.execute(stmt)
-    rows = result.scalars().all()
-    return [_row_to_response(row) for row in rows]
+    rows = list(result.scalars().all())
+
+    has_more = len(rows) > limit
+    if has_more:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            rows[-1].created_at, rows[-1].id
+        )
+
+    to_response = _row_to_response if full else _row_to_summary
+    return [to_response(row) for row in rows]
 
 
 @router.get("/api/insights/{insight_id}", response_model=InsightResponse)
@@ -207,6 +285,11 @@ async def toggle_insight_public(
         raise HTTPException(status_code=404, detail="Insight not found")
 
     row.is_public = body.is_public
+    # Dashboards showing this insight render differently now.
+    dashboard_ids = await dashboard_writer.touch_dashboards_with_insight(
+        session, row.id
+    )
     await session.commit()
+    dashboard_render_cache.invalidate(*dashboard_ids)
     await session.refresh(row)
     return _row_to_response(row)
@@ -6,12 +6,11 @@ from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from fastapi.responses import StreamingResponse
-from langchain_core.load import dumps
 from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.agent.graph import fetch_checkpointer, fetch_zeno
+from src.agent.graph import fetch_checkpointer
 from src.api.auth.dependencies import optional_auth, require_auth
 from src.api.data_models import RatingOrm, ThreadOrm, UserType
 from src.api.schemas import (
@@ -23,6 +22,7 @@ from src.api.schemas import (
     UserModel,
 )
 from src.api.services.chat import langfuse_client, replay_chat
+from src.api.services.thread_state import STATE_FIELDS, thread_state_reader
 from src.shared.database import get_session_from_pool_dependency
 from src.shared.logging_config import get_logger
 
@@ -157,14 +157,34 @@ async def update_thread(
 )
 async def get_thread_state(
     thread_id: str,
+    fields: Optional[str] = Query(
+        default=None,
+        description=(
+            "Comma-separated state fields to return (e.g. "
+            "'aoi_selection,dataset'); all fields when omitted."
+        ),
+    ),
     user: Optional[UserModel] = Depends(optional_auth),
+    checkpointer: AsyncPostgresSaver = Depends(fetch_checkpointer),
     session: AsyncSession = Depends(get_session_from_pool_dependency),
 ):
     """
     Get the current agent state for a thread.
 
     Public threads can be accessed by anyone; private threads require ownership.
+    Read straight from the latest checkpoint and cached per thread until the
+    next one is written, so polling a field or two stays cheap.
     """
+    selected = None
+    if fields is not None:
+        selected = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = sorted(set(selected) - set(STATE_FIELDS))
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown state fields: {', '.join(unknown)}",
+            )
+
     stmt = select(ThreadOrm).filter_by(id=thread_id)
     result = await session.execute(stmt)
     thread = result.scalars().first()
@@ -198,14 +218,10 @@ async def get_thread_state(
         )
 
     try:
-        zeno_async = await fetch_zeno()
-        config = {"configurable": {"thread_id": thread_id}}
-        state = await zeno_async.aget_state(config=config)
-
-        return ThreadStateResponse(
-            thread_id=thread_id,
-            state=dumps(state.values),
+        state = await thread_state_reader.read(
+            checkpointer, thread_id, selected
         )
+        return ThreadStateResponse(thread_id=thread_id, state=state)
 
     except Exception as e:
         logger.exception("Error retrieving thread state", thread_id=thread_id)
@@ -231,6 +247,7 @@ async def delete_thread(
     await checkpointer.adelete_thread(thread_id)
     await session.delete(thread)
     await session.commit()
+    thread_state_reader.invalidate(thread_id)
     return {"detail": "Thread deleted successfully"}
 
 
@@ -13,21 +13,40 @@ labelled as such. Only ``/sessions`` groups by session.
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass
-from datetime import date, datetime
-from typing import Annotated, Any, Optional
+import json
+from dataclasses import dataclass, replace
+from datetime import date, datetime, timedelta, timezone
+from typing import Annotated, Any, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+import httpx
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel, Field
-from sqlalchemy import func, select, text
+from sqlalchemy import literal, select, text, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.auth.dependencies import require_scope
 from src.api.auth.scopes import TRACES_READ
+from src.api.config import APISettings
 from src.api.data_models import LangfuseTraceOrm
+from src.api.pagination import (
+    NEXT_CURSOR_HEADER,
+    decode_text_cursor,
+    encode_cursor,
+)
 from src.api.schemas import UserModel
-from src.api.services.langfuse.fetch import LangfuseClient
+from src.api.services.langfuse.fetch import LangfuseClient, LangfuseFetchError
+from src.api.services.langfuse.raw_store import load_raw
+from src.api.services.langfuse.rollups import (
+    COST_HIST,
+    LATENCY_HIST,
+    ROLLUP_TURN_CAP,
+    hll_estimate,
+    rollups_ready,
+)
 from src.shared.database import get_session_from_pool_dependency
+from src.shared.logging_config import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter(prefix="/api/traces", tags=["traces"])
 
@@ -97,6 +116,7 @@ class TraceListItem(BaseModel):
 
 class TraceListResponse(BaseModel):
     total: int
+    total_is_estimate: bool = False
     limit: int
     offset: int
     items: list[TraceListItem]
@@ -115,9 +135,11 @@ class TraceDetail(TraceListItem):
     parse_error: Optional[str] = None
     recognized_contract: Optional[bool] = None
     derived: Optional[dict[str, Any]] = None
-    # input/output are fetched live from Langfuse (the raw-trace store of record);
-    # raw_available is False if Langfuse 404s or is unreachable.
+    # input/output come from the copy ingestion stored (raw_source "stored")
+    # or, failing that, live from Langfuse (the raw-trace store of record);
+    # raw_available is False if neither has it or Langfuse is unreachable.
     raw_available: bool = False
+    raw_source: Optional[Literal["stored", "langfuse"]] = None
     input: Optional[Any] = None
     output: Optional[Any] = None
 
@@ -226,37 +248,163 @@ def _filters(flt: ListFilters) -> list[Any]:
     return conds
 
 
+_EXACT_TOTAL_QUERY = Query(
+    False,
+    description=(
+        "Count total exactly. By default it is estimated from the rollups or "
+        "planner statistics once past a few thousand rows."
+    ),
+)
+
+
+async def _planner_rows(
+    session: AsyncSession, sql: str, params: dict[str, Any]
+) -> int:
+    """The planner's row estimate for ``sql`` (table statistics; nothing is
+    executed)."""
+    plan: Any = (
+        await session.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"), params)
+    ).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def _rollup_total(
+    session: AsyncSession, flt: TurnAnalyticsFilters, kind: str = "traces"
+) -> Optional[int]:
+    """Trace (or distinct-session) count for ``flt`` from the rollups, or
+    None when they cannot answer it."""
+    rollup = _rollup_where(flt)
+    if rollup is None or not await rollups_ready(session):
+        return None
+    where, params = rollup
+    if kind == "sessions":
+        sketches = await _rollup_sketches(
+            session, where, params, ("sessions",)
+        )
+        return hll_estimate(sketches.get(("sessions", 0), {}))
+    return int(
+        (
+            await session.execute(
+                text(f"SELECT sum(traces) FROM langfuse_trace_rollups{where}"),
+                params,
+            )
+        ).scalar()
+        or 0
+    )
+
+
+async def _total(
+    session: AsyncSession,
+    count_sql: str,
+    rows_sql: str,
+    params: dict[str, Any],
+    *,
+    exact: bool,
+    estimate: Optional[int] = None,
+) -> tuple[int, bool]:
+    """``(total, is_estimate)`` for a listing. Uses ``estimate`` (from the
+    rollups) when given, else the planner's estimate for ``rows_sql``; an
+    estimate under ``traces_exact_count_below`` is replaced by running
+    ``count_sql``."""
+    if not exact:
+        if estimate is None:
+            estimate = await _planner_rows(session, rows_sql, params)
+        if estimate >= APISettings.traces_exact_count_below:
+            return estimate, True
+    return int(
+        (await session.execute(text(count_sql), params)).scalar() or 0
+    ), False
+
+
 @router.get("", response_model=TraceListResponse)
 async def list_traces(
+    response: Response,
     flt: ListFilters = Depends(),
     limit: int = Query(50, ge=1, le=200),
-    offset: int = Query(0, ge=0),
+    offset: int = Query(
+        0, ge=0, description="Deprecated: costs O(offset); page with cursor."
+    ),
+    cursor: Optional[str] = Query(
+        None, description=f"{NEXT_CURSOR_HEADER} from the previous page."
+    ),
+    exact_total: bool = _EXACT_TOTAL_QUERY,
     _reader: UserModel = Depends(require_scope(TRACES_READ)),
     session: AsyncSession = Depends(get_session_from_pool_dependency),
 ) -> TraceListResponse:
-    """List/filter traces (derived columns only — never raw/output)."""
-    conds = _filters(flt)
+    """List/filter traces (derived columns only — never raw/output), newest
+    first; traces without a timestamp come last.
 
-    count_stmt = select(func.count()).select_from(LangfuseTraceOrm)
-    for c in conds:
-        count_stmt = count_stmt.where(c)
-    total = int((await session.execute(count_stmt)).scalar() or 0)
+    Keyset-paginated on ``(trace_timestamp, id)``: while more rows exist the
+    ``X-Next-Cursor`` response header carries the ``cursor`` for the next
+    page, so every page costs the same. ``total`` is an estimate unless it is
+    small or ``exact_total`` is set (see ``total_is_estimate``)."""
+    where, params = _where_sql(flt)
+    total, estimated = await _total(
+        session,
+        f"SELECT count(*) FROM langfuse_traces{where}",
+        f"SELECT 1 FROM langfuse_traces{where}",
+        params,
+        exact=exact_total,
+        estimate=None if exact_total else await _rollup_total(session, flt),
+    )
 
     stmt = select(*_LIST_COLUMNS)
-    for c in conds:
+    for c in _filters(flt):
         stmt = stmt.where(c)
-    stmt = stmt.order_by(LangfuseTraceOrm.trace_timestamp.desc().nullslast())
-    stmt = stmt.limit(limit).offset(offset)
-    rows = (await session.execute(stmt)).mappings().all()
+    if offset:
+        stmt = stmt.order_by(
+            LangfuseTraceOrm.trace_timestamp.desc().nullslast(),
+            LangfuseTraceOrm.id.desc(),
+        )
+        stmt = stmt.limit(limit + 1).offset(offset)
+        rows = list((await session.execute(stmt)).mappings().all())
+    else:
+        rows = await _trace_page(session, stmt, cursor, limit + 1)
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            rows[-1]["trace_timestamp"], rows[-1]["id"]
+        )
 
     return TraceListResponse(
         total=total,
+        total_is_estimate=estimated,
         limit=limit,
         offset=offset,
         items=[_list_item_from_row(dict(r)) for r in rows],
     )
 
 
+async def _trace_page(
+    session: AsyncSession, stmt: Any, cursor: Optional[str], n: int
+) -> list[Any]:
+    """Up to ``n`` rows of ``stmt`` after ``cursor`` in ``(trace_timestamp
+    DESC NULLS LAST, id DESC)`` order. Dated rows and the NULL-timestamp tail
+    are read separately so each is one ordered range scan of
+    ``ix_langfuse_traces_timestamp_id``."""
+    ts, row_id = LangfuseTraceOrm.trace_timestamp, LangfuseTraceOrm.id
+    after_ts, after_id = decode_text_cursor(cursor) if cursor else (None, None)
+    rows: list[Any] = []
+    if after_id is None or after_ts is not None:
+        dated = stmt.where(ts.is_not(None))
+        if after_ts is not None:
+            dated = dated.where(
+                tuple_(ts, row_id)
+                < tuple_(literal(after_ts), literal(after_id))
+            )
+        dated = dated.order_by(ts.desc(), row_id.desc()).limit(n)
+        rows = list((await session.execute(dated)).mappings().all())
+    if len(rows) < n:
+        undated = stmt.where(ts.is_(None))
+        if after_id is not None and after_ts is None:
+            undated = undated.where(row_id < after_id)
+        undated = undated.order_by(row_id.desc()).limit(n - len(rows))
+        rows += (await session.execute(undated)).mappings().all()
+    return rows
+
+
 # --------------------------------------------------------------------------- #
 # Analytics + sessions (declared BEFORE /{trace_id} so literals aren't shadowed)
 # --------------------------------------------------------------------------- #
@@ -270,7 +418,20 @@ class DailyCount(BaseModel):
     count: int
 
 
+AnalyticsSource = Annotated[
+    Literal["raw", "rollup"],
+    Field(
+        description=(
+            "raw: exact, scanned from langfuse_traces. rollup: answered from the "
+            "hourly/daily rollups; counts, sums and averages are exact, "
+            "percentiles are within ~2% and distinct counts within ~2-3%."
+        )
+    ),
+]
+
+
 class TraceAnalytics(BaseModel):
+    source: AnalyticsSource = "raw"
     total_traces: int
     unique_sessions: int
     unique_users: int
@@ -329,6 +490,7 @@ class TurnGroup(TurnMetrics):
 
 
 class TurnAnalytics(BaseModel):
+    source: AnalyticsSource = "raw"
     turn_bucket_cap: int
     ungrouped_traces: int = Field(
         ...,
@@ -353,6 +515,7 @@ class SessionItem(BaseModel):
 
 class SessionListResponse(BaseModel):
     total: int
+    total_is_estimate: bool = False
     limit: int
     offset: int
     items: list[SessionItem]
@@ -377,6 +540,12 @@ def _where_sql(
     if flt.user_id:
         clauses.append("user_id = :user_id")
         params["user_id"] = flt.user_id
+    if isinstance(flt, ListFilters) and flt.session_id:
+        clauses.append("session_id = :session_id")
+        params["session_id"] = flt.session_id
+    if isinstance(flt, ListFilters) and flt.prompt_contains:
+        clauses.append("prompt ILIKE :prompt_contains")
+        params["prompt_contains"] = f"%{flt.prompt_contains}%"
     if flt.start:
         clauses.append("trace_timestamp >= :start")
         params["start"] = flt.start
@@ -460,16 +629,320 @@ def _metrics_dict(r: Any) -> dict[str, Any]:
     }
 
 
+# --------------------------------------------------------------------------- #
+# Rollup read path (tables maintained by src/api/services/langfuse/rollups.py)
+# --------------------------------------------------------------------------- #
+def _utc(ts: datetime) -> datetime:
+    # Naive bounds compare as UTC in the database session, so treat them so.
+    if ts.tzinfo is None:
+        return ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc)
+
+
+def _on_the_hour(ts: datetime) -> bool:
+    return _utc(ts).replace(minute=0, second=0, microsecond=0) == _utc(ts)
+
+
+def _rollup_ranges(
+    start: Optional[datetime], end: Optional[datetime]
+) -> list[tuple[str, Optional[datetime], Optional[datetime]]]:
+    """(grain, lo, hi) bucket ranges selecting each hour of [start, end)
+    exactly once: whole UTC days from the daily rollups, the partial days at
+    either edge from the hourly ones. A None bound is open."""
+    start = _utc(start) if start is not None else None
+    end = _utc(end) if end is not None else None
+    day_lo = day_hi = None
+    if start is not None:
+        day_lo = start.replace(hour=0)
+        if day_lo < start:
+            day_lo += timedelta(days=1)
+    if end is not None:
+        day_hi = end.replace(hour=0)
+    if day_lo is not None and day_hi is not None and day_lo >= day_hi:
+        return [("hour", start, end)]
+    ranges = [("day", day_lo, day_hi)]
+    if start is not None and day_lo is not None and start < day_lo:
+        ranges.append(("hour", start, day_lo))
+    if end is not None and day_hi is not None and day_hi < end:
+        ranges.append(("hour", day_hi, end))
+    return ranges
+
+
+def _rollup_time_sql(
+    start: Optional[datetime], end: Optional[datetime]
+) -> tuple[str, dict[str, Any]]:
+    parts: list[str] = []
+    params: dict[str, Any] = {}
+    for n, (grain, lo, hi) in enumerate(_rollup_ranges(start, end)):
+        clause = [f"grain = '{grain}'"]
+        if lo is not None:
+            clause.append(f"bucket_start >= :r_lo{n}")
+            params[f"r_lo{n}"] = lo
+        if hi is not None:
+            clause.append(f"bucket_start < :r_hi{n}")
+            params[f"r_hi{n}"] = hi
+        parts.append("(" + " AND ".join(clause) + ")")
+    return "(" + " OR ".join(parts) + ")", params
+
+
+def _rollup_where(
+    flt: TurnAnalyticsFilters,
+) -> Optional[tuple[str, dict[str, Any]]]:
+    """The rollup-table counterpart of ``_where_sql``, or None when the
+    filters need a raw scan: a user filter (not a rollup dimension), a time
+    bound off the hour, a turn position past ``ROLLUP_TURN_CAP``, or one of
+    the list-only filters."""
+    if flt.user_id:
+        return None
+    if isinstance(flt, ListFilters) and (
+        flt.session_id or flt.prompt_contains
+    ):
+        return None
+    if any(
+        t is not None and not _on_the_hour(t) for t in (flt.start, flt.end)
+    ):
+        return None
+    if (
+        (flt.turn_index or 0) > ROLLUP_TURN_CAP
+        or (flt.max_turn_index or 0) > ROLLUP_TURN_CAP
+        or (flt.min_turn_index or 0) > ROLLUP_TURN_CAP + 1
+    ):
+        return None
+    # environment, outcome and turn_index are rollup columns too.
+    where, params = _where_sql(replace(flt, start=None, end=None))
+    time_sql, time_params = _rollup_time_sql(flt.start, flt.end)
+    where = f"{where} AND {time_sql}" if where else f" WHERE {time_sql}"
+    return where, {**params, **time_params}
+
+
+# Rollup equivalents of the _SCALAR_METRICS_SQL aliases (percentiles come
+# from the merged histograms; see _with_quantiles).
+_ROLLUP_METRICS_SQL = """
+  sum(traces) AS total,
+  sum(lat_sum) / nullif(sum(lat_count), 0) AS lat_avg,
+  sum(cost_sum) / nullif(sum(cost_count), 0) AS cost_avg,
+  CASE WHEN sum(cost_count) > 0 THEN sum(cost_sum) END AS cost_total,
+  sum(tok_sum)::float / nullif(sum(tok_count), 0) AS tok_avg,
+  CASE WHEN sum(tok_count) > 0 THEN sum(tok_sum) END AS tok_total,
+  sum(tool_sum)::float / nullif(sum(tool_count), 0) AS tool_avg,
+  sum(tool_error_traces)::float / nullif(sum(traces), 0) AS tool_err_rate
+""".strip()
+
+# name -> (index column, value column, merge aggregate)
+_SKETCHES = {
+    "lat": ("lat_hist_idx", "lat_hist_cnt", "sum"),
+    "cost": ("cost_hist_idx", "cost_hist_cnt", "sum"),
+    "sessions": ("session_hll_idx", "session_hll_rho", "max"),
+    "users": ("user_hll_idx", "user_hll_rho", "max"),
+}
+
+
+async def _rollup_sketches(
+    session: AsyncSession,
+    where: str,
+    params: dict[str, Any],
+    kinds: tuple[str, ...],
+    cap: Optional[int] = None,
+) -> dict[tuple[str, int], dict[int, int]]:
+    """Merge the named sketches over the matching rollup cells in SQL, keyed
+    by (name, turn bucket) with ``cap``, else (name, 0)."""
+    group = "LEAST(turn_index, :cap)" if cap else "0"
+    if cap:
+        where += f"{' AND' if where else ' WHERE'} turn_index IS NOT NULL"
+        params = {**params, "cap": cap}
+    sql = " UNION ALL ".join(
+        f"SELECT '{k}' AS k, {group} AS g, u.i, {agg}(u.v) AS v "
+        f"FROM langfuse_trace_rollups, unnest({idx}, {val}) AS u(i, v)"
+        f"{where} GROUP BY 2, 3"
+        for k in kinds
+        for idx, val, agg in [_SKETCHES[k]]
+    )
+    merged: dict[tuple[str, int], dict[int, int]] = {}
+    for k, g, i, v in await session.execute(text(sql), params):
+        merged.setdefault((k, g), {})[i] = v
+    return merged
+
+
+def _with_quantiles(
+    r: Any, sketches: dict[tuple[str, int], dict[int, int]], g: int = 0
+) -> dict[str, Any]:
+    lat = sketches.get(("lat", g), {})
+    cost = sketches.get(("cost", g), {})
+    return {
+        **r,
+        "lat_p50": LATENCY_HIST.quantile(lat, 0.5),
+        "lat_p95": LATENCY_HIST.quantile(lat, 0.95),
+        "cost_p95": COST_HIST.quantile(cost, 0.95),
+    }
+
+
+async def _analytics_from_rollups(
+    session: AsyncSession, where: str, params: dict[str, Any]
+) -> TraceAnalytics:
+    summary = (
+        (
+            await session.execute(
+                text(
+                    f"SELECT {_ROLLUP_METRICS_SQL} "
+                    f"FROM langfuse_trace_rollups{where}"
+                ),
+                params,
+            )
+        )
+        .mappings()
+        .one()
+    )
+    sketches = await _rollup_sketches(
+        session, where, params, ("lat", "cost", "sessions", "users")
+    )
+    outcomes = (
+        (
+            await session.execute(
+                text(
+                    f"SELECT outcome AS value, sum(traces)::bigint AS count "
+                    f"FROM langfuse_trace_rollups{where} "
+                    f"GROUP BY outcome ORDER BY count DESC"
+                ),
+                params,
+            )
+        )
+        .mappings()
+        .all()
+    )
+    daily = (
+        (
+            await session.execute(
+                text(
+                    f"SELECT (bucket_start AT TIME ZONE 'UTC')::date AS day, "
+                    f"sum(traces)::bigint AS count "
+                    f"FROM langfuse_trace_rollups{where} "
+                    f"GROUP BY day ORDER BY day"
+                ),
+                params,
+            )
+        )
+        .mappings()
+        .all()
+    )
+    aoi = (
+        (
+            await session.execute(
+                text(
+                    f"SELECT a.key AS value, sum(a.value::bigint)::bigint AS count "
+                    f"FROM langfuse_trace_rollups "
+                    f"CROSS JOIN LATERAL jsonb_each_text(aoi_types) AS a{where} "
+                    f"GROUP BY a.key ORDER BY count DESC"
+                ),
+                params,
+            )
+        )
+        .mappings()
+        .all()
+    )
+    return TraceAnalytics(
+        source="rollup",
+        unique_sessions=hll_estimate(sketches.get(("sessions", 0), {})),
+        unique_users=hll_estimate(sketches.get(("users", 0), {})),
+        outcome_breakdown=[NamedCount(**dict(r)) for r in outcomes],
+        daily_volume=[DailyCount(**dict(r)) for r in daily],
+        aoi_type_breakdown=[NamedCount(**dict(r)) for r in aoi],
+        **_metrics_dict(_with_quantiles(summary, sketches)),
+    )
+
+
+async def _analytics_by_turn_from_rollups(
+    session: AsyncSession, where: str, params: dict[str, Any], cap: int
+) -> TurnAnalytics:
+    grand = (
+        (
+            await session.execute(
+                text(
+                    f"SELECT {_ROLLUP_METRICS_SQL}, "
+                    f"sum(traces) FILTER (WHERE turn_index IS NULL) AS ungrouped "
+                    f"FROM langfuse_trace_rollups{where}"
+                ),
+                params,
+            )
+        )
+        .mappings()
+        .one()
+    )
+    grand_sketches = await _rollup_sketches(
+        session, where, params, ("lat", "cost")
+    )
+    group_rows = (
+        (
+            await session.execute(
+                text(
+                    f"SELECT LEAST(turn_index, :cap) AS turn_index, "
+                    f"min(turn_min) AS turn_index_min, "
+                    f"max(turn_max) AS turn_index_max, "
+                    f"{_ROLLUP_METRICS_SQL} FROM langfuse_trace_rollups{where}"
+                    f"{' AND' if where else ' WHERE'} turn_index IS NOT NULL "
+                    f"GROUP BY 1 ORDER BY 1"
+                ),
+                {**params, "cap": cap},
+            )
+        )
+        .mappings()
+        .all()
+    )
+    sketches = await _rollup_sketches(
+        session, where, params, ("lat", "cost", "sessions"), cap=cap
+    )
+    groups = [
+        TurnGroup(
+            turn_index=int(r["turn_index"]),
+            is_terminal=int(r["turn_index"]) == cap,
+            turn_index_min=int(r["turn_index_min"]),
+            turn_index_max=int(r["turn_index_max"]),
+            sessions_reaching=hll_estimate(
+                sketches.get(("sessions", int(r["turn_index"])), {})
+            ),
+            **_metrics_dict(
+                _with_quantiles(r, sketches, int(r["turn_index"]))
+            ),
+        )
+        for r in group_rows
+    ]
+    return TurnAnalytics(
+        source="rollup",
+        turn_bucket_cap=cap,
+        ungrouped_traces=int(grand["ungrouped"] or 0),
+        grand_total=TurnMetrics(
+            **_metrics_dict(_with_quantiles(grand, grand_sketches))
+        ),
+        groups=groups,
+    )
+
+
+_EXACT_QUERY = Query(
+    False,
+    description=(
+        "always scan langfuse_traces (exact percentiles and distinct counts), "
+        "even when the rollups could answer"
+    ),
+)
+
+
 @router.get("/analytics", response_model=TraceAnalytics)
 async def trace_analytics(
     flt: TurnAnalyticsFilters = Depends(),
+    exact: bool = _EXACT_QUERY,
     _reader: UserModel = Depends(require_scope(TRACES_READ)),
     session: AsyncSession = Depends(get_session_from_pool_dependency),
 ) -> TraceAnalytics:
     """Server-side aggregates over the filtered trace set. All metrics are
     turn-level (one row per trace), so counts/sums are not double-counted. The
     turn-position filters answer "how does turn 1 differ from turn 3+" via two
-    calls, filtering the indexed ``turn_index`` (no window)."""
+    calls, filtering the indexed ``turn_index`` (no window).
+
+    Answered from the hourly/daily rollups when the filters are expressible
+    on them (no ``user_id``, time bounds on the hour) and they have been
+    built; ``source`` says which."""
+    if not exact and (rollup := _rollup_where(flt)) is not None:
+        if await rollups_ready(session):
+            return await _analytics_from_rollups(session, *rollup)
     where, params = _where_sql(flt)
 
     summary = (
@@ -552,6 +1025,7 @@ async def trace_analytics_by_turn(
         le=50,
         description="turn positions >= this collapse into one terminal bucket",
     ),
+    exact: bool = _EXACT_QUERY,
     _reader: UserModel = Depends(require_scope(TRACES_READ)),
     session: AsyncSession = Depends(get_session_from_pool_dependency),
 ) -> TurnAnalytics:
@@ -559,7 +1033,13 @@ async def trace_analytics_by_turn(
     so "how do turns evolve within a session" is a single call. Positions at/above
     ``turn_bucket_cap`` collapse into one terminal bucket. Any turn-position filter
     applies *before* bucketing (filter, then bucket). Filters compose with the
-    stored, indexed ``turn_index`` — no window, no view."""
+    stored, indexed ``turn_index`` — no window, no view. Rollups answer it
+    under the same conditions as ``/analytics``."""
+    if not exact and (rollup := _rollup_where(flt)) is not None:
+        if await rollups_ready(session):
+            return await _analytics_by_turn_from_rollups(
+                session, *rollup, turn_bucket_cap
+            )
     where, params = _where_sql(flt)
 
     # Grand total over the whole filtered set (includes NULL-turn rows), plus the
@@ -620,71 +1100,171 @@ async def trace_analytics_by_turn(
     )
 
 
+_SESSION_COLUMNS_SQL = """
+  session_id,
+  max(user_id) AS user_id,
+  max(environment) AS environment,
+  (array_agg(prompt ORDER BY trace_timestamp ASC))[1] AS first_prompt,
+  min(trace_timestamp) AS first_timestamp,
+  max(trace_timestamp) AS last_timestamp,
+  count(*) AS turn_count
+"""
+
+
 @router.get("/sessions", response_model=SessionListResponse)
 async def list_sessions(
+    response: Response,
     environment: Optional[str] = Query(None),
     user_id: Optional[str] = Query(None),
     start: Optional[datetime] = Query(None),
     end: Optional[datetime] = Query(None),
     limit: int = Query(50, ge=1, le=200),
-    offset: int = Query(0, ge=0),
+    offset: int = Query(
+        0, ge=0, description="Deprecated: costs O(offset); page with cursor."
+    ),
+    cursor: Optional[str] = Query(
+        None, description=f"{NEXT_CURSOR_HEADER} from the previous page."
+    ),
+    exact_total: bool = _EXACT_TOTAL_QUERY,
     _reader: UserModel = Depends(require_scope(TRACES_READ)),
     session: AsyncSession = Depends(get_session_from_pool_dependency),
 ) -> SessionListResponse:
-    """Conversation browser: one row per session (thread), newest first, with the
-    first prompt of the thread and a turn count."""
-    where, params = _where_sql(
-        TurnAnalyticsFilters(
-            environment=environment, user_id=user_id, start=start, end=end
-        ),
-        require_session=True,
+    """Conversation browser: one row per session (thread), newest activity
+    first, with the first prompt of the thread and a turn count.
+
+    Keyset-paginated on ``(last_timestamp, session_id)`` through the
+    ``X-Next-Cursor`` header, as ``GET /api/traces``; ``total`` is estimated
+    the same way."""
+    flt = TurnAnalyticsFilters(
+        environment=environment, user_id=user_id, start=start, end=end
     )
-
-    total = int(
-        (
-            await session.execute(
-                text(
-                    f"SELECT count(DISTINCT session_id) FROM langfuse_traces{where}"
-                ),
-                params,
-            )
-        ).scalar()
-        or 0
+    where, params = _where_sql(flt, require_session=True)
+    total, estimated = await _total(
+        session,
+        f"SELECT count(DISTINCT session_id) FROM langfuse_traces{where}",
+        f"SELECT DISTINCT session_id FROM langfuse_traces{where}",
+        params,
+        exact=exact_total,
+        estimate=(
+            None
+            if exact_total
+            else await _rollup_total(session, flt, kind="sessions")
+        ),
     )
 
-    rows = (
-        (
-            await session.execute(
-                text(
-                    f"""
-                SELECT session_id,
-                       max(user_id) AS user_id,
-                       max(environment) AS environment,
-                       (array_agg(prompt ORDER BY trace_timestamp ASC))[1] AS first_prompt,
-                       min(trace_timestamp) AS first_timestamp,
-                       max(trace_timestamp) AS last_timestamp,
-                       count(*) AS turn_count
-                FROM langfuse_traces{where}
-                GROUP BY session_id
-                ORDER BY max(trace_timestamp) DESC NULLS LAST
-                LIMIT :limit OFFSET :offset
-                """
-                ),
-                {**params, "limit": limit, "offset": offset},
+    if offset:
+        rows = (
+            (
+                await session.execute(
+                    text(
+                        f"SELECT {_SESSION_COLUMNS_SQL} "
+                        f"FROM langfuse_traces{where} GROUP BY session_id "
+                        f"ORDER BY max(trace_timestamp) DESC NULLS LAST, "
+                        f"session_id DESC LIMIT :limit OFFSET :offset"
+                    ),
+                    {**params, "limit": limit + 1, "offset": offset},
+                )
             )
+            .mappings()
+            .all()
+        )
+    else:
+        page = await _session_page(session, where, params, cursor, limit + 1)
+        by_id = {
+            r["session_id"]: r
+            for r in (
+                await session.execute(
+                    text(
+                        f"SELECT {_SESSION_COLUMNS_SQL} "
+                        f"FROM langfuse_traces{where} "
+                        f"AND session_id = ANY(:page_ids) GROUP BY session_id"
+                    ),
+                    {**params, "page_ids": page},
+                )
+            ).mappings()
+        }
+        rows = [by_id[sid] for sid in page]
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            rows[-1]["last_timestamp"], rows[-1]["session_id"]
         )
-        .mappings()
-        .all()
-    )
 
     return SessionListResponse(
         total=total,
+        total_is_estimate=estimated,
         limit=limit,
         offset=offset,
         items=[SessionItem(**dict(r)) for r in rows],
     )
 
 
+async def _session_page(
+    session: AsyncSession,
+    where: str,
+    params: dict[str, Any],
+    cursor: Optional[str],
+    n: int,
+) -> list[str]:
+    """Up to ``n`` session ids after ``cursor`` in ``(max(trace_timestamp)
+    DESC NULLS LAST, session_id DESC)`` order, without grouping the window.
+
+    Walks matching turns newest first and keeps each session's latest one
+    (no later matching turn in the same session), so the page stops after
+    ``n`` sessions instead of aggregating every session in range. ``where``
+    is unqualified and reused in the correlated subquery, where its columns
+    bind to the inner ``later`` alias."""
+    after_ts, after_id = decode_text_cursor(cursor) if cursor else (None, None)
+    params = {**params, "n": n}
+    ids: list[str] = []
+    if after_id is None or after_ts is not None:
+        keyset = ""
+        if after_ts is not None:
+            keyset = " AND (t.trace_timestamp, t.session_id) < (:after_ts, :after_id)"
+            params.update(after_ts=after_ts, after_id=after_id)
+        ids = list(
+            (
+                await session.execute(
+                    text(
+                        f"SELECT t.session_id FROM langfuse_traces t{where} "
+                        f"AND t.trace_timestamp IS NOT NULL{keyset} "
+                        f"AND NOT EXISTS (SELECT 1 FROM langfuse_traces later"
+                        f"{where} AND later.session_id = t.session_id "
+                        f"AND (later.trace_timestamp, later.id) "
+                        f"> (t.trace_timestamp, t.id)) "
+                        f"ORDER BY t.trace_timestamp DESC, t.session_id DESC "
+                        f"LIMIT :n"
+                    ),
+                    params,
+                )
+            ).scalars()
+        )
+    if len(ids) < n:
+        # Sessions whose matching turns all lack a timestamp sort last.
+        keyset = ""
+        if after_id is not None and after_ts is None:
+            keyset = " AND t.session_id < :after_id"
+            params["after_id"] = after_id
+        ids += (
+            (
+                await session.execute(
+                    text(
+                        f"SELECT DISTINCT t.session_id FROM langfuse_traces t{where} "
+                        f"AND t.trace_timestamp IS NULL{keyset} "
+                        f"AND NOT EXISTS (SELECT 1 FROM langfuse_traces later"
+                        f"{where} AND later.session_id = t.session_id "
+                        f"AND later.trace_timestamp IS NOT NULL) "
+                        f"ORDER BY t.session_id DESC LIMIT :tail"
+                    ),
+                    {**params, "tail": n - len(ids)},
+                )
+            )
+            .scalars()
+            .all()
+        )
+    return ids
+
+
 @router.get("/{trace_id}", response_model=TraceDetail)
 async def get_trace(
     trace_id: str,
@@ -692,8 +1272,9 @@ async def get_trace(
     session: AsyncSession = Depends(get_session_from_pool_dependency),
 ) -> TraceDetail:
     """Full detail for one trace: our derived columns from Postgres, plus the
-    `input`/`output` (the AgentState snapshot) fetched live from Langfuse, which
-    is the store of record for the raw trace."""
+    `input`/`output` (the AgentState snapshot) from the raw copy ingestion
+    stored, or fetched live from Langfuse (the store of record for the raw
+    trace) when there is none."""
     row = (
         await session.execute(
             select(LangfuseTraceOrm).where(LangfuseTraceOrm.id == trace_id)
@@ -702,9 +1283,10 @@ async def get_trace(
     if row is None:
         raise HTTPException(status_code=404, detail="Trace not found")
 
-    trace = await asyncio.to_thread(
-        LangfuseClient.from_env().fetch_trace, trace_id
-    )
+    trace = await load_raw(session, trace_id)
+    raw_source: Optional[Literal["stored", "langfuse"]] = "stored"
+    if trace is None:
+        trace, raw_source = await _fetch_live(trace_id), "langfuse"
     raw_available = isinstance(trace, dict)
     trace = trace or {}
 
@@ -747,6 +1329,26 @@ async def get_trace(
         recognized_contract=row.recognized_contract,
         derived=row.derived,
         raw_available=raw_available,
+        raw_source=raw_source if raw_available else None,
         input=trace.get("input"),
         output=trace.get("output"),
     )
+
+
+async def _fetch_live(trace_id: str) -> Optional[dict[str, Any]]:
+    """The trace from Langfuse, or None when it's missing or unreachable. The
+    blocking client runs on a worker thread with a single short attempt: a
+    click in the browser shouldn't sit through the ingestion retry budget."""
+    try:
+        client = LangfuseClient.from_env()
+    except KeyError:
+        return None  # Langfuse not configured for this deployment
+    client.timeout = APISettings.trace_detail_langfuse_timeout_seconds
+    client.max_retries = 0
+    try:
+        return await asyncio.to_thread(client.fetch_trace, trace_id)
+    except (LangfuseFetchError, httpx.HTTPError) as e:
+        logger.warning(
+            "trace_detail_fetch_failed", trace_id=trace_id, error=str(e)
+        )
+        return None
@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.api.auth.dependencies import require_auth
+from src.api.auth.dependencies import invalidate_resolved_user, require_auth
 from src.api.config import APISettings
 from src.api.data_models import UserOrm
 from src.api.schemas import (
@@ -70,6 +70,7 @@ async def update_user_profile(
         setattr(db_user, field, value)
 
     await session.commit()
+    invalidate_resolved_user(user.id)
     await session.refresh(db_user)
 
     return UserModel(
@@ -473,7 +473,9 @@ class CodeActPartResponse(BaseModel):
     content: str
 
 
-class InsightChartResponse(BaseModel):
+class InsightChartSummaryResponse(BaseModel):
+    """Chart spec without its data rows (list views)."""
+
     model_config = ConfigDict(from_attributes=True)
 
     id: UUID
@@ -486,14 +488,19 @@ class InsightChartResponse(BaseModel):
     stack_field: str
     group_field: str
     series_fields: List[str]
-    chart_data: List[dict]
     dataset_id: Optional[int] = None
     color_map: Dict[str, str] = {}
     series_color: Optional[str] = None
     divergent_colors: Optional[Dict[str, str]] = None
 
 
-class InsightResponse(BaseModel):
+class InsightChartResponse(InsightChartSummaryResponse):
+    chart_data: List[dict]
+
+
+class InsightSummaryResponse(BaseModel):
+    """Insight without chart data or codeact parts (list views)."""
+
     model_config = ConfigDict(from_attributes=True)
 
     id: UUID
@@ -502,12 +509,16 @@ class InsightResponse(BaseModel):
     insight_text: str
     follow_up_suggestions: List[str]
     statistics_ids: List[str] = []
-    charts: List[InsightChartResponse]
-    codeact_parts: List[CodeActPartResponse]
+    charts: List[InsightChartSummaryResponse]
     is_public: bool
     created_at: datetime
 
 
+class InsightResponse(InsightSummaryResponse):
+    charts: List[InsightChartResponse]  # type: ignore[assignment]
+    codeact_parts: List[CodeActPartResponse]
+
+
 class InsightPublicToggleRequest(BaseModel):
     is_public: bool
 
@@ -724,6 +735,31 @@ class DashboardResponse(BaseModel):
     widgets: List[DashboardWidgetResponse] = []
 
 
+class DashboardSummaryResponse(BaseModel):
+    """List-view dashboard: counts and a thumbnail reference instead of the
+    AOI and widget collections."""
+
+    id: UUID
+    user_id: str
+    name: str
+    description: Optional[str] = None
+    is_public: bool
+    created_at: datetime
+    updated_at: datetime
+    aoi_count: int
+    widget_count: int
+    primary_aoi: Optional[DashboardAoi] = Field(
+        default=None, description="The first AOI, if any."
+    )
+    thumbnail_path: Optional[str] = Field(
+        default=None,
+        description=(
+            "API path of the primary AOI's thumbnail, e.g. "
+            "`/api/geometry/gadm/BRA.16_1/thumbnail`."
+        ),
+    )
+
+
 class DashboardPublicToggleResponse(DashboardResponse):
     publicized_insight_ids: List[UUID] = Field(
         default=[],
@@ -0,0 +1,115 @@
+"""Per-worker render cache for public dashboards.
+
+A public dashboard renders the same for every viewer who sees only public
+insights, so the expanded response is built once and reused. Entries are
+keyed by dashboard id and stamped with the dashboard's ``updated_at``, which
+every write that changes a render bumps (widget add/update/remove, dashboard
+edits, insight restyles and visibility changes — see ``dashboard_writer``).
+
+Every hit is revalidated with a primary-key lookup of ``(updated_at,
+is_public)``: an unchanged stamp on a still-public dashboard serves the
+entry, anything else rebuilds it (or refuses it, if the dashboard is now
+private or gone). The cache saves the expanded load and the response
+build, not the round trip. Writes in this worker also drop the entry
+immediately, but entries are per worker, so the lookup is what keeps other
+workers from serving a dashboard its owner has just unpublished.
+
+``fresh_seconds`` (default 0) opts into serving an entry without the
+lookup for that long after it was built or last revalidated. Writes in
+other workers then go unseen for up to ``fresh_seconds``, including
+unpublishing, so only enable it where that exposure is acceptable.
+"""
+
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Iterable, Optional
+from uuid import UUID
+
+from cachetools import LRUCache
+
+from src.api.config import APISettings
+
+
+@dataclass
+class RenderedDashboard:
+    version: datetime  # dashboards.updated_at the render was built from
+    response: Any
+    owner_id: str
+    # Owners of referenced insights that are not public: they would see
+    # those insights expanded, so they don't get the shared render.
+    private_insight_owners: frozenset[str]
+    checked_at: float
+
+    def servable_to(self, viewer_id: Optional[str]) -> bool:
+        """Whether `viewer_id` (None = anonymous) sees exactly this render.
+        Privileged viewers are excluded by the caller."""
+        if viewer_id is None:
+            return True
+        return (
+            viewer_id != self.owner_id
+            and viewer_id not in self.private_insight_owners
+        )
+
+
+@dataclass
+class DashboardCacheStats:
+    hits: int = 0
+    revalidated: int = 0
+    misses: int = 0
+    invalidations: int = 0
+
+
+class DashboardRenderCache:
+    def __init__(self, maxsize: int, fresh_seconds: float):
+        self.fresh_seconds = fresh_seconds
+        self._entries: LRUCache = LRUCache(maxsize=maxsize)
+        self.stats = DashboardCacheStats()
+
+    def get(self, dashboard_id: UUID) -> Optional[RenderedDashboard]:
+        return self._entries.get(dashboard_id)
+
+    def is_fresh(self, entry: RenderedDashboard) -> bool:
+        if self.fresh_seconds <= 0:
+            return False
+        return time.monotonic() - entry.checked_at < self.fresh_seconds
+
+    def mark_checked(self, entry: RenderedDashboard) -> None:
+        entry.checked_at = time.monotonic()
+
+    def put(
+        self,
+        dashboard_id: UUID,
+        *,
+        version: datetime,
+        response: Any,
+        owner_id: str,
+        private_insight_owners: Iterable[str],
+    ) -> None:
+        self._entries[dashboard_id] = RenderedDashboard(
+            version=version,
+            response=response,
+            owner_id=owner_id,
+            private_insight_owners=frozenset(private_insight_owners),
+            checked_at=time.monotonic(),
+        )
+
+    def invalidate(self, *dashboard_ids: Any) -> None:
+        for dashboard_id in dashboard_ids:
+            key = dashboard_id
+            if not isinstance(key, UUID):
+                try:
+                    key = UUID(str(dashboard_id))
+                except ValueError:
+                    continue
+            if self._entries.pop(key, None) is not None:
+                self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+dashboard_render_cache = DashboardRenderCache(
+    maxsize=APISettings.dashboard_render_cache_size,
+    fresh_seconds=APISettings.dashboard_render_cache_fresh_seconds,
+)
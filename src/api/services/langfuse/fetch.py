@@ -7,21 +7,28 @@ ClickHouse memory limits under load):
   ``toTimestamp`` + ``orderBy=timestamp.asc``). Never page-number over an
   open-ended ``desc`` set — new traces arriving mid-run would shift offsets and
   silently skip rows.
+* Pages of a window are fetched concurrently (``concurrency`` requests in
+  flight, a bounded read-ahead) and yielded in order as they arrive, so the
+  caller can parse and upsert while later pages are still downloading.
 * Retry 429 (honouring ``Retry-After``) and network errors with backoff.
-* On persistent 5xx, **halve the page size (floor 1) and restart the window**;
-  id-dedup makes the refetch safe. If it still fails at size 1, raise loudly
+* On persistent 5xx, **re-fetch that page's offset range in smaller pages**
+  (the largest proper divisor of the size, so page numbers still line up)
+  and use the smaller size for the rest of the window; id-dedup makes the
+  overlap safe. If it still fails at size 1, raise loudly
   (``LangfuseFetchError``) so the caller records a failed chunk rather than
   silently dropping data.
 """
 
 from __future__ import annotations
 
+import asyncio
 import os
 import random
 import time
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
 
 import httpx
 
@@ -51,6 +58,16 @@ def _backoff(attempt: int) -> float:
     return min(30.0, (2**attempt) + random.uniform(0, 1.0))
 
 
+def _smaller_page(size: int) -> int:
+    """Largest proper divisor of `size`: offsets aligned to the old size stay
+    aligned, so ``page = offset // size + 1`` remains exact (50 -> 25 -> 5 ->
+    1)."""
+    for d in range(size // 2, 0, -1):
+        if size % d == 0:
+            return d
+    return 1
+
+
 @dataclass
 class LangfuseClient:
     host: str
@@ -58,6 +75,8 @@ class LangfuseClient:
     secret_key: str
     timeout: float = 60.0
     max_retries: int = 6
+    # List pages in flight per window.
+    concurrency: int = 4
 
     @classmethod
     def from_env(cls) -> "LangfuseClient":
@@ -69,37 +88,82 @@ class LangfuseClient:
         )
 
     # -- public API -------------------------------------------------------- #
-    def fetch_window(
+    async def iter_window(
+        self,
+        from_ts: datetime,
+        to_ts: datetime,
+        environment: Optional[str] = None,
+        page_size: int = 50,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Yield the traces with ``from_ts <= timestamp < to_ts`` page by page
+        (ascending), de-duplicated by id across the window. Up to
+        ``concurrency`` pages are fetched ahead of the consumer. Raises
+        ``LangfuseFetchError`` on unrecoverable failure."""
+        seen: set[str] = set()
+        window = _Window(from_ts, to_ts, environment, page_size)
+
+        def fresh(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+            out = []
+            for r in rows:
+                rid = r.get("id")
+                if rid and rid not in seen:
+                    seen.add(rid)
+                    out.append(r)
+            return out
+
+        limits = httpx.Limits(max_connections=max(1, self.concurrency))
+        async with httpx.AsyncClient(
+            timeout=self.timeout, limits=limits
+        ) as client:
+            # The first page tells us how many items the window holds. A
+            # range is returned whole even if a 5xx shrinks window.size
+            # mid-request, so offsets advance by the size requested.
+            first = window.size
+            rows = await self._get_range(client, window, 0, first)
+            yield fresh(rows)
+            offset = first
+            if window.total is None:
+                # No meta: walk sequentially until an empty page.
+                while rows:
+                    size = window.size
+                    rows = await self._get_range(client, window, offset, size)
+                    offset += size
+                    yield fresh(rows)
+                return
+
+            inflight: deque[asyncio.Task] = deque()
+            try:
+                while inflight or offset < window.total:
+                    while (
+                        len(inflight) < self.concurrency
+                        and offset < window.total
+                    ):
+                        size = window.size
+                        inflight.append(
+                            asyncio.create_task(
+                                self._get_range(client, window, offset, size)
+                            )
+                        )
+                        offset += size
+                    yield fresh(await inflight.popleft())
+            finally:
+                for task in inflight:
+                    task.cancel()
+
+    async def fetch_window(
         self,
         from_ts: datetime,
         to_ts: datetime,
         environment: Optional[str] = None,
         page_size: int = 50,
     ) -> list[dict[str, Any]]:
-        """Return all traces with ``from_ts <= timestamp < to_ts`` (ascending),
-        de-duplicated by id. Raises ``LangfuseFetchError`` on unrecoverable
-        failure."""
-        limit = page_size
-        with httpx.Client(timeout=self.timeout) as client:
-            while True:
-                try:
-                    return self._fetch_all_pages(
-                        client, from_ts, to_ts, environment, limit
-                    )
-                except _ServerError as e:
-                    if limit <= 1:
-                        raise LangfuseFetchError(
-                            f"Langfuse 5xx at page size 1 for window "
-                            f"[{_iso(from_ts)}, {_iso(to_ts)}): {e}"
-                        ) from e
-                    new_limit = max(1, limit // 2)
-                    logger.warning(
-                        "langfuse_fetch_halving_page_size",
-                        old_limit=limit,
-                        new_limit=new_limit,
-                        window_start=_iso(from_ts),
-                    )
-                    limit = new_limit
+        """All of ``iter_window`` as one list."""
+        out: list[dict[str, Any]] = []
+        async for page in self.iter_window(
+            from_ts, to_ts, environment, page_size
+        ):
+            out.extend(page)
+        return out
 
     def fetch_trace(self, trace_id: str) -> Optional[dict[str, Any]]:
         """Fetch a single trace by id (the cheap/reliable path). Returns the
@@ -138,57 +202,74 @@ class LangfuseClient:
                 return resp.json()
 
     # -- internals --------------------------------------------------------- #
-    def _fetch_all_pages(
+    async def _get_range(
         self,
-        client: httpx.Client,
-        from_ts: datetime,
-        to_ts: datetime,
-        environment: Optional[str],
-        limit: int,
+        client: httpx.AsyncClient,
+        window: "_Window",
+        offset: int,
+        size: int,
     ) -> list[dict[str, Any]]:
-        seen: set[str] = set()
-        out: list[dict[str, Any]] = []
-        page = 1
-        while True:
-            data = self._get_page(
-                client, page, limit, from_ts, to_ts, environment
+        """Rows at ``[offset, offset + size)`` of the window, splitting the
+        range into smaller pages while the server keeps 5xx-ing."""
+        try:
+            data = await self._get_page(
+                client, offset // size + 1, size, window
             )
-            rows = data.get("data") or []
-            for r in rows:
-                rid = r.get("id")
-                if rid and rid not in seen:
-                    seen.add(rid)
-                    out.append(r)
-            meta = data.get("meta") or {}
-            total_pages = meta.get("totalPages")
-            if not rows or (total_pages is not None and page >= total_pages):
-                return out
-            page += 1
+        except _ServerError as e:
+            if size <= 1:
+                raise LangfuseFetchError(
+                    f"Langfuse 5xx at page size 1 for window "
+                    f"[{_iso(window.from_ts)}, {_iso(window.to_ts)}): {e}"
+                ) from e
+            smaller = _smaller_page(size)
+            if smaller < window.size:
+                logger.warning(
+                    "langfuse_fetch_shrinking_page_size",
+                    old_limit=window.size,
+                    new_limit=smaller,
+                    window_start=_iso(window.from_ts),
+                )
+                window.size = smaller
+            rows: list[dict[str, Any]] = []
+            for sub in range(offset, offset + size, smaller):
+                if window.total is not None and sub >= window.total:
+                    break
+                rows.extend(
+                    await self._get_range(client, window, sub, smaller)
+                )
+            return rows
+
+        meta = data.get("meta") or {}
+        total = meta.get("totalItems")
+        if total is None and meta.get("totalPages") is not None:
+            total = meta["totalPages"] * size
+        if total is not None:
+            # Late arrivals can grow the window; never shrink it.
+            window.total = max(window.total or 0, int(total))
+        return data.get("data") or []
 
-    def _get_page(
+    async def _get_page(
         self,
-        client: httpx.Client,
+        client: httpx.AsyncClient,
         page: int,
         limit: int,
-        from_ts: datetime,
-        to_ts: datetime,
-        environment: Optional[str],
+        window: "_Window",
     ) -> dict[str, Any]:
         params: dict[str, Any] = {
             "page": page,
             "limit": limit,
             "orderBy": "timestamp.asc",
-            "fromTimestamp": _iso(from_ts),
-            "toTimestamp": _iso(to_ts),
+            "fromTimestamp": _iso(window.from_ts),
+            "toTimestamp": _iso(window.to_ts),
         }
-        if environment:
-            params["environment"] = environment
+        if window.environment:
+            params["environment"] = window.environment
 
         attempt = 0
         server_errors = 0
         while True:
             try:
-                resp = client.get(
+                resp = await client.get(
                     self.host + _TRACES_PATH,
                     params=params,
                     auth=(self.public_key, self.secret_key),
@@ -199,7 +280,7 @@ class LangfuseClient:
                     raise LangfuseFetchError(
                         f"network error after {attempt} attempts: {e}"
                     ) from e
-                time.sleep(_backoff(attempt))
+                await asyncio.sleep(_backoff(attempt))
                 continue
 
             if resp.status_code == 429:
@@ -208,21 +289,32 @@ class LangfuseClient:
                 if attempt > self.max_retries:
                     raise LangfuseFetchError("rate-limited past max_retries")
                 logger.warning("langfuse_rate_limited", wait_s=round(wait, 1))
-                time.sleep(wait)
+                await asyncio.sleep(wait)
                 continue
 
             if resp.status_code >= 500:
                 server_errors += 1
                 if server_errors > 2:
-                    # let the window halve its page size
+                    # let the range split into smaller pages
                     raise _ServerError(f"{resp.status_code} x{server_errors}")
-                time.sleep(_backoff(server_errors))
+                await asyncio.sleep(_backoff(server_errors))
                 continue
 
             resp.raise_for_status()
             return resp.json()
 
 
+@dataclass
+class _Window:
+    """Per-window fetch state shared by its in-flight page requests."""
+
+    from_ts: datetime
+    to_ts: datetime
+    environment: Optional[str]
+    size: int  # current page size; only ever shrinks
+    total: Optional[int] = None  # items in the window, once known
+
+
 def _retry_after(resp: httpx.Response) -> Optional[float]:
     raw = resp.headers.get("Retry-After")
     if not raw:
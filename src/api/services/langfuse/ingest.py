@@ -13,6 +13,11 @@ last contiguous good chunk so the next run resumes there.
 from __future__ import annotations
 
 import asyncio
+import json
+import multiprocessing
+import re
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from typing import Any, Iterable, Optional
@@ -24,6 +29,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.api.data_models import LangfuseIngestionRunOrm, LangfuseTraceOrm
 from src.api.services.langfuse import parse as P
 from src.api.services.langfuse.fetch import LangfuseClient, LangfuseFetchError
+from src.api.services.langfuse.raw_store import encode_raw, store_raw
+from src.api.services.langfuse.rollups import refresh_rollups
 from src.shared.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -73,6 +80,20 @@ def _strip_nul(value: Any) -> Any:
     return value
 
 
+# json.dumps writes NUL as the escape \u0000 (which jsonb rejects); match it
+# only when the backslash isn't itself escaped (an even run of backslashes
+# before it), so a literal "\\u0000" in the text survives.
+_JSON_NUL = re.compile(r"(?<!\\)((?:\\\\)*)\\u0000")
+
+
+def _jsonb(value: Any) -> Optional[str]:
+    """Serialize a jsonb value, dropping NUL in the same pass."""
+    if value is None:
+        return None
+    out = json.dumps(value)
+    return _JSON_NUL.sub(r"\1", out) if "\\u0000" in out else out
+
+
 # --------------------------------------------------------------------------- #
 # Row building
 # --------------------------------------------------------------------------- #
@@ -123,15 +144,29 @@ def build_row(trace: dict[str, Any]) -> dict[str, Any]:
         row["datasets_analysed_this_turn"] = (
             derived.get("datasets_analysed_cumulative") or []
         )
-    return _strip_nul(row)
+    # Column values are scrubbed here (ids feed the recompute and FK
+    # sampling); the nested `derived` payload is scrubbed as it is
+    # serialized for the write, rather than walked twice.
+    for key, value in row.items():
+        if key != "derived":
+            row[key] = _strip_nul(value)
+    return row
 
 
 # --------------------------------------------------------------------------- #
 # Upsert
 # --------------------------------------------------------------------------- #
 async def _upsert(session: AsyncSession, rows: list[dict[str, Any]]) -> int:
+    """Multi-row ``INSERT ... ON CONFLICT`` with one bind parameter per value;
+    the fallback for drivers without COPY support."""
     if not rows:
         return 0
+    rows = [
+        {**r, "derived": _strip_nul(r["derived"])}
+        if r.get("derived") is not None
+        else r
+        for r in rows
+    ]
     keys: set[str] = set()
     for r in rows:
         keys.update(r.keys())
@@ -142,6 +177,74 @@ async def _upsert(session: AsyncSession, rows: list[dict[str, Any]]) -> int:
     return len(rows)
 
 
+_TRACE_COLUMNS = tuple(c.name for c in LangfuseTraceOrm.__table__.columns)
+_STAGING_TABLE = "langfuse_traces_staging"
+# Temporary, so unlogged and private to the connection: concurrent runs
+# can't see each other's batches. Emptied after every merge.
+_CREATE_STAGING_SQL = text(
+    f"CREATE TEMPORARY TABLE IF NOT EXISTS {_STAGING_TABLE} "
+    "(LIKE langfuse_traces) ON COMMIT DELETE ROWS"
+)
+
+
+def _copy_record(row: dict[str, Any], ingested_at: datetime) -> tuple:
+    """One COPY record in ``_TRACE_COLUMNS`` order."""
+    return tuple(
+        _jsonb(row.get(col))
+        if col == "derived"
+        else ingested_at
+        if col == "ingested_at"
+        else row.get(col)
+        for col in _TRACE_COLUMNS
+    )
+
+
+async def _copy_upsert(
+    session: AsyncSession, rows: list[dict[str, Any]]
+) -> int:
+    """Stream `rows` through COPY into the staging table, then merge them
+    into langfuse_traces with one ``INSERT ... ON CONFLICT``. Same result as
+    ``_upsert`` (including which columns a re-ingest overwrites), without
+    the per-value parameter overhead. Falls back to ``_upsert`` when the
+    session isn't on asyncpg."""
+    if not rows:
+        return 0
+    conn = await session.connection()
+    if conn.dialect.driver != "asyncpg":
+        return await _upsert(session, rows)
+    raw = await conn.get_raw_connection()
+    driver = raw.driver_connection
+    assert driver is not None
+
+    await conn.execute(_CREATE_STAGING_SQL)
+    ingested_at = _utcnow()
+    await driver.copy_records_to_table(
+        _STAGING_TABLE,
+        records=(_copy_record(r, ingested_at) for r in rows),
+        columns=_TRACE_COLUMNS,
+    )
+    # Like _upsert: a re-ingest overwrites the columns this batch carries,
+    # never the id or the first ingested_at.
+    carried: set[str] = set()
+    for r in rows:
+        carried.update(r.keys())
+    columns = ", ".join(_TRACE_COLUMNS)
+    updates = ", ".join(
+        f"{c} = EXCLUDED.{c}"
+        for c in _TRACE_COLUMNS
+        if c in carried and c not in ("id", "ingested_at")
+    )
+    await conn.execute(
+        text(
+            f"INSERT INTO langfuse_traces ({columns}) "
+            f"SELECT {columns} FROM {_STAGING_TABLE} "
+            f"ON CONFLICT (id) DO UPDATE SET {updates}"
+        )
+    )
+    await conn.execute(text(f"TRUNCATE {_STAGING_TABLE}"))
+    return len(rows)
+
+
 # Recompute the cross-row turn fields (turn_index, is_final_turn_in_thread, and the
 # per-turn diffs) for the given sessions from current table state. Each depends on
 # siblings, so a late/out-of-order trace can shift them; running once per chunk over
@@ -365,6 +468,20 @@ class WindowStats:
     touched_sessions: set[str] = field(default_factory=set)
 
 
+def build_rows(traces: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """``build_row`` over one page."""
+    return [build_row(t) for t in traces]
+
+
+def parse_page(
+    traces: list[dict[str, Any]], keep_raw: bool = False
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """``(rows, raw copies)`` for one page; the unit of work sent to a parse
+    pool, so compressing the raw copies is off the event loop too."""
+    raws = [encode_raw(t) for t in traces if t.get("id")] if keep_raw else []
+    return build_rows(traces), raws
+
+
 async def ingest_window(
     session: AsyncSession,
     client: LangfuseClient,
@@ -375,33 +492,58 @@ async def ingest_window(
     *,
     batch_size: int = 300,
     dry_run: bool = False,
+    parse_pool: Optional[Executor] = None,
+    keep_raw: bool = False,
 ) -> WindowStats:
-    """Fetch one closed window, parse, and upsert (chunked). The sync fetch runs
-    in a thread so it doesn't block the event loop. Fetch page size is clamped to
-    the Langfuse list-page max (``MAX_PAGE_SIZE``); the upsert batch is independent."""
-    page_size = min(batch_size, MAX_PAGE_SIZE)
-    traces = await asyncio.to_thread(
-        client.fetch_window, from_ts, to_ts, environment, page_size
-    )
-    stats = WindowStats(fetched=len(traces))
+    """Fetch one closed window, parse, and upsert (chunked), as a pipeline:
+    pages stream in from concurrent requests, each is parsed on
+    ``parse_pool`` (inline when None) with up to ``client.concurrency`` pages
+    queued, and rows are upserted every ``batch_size`` while later pages are still
+    downloading. Fetch page size is clamped to the Langfuse list-page max
+    (``MAX_PAGE_SIZE``); the upsert batch is independent. With ``keep_raw``
+    each trace's compressed raw copy is stored alongside its row."""
+    loop = asyncio.get_running_loop()
+    stats = WindowStats()
+    parsing: deque[asyncio.Future] = deque()
     batch: list[dict[str, Any]] = []
-    for t in traces:
-        row = build_row(t)
-        if row["trace_timestamp"] is not None:
-            if stats.max_ts is None or row["trace_timestamp"] > stats.max_ts:
-                stats.max_ts = row["trace_timestamp"]
-        batch.append(row)
+    raws: list[dict[str, Any]] = []
+
+    async def take(parsed: tuple[list[dict[str, Any]], list[dict[str, Any]]]):
+        nonlocal batch, raws
+        rows, page_raws = parsed
+        for row in rows:
+            ts = row["trace_timestamp"]
+            if ts is not None and (stats.max_ts is None or ts > stats.max_ts):
+                stats.max_ts = ts
+        batch.extend(rows)
+        raws.extend(page_raws)
         if len(batch) >= batch_size:
-            await _flush(session, batch, metrics, stats, dry_run)
-            batch = []
+            await _flush(session, batch, raws, metrics, stats, dry_run)
+            batch, raws = [], []
+
+    async for page in client.iter_window(
+        from_ts, to_ts, environment, min(batch_size, MAX_PAGE_SIZE)
+    ):
+        stats.fetched += len(page)
+        if parse_pool is None:
+            await take(parse_page(page, keep_raw))
+            continue
+        parsing.append(
+            loop.run_in_executor(parse_pool, parse_page, page, keep_raw)
+        )
+        if len(parsing) > client.concurrency:
+            await take(await parsing.popleft())
+    while parsing:
+        await take(await parsing.popleft())
     if batch:
-        await _flush(session, batch, metrics, stats, dry_run)
+        await _flush(session, batch, raws, metrics, stats, dry_run)
     return stats
 
 
 async def _flush(
     session: AsyncSession,
     batch: list[dict[str, Any]],
+    raws: list[dict[str, Any]],
     metrics: _Metrics,
     stats: WindowStats,
     dry_run: bool,
@@ -409,7 +551,8 @@ async def _flush(
     metrics.add_rows(batch)
     await _accumulate_fk(session, batch, metrics)
     if not dry_run:
-        stats.upserted += await _upsert(session, batch)
+        stats.upserted += await _copy_upsert(session, batch)
+        await store_raw(session, raws)
         stats.touched_sessions.update(
             r["session_id"] for r in batch if r.get("session_id")
         )
@@ -463,12 +606,62 @@ async def run_ingestion(
     chunk_hours: int = 24,
     batch_size: int = 300,
     dry_run: bool = False,
+    concurrency: int = 4,
+    parse_workers: int = 0,
+    keep_raw: bool = False,
 ) -> RunResult:
     """Ingest [since, until) in ascending chunks, with one run row recording
     counts, watermark, and drift metrics. Aborts (status=partial) on the first
     chunk that fails after retries, leaving the watermark on the last good chunk.
+
+    ``concurrency`` bounds list requests in flight per chunk; ``parse_workers``
+    > 0 parses on a process pool of that size (shared across chunks).
+    ``keep_raw`` also stores each trace's compressed raw copy (see
+    ``raw_store``) for the detail view.
     """
     client = LangfuseClient.from_env()
+    client.concurrency = concurrency
+    # spawn, not fork: the parent has an event loop, a DB connection and
+    # possibly threads, none of which a forked child should inherit.
+    parse_pool = (
+        ProcessPoolExecutor(
+            max_workers=parse_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        if parse_workers > 0
+        else None
+    )
+    try:
+        return await _run_chunks(
+            session,
+            client,
+            since=since,
+            until=until,
+            environment=environment,
+            chunk_hours=chunk_hours,
+            batch_size=batch_size,
+            dry_run=dry_run,
+            parse_pool=parse_pool,
+            keep_raw=keep_raw,
+        )
+    finally:
+        if parse_pool is not None:
+            parse_pool.shutdown(cancel_futures=True)
+
+
+async def _run_chunks(
+    session: AsyncSession,
+    client: LangfuseClient,
+    *,
+    since: datetime,
+    until: datetime,
+    environment: Optional[str],
+    chunk_hours: int,
+    batch_size: int,
+    dry_run: bool,
+    parse_pool: Optional[Executor],
+    keep_raw: bool = False,
+) -> RunResult:
     run = LangfuseIngestionRunOrm(
         window_start=since,
         window_end=until,
@@ -494,6 +687,8 @@ async def run_ingestion(
                 metrics,
                 batch_size=batch_size,
                 dry_run=dry_run,
+                parse_pool=parse_pool,
+                keep_raw=keep_raw,
             )
         except LangfuseFetchError as e:
             logger.error(
@@ -508,8 +703,10 @@ async def run_ingestion(
         result.upserted += ws.upserted
         if not dry_run:
             # Renumber turn positions for touched sessions from current table
-            # state, in-transaction, before the chunk is committed.
+            # state, in-transaction, before the chunk is committed; then
+            # re-roll the analytics rollups of every day that could change.
             await recompute_turn_positions(session, ws.touched_sessions)
+            await refresh_rollups(session, cfrom, cto, ws.touched_sessions)
             await session.commit()  # persist chunk before advancing watermark
         result.watermark = cto  # contiguous advance
         logger.info(
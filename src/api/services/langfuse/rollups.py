@@ -0,0 +1,432 @@
+"""Hourly/daily rollups of ``langfuse_traces`` for the analytics endpoints.
+
+One rollup row per (grain, bucket, environment, outcome, turn position)
+cell carries everything ``/api/traces/analytics`` and ``/analytics/by-turn``
+report, in mergeable form:
+
+- counts and sums (traces, latency, cost, tokens, tool calls, tool errors)
+  and per-AOI-type counts, merged by addition;
+- fixed log-scale histograms of latency and cost (``LogHistogram``), merged
+  by adding bucket counts, from which p50/p95 are read;
+- HyperLogLog registers over session and user ids (``hll_register``),
+  merged by taking the per-register max, from which distinct counts are
+  estimated.
+
+Histograms and registers are stored sparse, as parallel ``(index[],
+value[])`` arrays, so the endpoints merge any set of cells in SQL with
+``unnest`` and only the merged sketch comes back to Python.
+
+Turn positions above ``ROLLUP_TURN_CAP`` share one cell (with the true
+min/max kept alongside), which covers every ``turn_bucket_cap`` the by-turn
+endpoint accepts. Traces without a ``trace_timestamp`` are not rolled up.
+
+Rollups are rebuilt a UTC day at a time from the raw rows: ingestion
+refreshes the days each chunk touched (``refresh_rollups``), and
+``rebuild_rollups`` (the ``rebuild-trace-rollups`` CLI command) covers the
+whole table and marks the rollups ready. Until then, or after a change to
+the sketch parameters (``SKETCH_VERSION``), the endpoints keep scanning
+``langfuse_traces``.
+
+A day is replaced by deleting its cells and inserting new ones, so two
+transactions refreshing the same day (an ingestion chunk during a rebuild,
+or overlapping ingestion runs) would each miss the other's uncommitted
+insert and both survive, counting the day twice. ``refresh_days`` takes a
+transaction-scoped advisory lock per day, in day order, before it reads
+the raw rows, so writers of a day run one after the other.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Iterable, Mapping, Optional
+
+from sqlalchemy import delete, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.data_models import (
+    LangfuseTraceRollupOrm,
+    LangfuseTraceRollupStateOrm,
+)
+from src.shared.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Bump when the histogram or HLL parameters change: stored sketches stop
+# being comparable, so the endpoints fall back until a rebuild.
+SKETCH_VERSION = 1
+# Turn positions above this share one rollup cell (the by-turn endpoint's
+# turn_bucket_cap is at most 50).
+ROLLUP_TURN_CAP = 50
+# 2^12 registers: ~1.6% standard error on distinct counts.
+HLL_PRECISION = 12
+# Advisory lock class of the per-day rollup write locks (key 2 is the
+# day's ordinal).
+_DAY_LOCK_CLASS = 0x726F6C6C  # "roll"
+
+
+@dataclass(frozen=True)
+class LogHistogram:
+    """Fixed log-scale buckets: bucket 0 is ``[0, lo]``, bucket ``i`` is
+    ``(lo * 2^((i-1)/per_octave), lo * 2^(i/per_octave)]``, and the last
+    bucket also takes everything above it. With 16 buckets per octave a
+    quantile read from merged counts is within ~2% of the exact value."""
+
+    lo: float
+    per_octave: int
+    buckets: int
+
+    def index(self, x: float) -> int:
+        if x <= self.lo:
+            return 0
+        i = 1 + int(math.log2(x / self.lo) * self.per_octave)
+        return min(i, self.buckets - 1)
+
+    def bounds(self, i: int) -> tuple[float, float]:
+        if i == 0:
+            return 0.0, self.lo
+        return (
+            self.lo * 2 ** ((i - 1) / self.per_octave),
+            self.lo * 2 ** (i / self.per_octave),
+        )
+
+    def quantile(self, counts: Mapping[int, int], q: float) -> Optional[float]:
+        """``percentile_cont(q)`` over the histogram: interpolate between the
+        two order statistics around rank ``q * (n - 1)``, each placed by
+        spreading its bucket's values evenly across the bucket."""
+        n = sum(counts.values())
+        if not n:
+            return None
+        rank = q * (n - 1)
+        k = int(rank)
+        below = self._order_stat(counts, k)
+        if k + 1 >= n or rank == k:
+            return below
+        return below + (self._order_stat(counts, k + 1) - below) * (rank - k)
+
+    def _order_stat(self, counts: Mapping[int, int], k: int) -> float:
+        seen = 0
+        for i in sorted(counts):
+            c = counts[i]
+            if k < seen + c:
+                lo, hi = self.bounds(i)
+                return lo + (hi - lo) * (k - seen + 0.5) / c
+            seen += c
+        raise ValueError(f"rank {k} beyond {seen} values")
+
+
+# 10ms .. ~45min, and $0.000001 .. ~$16 per turn.
+LATENCY_HIST = LogHistogram(lo=0.01, per_octave=16, buckets=1 + 18 * 16)
+COST_HIST = LogHistogram(lo=1e-6, per_octave=16, buckets=1 + 24 * 16)
+
+
+def hll_register(value: str) -> tuple[int, int]:
+    """(register index, rank of the first set bit) for one distinct value."""
+    h = int.from_bytes(
+        hashlib.blake2b(value.encode(), digest_size=8).digest(), "big"
+    )
+    rest = 64 - HLL_PRECISION
+    w = h & ((1 << rest) - 1)
+    return h >> rest, rest - w.bit_length() + 1
+
+
+def hll_estimate(registers: Mapping[int, int]) -> int:
+    """HyperLogLog cardinality from sparse registers (absent = 0), with the
+    linear-counting correction that keeps small counts near-exact."""
+    if not registers:
+        return 0
+    m = 1 << HLL_PRECISION
+    zeros = m - len(registers)
+    alpha = 0.7213 / (1 + 1.079 / m)
+    raw = alpha * m * m / (zeros + sum(2.0**-r for r in registers.values()))
+    if raw <= 2.5 * m and zeros:
+        return round(m * math.log(m / zeros))
+    return round(raw)
+
+
+def _sparse(d: Mapping[int, int]) -> tuple[list[int], list[int]]:
+    keys = sorted(d)
+    return keys, [d[k] for k in keys]
+
+
+def _add_register(registers: dict[int, int], reg: tuple[int, int]) -> None:
+    idx, rho = reg
+    if rho > registers.get(idx, 0):
+        registers[idx] = rho
+
+
+@dataclass
+class _Cell:
+    traces: int = 0
+    turn_min: Optional[int] = None
+    turn_max: Optional[int] = None
+    lat_count: int = 0
+    lat_sum: float = 0.0
+    lat_hist: Counter[int] = field(default_factory=Counter)
+    cost_count: int = 0
+    cost_sum: float = 0.0
+    cost_hist: Counter[int] = field(default_factory=Counter)
+    tok_count: int = 0
+    tok_sum: int = 0
+    tool_count: int = 0
+    tool_sum: int = 0
+    tool_error_traces: int = 0
+    aoi_types: Counter[str] = field(default_factory=Counter)
+    sessions: dict[int, int] = field(default_factory=dict)
+    users: dict[int, int] = field(default_factory=dict)
+
+    def add(
+        self,
+        r: Mapping[str, Any],
+        session_reg: Optional[tuple[int, int]],
+        user_reg: Optional[tuple[int, int]],
+    ) -> None:
+        self.traces += 1
+        ti = r["turn_index"]
+        if ti is not None:
+            self.turn_min = (
+                ti if self.turn_min is None else min(self.turn_min, ti)
+            )
+            self.turn_max = (
+                ti if self.turn_max is None else max(self.turn_max, ti)
+            )
+        if (lat := r["latency_seconds"]) is not None:
+            self.lat_count += 1
+            self.lat_sum += lat
+            self.lat_hist[LATENCY_HIST.index(lat)] += 1
+        if (cost := r["total_cost"]) is not None:
+            self.cost_count += 1
+            self.cost_sum += cost
+            self.cost_hist[COST_HIST.index(cost)] += 1
+        if r["turn_tokens"] is not None:
+            self.tok_count += 1
+            self.tok_sum += r["turn_tokens"]
+        if r["turn_tool_calls"] is not None:
+            self.tool_count += 1
+            self.tool_sum += r["turn_tool_calls"]
+        if (r["tool_error_count"] or 0) > 0:
+            self.tool_error_traces += 1
+        if r["aoi_type"] is not None:
+            self.aoi_types[r["aoi_type"]] += 1
+        if session_reg:
+            _add_register(self.sessions, session_reg)
+        if user_reg:
+            _add_register(self.users, user_reg)
+
+    def row(self) -> dict[str, Any]:
+        lat_idx, lat_cnt = _sparse(self.lat_hist)
+        cost_idx, cost_cnt = _sparse(self.cost_hist)
+        sess_idx, sess_rho = _sparse(self.sessions)
+        user_idx, user_rho = _sparse(self.users)
+        return {
+            "traces": self.traces,
+            "turn_min": self.turn_min,
+            "turn_max": self.turn_max,
+            "lat_count": self.lat_count,
+            "lat_sum": self.lat_sum,
+            "lat_hist_idx": lat_idx,
+            "lat_hist_cnt": lat_cnt,
+            "cost_count": self.cost_count,
+            "cost_sum": self.cost_sum,
+            "cost_hist_idx": cost_idx,
+            "cost_hist_cnt": cost_cnt,
+            "tok_count": self.tok_count,
+            "tok_sum": self.tok_sum,
+            "tool_count": self.tool_count,
+            "tool_sum": self.tool_sum,
+            "tool_error_traces": self.tool_error_traces,
+            "aoi_types": dict(self.aoi_types),
+            "session_hll_idx": sess_idx,
+            "session_hll_rho": sess_rho,
+            "user_hll_idx": user_idx,
+            "user_hll_rho": user_rho,
+        }
+
+
+def build_cells(rows: Iterable[Mapping[Any, Any]]) -> list[dict[str, Any]]:
+    """Hourly and daily rollup rows for a set of raw trace rows (each needs
+    the ``_SOURCE_SQL`` columns). Every trace lands in exactly one hourly and
+    one daily cell."""
+    cells: dict[tuple, _Cell] = {}
+    for r in rows:
+        ts = r["trace_timestamp"]
+        if ts is None:
+            continue
+        ts = ts.astimezone(timezone.utc)
+        hour = ts.replace(minute=0, second=0, microsecond=0)
+        day = hour.replace(hour=0)
+        ti = r["turn_index"]
+        turn = None if ti is None else min(ti, ROLLUP_TURN_CAP + 1)
+        session_reg = (
+            hll_register(r["session_id"]) if r["session_id"] else None
+        )
+        user_reg = hll_register(r["user_id"]) if r["user_id"] else None
+        for grain, bucket in (("hour", hour), ("day", day)):
+            key = (grain, bucket, r["environment"], r["outcome"], turn)
+            cell = cells.get(key)
+            if cell is None:
+                cell = cells[key] = _Cell()
+            cell.add(r, session_reg, user_reg)
+    return [
+        {
+            "grain": grain,
+            "bucket_start": bucket,
+            "environment": env,
+            "outcome": outcome,
+            "turn_index": turn,
+            **cell.row(),
+        }
+        for (grain, bucket, env, outcome, turn), cell in cells.items()
+    ]
+
+
+_SOURCE_SQL = text(
+    """
+    SELECT trace_timestamp, environment, outcome, turn_index, latency_seconds,
+           total_cost, turn_tokens, turn_tool_calls, tool_error_count,
+           aoi_type, session_id, user_id
+    FROM langfuse_traces
+    WHERE trace_timestamp >= :lo AND trace_timestamp < :hi
+    """
+)
+
+_SESSION_DAYS_SQL = text(
+    """
+    SELECT DISTINCT date_trunc('day', trace_timestamp, 'UTC') AS day
+    FROM langfuse_traces
+    WHERE session_id = ANY(:ids) AND trace_timestamp IS NOT NULL
+    """
+)
+
+
+def _day_start(d: date) -> datetime:
+    return datetime.combine(d, time(), tzinfo=timezone.utc)
+
+
+def _days(first: date, last: date) -> list[date]:
+    return [first + timedelta(days=i) for i in range((last - first).days + 1)]
+
+
+def _day_runs(days: Iterable[date], max_days: int) -> list[tuple[date, date]]:
+    """Contiguous [first, last] runs of at most ``max_days`` days."""
+    runs: list[tuple[date, date]] = []
+    for d in sorted(set(days)):
+        if (
+            runs
+            and d == runs[-1][1] + timedelta(days=1)
+            and (d - runs[-1][0]).days < max_days
+        ):
+            runs[-1] = (runs[-1][0], d)
+        else:
+            runs.append((d, d))
+    return runs
+
+
+async def refresh_days(
+    session: AsyncSession, days: Iterable[date], *, max_days: int = 7
+) -> int:
+    """Recompute the hourly and daily rollups of the given UTC days from the
+    raw rows, replacing what was there. Doesn't commit; the days stay
+    locked against other rollup writers until the transaction ends. Returns
+    rollup rows written."""
+    runs = _day_runs(days, max_days)
+    for first, last in runs:
+        for d in _days(first, last):
+            await session.execute(
+                text("SELECT pg_advisory_xact_lock(:cls, :day)"),
+                {"cls": _DAY_LOCK_CLASS, "day": d.toordinal()},
+            )
+    written = 0
+    for first, last in runs:
+        lo, hi = _day_start(first), _day_start(last + timedelta(days=1))
+        source = (
+            (await session.execute(_SOURCE_SQL, {"lo": lo, "hi": hi}))
+            .mappings()
+            .all()
+        )
+        cells = build_cells(source)
+        await session.execute(
+            delete(LangfuseTraceRollupOrm).where(
+                LangfuseTraceRollupOrm.bucket_start >= lo,
+                LangfuseTraceRollupOrm.bucket_start < hi,
+            )
+        )
+        if cells:
+            await session.execute(insert(LangfuseTraceRollupOrm), cells)
+        written += len(cells)
+    return written
+
+
+async def refresh_rollups(
+    session: AsyncSession,
+    since: datetime,
+    until: datetime,
+    session_ids: set[str],
+) -> int:
+    """Refresh the rollups after an ingestion chunk: every day the chunk's
+    window overlaps, plus every day holding a turn of a touched session
+    (whose turn positions the recompute may have shifted)."""
+    days = set(
+        _days(
+            since.astimezone(timezone.utc).date(),
+            until.astimezone(timezone.utc).date(),
+        )
+    )
+    ids = [s for s in session_ids if s]
+    if ids:
+        res = await session.execute(_SESSION_DAYS_SQL, {"ids": ids})
+        days.update(d.date() for d in res.scalars())
+    return await refresh_days(session, days)
+
+
+async def rollups_ready(session: AsyncSession) -> bool:
+    """Whether a full rebuild with the current sketch parameters has run."""
+    version = await session.scalar(
+        select(LangfuseTraceRollupStateOrm.sketch_version).where(
+            LangfuseTraceRollupStateOrm.id == 1
+        )
+    )
+    return version == SKETCH_VERSION
+
+
+async def rebuild_rollups(
+    session: AsyncSession, *, batch_days: int = 7
+) -> int:
+    """Rebuild every rollup from ``langfuse_traces`` in committed batches of
+    ``batch_days`` days, then mark the rollups ready. The endpoints scan raw
+    rows while it runs; ingestion can keep going, since each batch takes the
+    same per-day locks as its chunk refreshes. Returns rollup rows
+    written."""
+    await session.execute(delete(LangfuseTraceRollupStateOrm))
+    await session.execute(delete(LangfuseTraceRollupOrm))
+    await session.commit()
+
+    bounds = (
+        await session.execute(
+            text(
+                "SELECT min(trace_timestamp), max(trace_timestamp) "
+                "FROM langfuse_traces"
+            )
+        )
+    ).one()
+    written = 0
+    if bounds[0] is not None:
+        first = bounds[0].astimezone(timezone.utc).date()
+        last = bounds[1].astimezone(timezone.utc).date()
+        while first <= last:
+            end = min(first + timedelta(days=batch_days - 1), last)
+            written += await refresh_days(
+                session, _days(first, end), max_days=batch_days
+            )
+            await session.commit()
+            logger.info("trace_rollups_rebuilt", through=end.isoformat())
+            first = end + timedelta(days=1)
+
+    session.add(
+        LangfuseTraceRollupStateOrm(id=1, sketch_version=SKETCH_VERSION)
+    )
+    await session.commit()
+    return written
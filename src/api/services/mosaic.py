@@ -15,18 +15,30 @@ without rerunning the STAC search.
 
 Before building, we check S3 for the mosaic object: if it already exists we
 skip the (expensive) STAC search, build and upload.
+
+Within a worker, resolved results are kept in a small TTL cache so repeat
+requests for a token skip S3 entirely, and concurrent requests for the same
+token share one in-flight lookup/build (single-flight) instead of each
+searching STAC and uploading the same MosaicJSON.
+
+CPU-bound stages (geometry union, geodesic area, MosaicJSON quadkey build)
+run on a small dedicated thread pool so a large AOI doesn't stall the event
+loop for every other request on the worker.
 """
 
+import asyncio
 import base64
 import functools
 import json
 import time
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 from datetime import date, timedelta
-from typing import Optional
+from typing import Any, Callable, Optional, TypeVar
 from urllib.parse import quote
 
 import boto3
+import cachetools
 import pystac_client
 from botocore.exceptions import ClientError
 from cogeo_mosaic.errors import MosaicNotFoundError
@@ -50,8 +62,16 @@ GFW_TILES_BASE = "https://tiles.globalforestwatch.org"
 # Mosaics are meant for regional AOIs; mid-size countries exceed this.
 MAX_AOI_AREA_KM2 = 50_000
 
+# In-process result cache. Tokens are deterministic recipes, so a resolved
+# result never changes; the TTL only bounds how long a worker keeps serving
+# a token whose S3 object was removed out from under it.
+MOSAIC_CACHE_SIZE = 512
+MOSAIC_CACHE_TTL_SECONDS = 60 * 60
+
 _geod = Geod(ellps="WGS84")
 
+T = TypeVar("T")
+
 
 class AoiTooLargeError(Exception):
     def __init__(self, area_km2: float):
@@ -71,6 +91,73 @@ class NoScenesFoundError(Exception):
     pass
 
 
+# ---------------------------------------------------------------------------
+# In-process cache and single-flight
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class MosaicCacheStats:
+    """Per-worker counters for the mosaic result cache.
+
+    hits: served from the in-process cache.
+    coalesced: joined an in-flight lookup/build for the same token.
+    misses: started a lookup (S3 read, then build if absent).
+    builds: misses that had to search STAC and upload a new mosaic.
+    """
+
+    hits: int = 0
+    coalesced: int = 0
+    misses: int = 0
+    builds: int = 0
+
+
+_mosaic_cache: cachetools.TTLCache = cachetools.TTLCache(
+    maxsize=MOSAIC_CACHE_SIZE, ttl=MOSAIC_CACHE_TTL_SECONDS
+)
+_inflight: dict[str, asyncio.Task] = {}
+_stats = MosaicCacheStats()
+
+
+def mosaic_cache_stats() -> dict[str, int]:
+    """Snapshot of the cache counters plus current cache/in-flight sizes."""
+    return {
+        **asdict(_stats),
+        "cached": len(_mosaic_cache),
+        "inflight": len(_inflight),
+    }
+
+
+def clear_mosaic_cache() -> None:
+    """Drop cached results and reset counters (tests, S3 prefix changes)."""
+    global _stats
+    _mosaic_cache.clear()
+    _stats = MosaicCacheStats()
+
+
+# ---------------------------------------------------------------------------
+# CPU-bound work
+# ---------------------------------------------------------------------------
+
+
+@functools.lru_cache(maxsize=1)
+def _cpu_executor() -> ThreadPoolExecutor:
+    # Separate from the default threadpool (S3 / STAC I/O) and kept small so
+    # concurrent large builds queue here rather than starving other work.
+    return ThreadPoolExecutor(
+        max_workers=SharedSettings.mosaic_cpu_workers,
+        thread_name_prefix="mosaic-cpu",
+    )
+
+
+async def _run_cpu(fn: Callable[..., T], *args: Any) -> T:
+    """Run a CPU-bound callable on the mosaic pool, off the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _cpu_executor(), functools.partial(fn, *args)
+    )
+
+
 # ---------------------------------------------------------------------------
 # S3 persistence
 # ---------------------------------------------------------------------------
@@ -279,16 +366,39 @@ def check_aoi_area(geometry: dict) -> float:
     return area_km2
 
 
+def _union_geometries(geometries: list[dict]) -> dict:
+    return mapping(union_all([shape(g) for g in geometries]))
+
+
 async def _load_geometry(recipe: MosaicRecipe) -> dict:
-    """Union the geometries of the recipe's AOIs into one GeoJSON geometry."""
-    shapes = []
-    for source, src_id in recipe.aois:
-        data = await get_geometry_data(source, src_id, user_id=recipe.user_id)
-        if data and data.get("geometry"):
-            shapes.append(shape(data["geometry"]))
-    if not shapes:
+    """Union the geometries of the recipe's AOIs into one GeoJSON geometry.
+
+    AOI lookups run concurrently; the union runs on the CPU pool.
+    """
+    results = await asyncio.gather(
+        *(
+            get_geometry_data(source, src_id, user_id=recipe.user_id)
+            for source, src_id in recipe.aois
+        )
+    )
+    geometries = [
+        data["geometry"] for data in results if data and data.get("geometry")
+    ]
+    if not geometries:
         raise MosaicNotFoundError("AOI geometry not found")
-    return mapping(union_all(shapes))
+    return await _run_cpu(_union_geometries, geometries)
+
+
+def _build_mosaic(items: list) -> MosaicJSON:
+    return MosaicJSON.from_features(
+        [item.to_dict() for item in items],
+        minzoom=8,
+        maxzoom=14,
+        accessor=lambda f: f["assets"][VISUAL_ASSET]["href"],
+        # Bound the sequential first-match reads per tile; items are sorted
+        # by date proximity, so the nearest scenes are kept.
+        maximum_items_per_tile=12,
+    )
 
 
 async def create_sentinel2_mosaic(recipe: MosaicRecipe) -> MosaicResult:
@@ -296,7 +406,8 @@ async def create_sentinel2_mosaic(recipe: MosaicRecipe) -> MosaicResult:
 
     If a mosaic for this recipe already exists in S3, the STAC search, build
     and upload are skipped; metadata is read from the mosaic JSON extra fields
-    if available.
+    if available. Results are cached per worker, and concurrent calls for the
+    same recipe await a single shared lookup/build.
 
     Raises MosaicNotFoundError (AOI geometry gone), AoiTooLargeError,
     StacSearchError or NoScenesFoundError.
@@ -309,6 +420,40 @@ async def create_sentinel2_mosaic(recipe: MosaicRecipe) -> MosaicResult:
 
     token = encode_recipe(recipe)
 
+    cached = _mosaic_cache.get(token)
+    if cached is not None:
+        _stats.hits += 1
+        logger.debug("Mosaic cache hit", **mosaic_cache_stats())
+        return cached
+
+    task = _inflight.get(token)
+    if task is not None:
+        _stats.coalesced += 1
+        logger.info("Mosaic request joined in-flight build")
+    else:
+        _stats.misses += 1
+        task = asyncio.create_task(_resolve_mosaic(recipe, token))
+        _inflight[token] = task
+        task.add_done_callback(functools.partial(_on_resolved, token))
+
+    # Shield so one caller disconnecting doesn't cancel the build for every
+    # other request waiting on the same token.
+    return await asyncio.shield(task)
+
+
+def _on_resolved(token: str, task: asyncio.Task) -> None:
+    """Clear the in-flight slot; cache the result if the build succeeded.
+
+    Failures are not cached: the next request retries from scratch.
+    """
+    _inflight.pop(token, None)
+    if task.cancelled() or task.exception() is not None:
+        return
+    _mosaic_cache[token] = task.result()
+
+
+async def _resolve_mosaic(recipe: MosaicRecipe, token: str) -> MosaicResult:
+    """Read the mosaic for `token` from S3, building it if absent."""
     # S3-based lookup: if the mosaic already exists, serve it without
     # rebuilding. A single GET both confirms existence and (if present)
     # reads back the persisted build metadata.
@@ -332,7 +477,7 @@ async def create_sentinel2_mosaic(recipe: MosaicRecipe) -> MosaicResult:
         return MosaicResult(mosaic_id=token)
 
     geometry = await _load_geometry(recipe)
-    check_aoi_area(geometry)
+    await _run_cpu(check_aoi_area, geometry)
 
     actual_start = recipe.target_date - timedelta(days=recipe.window_days)
     actual_end = min(
@@ -387,16 +532,9 @@ async def create_sentinel2_mosaic(recipe: MosaicRecipe) -> MosaicResult:
         )
     )
 
+    _stats.builds += 1
     build_start = time.perf_counter()
-    mosaic = MosaicJSON.from_features(
-        [item.to_dict() for item in items],
-        minzoom=8,
-        maxzoom=14,
-        accessor=lambda f: f["assets"][VISUAL_ASSET]["href"],
-        # Bound the sequential first-match reads per tile; items are sorted
-        # by date proximity, so the nearest scenes are kept.
-        maximum_items_per_tile=12,
-    )
+    mosaic = await _run_cpu(_build_mosaic, items)
 
     item_dates = [item.datetime.date() for item in items]
     date_start = min(item_dates)
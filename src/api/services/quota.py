@@ -1,6 +1,26 @@
-"""Daily quota checking and enforcement."""
+"""Daily quota checking and enforcement.
 
+Prompts are counted by a per-worker ``QuotaCounters`` layer in front of
+the ``daily_usage`` table rather than by one upsert-and-commit per prompt.
+While a user is well below their quota a worker admits prompts from memory
+and writes the accumulated count in one statement (at most every
+``quota_counter_tolerance`` prompts, and on the periodic flush). The last
+``quota_counter_tolerance`` prompts before the limit, and a user's first
+prompt on a worker, are written through so the decision is made against
+Postgres. Postgres still holds the total: flushes add their deltas to the
+shared row, so workers need no coordination beyond the upsert's row lock.
+
+With one worker the quota is exact. With several, a worker that last read
+the count before other workers' unflushed prompts can admit at most
+``quota_counter_tolerance`` prompts on that stale count, so the overshoot
+is bounded by tolerance x workers. A crashed worker loses its unflushed
+counts, which errs towards the user.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
 from datetime import date
+from typing import Optional
 
 from fastapi import HTTPException
 from sqlalchemy import select
@@ -10,10 +30,186 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.api.config import APISettings
 from src.api.data_models import DailyUsageOrm, UserType
 from src.api.schemas import UserModel
+from src.shared.database import get_session_from_pool
 from src.shared.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+CounterKey = tuple[str, date]
+
+
+@dataclass
+class _Counter:
+    known: int = 0  # usage_count as last read back from Postgres
+    synced: bool = False  # `known` has been read at least once
+    pending: int = 0  # prompts counted here but not yet written
+    writing: int = 0  # prompts in the write that holds `lock`
+    used: bool = True  # reserved since the last flush
+    # One write per counter at a time: a write that lands before an
+    # earlier one would be compared against a total missing its prompts.
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class QuotaCounters:
+    """Per-worker daily prompt counters that batch writes to daily_usage."""
+
+    def __init__(self, tolerance: int, flush_interval_seconds: float):
+        self.tolerance = tolerance
+        self.flush_interval_seconds = flush_interval_seconds
+        self._counters: dict[CounterKey, _Counter] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def reserve(
+        self, identity: str, quota: int, session: AsyncSession
+    ) -> int:
+        """Count one prompt for `identity` today and return the resulting
+        usage count; a count above `quota` means the prompt is refused."""
+        key = (identity, date.today())
+        counter = self._counters.get(key)
+        if counter is None:
+            counter = self._counters[key] = _Counter()
+        counter.used = True
+        # No await between the check and the increment, so concurrent
+        # requests on this worker cannot both take the same slot.
+        if counter.synced:
+            if counter.known >= quota:
+                # Counts only grow within a day: refuse without a write.
+                counter.pending += 1
+                return counter.known + counter.pending
+            # Prompts admitted here but not yet in Postgres are invisible
+            # to other workers; the tolerance caps them.
+            unconfirmed = counter.writing + counter.pending
+            used = counter.known + unconfirmed
+            if unconfirmed < self.tolerance and used + self.tolerance < quota:
+                counter.pending += 1
+                return used + 1
+
+        # First sight, slack used up or close to the limit: write through,
+        # carrying this worker's pending prompts along.
+        async with counter.lock:
+            delta, counter.pending = counter.pending + 1, 0
+            counter.writing = delta
+            try:
+                counts = await self._add(session, {key: delta})
+            except BaseException:
+                counter.pending += delta - 1
+                raise
+            finally:
+                counter.writing = 0
+            counter.known = max(counter.known, counts[key])
+            counter.synced = True
+            return counts[key]
+
+    def pending(self, identity: str) -> int:
+        """Prompts counted today on this worker but not yet written."""
+        counter = self._counters.get((identity, date.today()))
+        return counter.pending if counter else 0
+
+    async def _add(
+        self, session: AsyncSession, deltas: dict[CounterKey, int]
+    ) -> dict[CounterKey, int]:
+        """Add `deltas` to daily_usage in one statement and commit; return
+        the new totals. Rows are locked in key order so concurrent flushes
+        from several workers cannot deadlock."""
+        values = insert(DailyUsageOrm).values(
+            [
+                {
+                    "id": identity,
+                    "date": day,
+                    "usage_count": delta,
+                    "ip_address": None,
+                }
+                for (identity, day), delta in sorted(deltas.items())
+            ]
+        )
+        stmt = values.on_conflict_do_update(
+            index_elements=["id", "date"],
+            set_={
+                "usage_count": DailyUsageOrm.usage_count
+                + values.excluded.usage_count
+            },
+        ).returning(
+            DailyUsageOrm.id, DailyUsageOrm.date, DailyUsageOrm.usage_count
+        )
+        result = await session.execute(stmt)
+        counts = {(row.id, row.date): row.usage_count for row in result}
+        await session.commit()
+        return counts
+
+    async def flush(self, session: Optional[AsyncSession] = None) -> int:
+        """Write every pending count in one statement; return rows written.
+        Counters mid-write are left for their writer, which carries their
+        pending prompts; counters idle since the previous flush are
+        dropped."""
+        batch = {
+            key: counter
+            for key, counter in self._counters.items()
+            if counter.pending and not counter.lock.locked()
+        }
+        deltas = {}
+        for key, counter in batch.items():
+            # Uncontended (checked above, nothing ran since): no suspend.
+            await counter.lock.acquire()
+            deltas[key] = counter.writing = counter.pending
+            counter.pending = 0
+        counts: dict[CounterKey, int] = {}
+        try:
+            if deltas and session is not None:
+                counts = await self._add(session, deltas)
+            elif deltas:
+                async with get_session_from_pool() as pool_session:
+                    counts = await self._add(pool_session, deltas)
+        except Exception:
+            # Put the counts back so the next flush retries them.
+            for key, delta in deltas.items():
+                batch[key].pending += delta
+            logger.exception("Quota counter flush failed")
+            return 0
+        finally:
+            for counter in batch.values():
+                counter.writing = 0
+                counter.lock.release()
+
+        for key, counter in list(self._counters.items()):
+            if key in counts:
+                counter.known = max(counter.known, counts[key])
+                counter.synced = True
+            if counter.pending or counter.lock.locked():
+                continue
+            if counter.used:
+                counter.used = False
+            else:
+                del self._counters[key]
+        return len(deltas)
+
+    def clear(self) -> None:
+        self._counters.clear()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval_seconds)
+            await self.flush()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+quota_counters = QuotaCounters(
+    tolerance=APISettings.quota_counter_tolerance,
+    flush_interval_seconds=APISettings.quota_counter_flush_seconds,
+)
+
 
 async def get_user_identity_and_daily_quota(
     user: UserModel,
@@ -56,7 +252,7 @@ async def check_quota(
 
     identity_and_quota["prompts_used"] = (
         daily_usage.usage_count if daily_usage else 0
-    )
+    ) + quota_counters.pending(identity_and_quota["identity"])
     return identity_and_quota
 
 
@@ -73,25 +269,11 @@ async def enforce_quota(
 
     identity_and_quota = await get_user_identity_and_daily_quota(user)
 
-    today = date.today()
-
-    stmt = (
-        insert(DailyUsageOrm)
-        .values(
-            id=identity_and_quota["identity"],
-            date=today,
-            usage_count=1,
-            ip_address=None,
-        )
-        .on_conflict_do_update(
-            index_elements=["id", "date"],
-            set_={"usage_count": DailyUsageOrm.usage_count + 1},
-        )
-        .returning(DailyUsageOrm.usage_count)
+    count = await quota_counters.reserve(
+        identity_and_quota["identity"],
+        identity_and_quota["prompt_quota"],
+        session,
     )
-    result = await session.execute(stmt)
-    count = result.scalars().first()
-    await session.commit()
 
     if count > identity_and_quota["prompt_quota"]:
         raise HTTPException(
@@ -0,0 +1,159 @@
+"""Read a thread's latest agent state straight from the checkpointer.
+
+`GET /api/threads/{id}/state` used to build the whole agent (tools,
+middleware, prompt) just to call ``aget_state``. The state of a thread is the
+``channel_values`` of its latest checkpoint, so this reads that directly and
+keeps only the agent-state fields (graph-internal channels are dropped).
+
+Each field is serialized once with ``langchain_core.load.dumps`` and cached
+per thread, keyed by the checkpoint id it came from. Every read first looks
+up the thread's latest checkpoint id (an index-only query on the Postgres
+checkpointer); while it is unchanged, the cached fields are reused and only
+the requested ones are joined into the response. A new checkpoint (the next
+agent step) replaces the entry.
+
+Unlike ``aget_state``, pending writes of an in-flight step are not applied;
+they show up once that step's checkpoint lands.
+"""
+
+import json
+from dataclasses import dataclass
+from typing import (
+    Annotated,
+    Iterable,
+    Optional,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
+
+from cachetools import LRUCache
+from langchain_core.load import dumps
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+from psycopg_pool import AsyncConnectionPool
+
+from src.agent.state import AgentState
+from src.api.config import APISettings
+
+# Agent-state fields, in schema order (the order ``aget_state`` returns).
+STATE_FIELDS: tuple[str, ...] = tuple(AgentState.__annotations__)
+
+# List fields with a reducer (e.g. ``Annotated[list, operator.add]``) start
+# out as ``[]`` rather than missing, so ``aget_state`` reports them before
+# their first write; mirror that.
+_EMPTY_DEFAULTS: dict[str, str] = {
+    name: "[]"
+    for name, hint in get_type_hints(AgentState, include_extras=True).items()
+    if get_origin(hint) is Annotated and get_origin(get_args(hint)[0]) is list
+}
+
+_LATEST_CHECKPOINT_SQL = """
+    SELECT checkpoint_id FROM checkpoints
+    WHERE thread_id = %s AND checkpoint_ns = ''
+    ORDER BY checkpoint_id DESC
+    LIMIT 1
+"""
+
+
+@dataclass
+class SerializedState:
+    checkpoint_id: str
+    fields: dict[str, str]  # field -> dumps(value)
+
+
+@dataclass
+class ThreadStateCacheStats:
+    hits: int = 0
+    misses: int = 0
+
+
+def _join(fields: dict[str, str], names: Iterable[str]) -> str:
+    """Assemble the JSON object ``dumps`` would produce for those fields."""
+    return (
+        "{"
+        + ", ".join(
+            f"{json.dumps(name)}: {fields[name]}"
+            for name in names
+            if name in fields
+        )
+        + "}"
+    )
+
+
+class ThreadStateReader:
+    def __init__(self, maxsize: int):
+        self._entries: LRUCache = LRUCache(maxsize=maxsize)
+        self.stats = ThreadStateCacheStats()
+
+    async def _latest_checkpoint_id(
+        self, checkpointer: BaseCheckpointSaver, thread_id: str
+    ) -> Optional[str]:
+        if isinstance(checkpointer, AsyncPostgresSaver) and isinstance(
+            checkpointer.conn, AsyncConnectionPool
+        ):
+            async with checkpointer.conn.connection() as conn:
+                cursor = await conn.execute(
+                    _LATEST_CHECKPOINT_SQL, (thread_id,)
+                )
+                row = await cursor.fetchone()
+            return row["checkpoint_id"] if row else None
+        # Other savers (in-memory, tests) have no cheap id-only lookup.
+        saved = await checkpointer.aget_tuple(
+            {"configurable": {"thread_id": thread_id}}
+        )
+        return saved.checkpoint["id"] if saved else None
+
+    async def read(
+        self,
+        checkpointer: BaseCheckpointSaver,
+        thread_id: str,
+        fields: Optional[Iterable[str]] = None,
+    ) -> str:
+        """JSON of the thread's latest state, limited to `fields` if given.
+
+        A thread without checkpoints reads as ``{}``.
+        """
+        latest = await self._latest_checkpoint_id(checkpointer, thread_id)
+        if latest is None:
+            self._entries.pop(thread_id, None)
+            return "{}"
+
+        entry = self._entries.get(thread_id)
+        if entry is not None and entry.checkpoint_id == latest:
+            self.stats.hits += 1
+        else:
+            self.stats.misses += 1
+            saved = await checkpointer.aget_tuple(
+                {"configurable": {"thread_id": thread_id}}
+            )
+            if saved is None:  # deleted in between
+                self._entries.pop(thread_id, None)
+                return "{}"
+            values = saved.checkpoint["channel_values"]
+            entry = SerializedState(
+                checkpoint_id=saved.checkpoint["id"],
+                fields={
+                    name: (
+                        dumps(values[name])
+                        if name in values
+                        else _EMPTY_DEFAULTS[name]
+                    )
+                    for name in STATE_FIELDS
+                    if name in values or name in _EMPTY_DEFAULTS
+                },
+            )
+            self._entries[thread_id] = entry
+
+        return _join(entry.fields, STATE_FIELDS if fields is None else fields)
+
+    def invalidate(self, thread_id: str) -> None:
+        self._entries.pop(thread_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+thread_state_reader = ThreadStateReader(
+    maxsize=APISettings.thread_state_cache_size
+)
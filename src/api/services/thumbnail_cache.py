@@ -0,0 +1,148 @@
+"""Content-addressed on-disk cache for AOI thumbnails.
+
+Stores two kinds of entries under one size-bounded directory:
+
+* ``.overlay`` — the fitted, URL-encoded GeoJSON overlay for a geometry,
+  keyed by a hash of the geometry itself (so an edited custom area gets a
+  new entry rather than a stale outline).
+* ``.png`` — the Mapbox static image, keyed by a hash of the overlay plus
+  every request parameter that changes the rendered image.
+
+Entries are immutable once written (same key, same bytes), so the directory
+can be shared by every worker on a host without coordination: writes go to a
+temp file and are renamed into place. Eviction is least-recently-used by
+mtime (hits touch the file) and runs when the tracked size passes the bound.
+All methods block on disk I/O; call them from a worker thread.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+from src.shared.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Evict down to this fraction of max_bytes so we don't rescan on every put.
+_LOW_WATER = 0.8
+
+
+def content_key(*parts: Any) -> str:
+    """Stable sha256 hex digest of JSON-serialisable parts."""
+    h = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, bytes):
+            h.update(part)
+        elif isinstance(part, str):
+            h.update(part.encode("utf-8"))
+        else:
+            h.update(
+                json.dumps(part, sort_keys=True, separators=(",", ":")).encode(
+                    "utf-8"
+                )
+            )
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+class ThumbnailCache:
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # Lazily initialised from a directory scan; other workers writing to
+        # the same directory make this an estimate, which is corrected on
+        # every eviction pass.
+        self._size: Optional[int] = None
+
+    def _path(self, key: str, suffix: str) -> Path:
+        return self.directory / key[:2] / f"{key}{suffix}"
+
+    def get(self, key: str, suffix: str) -> Optional[bytes]:
+        path = self._path(key, suffix)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning("Thumbnail cache read failed", error=str(e))
+            return None
+        try:
+            os.utime(path)  # mark as recently used for LRU eviction
+        except OSError:
+            pass
+        return data
+
+    def put(self, key: str, suffix: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        path = self._path(key, suffix)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except OSError as e:
+            # A full or read-only disk must not fail the thumbnail itself.
+            logger.warning("Thumbnail cache write failed", error=str(e))
+            return
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(data)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        for path in self.directory.glob("*/*"):
+            if path.suffix == ".tmp":
+                continue
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self) -> None:
+        entries = sorted(self._entries(), key=lambda e: e[0])
+        size = sum(e[1] for e in entries)
+        target = int(self.max_bytes * _LOW_WATER)
+        removed = 0
+        for _, entry_size, path in entries:
+            if size <= target:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+            removed += 1
+        self._size = size
+        logger.info(
+            "Thumbnail cache evicted", removed=removed, size_bytes=size
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            for _, _, path in self._entries():
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+            self._size = 0
@@ -51,6 +51,8 @@ class _SharedSettings(BaseSettings):
     mosaic_s3_region: Optional[str] = Field(
         default=None, alias="MOSAIC_S3_REGION"
     )
+    # Threads for CPU-bound mosaic stages (geometry union, MosaicJSON build).
+    mosaic_cpu_workers: int = Field(default=2, alias="MOSAIC_CPU_WORKERS")
 
     model_config = {
         "env_file": ".env",
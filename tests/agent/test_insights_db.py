@@ -2,7 +2,7 @@
 
 These exercise the real SQL paths the tool unit tests mock out: the shared
 visibility clause in `_search_insights` (including its interaction with
-LIMIT), the ownership rule in `_load_editable_insight`, and the chart
+LIMIT), the trigger-maintained search vector and its ranking, the ownership rule in `_load_editable_insight`, and the chart
 replacement + provenance preservation in `update_insight`.
 """
 
@@ -134,6 +134,49 @@ async def test_search_matches_chart_title_and_data(user):
     assert insight_id in {row.id for row in by_data}
 
 
+async def test_search_ranks_phrase_match_above_newer_scattered_hits(user):
+    phrase = await _insert_insight(
+        user_id=user.id,
+        text="Tree cover loss in the Amazon rose.",
+        created_at=datetime(2026, 6, 1),
+    )
+    scattered = await _insert_insight(
+        user_id=user.id,
+        text="Loss of mangrove cover; tree planting in the Amazon basin.",
+        chart_title="Mangrove planting",
+        created_at=datetime(2026, 6, 5),
+    )
+
+    with bound_user_id(user.id):
+        rows = await _search_insights("tree cover loss")
+
+    assert [row.id for row in rows] == [phrase, scattered]
+
+
+async def test_search_stems_summary_terms(user):
+    insight_id = await _insert_insight(
+        user_id=user.id, text="Fire alerts spiked in Indonesia."
+    )
+
+    with bound_user_id(user.id):
+        rows = await _search_insights("fires")
+
+    assert [row.id for row in rows] == [insight_id]
+
+
+async def test_update_insight_refreshes_search_vector(user):
+    insight_id = await _insert_insight(user_id=user.id, text="Old summary.")
+
+    assert await update_insight(str(insight_id), _revised_insight()) is True
+
+    with bound_user_id(user.id):
+        # Old chart title is gone; the new summary and title are searchable.
+        assert await _search_insights("annual tree cover") == []
+        assert [r.id for r in await _search_insights("new title")] == [
+            insight_id
+        ]
+
+
 async def test_load_editable_insight_owner_only(user, user_ds):
     own = await _insert_insight(user_id=user.id, text="Mine.")
     theirs = await _insert_insight(
@@ -6,10 +6,10 @@ from unittest.mock import AsyncMock, patch
 from uuid import uuid4
 
 import pytest
+from sqlalchemy.dialects import postgresql
 
 from src.agent.tools.search_insights import (
-    _escape_like,
-    _score,
+    _match_query,
     _terms,
     search_insights,
 )
@@ -40,6 +40,10 @@ def _fake_insight(**kwargs):
                 group_field="",
                 series_fields=[],
                 chart_data=[{"year": 2020, "loss_ha": 5}],
+                dataset_id=None,
+                color_map={},
+                series_color=None,
+                divergent_colors=None,
             )
         ],
     )
@@ -56,16 +60,26 @@ def test_terms_drops_short_tokens_and_lowercases():
     ]
 
 
-def test_escape_like_escapes_metacharacters():
-    assert _escape_like("100%_gain\\") == "100\\%\\_gain\\\\"
+def _compiled(clause):
+    compiled = clause.compile(dialect=postgresql.dialect())
+    return compiled.string, list(compiled.params.values())
 
 
-def test_score_rewards_phrase_match():
-    row = _fake_insight()
-    terms = _terms("amazon tree cover")
-    phrase_hit = _score(row, terms, "tree cover loss in the amazon")
-    scattered = _score(row, terms, "amazon tree cover")
-    assert phrase_hit > scattered > 0
+def test_match_query_ors_terms_in_both_configurations():
+    sql, params = _compiled(_match_query("Fires in the Amazon"))
+    assert sql.count("to_tsquery(") == 2
+    assert params == [
+        "english",
+        "fires | the | amazon",
+        "simple",
+        "fires | the | amazon",
+    ]
+
+
+def test_match_query_falls_back_to_phrase_without_terms():
+    sql, params = _compiled(_match_query("uk eu"))
+    assert sql.count("plainto_tsquery(") == 2
+    assert params == ["english", "uk eu", "simple", "uk eu"]
 
 
 @pytest.mark.asyncio
@@ -95,19 +109,21 @@ async def test_search_insights_surfaces_best_match():
 
 
 @pytest.mark.asyncio
-async def test_search_insights_picks_highest_scoring():
-    weak = _fake_insight(
-        insight_text="Fire alerts spiked in Indonesia.",
-        created_at=datetime(2026, 6, 10),  # newer, but weaker match
-        charts=[],
-    )
+async def test_search_insights_surfaces_top_ranked_row():
+    # Ranking happens in SQL; the tool takes the first row as-is, even when
+    # a later candidate is newer.
     strong = _fake_insight(
         insight_text="Tree cover loss in the Amazon rose sharply.",
         created_at=datetime(2026, 6, 1),
     )
+    weak = _fake_insight(
+        insight_text="Fire alerts spiked in Indonesia.",
+        created_at=datetime(2026, 6, 10),
+        charts=[],
+    )
     with patch(
         "src.agent.tools.search_insights._search_insights",
-        new=AsyncMock(return_value=[weak, strong]),
+        new=AsyncMock(return_value=[strong, weak]),
     ):
         command = await search_insights.coroutine(
             query="tree cover amazon", tool_call_id="t1"
@@ -117,7 +133,7 @@ async def test_search_insights_picks_highest_scoring():
 
 @pytest.mark.asyncio
 async def test_search_insights_rejects_empty_query():
-    # No DB call: an empty query would ILIKE-match every insight.
+    # No DB call: an empty query has nothing to match on.
     command = await search_insights.coroutine(query="  ", tool_call_id="t1")
     assert command.update["messages"][0].status == "error"
     assert "too short" in _content(command)
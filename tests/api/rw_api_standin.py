@@ -0,0 +1,95 @@
+"""Local stand-in for the Resource Watch identity endpoint.
+
+Serves ``GET /auth/user/me`` from an in-memory token -> user table on a
+loopback port, so the real ``fetch_user_from_rw_api`` path (shared pooled
+client included) runs end to end without network access. Used by the
+``rw_api`` fixture; can also be run on its own for local load tests:
+
+    python -m tests.api.rw_api_standin --port 9000
+    RW_API_BASE_URL=http://127.0.0.1:9000 uvicorn src.api.app:app
+
+(standalone, every token maps to a user derived from the token itself.)
+"""
+
+import argparse
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+
+class RWAPIStandIn:
+    def __init__(self, users: Optional[dict[str, dict]] = None, port: int = 0):
+        # bearer token -> RW user payload; None means "any token is valid".
+        self.users = users
+        self.requests = 0
+        self._server = ThreadingHTTPServer(
+            ("127.0.0.1", port), self._handler()
+        )
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def user_for(self, token: str) -> Optional[dict]:
+        if self.users is None:
+            return {
+                "id": f"standin-{token}",
+                "name": f"Stand-in {token}",
+                "email": f"{token}@standin.example",
+                "createdAt": "2024-01-01T00:00:00Z",
+                "updatedAt": "2024-01-01T00:00:00Z",
+            }
+        return self.users.get(token)
+
+    def _handler(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive, so the shared client's connection pooling is real.
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                standin.requests += 1
+                auth = self.headers.get("Authorization", "")
+                token = auth.removeprefix("Bearer ")
+                user = (
+                    standin.user_for(token)
+                    if self.path == "/auth/user/me"
+                    else None
+                )
+                status, body = (
+                    (200, user) if user else (401, {"errors": ["Not valid"]})
+                )
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "RWAPIStandIn":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=9000)
+    args = parser.parse_args()
+    standin = RWAPIStandIn(port=args.port)
+    print(f"RW API stand-in on {standin.base_url}")
+    standin._thread.run()
@@ -1020,6 +1020,78 @@ async def test_export_users_renders_rows_correctly(
     assert comma_row[header.index("topics")] == "[]"
 
 
+@pytest.mark.asyncio
+async def test_export_users_streams_across_batches(
+    client, auth_override, superuser_factory, monkeypatch
+):
+    """With a batch smaller than the table, every row is still exported
+    exactly once, in order, under a single header row."""
+    from src.api.routers import admin
+
+    monkeypatch.setattr(admin, "_EXPORT_BATCH_SIZE", 2)
+    su = await superuser_factory("su-export-batches@example.test")
+    auth_override(su.id)
+    async with async_session_maker() as session:
+        for i in range(5):
+            session.add(
+                UserOrm(
+                    id=f"export-batch-{i}",
+                    name=f"Batch {i}",
+                    email=f"batch-{i}@example.test",
+                    created_at=datetime(2020, 1, 1 + i),
+                )
+            )
+        await session.commit()
+
+    response = await client.get(
+        "/api/admin/users/export",
+        headers={"Authorization": "Bearer test-token"},
+    )
+    assert response.status_code == 200
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == EXPORT_COLUMNS
+    assert EXPORT_COLUMNS not in rows[1:]
+    ids = [row[0] for row in rows[1:]]
+    assert len(ids) == len(set(ids))
+    assert [i for i in ids if i.startswith("export-batch-")] == [
+        f"export-batch-{i}" for i in reversed(range(5))
+    ]
+
+
+@pytest.mark.asyncio
+async def test_export_users_ndjson(client, auth_override, superuser_factory):
+    """format=ndjson yields one JSON object per user with the CSV columns,
+    native booleans/nulls and ISO-8601 datetimes."""
+    su = await superuser_factory("su-export-ndjson@example.test")
+    auth_override(su.id)
+    created = datetime(2025, 2, 3, 4, 5, 6)
+    await _seed_user("export-ndjson", "ndjson-export@example.test")
+    async with async_session_maker() as session:
+        user = await session.get(UserOrm, "export-ndjson")
+        user.created_at = created
+        user.topics = '["topic_alpha"]'
+        await session.commit()
+
+    response = await client.get(
+        "/api/admin/users/export?format=ndjson",
+        headers={"Authorization": "Bearer test-token"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert re.search(
+        r'filename="gnw-users-\d{4}-\d{2}-\d{2}\.ndjson"',
+        response.headers["content-disposition"],
+    )
+
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert all(list(r) == EXPORT_COLUMNS for r in records)
+    record = next(r for r in records if r["id"] == "export-ndjson")
+    assert datetime.fromisoformat(record["created_at"]) == created
+    assert record["first_name"] is None
+    assert record["has_profile"] is False
+    assert record["topics"] == '["topic_alpha"]'
+
+
 # --- POST /api/chat feature flag auth ---
 
 
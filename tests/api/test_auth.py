@@ -1,16 +1,11 @@
 """Tests for authentication-related endpoints."""
 
-from unittest.mock import patch
-
 import pytest
 
-from src.api.auth.dependencies import _user_info_cache
-from tests.api.mock import mock_rw_api_response
-
+from src.api.auth.dependencies import _resolved_user_cache
+from tests.api.mock import USERS
 
-@pytest.fixture(autouse=True)
-def clear_cache():
-    _user_info_cache.clear()
+AUTH = {"Authorization": "Bearer test-token"}
 
 
 @pytest.mark.asyncio
@@ -21,14 +16,10 @@ async def test_auth_me_requires_bearer_token(client):
 
 
 @pytest.mark.asyncio
-async def test_auth_me_returns_user_with_valid_token(client):
-    with patch("httpx.AsyncClient") as mock_client_class:
-        mock_client = mock_client_class.return_value.__aenter__.return_value
-        mock_client.get.return_value = mock_rw_api_response("Test User")
+async def test_auth_me_returns_user_with_valid_token(client, rw_api):
+    rw_api.users["test-token"] = USERS[0]
 
-        response = await client.get(
-            "/api/auth/me", headers={"Authorization": "Bearer test-token"}
-        )
+    response = await client.get("/api/auth/me", headers=AUTH)
 
     assert response.status_code == 200
     payload = response.json()
@@ -37,17 +28,90 @@ async def test_auth_me_returns_user_with_valid_token(client):
 
 
 @pytest.mark.asyncio
-async def test_auth_me_creates_user_without_whitelist_gates(client):
-    with patch("httpx.AsyncClient") as mock_client_class:
-        mock_client = mock_client_class.return_value.__aenter__.return_value
-        mock_response = mock_rw_api_response("Public User")
-        mock_response.json_data["id"] = "public-user-1"
-        mock_response.json_data["email"] = "public@example.org"
-        mock_client.get.return_value = mock_response
-
-        response = await client.get(
-            "/api/auth/me", headers={"Authorization": "Bearer test-token"}
-        )
+async def test_auth_me_creates_user_without_whitelist_gates(client, rw_api):
+    rw_api.users["test-token"] = {
+        **USERS[0],
+        "id": "public-user-1",
+        "email": "public@example.org",
+    }
+
+    response = await client.get("/api/auth/me", headers=AUTH)
 
     assert response.status_code == 200
     assert response.json()["id"] == "public-user-1"
+
+
+@pytest.mark.asyncio
+async def test_rw_api_rejection_is_passed_through(client, rw_api):
+    response = await client.get(
+        "/api/auth/me", headers={"Authorization": "Bearer unknown"}
+    )
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_rw_api_identity_is_cached_per_token(client, rw_api):
+    rw_api.users["test-token"] = USERS[0]
+
+    for _ in range(3):
+        response = await client.get("/api/auth/me", headers=AUTH)
+        assert response.status_code == 200
+    assert rw_api.requests == 1
+
+
+@pytest.mark.asyncio
+async def test_resolved_user_cached_and_invalidated_on_profile_update(
+    client, rw_api
+):
+    """Repeat requests reuse the resolved user; a profile update through the
+    API is visible on the very next request."""
+    rw_api.users["test-token"] = USERS[0]
+    user_id = USERS[0]["id"]
+
+    await client.get("/api/auth/me", headers=AUTH)
+    assert user_id in _resolved_user_cache
+
+    response = await client.patch(
+        "/api/auth/profile", headers=AUTH, json={"job_title": "Analyst"}
+    )
+    assert response.status_code == 200
+    assert user_id not in _resolved_user_cache
+
+    response = await client.get("/api/auth/me", headers=AUTH)
+    assert response.json()["jobTitle"] == "Analyst"
+
+
+@pytest.mark.asyncio
+async def test_resolved_user_invalidated_on_user_type_change(
+    client, rw_api, superuser_factory
+):
+    """Promoting a user takes effect on their next request, not after the
+    cache TTL."""
+    rw_api.users["test-token"] = USERS[0]
+    su = await superuser_factory("su-cache@example.test")
+    rw_api.users["su-token"] = {
+        **USERS[0],
+        "id": su.id,
+        "name": su.name,
+        "email": su.email,
+    }
+    user_id = USERS[0]["id"]
+
+    me = await client.get("/api/auth/me", headers=AUTH)
+    assert me.json()["userType"] == "regular"
+    assert (
+        await client.get("/api/admin/users/export", headers=AUTH)
+    ).status_code == 403
+
+    response = await client.patch(
+        f"/api/admin/users/{user_id}/user-type",
+        headers={"Authorization": "Bearer su-token"},
+        json={"user_type": "superuser"},
+    )
+    assert response.status_code == 200
+
+    me = await client.get("/api/auth/me", headers=AUTH)
+    assert me.json()["userType"] == "superuser"
+    assert (
+        await client.get("/api/admin/users/export", headers=AUTH)
+    ).status_code == 200
@@ -132,6 +132,90 @@ async def test_list_dashboards_own_only_newest_first(client, auth_override):
     ]
 
 
+@pytest.mark.asyncio
+async def test_list_dashboards_summary_counts_and_thumbnail(
+    client, auth_override
+):
+    user = await _create_user("summary-owner")
+    auth_override(user.id)
+    dashboard = await _create_dashboard(client)
+    insight = await _create_insight(user_id=user.id)
+    for body in (
+        {"widget_type": "insight", "insight_id": str(insight.id)},
+        {"widget_type": "text", "config": {"text": "Notes"}},
+    ):
+        response = await client.post(
+            f"/api/dashboards/{dashboard['id']}/widgets",
+            headers=AUTH,
+            json=body,
+        )
+        assert response.status_code == 201
+
+    response = await client.get("/api/dashboards", headers=AUTH)
+    assert response.status_code == 200
+    [item] = response.json()
+    assert item["id"] == dashboard["id"]
+    assert item["widget_count"] == 2
+    assert item["aoi_count"] == 1
+    assert item["primary_aoi"] == PARANA
+    assert item["thumbnail_path"] == "/api/geometry/gadm/BRA.16_1/thumbnail"
+    assert "widgets" not in item
+    assert "aois" not in item
+
+
+@pytest.mark.asyncio
+async def test_list_dashboards_full_includes_collections(
+    client, auth_override
+):
+    user = await _create_user("full-owner")
+    auth_override(user.id)
+    await _create_dashboard(client)
+
+    response = await client.get(
+        "/api/dashboards", params={"full": "true"}, headers=AUTH
+    )
+    [item] = response.json()
+    assert item["aois"][0]["src_id"] == "BRA.16_1"
+    assert item["widgets"] == []
+
+
+@pytest.mark.asyncio
+async def test_list_dashboards_paginates_with_cursor(client, auth_override):
+    user = await _create_user("page-owner")
+    auth_override(user.id)
+    created = [
+        await _create_dashboard(client, name=f"Dashboard {n}")
+        for n in range(5)
+    ]
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = await client.get(
+            "/api/dashboards", params=params, headers=AUTH
+        )
+        assert response.status_code == 200
+        seen.extend(d["id"] for d in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    assert seen == [d["id"] for d in reversed(created)]
+
+
+@pytest.mark.asyncio
+async def test_list_dashboards_invalid_cursor_returns_400(
+    client, auth_override
+):
+    user = await _create_user("bad-cursor-owner")
+    auth_override(user.id)
+
+    response = await client.get(
+        "/api/dashboards", params={"cursor": "nope"}, headers=AUTH
+    )
+    assert response.status_code == 400
+
+
 # ---------------------------------------------------------------------------
 # GET /api/dashboards/{id}
 # ---------------------------------------------------------------------------
@@ -232,6 +316,187 @@ async def test_get_dashboard_expands_insight_widgets(client, auth_override):
     assert widget["insight"]["id"] == str(insight.id)
 
 
+async def _publish_with_insight(client, user_id: str) -> tuple[dict, str]:
+    """A public dashboard owned by `user_id` with one insight widget."""
+    dashboard = await _create_dashboard(client)
+    insight = await _create_insight(user_id=user_id, is_public=True)
+    await client.post(
+        f"/api/dashboards/{dashboard['id']}/widgets",
+        headers=AUTH,
+        json={"widget_type": "insight", "insight_id": str(insight.id)},
+    )
+    await client.patch(
+        f"/api/dashboards/{dashboard['id']}/public",
+        headers=AUTH,
+        json={"is_public": True},
+    )
+    return dashboard, str(insight.id)
+
+
+@pytest.mark.asyncio
+async def test_public_dashboard_render_is_cached(
+    client, auth_override, monkeypatch
+):
+    from src.api.repositories import dashboard_writer
+    from src.api.services.dashboard_cache import dashboard_render_cache
+
+    owner = await _create_user("cache-owner")
+    viewer = await _create_user("cache-viewer")
+    auth_override(owner.id)
+    dashboard, _ = await _publish_with_insight(client, owner.id)
+
+    auth_override(viewer.id)
+    first = await client.get(f"/api/dashboards/{dashboard['id']}")
+    assert first.status_code == 200
+
+    # With the opt-in fresh window, a fresh cached render is served without
+    # loading the dashboard again.
+    async def _no_db(*args, **kwargs):
+        raise AssertionError("dashboard loaded despite a fresh cache entry")
+
+    monkeypatch.setattr(dashboard_render_cache, "fresh_seconds", 60)
+    hits = dashboard_render_cache.stats.hits
+    monkeypatch.setattr(dashboard_writer, "get_dashboard_expanded", _no_db)
+    monkeypatch.setattr(dashboard_writer, "get_dashboard_version", _no_db)
+    second = await client.get(f"/api/dashboards/{dashboard['id']}")
+    assert second.json() == first.json()
+    assert dashboard_render_cache.stats.hits == hits + 1
+
+
+@pytest.mark.asyncio
+async def test_cached_render_revalidates_against_updated_at(
+    client, auth_override, monkeypatch
+):
+    from src.api.services.dashboard_cache import dashboard_render_cache
+
+    owner = await _create_user("reval-owner")
+    viewer = await _create_user("reval-viewer")
+    auth_override(owner.id)
+    dashboard, _ = await _publish_with_insight(client, owner.id)
+
+    auth_override(viewer.id)
+    await client.get(f"/api/dashboards/{dashboard['id']}")
+    monkeypatch.setattr(dashboard_render_cache, "fresh_seconds", 0)
+    revalidated = dashboard_render_cache.stats.revalidated
+    response = await client.get(f"/api/dashboards/{dashboard['id']}")
+    assert response.status_code == 200
+    assert dashboard_render_cache.stats.revalidated == revalidated + 1
+
+
+@pytest.mark.asyncio
+async def test_cached_render_not_served_once_unpublished_elsewhere(
+    client, auth_override
+):
+    """Another worker's cache still holds the public render after the owner
+    unpublishes here; its hit must not serve it."""
+    from src.api.app import app
+    from src.api.auth.dependencies import fetch_user_from_rw_api
+    from src.api.services.dashboard_cache import dashboard_render_cache
+
+    owner = await _create_user("unpub-owner")
+    viewer = await _create_user("unpub-viewer")
+    auth_override(owner.id)
+    dashboard, _ = await _publish_with_insight(client, owner.id)
+
+    key = uuid.UUID(dashboard["id"])
+    auth_override(viewer.id)
+    await client.get(f"/api/dashboards/{dashboard['id']}")
+    stale = dashboard_render_cache.get(key)
+    assert stale is not None
+
+    auth_override(owner.id)
+    response = await client.patch(
+        f"/api/dashboards/{dashboard['id']}/public",
+        headers=AUTH,
+        json={"is_public": False},
+    )
+    assert response.status_code == 200
+    # The entry another worker still holds: this write only invalidated ours.
+    dashboard_render_cache._entries[key] = stale
+
+    app.dependency_overrides.pop(fetch_user_from_rw_api, None)
+    response = await client.get(f"/api/dashboards/{dashboard['id']}")
+    assert response.status_code == 401
+    assert dashboard_render_cache.get(key) is None
+
+
+@pytest.mark.asyncio
+async def test_widget_change_invalidates_cached_render(client, auth_override):
+    owner = await _create_user("inval-owner")
+    viewer = await _create_user("inval-viewer")
+    auth_override(owner.id)
+    dashboard, _ = await _publish_with_insight(client, owner.id)
+
+    auth_override(viewer.id)
+    before = await client.get(f"/api/dashboards/{dashboard['id']}")
+    assert len(before.json()["widgets"]) == 1
+
+    auth_override(owner.id)
+    await client.post(
+        f"/api/dashboards/{dashboard['id']}/widgets",
+        headers=AUTH,
+        json={"widget_type": "text", "config": {"text": "Notes"}},
+    )
+
+    auth_override(viewer.id)
+    after = await client.get(f"/api/dashboards/{dashboard['id']}")
+    assert len(after.json()["widgets"]) == 2
+    assert after.json()["updated_at"] != before.json()["updated_at"]
+
+
+@pytest.mark.asyncio
+async def test_insight_visibility_change_invalidates_cached_render(
+    client, auth_override
+):
+    owner = await _create_user("vis-owner")
+    viewer = await _create_user("vis-viewer")
+    auth_override(owner.id)
+    dashboard, insight_id = await _publish_with_insight(client, owner.id)
+
+    auth_override(viewer.id)
+    before = await client.get(f"/api/dashboards/{dashboard['id']}")
+    assert before.json()["widgets"][0]["insight"] is not None
+
+    auth_override(owner.id)
+    response = await client.patch(
+        f"/api/insights/{insight_id}/public",
+        headers=AUTH,
+        json={"is_public": False},
+    )
+    assert response.status_code == 200
+
+    auth_override(viewer.id)
+    after = await client.get(f"/api/dashboards/{dashboard['id']}")
+    assert after.json()["widgets"][0]["insight"] is None
+
+
+@pytest.mark.asyncio
+async def test_owner_does_not_get_shared_render(client, auth_override):
+    """The owner sees their private insights on a public dashboard; other
+    viewers get the shared render without them."""
+    owner = await _create_user("shared-owner")
+    viewer = await _create_user("shared-viewer")
+    auth_override(owner.id)
+    dashboard, _ = await _publish_with_insight(client, owner.id)
+    private = await _create_insight(user_id=owner.id)
+    await client.post(
+        f"/api/dashboards/{dashboard['id']}/widgets",
+        headers=AUTH,
+        json={"widget_type": "insight", "insight_id": str(private.id)},
+    )
+
+    auth_override(viewer.id)
+    shared = await client.get(f"/api/dashboards/{dashboard['id']}")
+    assert [w["insight"] is not None for w in shared.json()["widgets"]] == [
+        True,
+        False,
+    ]
+
+    auth_override(owner.id)
+    own = await client.get(f"/api/dashboards/{dashboard['id']}", headers=AUTH)
+    assert all(w["insight"] is not None for w in own.json()["widgets"])
+
+
 # ---------------------------------------------------------------------------
 # PATCH /api/dashboards/{id}
 # ---------------------------------------------------------------------------
@@ -366,6 +366,92 @@ async def test_list_insights_ordered_newest_first(client, auth_override):
     assert ids == [str(i2.id), str(i1.id)]
 
 
+@pytest.mark.asyncio
+async def test_list_insights_paginates_with_cursor(client, auth_override):
+    user = await _create_user("page-owner")
+    auth_override(user.id)
+    created = [
+        await _create_insight(user_id=user.id, title=f"Insight {n}")
+        for n in range(5)
+    ]
+    expected = [str(i.id) for i in reversed(created)]
+
+    seen, cursor = [], None
+    for _ in range(3):
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = await client.get(
+            "/api/insights",
+            params=params,
+            headers={"Authorization": "Bearer t"},
+        )
+        assert response.status_code == 200
+        seen.extend(i["id"] for i in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    assert seen == expected
+    assert cursor is None
+
+
+@pytest.mark.asyncio
+async def test_list_insights_cursor_breaks_created_at_ties(
+    client, auth_override
+):
+    user = await _create_user("tie-owner")
+    auth_override(user.id)
+    rows = [await _create_insight(user_id=user.id) for _ in range(3)]
+    async with async_session_maker() as session:
+        for row in rows:
+            row.created_at = rows[0].created_at
+            session.add(row)
+        await session.commit()
+
+    first = await client.get(
+        "/api/insights",
+        params={"limit": 1},
+        headers={"Authorization": "Bearer t"},
+    )
+    rest = await client.get(
+        "/api/insights",
+        params={"limit": 10, "cursor": first.headers["X-Next-Cursor"]},
+        headers={"Authorization": "Bearer t"},
+    )
+
+    ids = [i["id"] for i in first.json() + rest.json()]
+    assert sorted(ids) == sorted(str(r.id) for r in rows)
+    assert len(ids) == 3
+
+
+@pytest.mark.asyncio
+async def test_list_insights_invalid_cursor_returns_400(client, auth_override):
+    user = await _create_user("bad-cursor-owner")
+    auth_override(user.id)
+
+    response = await client.get(
+        "/api/insights",
+        params={"cursor": "yesterday"},
+        headers={"Authorization": "Bearer t"},
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_insights_summary_omits_payloads(client, auth_override):
+    user = await _create_user("summary-owner")
+    auth_override(user.id)
+    await _create_insight(user_id=user.id)
+
+    response = await client.get(
+        "/api/insights", headers={"Authorization": "Bearer t"}
+    )
+    assert response.status_code == 200
+    item = response.json()[0]
+    assert "codeact_parts" not in item
+    assert item["charts"][0]["title"] == "Test Insight"
+    assert "chart_data" not in item["charts"][0]
+
+
 # ---------------------------------------------------------------------------
 # GET /api/insights/{insight_id} (single)
 # ---------------------------------------------------------------------------
@@ -665,7 +751,7 @@ async def test_insight_response_shape(client, auth_override):
     await _create_insight(user_id=user.id)
 
     response = await client.get(
-        "/api/insights", headers={"Authorization": "Bearer t"}
+        "/api/insights?full=true", headers={"Authorization": "Bearer t"}
     )
     assert response.status_code == 200
     item = response.json()[0]
@@ -1,8 +1,10 @@
 """Tests for the Sentinel-2 mosaic service and endpoints."""
 
+import asyncio
 import base64
 import io
 import json
+import threading
 from datetime import date, datetime, timezone
 from unittest.mock import AsyncMock, patch
 
@@ -17,12 +19,15 @@ from src.api.services.mosaic import (
     MosaicRecipe,
     MosaicResult,
     NoScenesFoundError,
+    StacSearchError,
     _s3_key,
     _s3_uri,
     check_aoi_area,
+    clear_mosaic_cache,
     create_sentinel2_mosaic,
     decode_recipe,
     encode_recipe,
+    mosaic_cache_stats,
 )
 from src.shared.config import SharedSettings
 
@@ -48,11 +53,15 @@ class FakeS3Client:
 
     def __init__(self):
         self.store: dict[str, bytes] = {}
+        self.gets = 0
+        self.puts = 0
 
     def put_object(self, Bucket, Key, Body, ContentType=None):
+        self.puts += 1
         self.store[Key] = Body
 
     def get_object(self, Bucket, Key):
+        self.gets += 1
         if Key not in self.store:
             raise ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
         return {"Body": io.BytesIO(self.store[Key])}
@@ -60,12 +69,17 @@ class FakeS3Client:
 
 @pytest.fixture(autouse=True)
 def fake_s3(monkeypatch):
-    """Replace the S3 client with an in-memory fake and set mosaic settings."""
+    """Replace the S3 client with an in-memory fake and set mosaic settings.
+
+    The in-process mosaic cache is cleared so each test starts cold.
+    """
     client = FakeS3Client()
     monkeypatch.setattr(mosaic_service, "_s3_client", lambda: client)
     monkeypatch.setattr(SharedSettings, "mosaic_s3_bucket", "test-bucket")
     monkeypatch.setattr(SharedSettings, "mosaic_s3_prefix", "mosaics")
-    return client
+    clear_mosaic_cache()
+    yield client
+    clear_mosaic_cache()
 
 
 class FakeItem:
@@ -178,6 +192,53 @@ def test_check_aoi_area_rejects_continental():
         check_aoi_area(CONTINENTAL_POLYGON)
 
 
+@pytest.mark.asyncio
+async def test_load_geometry_fetches_aois_concurrently():
+    recipe = MosaicRecipe(
+        aois=(("gadm", "A"), ("gadm", "B"), ("gadm", "C")),
+        target_date=date(2025, 6, 15),
+    )
+    active = 0
+    peak = 0
+
+    async def slow_lookup(source, src_id, user_id=None):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return {"geometry": REGIONAL_POLYGON}
+
+    with patch(
+        "src.api.services.mosaic.get_geometry_data", side_effect=slow_lookup
+    ):
+        geometry = await mosaic_service._load_geometry(recipe)
+
+    assert peak == 3
+    assert geometry["type"] == "Polygon"
+
+
+@pytest.mark.asyncio
+async def test_mosaic_build_runs_off_event_loop(fake_s3):
+    build_threads = []
+    real_build = MosaicJSON.from_features
+
+    def recording_build(*args, **kwargs):
+        build_threads.append(threading.current_thread().name)
+        return real_build(*args, **kwargs)
+
+    item = FakeItem(date(2025, 6, 1), 3.0, "https://example.com/a.tif")
+    with (
+        _patch_geometry(),
+        _patch_search([item]),
+        patch.object(MosaicJSON, "from_features", side_effect=recording_build),
+    ):
+        await create_sentinel2_mosaic(RECIPE)
+
+    assert len(build_threads) == 1
+    assert build_threads[0].startswith("mosaic-cpu")
+
+
 @pytest.mark.asyncio
 async def test_create_mosaic_missing_geometry():
     with _patch_geometry(None):
@@ -262,6 +323,122 @@ def test_mosaic_result_urls():
     assert _s3_uri("abc123") == "s3://test-bucket/mosaics/abc123.json"
 
 
+# ---------------------------------------------------------------------------
+# In-process cache and single-flight
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_repeat_create_served_from_memory(fake_s3):
+    """Once resolved, a token is served without another S3 GET."""
+    item = FakeItem(date(2025, 6, 1), 3.0, "https://example.com/a.tif")
+    with _patch_geometry(), _patch_search([item]):
+        first = await create_sentinel2_mosaic(RECIPE)
+    gets_after_build = fake_s3.gets
+
+    second = await create_sentinel2_mosaic(RECIPE)
+
+    assert second == first
+    assert fake_s3.gets == gets_after_build
+    stats = mosaic_cache_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["builds"] == 1
+
+
+@pytest.mark.asyncio
+async def test_existing_s3_mosaic_is_cached_after_first_read(fake_s3):
+    item = FakeItem(date(2025, 6, 1), 3.0, "https://example.com/a.tif")
+    with _patch_geometry(), _patch_search([item]):
+        await create_sentinel2_mosaic(RECIPE)
+    # A fresh worker: the object is in S3 but not in memory.
+    clear_mosaic_cache()
+    fake_s3.gets = 0
+
+    for _ in range(3):
+        result = await create_sentinel2_mosaic(RECIPE)
+
+    assert result.item_count == 1
+    assert fake_s3.gets == 1
+    assert mosaic_cache_stats()["builds"] == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_creates_share_one_build(fake_s3):
+    """Concurrent requests for one token run a single search and upload."""
+    item = FakeItem(date(2025, 6, 1), 3.0, "https://example.com/a.tif")
+    with _patch_geometry() as geo, _patch_search([item]) as search:
+        results = await asyncio.gather(
+            *(create_sentinel2_mosaic(RECIPE) for _ in range(8))
+        )
+
+    assert {r.mosaic_id for r in results} == {encode_recipe(RECIPE)}
+    assert all(r.item_count == 1 for r in results)
+    assert geo.await_count == 1
+    assert search.call_count == 1
+    assert fake_s3.gets == 1
+    assert fake_s3.puts == 1
+    stats = mosaic_cache_stats()
+    assert stats["misses"] == 1
+    assert stats["coalesced"] == 7
+    assert stats["inflight"] == 0
+    assert stats["cached"] == 1
+
+
+@pytest.mark.asyncio
+async def test_distinct_tokens_build_independently(fake_s3):
+    other = MosaicRecipe(
+        aois=(("gadm", "CHE.1_1"),), target_date=date(2025, 6, 15)
+    )
+    item = FakeItem(date(2025, 6, 1), 3.0, "https://example.com/a.tif")
+    with _patch_geometry(), _patch_search([item]) as search:
+        a, b = await asyncio.gather(
+            create_sentinel2_mosaic(RECIPE), create_sentinel2_mosaic(other)
+        )
+
+    assert a.mosaic_id != b.mosaic_id
+    assert search.call_count == 2
+    assert fake_s3.puts == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_build_is_shared_but_not_cached(fake_s3):
+    """Waiters on a failing build all see the error; the next call retries."""
+    failing = patch(
+        "src.api.services.mosaic.pystac_client.Client.open",
+        side_effect=RuntimeError("STAC down"),
+    )
+    with _patch_geometry(), failing as search:
+        results = await asyncio.gather(
+            *(create_sentinel2_mosaic(RECIPE) for _ in range(3)),
+            return_exceptions=True,
+        )
+    assert all(isinstance(r, StacSearchError) for r in results)
+    assert search.call_count == 1
+    assert mosaic_cache_stats()["cached"] == 0
+
+    item = FakeItem(date(2025, 6, 1), 3.0, "https://example.com/a.tif")
+    with _patch_geometry(), _patch_search([item]):
+        result = await create_sentinel2_mosaic(RECIPE)
+    assert result.item_count == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_shared_build(fake_s3):
+    item = FakeItem(date(2025, 6, 1), 3.0, "https://example.com/a.tif")
+    with _patch_geometry(), _patch_search([item]):
+        leader = asyncio.create_task(create_sentinel2_mosaic(RECIPE))
+        follower = asyncio.create_task(create_sentinel2_mosaic(RECIPE))
+        await asyncio.sleep(0)
+        leader.cancel()
+        result = await follower
+
+    assert result.item_count == 1
+    assert fake_s3.puts == 1
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
 # ---------------------------------------------------------------------------
 # Endpoints
 # ---------------------------------------------------------------------------
@@ -1,29 +1,26 @@
 """Tests for quota functionality in authenticated-only mode."""
 
+import asyncio
+from datetime import date
 from unittest.mock import patch
 
 import pytest
+from sqlalchemy import select
 
 from src.api.config import APISettings
-from tests.api.mock import mock_rw_api_response
-
-
-@pytest.fixture(autouse=True)
-def clear_cache():
-    from src.api.auth.dependencies import _user_info_cache
-
-    _user_info_cache.clear()
+from src.api.data_models import DailyUsageOrm
+from src.api.services.quota import QuotaCounters
+from tests.api.mock import USERS
+from tests.conftest import async_session_maker
 
 
 @pytest.mark.asyncio
-async def test_auth_me_includes_quota_info_when_enabled(client):
-    with patch("httpx.AsyncClient") as mock_client_class:
-        mock_client = mock_client_class.return_value.__aenter__.return_value
-        mock_client.get.return_value = mock_rw_api_response("Test User")
+async def test_auth_me_includes_quota_info_when_enabled(client, rw_api):
+    rw_api.users["test-token"] = USERS[0]
 
-        response = await client.get(
-            "/api/auth/me", headers={"Authorization": "Bearer test-token"}
-        )
+    response = await client.get(
+        "/api/auth/me", headers={"Authorization": "Bearer test-token"}
+    )
 
     assert response.status_code == 200
     data = response.json()
@@ -32,20 +29,18 @@ async def test_auth_me_includes_quota_info_when_enabled(client):
 
 
 @pytest.mark.asyncio
-async def test_chat_quota_headers_for_authenticated_user(client):
-    with patch("httpx.AsyncClient") as mock_client_class:
-        mock_client = mock_client_class.return_value.__aenter__.return_value
-        mock_client.get.return_value = mock_rw_api_response("Test User")
+async def test_chat_quota_headers_for_authenticated_user(client, rw_api):
+    rw_api.users["test-token"] = USERS[0]
 
-        async def _mock_stream(*args, **kwargs):
-            yield b'{"response": "Hello!"}\n'
+    async def _mock_stream(*args, **kwargs):
+        yield b'{"response": "Hello!"}\n'
 
-        with patch("src.api.routers.chat.stream_chat", _mock_stream):
-            response = await client.post(
-                "/api/chat",
-                json={"query": "Test message", "thread_id": "quota-thread"},
-                headers={"Authorization": "Bearer test-token"},
-            )
+    with patch("src.api.routers.chat.stream_chat", _mock_stream):
+        response = await client.post(
+            "/api/chat",
+            json={"query": "Test message", "thread_id": "quota-thread"},
+            headers={"Authorization": "Bearer test-token"},
+        )
 
     assert response.status_code == 200
     assert response.headers["X-Prompts-Used"] == "1"
@@ -58,3 +53,58 @@ async def test_chat_quota_headers_for_authenticated_user(client):
 async def test_quota_endpoint_requires_auth(client):
     response = await client.get("/api/quota")
     assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_quota_reports_prompts_not_yet_flushed(client, rw_api):
+    rw_api.users["test-token"] = USERS[0]
+
+    async def _mock_stream(*args, **kwargs):
+        yield b'{"response": "Hello!"}\n'
+
+    with patch("src.api.routers.chat.stream_chat", _mock_stream):
+        for expected in ("1", "2"):
+            response = await client.post(
+                "/api/chat",
+                json={"query": "Test message", "thread_id": "quota-thread"},
+                headers={"Authorization": "Bearer test-token"},
+            )
+            assert response.headers["X-Prompts-Used"] == expected
+
+    response = await client.get(
+        "/api/quota", headers={"Authorization": "Bearer test-token"}
+    )
+    assert response.json()["promptsUsed"] == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_workers_admit_within_tolerance():
+    """Several workers' counters racing on one user's row never admit more
+    than quota + tolerance x workers, and every prompt is counted."""
+    quota, tolerance, requests = 25, 2, 150
+    workers = [
+        QuotaCounters(tolerance=tolerance, flush_interval_seconds=60)
+        for _ in range(4)
+    ]
+    connections = asyncio.Semaphore(20)
+
+    async def prompt(i):
+        async with connections, async_session_maker() as session:
+            count = await workers[i % len(workers)].reserve(
+                "user:racer", quota, session
+            )
+        return count <= quota
+
+    admitted = sum(await asyncio.gather(*map(prompt, range(requests))))
+    for worker in workers:
+        async with async_session_maker() as session:
+            await worker.flush(session)
+
+    assert quota <= admitted <= quota + tolerance * len(workers)
+    async with async_session_maker() as session:
+        usage = await session.scalar(
+            select(DailyUsageOrm.usage_count).filter_by(
+                id="user:racer", date=date.today()
+            )
+        )
+    assert usage == requests
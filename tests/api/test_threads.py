@@ -1,6 +1,7 @@
 """Tests for thread-related endpoints and sharing functionality."""
 
 import asyncio
+import json
 import uuid
 from datetime import datetime, timedelta
 from unittest.mock import AsyncMock
@@ -794,3 +795,141 @@ async def test_pagination_no_threads(client, auth_override):
     assert response.status_code == 200
     assert response.json() == []
     assert "x-next-cursor" not in response.headers
+
+
+# --- GET /api/threads/{id}/state ------------------------------------------
+
+
+@pytest_asyncio.fixture
+async def state_checkpointer():
+    """In-memory checkpointer served to the state endpoint, plus a tiny
+    graph over AgentState that writes checkpoints into it."""
+    from langgraph.checkpoint.memory import InMemorySaver
+    from langgraph.graph import START, StateGraph
+
+    from src.agent.graph import fetch_checkpointer
+    from src.agent.state import AgentState
+    from src.api.app import app
+    from src.api.services.thread_state import thread_state_reader
+
+    saver = InMemorySaver()
+    builder = StateGraph(AgentState)
+    builder.add_node("step", lambda state: state["view_context"]["update"])
+    builder.add_edge(START, "step")
+    graph = builder.compile(checkpointer=saver)
+
+    async def _checkpointer():
+        return saver
+
+    app.dependency_overrides[fetch_checkpointer] = _checkpointer
+    thread_state_reader.clear()
+    try:
+        yield graph
+    finally:
+        app.dependency_overrides.pop(fetch_checkpointer, None)
+        thread_state_reader.clear()
+
+
+async def _run_step(graph, thread_id: str, update: dict) -> None:
+    await graph.ainvoke(
+        {"view_context": {"update": update}},
+        {"configurable": {"thread_id": thread_id}},
+    )
+
+
+@pytest.mark.asyncio
+async def test_thread_state_matches_agent_state(
+    client, auth_override, thread_factory, state_checkpointer
+):
+    """The direct checkpoint read returns what aget_state would."""
+    from langchain_core.load import dumps
+
+    auth_override("state-owner")
+    thread = await thread_factory("state-owner")
+    await _run_step(
+        state_checkpointer,
+        thread.id,
+        {"aoi_selection": {"name": "Paraná"}, "dataset": {"dataset_id": 1}},
+    )
+
+    response = await client.get(
+        f"/api/threads/{thread.id}/state",
+        headers={"Authorization": "Bearer test-token"},
+    )
+    assert response.status_code == 200
+    expected = await state_checkpointer.aget_state(
+        {"configurable": {"thread_id": thread.id}}
+    )
+    assert json.loads(response.json()["state"]) == json.loads(
+        dumps(expected.values)
+    )
+
+
+@pytest.mark.asyncio
+async def test_thread_state_field_selection(
+    client, auth_override, thread_factory, state_checkpointer
+):
+    auth_override("state-fields")
+    thread = await thread_factory("state-fields")
+    await _run_step(
+        state_checkpointer,
+        thread.id,
+        {"aoi_selection": {"name": "Paraná"}, "dataset": {"dataset_id": 1}},
+    )
+
+    response = await client.get(
+        f"/api/threads/{thread.id}/state?fields=dataset",
+        headers={"Authorization": "Bearer test-token"},
+    )
+    assert response.status_code == 200
+    assert json.loads(response.json()["state"]) == {
+        "dataset": {"dataset_id": 1}
+    }
+
+    response = await client.get(
+        f"/api/threads/{thread.id}/state?fields=dataset,not_a_field",
+        headers={"Authorization": "Bearer test-token"},
+    )
+    assert response.status_code == 400
+    assert "not_a_field" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_thread_state_cached_until_next_checkpoint(
+    client, auth_override, thread_factory, state_checkpointer
+):
+    from src.api.services.thread_state import thread_state_reader
+
+    auth_override("state-cache")
+    thread = await thread_factory("state-cache")
+    url = f"/api/threads/{thread.id}/state?fields=dataset"
+    headers = {"Authorization": "Bearer test-token"}
+    await _run_step(state_checkpointer, thread.id, {"dataset": {"v": 1}})
+
+    await client.get(url, headers=headers)
+    misses = thread_state_reader.stats.misses
+    hits = thread_state_reader.stats.hits
+    response = await client.get(url, headers=headers)
+    assert json.loads(response.json()["state"]) == {"dataset": {"v": 1}}
+    assert thread_state_reader.stats.hits == hits + 1
+    assert thread_state_reader.stats.misses == misses
+
+    await _run_step(state_checkpointer, thread.id, {"dataset": {"v": 2}})
+    response = await client.get(url, headers=headers)
+    assert json.loads(response.json()["state"]) == {"dataset": {"v": 2}}
+    assert thread_state_reader.stats.misses == misses + 1
+
+
+@pytest.mark.asyncio
+async def test_thread_state_without_checkpoints_is_empty(
+    client, auth_override, thread_factory, state_checkpointer
+):
+    auth_override("state-empty")
+    thread = await thread_factory("state-empty")
+
+    response = await client.get(
+        f"/api/threads/{thread.id}/state",
+        headers={"Authorization": "Bearer test-token"},
+    )
+    assert response.status_code == 200
+    assert response.json()["state"] == "{}"
@@ -1,13 +1,18 @@
 """Unit and integration tests for the AOI thumbnail endpoint."""
 
 import json
+import threading
 import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
+import numpy as np
 import pytest
 import shapely.geometry
 
+import src.api.routers.thumbnails as thumbnails_router
+from src.api.config import APISettings
 from src.api.routers.thumbnails import (
     _FILL_COLOR,
     _FILL_OPACITY,
@@ -19,10 +24,11 @@ from src.api.routers.thumbnails import (
     _fit_overlay,
     _geojson_feature,
     _prepare_shape,
-    _round_coords,
+    _round_shape,
     _simplify_shape,
     _to_feature_collection,
 )
+from src.api.services.thumbnail_cache import ThumbnailCache
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -251,17 +257,12 @@ def test_simplify_shape_reduces_vertex_count():
     assert simplified_verts < original_verts
 
 
-def test_round_coords_compacts_floats():
-    """round_coords must produce short JSON-serialisable floats."""
+def test_round_shape_compacts_floats():
+    """_round_shape must produce short JSON-serialisable floats."""
     import json
 
-    geom = {
-        "type": "Polygon",
-        "coordinates": [[[47.93001174926758, 41.300323486328125]]],
-    }
-    rounded = _round_coords(geom)
-    lon = rounded["coordinates"][0][0][0]
-    lat = rounded["coordinates"][0][0][1]
+    point = shapely.geometry.Point(47.93001174926758, 41.300323486328125)
+    lon, lat = shapely.geometry.mapping(_round_shape(point))["coordinates"]
     # Must be at most 4 decimal places
     assert lon == round(47.93001174926758, 4)
     assert lat == round(41.300323486328125, 4)
@@ -270,11 +271,78 @@ def test_round_coords_compacts_floats():
     assert len(json.dumps(lat)) <= 7
 
 
+def test_round_shape_matches_python_round():
+    rng = np.random.default_rng(0)
+    coords = rng.uniform(-180, 90, size=(500, 2))
+    line = shapely.geometry.LineString(coords)
+    rounded = shapely.get_coordinates(_round_shape(line))
+    expected = [[round(x, 4), round(y, 4)] for x, y in coords.tolist()]
+    assert rounded.tolist() == expected
+
+
+def test_round_shape_rounds_half_way_decimals_like_python():
+    """Stored GeoJSON often has 5-decimal coordinates sitting exactly on a
+    half-way decimal, where scale-then-round (np.round) disagrees with
+    ``round``."""
+    coords = [(5.18325, 1.00005), (12.34565, -7.65435), (0.00015, 89.99995)]
+    line = shapely.geometry.LineString(coords)
+    assert np.round(5.18325, 4) != round(5.18325, 4)
+    rounded = shapely.geometry.mapping(_round_shape(line))["coordinates"]
+    assert [list(c) for c in rounded] == [
+        [round(x, 4), round(y, 4)] for x, y in coords
+    ]
+    assert rounded[0] == (5.1833, 1.0001)
+
+
+def test_simplify_shape_keeps_z_coordinates():
+    ring = [
+        (0.123456, 0.0, 10.123456),
+        (1.0, 0.0, 11.0),
+        (1.0, 1.0, 12.5),
+        (0.0, 1.0, 13.00005),
+        (0.123456, 0.0, 10.123456),
+    ]
+    simplified = _simplify_shape(shapely.geometry.Polygon(ring), 0.0001)
+    assert simplified["coordinates"][0] == tuple(
+        tuple(round(v, 4) for v in c) for c in ring
+    )
+
+
 # ---------------------------------------------------------------------------
 # _fit_overlay
 # ---------------------------------------------------------------------------
 
 
+def test_fit_overlay_picks_finest_fitting_tolerance():
+    """The binary search must land on the same tolerance a linear sweep
+    would: the smallest one whose encoding fits."""
+    import math
+
+    import src.api.routers.thumbnails as thumbnails
+
+    n = 4000
+    coords = [
+        (
+            10 * math.cos(2 * math.pi * i / n) * (1 + 0.05 * math.sin(i)),
+            10 * math.sin(2 * math.pi * i / n) * (1 + 0.05 * math.cos(i)),
+        )
+        for i in range(n)
+    ]
+    coords.append(coords[0])
+    geom = {"type": "Polygon", "coordinates": [coords]}
+    shape = _prepare_shape(geom)
+
+    fitting = [
+        t
+        for t in thumbnails._TOLERANCES
+        if len(_encode_overlay(_simplify_shape(shape, t)))
+        <= _MAX_OVERLAY_CHARS
+    ]
+    assert _fit_overlay(geom) == _encode_overlay(
+        _simplify_shape(shape, fitting[0])
+    )
+
+
 def test_fit_overlay_within_char_budget():
     encoded = _fit_overlay(SIMPLE_POLYGON)
     assert len(encoded) <= _MAX_OVERLAY_CHARS
@@ -317,8 +385,16 @@ _MOCK_GEOMETRY_DATA = {
 }
 
 
+@pytest.fixture(autouse=True)
+def thumbnail_cache(tmp_path, monkeypatch):
+    """Give each test an empty, private thumbnail cache."""
+    cache = ThumbnailCache(tmp_path / "thumbnails", max_bytes=1024 * 1024)
+    monkeypatch.setattr(thumbnails_router, "_thumbnail_cache", cache)
+    return cache
+
+
 def _mapbox_mock(content: bytes = b"\x89PNG\r\n\x1a\n"):
-    """Return a mock async httpx client that returns a fake PNG."""
+    """Return a mock for the shared Mapbox client that returns a fake PNG."""
     mock_response = MagicMock()
     mock_response.content = content
     mock_response.raise_for_status = MagicMock()
@@ -326,9 +402,7 @@ def _mapbox_mock(content: bytes = b"\x89PNG\r\n\x1a\n"):
     mock_client = AsyncMock()
     mock_client.get = AsyncMock(return_value=mock_response)
 
-    mock_cls = MagicMock()
-    mock_cls.return_value.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_cls.return_value.__aexit__ = AsyncMock(return_value=False)
+    mock_cls = MagicMock(return_value=mock_client)
     return mock_cls, mock_client
 
 
@@ -406,7 +480,7 @@ async def test_thumbnail_success_returns_png(client, auth_override):
             "src.api.routers.thumbnails.get_geometry_data",
             new_callable=AsyncMock,
         ) as mock_get,
-        patch("src.api.routers.thumbnails.httpx.AsyncClient", mock_cls),
+        patch("src.api.routers.thumbnails._mapbox_client", mock_cls),
     ):
         mock_settings.mapbox_api_token = "pk.test"
         mock_get.return_value = _MOCK_GEOMETRY_DATA
@@ -435,7 +509,7 @@ async def test_thumbnail_custom_area_lookup_uses_requester(
             "src.api.routers.thumbnails.get_geometry_data",
             new_callable=AsyncMock,
         ) as mock_get,
-        patch("src.api.routers.thumbnails.httpx.AsyncClient", mock_cls),
+        patch("src.api.routers.thumbnails._mapbox_client", mock_cls),
     ):
         mock_settings.mapbox_api_token = "pk.test"
         mock_get.return_value = {
@@ -466,7 +540,7 @@ async def test_thumbnail_cache_control_header(client, auth_override):
             "src.api.routers.thumbnails.get_geometry_data",
             new_callable=AsyncMock,
         ) as mock_get,
-        patch("src.api.routers.thumbnails.httpx.AsyncClient", mock_cls),
+        patch("src.api.routers.thumbnails._mapbox_client", mock_cls),
     ):
         mock_settings.mapbox_api_token = "pk.test"
         mock_get.return_value = _MOCK_GEOMETRY_DATA
@@ -494,7 +568,7 @@ async def test_thumbnail_custom_dimensions_in_mapbox_url(
             "src.api.routers.thumbnails.get_geometry_data",
             new_callable=AsyncMock,
         ) as mock_get,
-        patch("src.api.routers.thumbnails.httpx.AsyncClient", mock_cls),
+        patch("src.api.routers.thumbnails._mapbox_client", mock_cls),
     ):
         mock_settings.mapbox_api_token = "pk.test"
         mock_get.return_value = _MOCK_GEOMETRY_DATA
@@ -521,7 +595,7 @@ async def test_thumbnail_uses_auto_camera_with_padding(client, auth_override):
             "src.api.routers.thumbnails.get_geometry_data",
             new_callable=AsyncMock,
         ) as mock_get,
-        patch("src.api.routers.thumbnails.httpx.AsyncClient", mock_cls),
+        patch("src.api.routers.thumbnails._mapbox_client", mock_cls),
     ):
         mock_settings.mapbox_api_token = "pk.test"
         mock_get.return_value = _MOCK_GEOMETRY_DATA
@@ -551,7 +625,7 @@ async def test_thumbnail_antimeridian_geometry_uses_auto_camera(
             "src.api.routers.thumbnails.get_geometry_data",
             new_callable=AsyncMock,
         ) as mock_get,
-        patch("src.api.routers.thumbnails.httpx.AsyncClient", mock_cls),
+        patch("src.api.routers.thumbnails._mapbox_client", mock_cls),
     ):
         mock_settings.mapbox_api_token = "pk.test"
         mock_get.return_value = {
@@ -584,9 +658,7 @@ async def test_thumbnail_502_on_mapbox_http_error(client, auth_override):
             "error", request=MagicMock(), response=mock_error_response
         )
     )
-    mock_cls = MagicMock()
-    mock_cls.return_value.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_cls.return_value.__aexit__ = AsyncMock(return_value=False)
+    mock_cls = MagicMock(return_value=mock_client)
 
     with (
         patch("src.api.routers.thumbnails.APISettings") as mock_settings,
@@ -594,7 +666,7 @@ async def test_thumbnail_502_on_mapbox_http_error(client, auth_override):
             "src.api.routers.thumbnails.get_geometry_data",
             new_callable=AsyncMock,
         ) as mock_get,
-        patch("src.api.routers.thumbnails.httpx.AsyncClient", mock_cls),
+        patch("src.api.routers.thumbnails._mapbox_client", mock_cls),
     ):
         mock_settings.mapbox_api_token = "pk.test"
         mock_get.return_value = _MOCK_GEOMETRY_DATA
@@ -618,9 +690,7 @@ async def test_thumbnail_502_on_mapbox_request_error(client, auth_override):
             "Connection refused", request=MagicMock()
         )
     )
-    mock_cls = MagicMock()
-    mock_cls.return_value.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_cls.return_value.__aexit__ = AsyncMock(return_value=False)
+    mock_cls = MagicMock(return_value=mock_client)
 
     with (
         patch("src.api.routers.thumbnails.APISettings") as mock_settings,
@@ -628,7 +698,7 @@ async def test_thumbnail_502_on_mapbox_request_error(client, auth_override):
             "src.api.routers.thumbnails.get_geometry_data",
             new_callable=AsyncMock,
         ) as mock_get,
-        patch("src.api.routers.thumbnails.httpx.AsyncClient", mock_cls),
+        patch("src.api.routers.thumbnails._mapbox_client", mock_cls),
     ):
         mock_settings.mapbox_api_token = "pk.test"
         mock_get.return_value = _MOCK_GEOMETRY_DATA
@@ -655,7 +725,7 @@ async def test_thumbnail_mapbox_url_contains_access_token(
             "src.api.routers.thumbnails.get_geometry_data",
             new_callable=AsyncMock,
         ) as mock_get,
-        patch("src.api.routers.thumbnails.httpx.AsyncClient", mock_cls),
+        patch("src.api.routers.thumbnails._mapbox_client", mock_cls),
     ):
         mock_settings.mapbox_api_token = "pk.my-secret-token"
         mock_get.return_value = _MOCK_GEOMETRY_DATA
@@ -669,3 +739,211 @@ async def test_thumbnail_mapbox_url_contains_access_token(
     called_url = mock_client.get.call_args[0][0]
     assert "pk.my-secret-token" in called_url
     assert "access_token=" in called_url
+
+
+@pytest.mark.asyncio
+async def test_thumbnail_repeat_request_served_from_cache(
+    client, auth_override
+):
+    auth_override("test-user-1")
+    mock_cls, mock_client = _mapbox_mock()
+
+    with (
+        patch("src.api.routers.thumbnails.APISettings") as mock_settings,
+        patch(
+            "src.api.routers.thumbnails.get_geometry_data",
+            new_callable=AsyncMock,
+        ) as mock_get,
+        patch("src.api.routers.thumbnails._mapbox_client", mock_cls),
+        patch(
+            "src.api.routers.thumbnails._fit_overlay", wraps=_fit_overlay
+        ) as fit,
+    ):
+        mock_settings.mapbox_api_token = "pk.test"
+        mock_get.return_value = _MOCK_GEOMETRY_DATA
+
+        first = await client.get(
+            "/api/geometry/gadm/IND.2_1/thumbnail",
+            headers={"Authorization": "Bearer test-token"},
+        )
+        second = await client.get(
+            "/api/geometry/gadm/IND.2_1/thumbnail",
+            headers={"Authorization": "Bearer test-token"},
+        )
+
+    assert first.status_code == second.status_code == 200
+    assert second.content == first.content
+    assert second.headers["etag"] == first.headers["etag"]
+    assert mock_client.get.await_count == 1
+    assert fit.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_thumbnail_size_is_part_of_cache_key(client, auth_override):
+    auth_override("test-user-1")
+    mock_cls, mock_client = _mapbox_mock()
+
+    with (
+        patch("src.api.routers.thumbnails.APISettings") as mock_settings,
+        patch(
+            "src.api.routers.thumbnails.get_geometry_data",
+            new_callable=AsyncMock,
+        ) as mock_get,
+        patch("src.api.routers.thumbnails._mapbox_client", mock_cls),
+    ):
+        mock_settings.mapbox_api_token = "pk.test"
+        mock_get.return_value = _MOCK_GEOMETRY_DATA
+
+        small = await client.get(
+            "/api/geometry/gadm/IND.2_1/thumbnail?width=100&height=100",
+            headers={"Authorization": "Bearer test-token"},
+        )
+        large = await client.get(
+            "/api/geometry/gadm/IND.2_1/thumbnail?width=600&height=600",
+            headers={"Authorization": "Bearer test-token"},
+        )
+
+    assert small.headers["etag"] != large.headers["etag"]
+    assert mock_client.get.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_thumbnail_conditional_get_returns_304(client, auth_override):
+    auth_override("test-user-1")
+    mock_cls, mock_client = _mapbox_mock()
+
+    with (
+        patch("src.api.routers.thumbnails.APISettings") as mock_settings,
+        patch(
+            "src.api.routers.thumbnails.get_geometry_data",
+            new_callable=AsyncMock,
+        ) as mock_get,
+        patch("src.api.routers.thumbnails._mapbox_client", mock_cls),
+    ):
+        mock_settings.mapbox_api_token = "pk.test"
+        mock_get.return_value = _MOCK_GEOMETRY_DATA
+
+        first = await client.get(
+            "/api/geometry/gadm/IND.2_1/thumbnail",
+            headers={"Authorization": "Bearer test-token"},
+        )
+        etag = first.headers["etag"]
+        revalidated = await client.get(
+            "/api/geometry/gadm/IND.2_1/thumbnail",
+            headers={
+                "Authorization": "Bearer test-token",
+                "If-None-Match": f'W/"other", {etag}',
+            },
+        )
+        stale = await client.get(
+            "/api/geometry/gadm/IND.2_1/thumbnail",
+            headers={
+                "Authorization": "Bearer test-token",
+                "If-None-Match": '"not-the-etag"',
+            },
+        )
+
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["etag"] == etag
+    assert stale.status_code == 200
+    assert mock_client.get.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_thumbnail_changed_geometry_gets_new_etag(client, auth_override):
+    """Keys are content-addressed: an edited custom area is not served the
+    old image."""
+    auth_override("test-user-1")
+    mock_cls, mock_client = _mapbox_mock()
+    moved = {
+        "type": "Polygon",
+        "coordinates": [[[5, 5], [6, 5], [6, 6], [5, 6], [5, 5]]],
+    }
+
+    with (
+        patch("src.api.routers.thumbnails.APISettings") as mock_settings,
+        patch(
+            "src.api.routers.thumbnails.get_geometry_data",
+            new_callable=AsyncMock,
+        ) as mock_get,
+        patch("src.api.routers.thumbnails._mapbox_client", mock_cls),
+    ):
+        mock_settings.mapbox_api_token = "pk.test"
+        mock_get.return_value = _MOCK_GEOMETRY_DATA
+        before = await client.get(
+            "/api/geometry/gadm/IND.2_1/thumbnail",
+            headers={"Authorization": "Bearer test-token"},
+        )
+        mock_get.return_value = {**_MOCK_GEOMETRY_DATA, "geometry": moved}
+        after = await client.get(
+            "/api/geometry/gadm/IND.2_1/thumbnail",
+            headers={"Authorization": "Bearer test-token"},
+        )
+
+    assert before.headers["etag"] != after.headers["etag"]
+    assert mock_client.get.await_count == 2
+
+
+class _StandInMapbox(BaseHTTPRequestHandler):
+    """Serves a fixed PNG for any static-image path and records requests."""
+
+    png = b"\x89PNG\r\n\x1a\nstand-in"
+    paths: list[str] = []
+
+    def do_GET(self):
+        type(self).paths.append(self.path)
+        self.send_response(200)
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", str(len(self.png)))
+        self.end_headers()
+        self.wfile.write(self.png)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stand_in_mapbox(monkeypatch):
+    _StandInMapbox.paths = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInMapbox)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    monkeypatch.setattr(
+        APISettings, "mapbox_api_base_url", f"http://{host}:{port}"
+    )
+    monkeypatch.setattr(APISettings, "mapbox_api_token", "pk.stand-in")
+    monkeypatch.setattr(thumbnails_router, "_http_client", None)
+    yield _StandInMapbox
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.asyncio
+async def test_thumbnail_against_stand_in_server(
+    client, auth_override, stand_in_mapbox
+):
+    auth_override("test-user-1")
+
+    with patch(
+        "src.api.routers.thumbnails.get_geometry_data",
+        new_callable=AsyncMock,
+        return_value=_MOCK_GEOMETRY_DATA,
+    ):
+        responses = [
+            await client.get(
+                "/api/geometry/gadm/IND.2_1/thumbnail",
+                headers={"Authorization": "Bearer test-token"},
+            )
+            for _ in range(3)
+        ]
+    await thumbnails_router.close_http_client()
+
+    assert all(r.status_code == 200 for r in responses)
+    assert all(r.content == stand_in_mapbox.png for r in responses)
+    assert len(stand_in_mapbox.paths) == 1
+    assert stand_in_mapbox.paths[0].startswith(
+        "/styles/v1/mapbox/outdoors-v12/static/geojson("
+    )
+    assert "access_token=pk.stand-in" in stand_in_mapbox.paths[0]
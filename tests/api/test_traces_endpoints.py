@@ -1,20 +1,40 @@
 """Tests for the superuser-gated Langfuse trace explorer endpoints."""
 
-from datetime import datetime, timedelta, timezone
+import asyncio
+import threading
+from datetime import date, datetime, timedelta, timezone
+from urllib.parse import quote
 
 import pytest
 from fastapi import Request
-from sqlalchemy import select
+from sqlalchemy import func, select
 
 from src.api.app import app
 from src.api.auth.dependencies import fetch_user_from_rw_api
 from src.api.auth.scopes import TRACES_READ
-from src.api.data_models import LangfuseTraceOrm
+from src.api.config import APISettings
+from src.api.data_models import LangfuseTraceOrm, LangfuseTraceRollupOrm
+from src.api.pagination import NEXT_CURSOR_HEADER
 from src.api.schemas import UserModel
+from src.api.services.langfuse import raw_store
+from src.api.services.langfuse.fetch import LangfuseFetchError
 from src.api.services.langfuse.ingest import (
+    _copy_upsert,
+    _upsert,
     backfill_turn_fields,
+    build_row,
     recompute_turn_positions,
 )
+from src.api.services.langfuse.raw_store import (
+    decode_raw,
+    encode_raw,
+    store_raw,
+)
+from src.api.services.langfuse.rollups import (
+    rebuild_rollups,
+    refresh_days,
+    refresh_rollups,
+)
 from tests.conftest import async_session_maker
 
 H = {"Authorization": "Bearer test-token"}
@@ -169,6 +189,101 @@ async def test_list_pagination(client, auth_override, superuser_factory):
     assert body["items"][0]["id"] == "p4"  # newest
 
 
+async def _walk(client, url: str) -> tuple[list[dict], int]:
+    """Follow X-Next-Cursor from ``url`` to the end; (items, pages)."""
+    items, pages, cursor = [], 0, None
+    while True:
+        sep = "&" if "?" in url else "?"
+        resp = await client.get(
+            url + (f"{sep}cursor={quote(cursor)}" if cursor else ""), headers=H
+        )
+        assert resp.status_code == 200
+        items += resp.json()["items"]
+        pages += 1
+        cursor = resp.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return items, pages
+
+
+@pytest.mark.asyncio
+async def test_list_cursor_walk_covers_ties_and_undated_traces(
+    client, auth_override, superuser_factory
+):
+    su = await superuser_factory("su_walk@example.com")
+    auth_override(su.id)
+    tie = datetime(2026, 6, 1, 5, tzinfo=timezone.utc)
+    for i in range(5):
+        await _seed_trace(
+            f"k{i}",
+            trace_timestamp=datetime(2026, 6, 1, i, tzinfo=timezone.utc),
+        )
+    for tid in ("kt1", "kt2", "kt3"):
+        await _seed_trace(tid, trace_timestamp=tie)
+    for tid in ("kn1", "kn2"):
+        await _seed_trace(tid)
+
+    items, pages = await _walk(client, "/api/traces?limit=3")
+
+    assert [t["id"] for t in items] == [
+        "kt3", "kt2", "kt1", "k4", "k3", "k2", "k1", "k0", "kn2", "kn1"
+    ]  # fmt: skip
+    assert pages == 4
+    # The legacy offset path agrees with the keyset order.
+    legacy = (
+        await client.get("/api/traces?limit=3&offset=6", headers=H)
+    ).json()
+    assert [t["id"] for t in legacy["items"]] == ["k1", "k0", "kn2"]
+
+
+@pytest.mark.asyncio
+async def test_list_cursor_respects_filters_and_rejects_garbage(
+    client, auth_override, superuser_factory
+):
+    su = await superuser_factory("su_walkf@example.com")
+    auth_override(su.id)
+    for i in range(6):
+        await _seed_trace(
+            f"f{i}",
+            environment="production" if i % 2 else "staging",
+            trace_timestamp=datetime(2026, 6, 1, i, tzinfo=timezone.utc),
+        )
+
+    items, _ = await _walk(
+        client, "/api/traces?environment=production&limit=1"
+    )
+    assert [t["id"] for t in items] == ["f5", "f3", "f1"]
+
+    bad = await client.get("/api/traces?cursor=not-a-cursor", headers=H)
+    assert bad.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_total_estimate_and_exact_total(
+    client, auth_override, superuser_factory, monkeypatch
+):
+    su = await superuser_factory("su_est@example.com")
+    auth_override(su.id)
+    for i in range(3):
+        await _seed_trace(
+            f"e{i}",
+            trace_timestamp=datetime(2026, 6, 1, i, tzinfo=timezone.utc),
+        )
+
+    small = (await client.get("/api/traces", headers=H)).json()
+    assert (small["total"], small["total_is_estimate"]) == (3, False)
+
+    # With the threshold at 0 every default count is the planner's estimate.
+    monkeypatch.setattr(APISettings, "traces_exact_count_below", 0)
+    estimated = (await client.get("/api/traces", headers=H)).json()
+    assert estimated["total_is_estimate"] is True
+    sessions = (await client.get("/api/traces/sessions", headers=H)).json()
+    assert sessions["total_is_estimate"] is True
+    exact = (
+        await client.get("/api/traces?exact_total=true", headers=H)
+    ).json()
+    assert (exact["total"], exact["total_is_estimate"]) == (3, False)
+
+
 @pytest.mark.asyncio
 async def test_list_surfaces_derived_fields(
     client, auth_override, superuser_factory
@@ -230,6 +345,7 @@ async def test_detail_returns_derived_from_db_and_io_from_langfuse(
     assert b["answer"] == "the answer"  # from our DB
     assert b["derived"]["aoi_count"] == 1  # from our DB
     assert b["raw_available"] is True
+    assert b["raw_source"] == "langfuse"
     assert b["output"]["aoi_selection"]["name"] == "Brazil"  # from Langfuse
     assert b["input"]["messages"][0]["content"] == "hi"  # from Langfuse
 
@@ -248,6 +364,67 @@ async def test_detail_raw_unavailable(
     assert b["answer"] == "kept"  # derived columns still served
 
 
+@pytest.mark.asyncio
+async def test_detail_serves_stored_raw_copy_without_langfuse(
+    client, auth_override, superuser_factory, monkeypatch
+):
+    su = await superuser_factory("su_stored@example.com")
+    auth_override(su.id)
+    await _seed_trace("d3", outcome="ANSWER")
+    raw = {
+        "id": "d3",
+        "input": {"messages": [{"type": "human", "content": "hola\u0000"}]},
+        "output": {"messages": [], "aoi_selection": {"name": "Peru"}},
+    }
+    async with async_session_maker() as session:
+        await store_raw(session, [encode_raw(raw)])
+        await session.commit()
+
+    class _Unreachable:
+        @classmethod
+        def from_env(cls):
+            raise AssertionError("stored traces must not hit Langfuse")
+
+    decoded_on = []
+
+    def _decode(encoding, payload):
+        decoded_on.append(threading.get_ident())
+        return decode_raw(encoding, payload)
+
+    monkeypatch.setattr("src.api.routers.traces.LangfuseClient", _Unreachable)
+    monkeypatch.setattr(raw_store, "decode_raw", _decode)
+    b = (await client.get("/api/traces/d3", headers=H)).json()
+    assert (b["raw_available"], b["raw_source"]) == (True, "stored")
+    # the payload is inflated and parsed off the event loop
+    assert decoded_on and threading.get_ident() not in decoded_on
+    assert b["output"]["aoi_selection"]["name"] == "Peru"
+    assert b["input"] == raw["input"]
+
+
+@pytest.mark.asyncio
+async def test_detail_survives_langfuse_failure(
+    client, auth_override, superuser_factory, monkeypatch
+):
+    su = await superuser_factory("su_lfdown@example.com")
+    auth_override(su.id)
+    await _seed_trace("d4", outcome="ANSWER", answer="kept")
+
+    class _Down:
+        @classmethod
+        def from_env(cls):
+            return cls()
+
+        def fetch_trace(self, trace_id):
+            raise LangfuseFetchError("503 past max_retries")
+
+    monkeypatch.setattr("src.api.routers.traces.LangfuseClient", _Down)
+    resp = await client.get("/api/traces/d4", headers=H)
+    assert resp.status_code == 200
+    b = resp.json()
+    assert (b["raw_available"], b["raw_source"]) == (False, None)
+    assert b["answer"] == "kept"
+
+
 @pytest.mark.asyncio
 async def test_detail_404(client, auth_override, superuser_factory):
     su = await superuser_factory("su_404@example.com")
@@ -655,6 +832,56 @@ async def test_sessions(client, auth_override, superuser_factory):
     assert sx["first_prompt"] == "first question"  # earliest turn's prompt
 
 
+@pytest.mark.asyncio
+async def test_sessions_cursor_walk_orders_by_last_activity(
+    client, auth_override, superuser_factory
+):
+    su = await superuser_factory("su_sesswalk@example.com")
+    auth_override(su.id)
+    day = datetime(2026, 6, 1, tzinfo=timezone.utc)
+    # sa's latest turn is newest overall even though its first is oldest.
+    await _seed_trace("sa1", session_id="sa", trace_timestamp=day)
+    await _seed_trace(
+        "sa2", session_id="sa", trace_timestamp=day + timedelta(hours=9)
+    )
+    for n, sid in enumerate(("sb", "sc", "sd")):
+        await _seed_trace(
+            f"{sid}1",
+            session_id=sid,
+            trace_timestamp=day + timedelta(hours=n + 1),
+        )
+    # Same last activity as sd: the tie breaks on session_id.
+    await _seed_trace(
+        "se1", session_id="se", trace_timestamp=day + timedelta(hours=3)
+    )
+    await _seed_trace("sf1", session_id="sf")  # only undated turns
+    await _seed_trace("nosession", trace_timestamp=day + timedelta(hours=20))
+
+    items, pages = await _walk(client, "/api/traces/sessions?limit=2")
+
+    assert [s["session_id"] for s in items] == [
+        "sa", "se", "sd", "sc", "sb", "sf"
+    ]  # fmt: skip
+    assert pages == 3
+    sa = items[0]
+    assert sa["turn_count"] == 2 and sa["first_timestamp"].startswith(
+        "2026-06-01T00:00"
+    )
+    assert items[-1]["last_timestamp"] is None
+
+    # A date filter bounds both the walk and the aggregates.
+    items, _ = await _walk(
+        client,
+        "/api/traces/sessions?limit=1&end="
+        + quote((day + timedelta(hours=2, minutes=30)).isoformat()),
+    )
+    assert [(s["session_id"], s["turn_count"]) for s in items] == [
+        ("sc", 1),
+        ("sb", 1),
+        ("sa", 1),
+    ]
+
+
 # --- turn position (Phase 0) -----------------------------------------------
 @pytest.mark.asyncio
 async def test_turn_index_surfaced_and_filtered(
@@ -937,3 +1164,256 @@ async def test_per_turn_diffs_surfaced_on_list_item(
     assert item["datasets_analysed_this_turn"] == ["b"]
     # the cumulative field still reflects the whole thread as of this turn
     assert item["datasets_analysed"] == ["a", "b"]
+
+
+# --- COPY upsert -----------------------------------------------------------
+def _raw_trace(trace_id: str, **kw) -> dict:
+    return {
+        "id": trace_id,
+        "sessionId": "cs",
+        "timestamp": "2026-06-01T00:00:00Z",
+        "latency": 1.5,
+        "output": {"messages": [], "aoi_selection": {"name": "Gabon"}},
+        **kw,
+    }
+
+
+async def _stored(trace_id: str) -> LangfuseTraceOrm:
+    async with async_session_maker() as session:
+        return (
+            await session.execute(
+                select(LangfuseTraceOrm).where(LangfuseTraceOrm.id == trace_id)
+            )
+        ).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_copy_upsert_inserts_then_updates_keeping_ingested_at():
+    async with async_session_maker() as session:
+        assert await _copy_upsert(session, [build_row(_raw_trace("cp1"))]) == 1
+        await session.commit()
+    first = await _stored("cp1")
+    assert first.session_id == "cs" and first.latency_seconds == 1.5
+    assert first.aoi_name == "Gabon"
+
+    async with async_session_maker() as session:
+        await _copy_upsert(
+            session, [build_row(_raw_trace("cp1", latency=9.0))]
+        )
+        # the staging table is emptied per batch, so a second COPY in the
+        # same transaction doesn't re-merge the first
+        await _copy_upsert(session, [build_row(_raw_trace("cp2"))])
+        await session.commit()
+    again = await _stored("cp1")
+    assert again.latency_seconds == 9.0
+    assert again.ingested_at == first.ingested_at
+    assert (await _stored("cp2")).session_id == "cs"
+
+
+@pytest.mark.asyncio
+async def test_copy_upsert_strips_nul_and_matches_insert_path():
+    raw = _raw_trace(
+        "cp3",
+        userId="u\x001",
+        output={"messages": [], "aoi_selection": {"name": "Ga\x00bon"}},
+    )
+    async with async_session_maker() as session:
+        await _copy_upsert(session, [build_row(raw)])
+        await _upsert(session, [build_row({**raw, "id": "cp4"})])
+        await session.commit()
+
+    copied, inserted = await _stored("cp3"), await _stored("cp4")
+    assert copied.user_id == "u1" and copied.aoi_name == "Gabon"
+    skip = {"id", "ingested_at", "parsed_at"}
+    for col in LangfuseTraceOrm.__table__.columns.keys():
+        if col not in skip:
+            assert getattr(copied, col) == getattr(inserted, col), col
+
+
+# --- rollups ---------------------------------------------------------------
+async def _seed_rollup_fixture() -> None:
+    """40 traces over three days, four sessions and two environments, with
+    turn positions past the by-turn cap and a few NULL ones."""
+    for i in range(40):
+        await _seed_trace(
+            f"ru{i}",
+            session_id=f"rs{i % 4}",
+            user_id=f"ru{i % 3}",
+            environment="production" if i % 5 else "staging",
+            outcome=("ANSWER", "ERROR", None)[i % 3],
+            aoi_type=("country", "state-province", None)[i % 3],
+            turn_index=None if i % 11 == 0 else i // 4 + 1,
+            latency_seconds=None if i % 7 == 0 else 0.5 + i * 0.37,
+            total_cost=0.001 * (i + 1),
+            turn_tokens=100 + i,
+            turn_tool_calls=i % 4,
+            tool_error_count=int(i % 6 == 0),
+            trace_timestamp=datetime(2026, 6, 1, tzinfo=timezone.utc)
+            + timedelta(hours=i * 1.7),
+        )
+
+
+def _close(rollup: dict, raw: dict) -> None:
+    """Counts, sums and averages match exactly; percentiles approximately."""
+    for block in ("latency", "cost", "tokens", "tool_usage"):
+        for key, value in raw[block].items():
+            got = rollup[block][key]
+            if key.startswith("p"):
+                assert got == pytest.approx(value, rel=0.05), (block, key)
+            else:
+                assert got == pytest.approx(value, abs=1e-3), (block, key)
+    assert rollup["total_traces"] == raw["total_traces"]
+
+
+@pytest.mark.asyncio
+async def test_analytics_from_rollups_matches_raw_scan(
+    client, auth_override, superuser_factory
+):
+    su = await superuser_factory("su_ru1@example.com")
+    auth_override(su.id)
+    await _seed_rollup_fixture()
+
+    # not built yet: raw scan
+    before = (await client.get("/api/traces/analytics", headers=H)).json()
+    assert before["source"] == "raw"
+
+    async with async_session_maker() as session:
+        assert await rebuild_rollups(session) > 0
+
+    for query in (
+        "",
+        "?environment=production",
+        "?outcome=ANSWER&min_turn_index=2",
+        "?start=2026-06-01T05:00:00Z&end=2026-06-03T07:00:00Z",
+        "?start=2026-06-02T00:00:00Z&end=2026-06-02T09:00:00Z",
+    ):
+        sep = "&" if query else "?"
+        rollup = (
+            await client.get(f"/api/traces/analytics{query}", headers=H)
+        ).json()
+        raw = (
+            await client.get(
+                f"/api/traces/analytics{query}{sep}exact=true", headers=H
+            )
+        ).json()
+        assert rollup["source"] == "rollup" and raw["source"] == "raw", query
+        _close(rollup, raw)
+        for key in ("outcome_breakdown", "aoi_type_breakdown"):
+            assert sorted(map(str, rollup[key])) == sorted(map(str, raw[key]))
+        assert rollup["daily_volume"] == raw["daily_volume"]
+        assert rollup["unique_sessions"] == raw["unique_sessions"]
+        assert rollup["unique_users"] == raw["unique_users"]
+
+
+@pytest.mark.asyncio
+async def test_analytics_falls_back_for_filters_rollups_cannot_answer(
+    client, auth_override, superuser_factory
+):
+    su = await superuser_factory("su_ru2@example.com")
+    auth_override(su.id)
+    await _seed_rollup_fixture()
+    async with async_session_maker() as session:
+        await rebuild_rollups(session)
+
+    for query in ("?user_id=ru1", "?start=2026-06-01T05:30:00Z"):
+        body = (
+            await client.get(f"/api/traces/analytics{query}", headers=H)
+        ).json()
+        assert body["source"] == "raw", query
+
+
+@pytest.mark.asyncio
+async def test_by_turn_from_rollups_matches_raw_scan(
+    client, auth_override, superuser_factory
+):
+    su = await superuser_factory("su_ru3@example.com")
+    auth_override(su.id)
+    await _seed_rollup_fixture()
+    async with async_session_maker() as session:
+        await rebuild_rollups(session)
+
+    url = "/api/traces/analytics/by-turn?turn_bucket_cap=4"
+    rollup = (await client.get(url, headers=H)).json()
+    raw = (await client.get(f"{url}&exact=true", headers=H)).json()
+
+    assert rollup["source"] == "rollup"
+    assert rollup["ungrouped_traces"] == raw["ungrouped_traces"]
+    _close(rollup["grand_total"], raw["grand_total"])
+    assert len(rollup["groups"]) == len(raw["groups"])
+    for got, want in zip(rollup["groups"], raw["groups"]):
+        for key in (
+            "turn_index",
+            "is_terminal",
+            "turn_index_min",
+            "turn_index_max",
+            "sessions_reaching",
+        ):
+            assert got[key] == want[key], key
+        _close(got, want)
+
+
+@pytest.mark.asyncio
+async def test_refresh_rollups_picks_up_new_and_renumbered_turns(
+    client, auth_override, superuser_factory
+):
+    su = await superuser_factory("su_ru4@example.com")
+    auth_override(su.id)
+    await _seed_rollup_fixture()
+    async with async_session_maker() as session:
+        await rebuild_rollups(session)
+
+    # a late trace lands before every turn of rs0, shifting its positions
+    late = datetime(2026, 5, 31, 23, tzinfo=timezone.utc)
+    await _seed_trace("ru-late", session_id="rs0", trace_timestamp=late)
+    async with async_session_maker() as session:
+        await recompute_turn_positions(session, {"rs0"})
+        await refresh_rollups(
+            session, late, late + timedelta(hours=1), {"rs0"}
+        )
+        await session.commit()
+
+    url = "/api/traces/analytics/by-turn?turn_bucket_cap=50"
+    rollup = (await client.get(url, headers=H)).json()
+    raw = (await client.get(f"{url}&exact=true", headers=H)).json()
+    assert rollup["source"] == "rollup"
+    assert rollup["grand_total"]["total_traces"] == 41
+    assert [
+        (g["turn_index"], g["total_traces"]) for g in rollup["groups"]
+    ] == [(g["turn_index"], g["total_traces"]) for g in raw["groups"]]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_refreshes_of_a_day_do_not_double_count():
+    await _seed_rollup_fixture()
+    async with async_session_maker() as session:
+        await rebuild_rollups(session)
+    day = date(2026, 6, 2)
+    lo = datetime(2026, 6, 2, tzinfo=timezone.utc)
+    hi = lo + timedelta(days=1)
+
+    async with async_session_maker() as first, async_session_maker() as second:
+        await refresh_days(first, [day])
+        # the second writer of the day waits for the first to commit
+        blocked = asyncio.create_task(refresh_days(second, [day]))
+        await asyncio.sleep(0.3)
+        assert not blocked.done()
+        await first.commit()
+        await blocked
+        await second.commit()
+
+    async with async_session_maker() as session:
+        raw = await session.scalar(
+            select(func.count()).where(
+                LangfuseTraceOrm.trace_timestamp >= lo,
+                LangfuseTraceOrm.trace_timestamp < hi,
+            )
+        )
+        for grain in ("hour", "day"):
+            rolled = await session.scalar(
+                select(func.sum(LangfuseTraceRollupOrm.traces)).where(
+                    LangfuseTraceRollupOrm.grain == grain,
+                    LangfuseTraceRollupOrm.bucket_start >= lo,
+                    LangfuseTraceRollupOrm.bucket_start < hi,
+                )
+            )
+            assert raw > 0 and rolled == raw, grain
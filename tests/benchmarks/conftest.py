@@ -0,0 +1,23 @@
+"""Micro-benchmarks (pytest-benchmark). Not part of the CI test run.
+
+uv run pytest tests/benchmarks --benchmark-only
+"""
+
+import pytest
+
+
+# Override the root autouse DB fixtures so benchmarks don't require a live
+# database.
+@pytest.fixture(scope="session", autouse=True)
+def test_db():
+    yield
+
+
+@pytest.fixture(scope="function", autouse=True)
+def test_db_session():
+    yield
+
+
+@pytest.fixture(scope="function", autouse=True)
+def test_db_pool():
+    yield
@@ -0,0 +1,256 @@
+"""Local stand-in for the Langfuse public traces API.
+
+Serves ``GET /api/public/traces`` (page/limit over a closed, ascending
+timestamp window, with the same ``meta`` block Langfuse returns) and
+``GET /api/public/traces/{id}`` from an in-memory set of synthetic traces
+whose ``output`` mirrors the AgentState snapshot, so ``parse_trace`` does
+real work. Per-request latency and a page-size ceiling above which every
+request 500s (the staging ClickHouse memory limit) can be dialled in.
+
+Used by the fetch unit tests and the ingestion throughput benchmark; can
+also be run on its own and pointed at by the real CLI:
+
+    python -m tests.benchmarks.langfuse_standin --traces 50000 --port 3001
+    LANGFUSE_HOST=http://127.0.0.1:3001 LANGFUSE_PUBLIC_KEY=pk \\
+        LANGFUSE_SECRET_KEY=sk uv run python src/api/cli.py \\
+        ingest-langfuse-traces --backfill --since 2025-01-01T00:00:00Z \\
+        --until 2025-01-08T00:00:00Z --concurrency 8 --parse-workers 4
+"""
+
+import argparse
+import bisect
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlparse
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+# Langfuse rejects larger list pages with a 400.
+MAX_LIMIT = 100
+
+_PLACES = ["Brazil", "Indonesia", "Gabon", "Peru", "Congo", "Bolivia"]
+_DATASETS = ["Tree cover loss", "Fire alerts", "Grassland extent"]
+
+
+def _iso(dt: datetime) -> str:
+    return dt.isoformat().replace("+00:00", "Z")
+
+
+def _parse_ts(raw: str) -> datetime:
+    return datetime.fromisoformat(raw.replace("Z", "+00:00"))
+
+
+def synthetic_trace(i: int, start: datetime = START) -> dict[str, Any]:
+    """One agent turn: a few turns per session, a tool call, an insight on
+    every third turn. Deterministic in ``i``."""
+    place = _PLACES[i % len(_PLACES)]
+    dataset = _DATASETS[i % len(_DATASETS)]
+    ts = start + timedelta(seconds=30 * i)
+    messages = [
+        {"type": "human", "content": f"Analyse {dataset} in {place}"},
+        {
+            "type": "ai",
+            "content": "",
+            "tool_calls": [
+                {"name": "pick_aoi", "id": f"a{i}", "args": {"q": place}},
+                {
+                    "name": "pull_data",
+                    "id": f"p{i}",
+                    "args": {"dataset_name": dataset},
+                },
+            ],
+            "usage_metadata": {
+                "input_tokens": 900 + i % 100,
+                "output_tokens": 40,
+                "total_tokens": 940 + i % 100,
+            },
+        },
+        {
+            "type": "tool",
+            "name": "pick_aoi",
+            "content": f"Selected {place}",
+            "status": "success",
+            "tool_call_id": f"a{i}",
+        },
+        {
+            "type": "tool",
+            "name": "pull_data",
+            "content": "ok " * 50,
+            "status": "success",
+            "tool_call_id": f"p{i}",
+        },
+        {
+            "type": "ai",
+            "content": f"{dataset} in {place} changed by {i % 97}%. " * 5,
+            "response_metadata": {"finish_reason": "end_turn"},
+            "usage_metadata": {
+                "input_tokens": 1500,
+                "output_tokens": 200,
+                "total_tokens": 1700,
+            },
+        },
+    ]
+    return {
+        "id": f"trace-{i:08d}",
+        "sessionId": f"session-{i // 4}",
+        "userId": f"user-{i % 500}",
+        "environment": "production",
+        "timestamp": _iso(ts),
+        "updatedAt": _iso(ts + timedelta(seconds=5)),
+        "latency": 12.5,
+        "totalCost": 0.01,
+        "input": {"messages": messages[:1]},
+        "output": {
+            "messages": messages,
+            "aoi_selection": {
+                "name": place,
+                "aois": [
+                    {"name": place, "subtype": "country", "source": "gadm"}
+                ],
+            },
+            "statistics": [{"id": f"s{i}", "dataset_name": dataset}],
+            "insight_id": f"ins-{i}" if i % 3 == 0 else None,
+        },
+    }
+
+
+class LangfuseStandIn:
+    def __init__(
+        self,
+        traces: Optional[list[dict[str, Any]]] = None,
+        n_traces: int = 1000,
+        latency: float = 0.0,
+        fail_above_limit: Optional[int] = None,
+        port: int = 0,
+    ):
+        if traces is None:
+            traces = [synthetic_trace(i) for i in range(n_traces)]
+        self.traces = sorted(traces, key=lambda t: (t["timestamp"], t["id"]))
+        self._keys = [_parse_ts(t["timestamp"]) for t in self.traces]
+        self._by_id = {t["id"]: t for t in self.traces}
+        self.latency = latency
+        # Every list request with limit above this 500s.
+        self.fail_above_limit = fail_above_limit
+        self.requests = 0
+        # Trace rows returned by successful list requests, over all pages.
+        self.rows_served = 0
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(
+            ("127.0.0.1", port), self._handler()
+        )
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def span(self) -> tuple[datetime, datetime]:
+        """A closed window covering every trace."""
+        return self._keys[0], self._keys[-1] + timedelta(seconds=1)
+
+    def list_traces(self, params: dict[str, str]) -> tuple[int, dict]:
+        limit = int(params.get("limit", 50))
+        page = int(params.get("page", 1))
+        if limit > MAX_LIMIT:
+            return 400, {"message": "limit too large"}
+        if self.fail_above_limit is not None and limit > self.fail_above_limit:
+            return 500, {"message": "Memory limit exceeded"}
+        lo = bisect.bisect_left(self._keys, _parse_ts(params["fromTimestamp"]))
+        hi = bisect.bisect_left(self._keys, _parse_ts(params["toTimestamp"]))
+        total = hi - lo
+        start = lo + (page - 1) * limit
+        rows = self.traces[start : min(start + limit, hi)]
+        with self._lock:
+            self.rows_served += len(rows)
+        return 200, {
+            "data": rows,
+            "meta": {
+                "page": page,
+                "limit": limit,
+                "totalItems": total,
+                "totalPages": -(-total // limit),
+            },
+        }
+
+    def _handler(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with standin._lock:
+                    standin.requests += 1
+                    standin._in_flight += 1
+                    standin.max_in_flight = max(
+                        standin.max_in_flight, standin._in_flight
+                    )
+                try:
+                    if standin.latency:
+                        time.sleep(standin.latency)
+                    url = urlparse(self.path)
+                    if url.path == "/api/public/traces":
+                        params = {
+                            k: v[0] for k, v in parse_qs(url.query).items()
+                        }
+                        status, body = standin.list_traces(params)
+                    else:
+                        trace_id = url.path.rsplit("/", 1)[-1]
+                        trace = standin._by_id.get(trace_id)
+                        status, body = (
+                            (200, trace)
+                            if trace
+                            else (404, {"message": "not found"})
+                        )
+                    payload = json.dumps(body).encode()
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                finally:
+                    with standin._lock:
+                        standin._in_flight -= 1
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "LangfuseStandIn":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=3001)
+    parser.add_argument("--traces", type=int, default=10_000)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--fail-above-limit", type=int, default=None)
+    args = parser.parse_args()
+    standin = LangfuseStandIn(
+        n_traces=args.traces,
+        latency=args.latency,
+        fail_above_limit=args.fail_above_limit,
+        port=args.port,
+    )
+    first, last = standin.span
+    print(
+        f"Langfuse stand-in on {standin.base_url}: {len(standin.traces)} "
+        f"traces, {_iso(first)} .. {_iso(last)}"
+    )
+    standin._thread.run()
@@ -0,0 +1,91 @@
+"""Exact-term lookups: grep_articles' full-corpus regex against BM25 postings.
+
+A synthetic corpus of ARTICLES markdown files, PARAGRAPHS tagged paragraphs
+each, drawn from a Zipf-like vocabulary with a few rare place names mixed
+in (the kind of keyword query that used to force a full scan).
+``test_grep_full_scan`` runs ``grep_articles`` over every file, as the
+search agent did without slugs; ``test_bm25_lookup`` scores the same terms
+against the segment postings that ``build_index`` writes, memory-mapped
+from disk as ``hybrid_query`` reads them.
+
+    uv run pytest tests/benchmarks/test_blog_keyword_search.py \\
+        --benchmark-only --benchmark-columns=mean,median
+
+SGREP_BENCH_ARTICLES overrides the corpus size.
+"""
+
+import os
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from src.agent.subagents.search.blog import grep_articles
+from src.agent.utils import sgrep_bm25
+
+ARTICLES = int(os.getenv("SGREP_BENCH_ARTICLES", 5000))
+PARAGRAPHS = 20
+WORDS = 60
+VOCAB = 20_000
+PLACES = ["Sahel", "Yuba", "Kalimantan", "Cerrado", "Okavango"]
+QUERIES = ["Yuba watershed", "Kalimantan peat", "Okavango"]
+
+
+@pytest.fixture(scope="module")
+def corpus(tmp_path_factory):
+    """(data dir, [(postings, no tombstones)]) over the same paragraphs."""
+    rng = np.random.default_rng(0)
+    data_dir = tmp_path_factory.mktemp("articles")
+    words = np.array([f"w{i}" for i in range(VOCAB)] + ["watershed", "peat"])
+    weights = 1 / np.arange(1, len(words) + 1)
+    weights /= weights.sum()
+    texts = []
+    for a in range(ARTICLES):
+        paras = []
+        for p in range(1, PARAGRAPHS + 1):
+            tokens = list(rng.choice(words, WORDS, p=weights))
+            if rng.random() < 0.002:
+                tokens[rng.integers(WORDS)] = str(rng.choice(PLACES))
+            text = " ".join(tokens)
+            texts.append(text)
+            paras.append(f"§{p} {text}")
+        (data_dir / f"article-{a}.md").write_text("\n\n".join(paras))
+
+    prefix = data_dir.parent / "seg-1"
+    segment = sgrep_bm25.save(prefix, sgrep_bm25.build(texts))
+    index = sgrep_bm25.load(prefix.parent, segment)
+    return data_dir, [(index, np.empty(0, dtype=np.intp))]
+
+
+def test_grep_full_scan(benchmark, corpus):
+    data_dir, _ = corpus
+    with (
+        patch("src.agent.subagents.search.blog.DATA_DIR", data_dir),
+        patch(
+            "src.agent.subagents.search.blog._article_index", return_value={}
+        ),
+    ):
+        benchmark.pedantic(
+            lambda: [
+                grep_articles.invoke({"pattern": q.replace(" ", "|")})
+                for q in QUERIES
+            ],
+            rounds=3,
+            warmup_rounds=1,
+        )
+    benchmark.extra_info["ms_per_query"] = round(
+        benchmark.stats.stats.mean / len(QUERIES) * 1000, 2
+    )
+
+
+def test_bm25_lookup(benchmark, corpus):
+    _, segments = corpus
+    hits = benchmark.pedantic(
+        lambda: [sgrep_bm25.score(segments, q, 50) for q in QUERIES],
+        rounds=10,
+        warmup_rounds=1,
+    )
+    assert all(hits)
+    benchmark.extra_info["ms_per_query"] = round(
+        benchmark.stats.stats.mean / len(QUERIES) * 1000, 3
+    )
@@ -0,0 +1,144 @@
+"""Langfuse ingestion throughput against the local stand-in.
+
+The stand-in (tests/benchmarks/langfuse_standin.py) adds a fixed latency to
+every list request, like the real API under load, so page concurrency shows
+up directly: at concurrency 1 a window costs pages x latency; at N it
+approaches pages x latency / N until parsing becomes the bottleneck, which
+is where ``parse_workers`` comes in (on a multi-core host).
+
+    uv run pytest tests/benchmarks/test_langfuse_ingest_throughput.py \\
+        --benchmark-only --benchmark-group-by=func
+
+``test_fetch_parse_throughput`` needs no database (upserts are skipped).
+``test_end_to_end_run`` writes to a scratch schema in the database named by
+BENCHMARK_DATABASE_URL and is skipped when unset.
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.api.data_models import (
+    LangfuseIngestionRunOrm,
+    LangfuseTraceOrm,
+    LangfuseTraceRollupOrm,
+)
+from src.api.services.langfuse import ingest as I
+from src.api.services.langfuse.fetch import LangfuseClient
+from tests.benchmarks.langfuse_standin import LangfuseStandIn
+
+TRACES = 3_000
+LATENCY = 0.05
+SCHEMA = "bench_langfuse_ingest"
+
+
+@pytest.fixture(scope="module")
+def standin():
+    server = LangfuseStandIn(n_traces=TRACES, latency=LATENCY).start()
+    yield server
+    server.stop()
+
+
+@pytest.mark.parametrize("parse_workers", [0, 4])
+@pytest.mark.parametrize("concurrency", [1, 4, 8])
+def test_fetch_parse_throughput(
+    benchmark, standin, monkeypatch, concurrency, parse_workers
+):
+    async def skip_upsert(session, batch, metrics, stats, dry_run):
+        stats.upserted += len(batch)
+
+    monkeypatch.setattr(I, "_flush", skip_upsert)
+    client = LangfuseClient(
+        host=standin.base_url,
+        public_key="pk",
+        secret_key="sk",
+        concurrency=concurrency,
+    )
+    pool = (
+        ProcessPoolExecutor(
+            parse_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        if parse_workers
+        else None
+    )
+
+    def run():
+        return asyncio.run(
+            I.ingest_window(
+                None,
+                client,
+                *standin.span,
+                None,
+                I._Metrics(),
+                parse_pool=pool,
+            )
+        )
+
+    try:
+        run()  # warm the parse workers
+        stats = benchmark.pedantic(run, rounds=3)
+    finally:
+        if pool:
+            pool.shutdown()
+    benchmark.extra_info["traces"] = TRACES
+    benchmark.extra_info["traces_per_second"] = round(
+        TRACES / benchmark.stats.stats.mean
+    )
+    assert stats.upserted == TRACES
+
+
+@pytest.mark.skipif(
+    not os.getenv("BENCHMARK_DATABASE_URL"),
+    reason="BENCHMARK_DATABASE_URL not set",
+)
+def test_end_to_end_run(benchmark, standin, monkeypatch):
+    monkeypatch.setenv("LANGFUSE_HOST", standin.base_url)
+    monkeypatch.setenv("LANGFUSE_PUBLIC_KEY", "pk")
+    monkeypatch.setenv("LANGFUSE_SECRET_KEY", "sk")
+    first, last = standin.span
+
+    async def run():
+        engine = create_async_engine(
+            os.environ["BENCHMARK_DATABASE_URL"],
+            connect_args={"options": f"-csearch_path={SCHEMA},public"},
+        )
+        async with engine.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+            await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+            await conn.run_sync(
+                lambda sync_conn: LangfuseTraceOrm.metadata.create_all(
+                    sync_conn,
+                    tables=[
+                        LangfuseTraceOrm.__table__,
+                        LangfuseIngestionRunOrm.__table__,
+                        LangfuseTraceRollupOrm.__table__,
+                    ],
+                )
+            )
+        try:
+            async with AsyncSession(engine) as session:
+                return await I.run_ingestion(
+                    session,
+                    since=first,
+                    until=last,
+                    chunk_hours=int(
+                        (last - first) / timedelta(hours=1) / 4 + 1
+                    ),
+                    concurrency=8,
+                )
+        finally:
+            async with engine.begin() as conn:
+                await conn.execute(
+                    text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+                )
+            await engine.dispose()
+
+    result = benchmark.pedantic(lambda: asyncio.run(run()), rounds=1)
+    assert result.status == "success"
+    assert result.upserted == TRACES
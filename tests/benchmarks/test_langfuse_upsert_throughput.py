@@ -0,0 +1,91 @@
+"""Langfuse trace upsert throughput: COPY through the staging table vs the
+multi-row ``INSERT ... ON CONFLICT`` it replaced.
+
+Rows come from ``build_row`` over the stand-in's synthetic traces, so the
+``derived`` payloads are realistic in size. Each round writes the same ids,
+so after the first round both paths measure the update-on-conflict case an
+overlapping ingestion window hits.
+
+    BENCHMARK_DATABASE_URL=postgresql+asyncpg://... \\
+        uv run pytest tests/benchmarks/test_langfuse_upsert_throughput.py \\
+        --benchmark-only --benchmark-group-by=param:batch_size
+
+Writes to a scratch schema and is skipped when BENCHMARK_DATABASE_URL is
+unset.
+"""
+
+import asyncio
+import os
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.api.data_models import LangfuseTraceOrm
+from src.api.services.langfuse import ingest as I
+from tests.benchmarks.langfuse_standin import synthetic_trace
+
+ROWS = 20_000
+SCHEMA = "bench_langfuse_upsert"
+
+pytestmark = pytest.mark.skipif(
+    not os.getenv("BENCHMARK_DATABASE_URL"),
+    reason="BENCHMARK_DATABASE_URL not set",
+)
+
+
+@pytest.fixture(scope="module")
+def rows():
+    return I.build_rows([synthetic_trace(i) for i in range(ROWS)])
+
+
+@pytest.mark.parametrize("batch_size", [300, 2000])
+@pytest.mark.parametrize("path", ["insert", "copy"])
+def test_upsert_throughput(benchmark, rows, path, batch_size):
+    upsert = I._copy_upsert if path == "copy" else I._upsert
+    # The bind-parameter path tops out at 32767 parameters per statement.
+    if path == "insert" and batch_size * len(rows[0]) > 32767:
+        pytest.skip("batch exceeds the asyncpg bind-parameter limit")
+    url = make_url(os.environ["BENCHMARK_DATABASE_URL"]).set(
+        drivername="postgresql+asyncpg"
+    )
+
+    async def setup(engine):
+        async with engine.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+            await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+            await conn.run_sync(
+                lambda sync_conn: LangfuseTraceOrm.metadata.create_all(
+                    sync_conn, tables=[LangfuseTraceOrm.__table__]
+                )
+            )
+
+    async def write(engine):
+        async with AsyncSession(engine) as session:
+            for i in range(0, len(rows), batch_size):
+                await upsert(session, rows[i : i + batch_size])
+            await session.commit()
+
+    engine = create_async_engine(
+        url, connect_args={"server_settings": {"search_path": SCHEMA}}
+    )
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(setup(engine))
+        benchmark.pedantic(
+            lambda: loop.run_until_complete(write(engine)), rounds=3
+        )
+    finally:
+        loop.run_until_complete(_drop(engine))
+        loop.run_until_complete(engine.dispose())
+        loop.close()
+    benchmark.extra_info["rows"] = ROWS
+    benchmark.extra_info["rows_per_second"] = round(
+        ROWS / benchmark.stats.stats.mean
+    )
+
+
+async def _drop(engine) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
@@ -0,0 +1,165 @@
+"""sgrep IVF search: recall@10 against brute force, and latency, by nprobe.
+
+The index is synthetic by default: CHUNKS int8 rows drawn around TOPICS
+topic directions, in two shapes that bracket real text embeddings.
+``isotropic`` topics are random in all 512 dimensions, with noise in all
+of them: the hardest case for a coarse quantizer, as a chunk's nearest
+centroid is nearly random. ``low-rank`` topics group into broad themes
+within a 64-dimensional subspace, like embeddings whose variance sits in
+a few dozen directions. Queries are fresh draws from the same mixture.
+Recall@10 is the share of the brute-force top 10 (``rank`` over every
+row) that the IVF search returns, averaged over the queries, and is
+recorded in ``extra_info`` next to the latency so each nprobe is one
+operating point:
+
+    uv run pytest tests/benchmarks/test_sgrep_ivf.py --benchmark-only \\
+        --benchmark-columns=mean,median --benchmark-group-by=param:index
+
+SGREP_BENCH_CHUNKS overrides the index size. SGREP_EVAL_INDEX points the
+benchmark at a built index instead (e.g. data/insights_index); its own
+IVF lists are used if it has them, and queries are its rows with noise
+added, which flatters recall somewhat compared to real queries.
+"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.agent.utils import sgrep_ivf
+from src.agent.utils.sgrep import (
+    _gather,
+    _load_index,
+    _rank_ivf,
+    _rank_segments,
+    normalize,
+    quantize_rows,
+)
+
+CHUNKS = int(os.getenv("SGREP_BENCH_CHUNKS", 1_000_000))
+DIM = 512  # potion-retrieval-32M
+TOPICS = 4000
+RANK = 64
+QUERIES = 64
+K = 10
+
+
+class _Mixture:
+    def __init__(self, shape: str, rng) -> None:
+        self.shape, self.rng = shape, rng
+        if shape == "isotropic":
+            self.centers = normalize(rng.standard_normal((TOPICS, DIM)))
+        else:
+            themes = rng.standard_normal((RANK, RANK))
+            self.centers = themes[
+                rng.integers(0, RANK, TOPICS)
+            ] + 0.6 * rng.standard_normal((TOPICS, RANK))
+            self.basis = np.linalg.qr(rng.standard_normal((DIM, RANK)))[0].T
+
+    def draw(self, n: int) -> np.ndarray:
+        topics = self.centers[self.rng.integers(0, TOPICS, n)]
+        if self.shape == "isotropic":
+            # ~0.65 cosine between a chunk and its topic
+            points = topics + 0.05 * self.rng.standard_normal((n, DIM))
+        else:
+            points = (
+                topics + 0.5 * self.rng.standard_normal((n, RANK))
+            ) @ self.basis + 0.01 * self.rng.standard_normal((n, DIM))
+        return normalize(points).astype(np.float32)
+
+
+def _train(segments):
+    """IVF lists over every row, as build_index trains them."""
+    n = sum(len(emb) for emb, _, _ in segments)
+    nlist = sgrep_ivf.n_lists(n)
+    rng = np.random.default_rng(0)
+    sample = np.sort(
+        rng.choice(n, min(n, nlist * sgrep_ivf.SAMPLE_PER_LIST), replace=False)
+    )
+    centroids = sgrep_ivf.train(_gather(segments, sample)[0], nlist)
+    labels = np.concatenate(
+        [sgrep_ivf.assign(seg_emb, centroids) for seg_emb, _, _ in segments]
+    )
+    return (centroids, *sgrep_ivf.inverted_lists(labels, nlist))
+
+
+@pytest.fixture(
+    scope="module",
+    params=["real"]
+    if os.getenv("SGREP_EVAL_INDEX")
+    else ["isotropic", "low-rank"],
+)
+def index(request, tmp_path_factory):
+    """(segments, IVF lists, queries)."""
+    real = os.getenv("SGREP_EVAL_INDEX")
+    if real:
+        segments, meta, _, ivf = _load_index(str(Path(real).resolve()))
+        rng = np.random.default_rng(1)
+        live = np.flatnonzero([m is not None for m in meta])
+        rows, _ = _gather(
+            segments, np.sort(rng.choice(live, QUERIES, replace=False))
+        )
+        queries = normalize(
+            normalize(rows.astype(np.float32))
+            + 0.05 * rng.standard_normal(rows.shape)
+        ).astype(np.float32)
+        return segments, ivf or _train(segments), queries
+
+    path = tmp_path_factory.mktemp("sgrep_ivf") / "seg.npy"
+    mixture = _Mixture(request.param, np.random.default_rng(0))
+    emb = np.lib.format.open_memmap(
+        path, mode="w+", dtype=np.int8, shape=(CHUNKS, DIM)
+    )
+    scales = np.empty(CHUNKS, dtype=np.float32)
+    for start in range(0, CHUNKS, 100_000):
+        block = mixture.draw(min(100_000, CHUNKS - start))
+        stop = start + len(block)
+        emb[start:stop], scales[start:stop] = quantize_rows(block)
+    emb.flush()
+    del emb
+    segments = [
+        (np.load(path, mmap_mode="r"), scales, np.empty(0, dtype=np.intp))
+    ]
+    return segments, _train(segments), mixture.draw(QUERIES)
+
+
+@pytest.fixture(scope="module")
+def exact(index):
+    segments, _, queries = index
+    return [
+        {i for i, _ in hits}
+        for hits in _rank_segments(segments, queries, K, -np.inf)
+    ]
+
+
+def test_brute_force_latency(benchmark, index):
+    segments, _, queries = index
+    benchmark.pedantic(
+        lambda: [
+            _rank_segments(segments, qv[None], K, -np.inf) for qv in queries
+        ],
+        rounds=3,
+        warmup_rounds=1,
+    )
+    benchmark.extra_info["ms_per_query"] = round(
+        benchmark.stats.stats.mean / QUERIES * 1000, 2
+    )
+
+
+@pytest.mark.parametrize("nprobe", [1, 4, 8, 16, 32, 64, 128])
+def test_ivf_recall_and_latency(benchmark, index, exact, nprobe):
+    segments, ivf, queries = index
+    hits = benchmark.pedantic(
+        lambda: _rank_ivf(segments, ivf, queries, K, -np.inf, nprobe),
+        rounds=3,
+        warmup_rounds=1,
+    )
+    recall = np.mean(
+        [len({i for i, _ in h} & e) / len(e) for h, e in zip(hits, exact)]
+    )
+    benchmark.extra_info["lists"] = len(ivf[0])
+    benchmark.extra_info["recall_at_10"] = round(float(recall), 3)
+    benchmark.extra_info["ms_per_query"] = round(
+        benchmark.stats.stats.mean / QUERIES * 1000, 2
+    )
@@ -0,0 +1,136 @@
+"""sgrep scoring latency and memory on a synthetic 1M-chunk index.
+
+Compares the original path (the int8 file widened to a float32 matrix held
+in memory, one matrix-vector product and a full ``np.argsort`` per query)
+with ``rank`` over the memory-mapped int8 matrix: argpartition top-k, one
+query at a time and in batches. Query vectors are random unit vectors, so
+only the scoring is measured; encoding with the static model is a lookup
+and sum, and is not what grows with the index.
+
+``test_resident_memory`` loads the index in a fresh process each way and
+reports its private (anonymous) and file-backed resident memory after a
+query. File-backed pages are the shared page cache; anonymous ones are paid
+again by every worker.
+
+    uv run pytest tests/benchmarks/test_sgrep_query.py --benchmark-only \\
+        --benchmark-columns=mean,median,ops
+
+SGREP_BENCH_CHUNKS overrides the index size (the float32 baseline holds
+~2 GB at 1M x 512).
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from src.agent.utils.sgrep import normalize, quantize_rows, rank
+
+CHUNKS = int(os.getenv("SGREP_BENCH_CHUNKS", 1_000_000))
+DIM = 512  # potion-retrieval-32M
+QUERIES = 64
+K = 10
+
+
+@pytest.fixture(scope="module")
+def index_dir(tmp_path_factory):
+    """An int8 index with per-row scales, written in slices."""
+    path = tmp_path_factory.mktemp("sgrep_index")
+    rng = np.random.default_rng(0)
+    emb = np.lib.format.open_memmap(
+        path / "embeddings.npy", mode="w+", dtype=np.int8, shape=(CHUNKS, DIM)
+    )
+    scales = np.empty(CHUNKS, dtype=np.float32)
+    for start in range(0, CHUNKS, 100_000):
+        block = normalize(
+            rng.standard_normal((min(100_000, CHUNKS - start), DIM))
+        )
+        stop = start + len(block)
+        emb[start:stop], scales[start:stop] = quantize_rows(block)
+    emb.flush()
+    del emb
+    np.save(path / "scales.npy", scales)
+    return path
+
+
+@pytest.fixture(scope="module")
+def queries():
+    rng = np.random.default_rng(1)
+    return normalize(rng.standard_normal((QUERIES, DIM))).astype("float32")
+
+
+def _argsort_per_query(emb, scales, qvs):
+    """The pre-argpartition query_index scoring loop (per-row scales
+    folded into the float32 copy, as a single scale used to be)."""
+    out = []
+    for qv in qvs:
+        scores = (emb @ qv) * scales
+        out.append(np.argsort(-scores)[:K])
+    return out
+
+
+@pytest.mark.parametrize(
+    "mode", ["float32-argsort", "int8-per-query", "int8-batched"]
+)
+def test_query_latency(benchmark, index_dir, queries, mode):
+    emb = np.load(index_dir / "embeddings.npy", mmap_mode="r")
+    scales = np.load(index_dir / "scales.npy")
+    if mode == "float32-argsort":
+        dense = emb.astype(np.float32)
+        run = lambda: _argsort_per_query(dense, scales, queries)  # noqa: E731
+    elif mode == "int8-per-query":
+        run = lambda: [  # noqa: E731
+            rank(emb, scales, qv[None], k=K, threshold=-np.inf)
+            for qv in queries
+        ]
+    else:
+        run = lambda: rank(emb, scales, queries, k=K, threshold=-np.inf)  # noqa: E731
+
+    benchmark.pedantic(run, rounds=3, warmup_rounds=1)
+    benchmark.extra_info["chunks"] = CHUNKS
+    benchmark.extra_info["ms_per_query"] = round(
+        benchmark.stats.stats.mean / QUERIES * 1000, 2
+    )
+
+
+_RSS_SCRIPT = """
+import json, sys
+import numpy as np
+from src.agent.utils.sgrep import normalize, rank
+
+path, mode = sys.argv[1], sys.argv[2]
+emb = np.load(f"{path}/embeddings.npy", mmap_mode="r")
+scales = np.load(f"{path}/scales.npy", mmap_mode="r")
+rng = np.random.default_rng(1)
+qv = normalize(rng.standard_normal((1, emb.shape[1]))).astype("float32")
+if mode == "float32-copy":
+    dense = emb.astype(np.float32)
+    np.argsort(-(dense @ qv[0]) * scales)[:10]
+else:
+    rank(emb, scales, qv, k=10)
+status = dict(
+    line.split(":", 1) for line in open("/proc/self/status") if ":" in line
+)
+print(json.dumps({k: status[k].strip() for k in ("RssAnon", "RssFile")}))
+"""
+
+
+@pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="reads /proc/self/status"
+)
+@pytest.mark.parametrize("mode", ["float32-copy", "int8-mmap"])
+def test_resident_memory(benchmark, index_dir, mode):
+    def run():
+        out = subprocess.run(
+            [sys.executable, "-c", _RSS_SCRIPT, str(index_dir), mode],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return json.loads(out.stdout)
+
+    rss = benchmark.pedantic(run, rounds=1)
+    benchmark.extra_info.update(rss)
@@ -0,0 +1,201 @@
+"""Overlay fitting: vectorised implementation vs the original pure-Python
+sweep, on synthetic country-scale geometries shaped like GADM level-0
+outlines (a ragged ~60k-vertex mainland with lakes, plus ~1.5k islands).
+
+The reference functions below are the pre-vectorisation implementation,
+kept here so both correctness (identical overlays) and speed can be
+compared on the same inputs.
+"""
+
+import json
+import math
+
+import numpy as np
+import pytest
+import shapely
+import shapely.geometry
+
+from src.api.routers.thumbnails import (
+    _MAX_OVERLAY_CHARS,
+    _TOLERANCES,
+    _crosses_antimeridian,
+    _encode_overlay,
+    _fit_overlay,
+    _fix_shape,
+    _starting_tolerance_index,
+)
+
+# ---------------------------------------------------------------------------
+# Reference (pre-vectorisation) implementation
+# ---------------------------------------------------------------------------
+
+
+def _ref_filter_small_parts(shape, min_area_fraction: float = 0.005):
+    if shape.geom_type != "MultiPolygon":
+        return shape
+    total = shape.area
+    parts = [p for p in shape.geoms if p.area / total >= min_area_fraction]
+    if not parts:
+        parts = [max(shape.geoms, key=lambda p: p.area)]
+    return shapely.geometry.MultiPolygon(parts) if len(parts) > 1 else parts[0]
+
+
+def _ref_drop_interior_rings(shape):
+    if shape.geom_type == "Polygon":
+        return shapely.geometry.Polygon(shape.exterior)
+    if shape.geom_type == "MultiPolygon":
+        parts = [
+            shapely.geometry.Polygon(p.exterior)
+            for p in shape.geoms
+            if not p.is_empty
+        ]
+        return (
+            shapely.geometry.MultiPolygon(parts)
+            if len(parts) > 1
+            else parts[0]
+        )
+    return shape
+
+
+def _ref_prepare_shape(geometry: dict):
+    try:
+        shape = _ref_filter_small_parts(shapely.geometry.shape(geometry))
+        if _crosses_antimeridian(shape):
+            shape = shapely.geometry.shape(
+                _fix_shape(shapely.geometry.mapping(shape))
+            )
+        return _ref_drop_interior_rings(shape)
+    except Exception:
+        return None
+
+
+def _ref_round_coords(geometry: dict, decimals: int = 4) -> dict:
+    def walk(obj):
+        if isinstance(obj, (int, float)):
+            return round(float(obj), decimals)
+        if isinstance(obj, (list, tuple)):
+            return [walk(item) for item in obj]
+        return obj
+
+    return {**geometry, "coordinates": walk(geometry["coordinates"])}
+
+
+def _ref_simplify_shape(shape, tolerance: float) -> dict:
+    s = shape.simplify(tolerance, preserve_topology=True)
+    if s.geom_type == "MultiPolygon":
+        parts = [g for g in s.geoms if not g.is_empty]
+        if parts:
+            s = (
+                shapely.geometry.MultiPolygon(parts)
+                if len(parts) > 1
+                else parts[0]
+            )
+    return _ref_round_coords(shapely.geometry.mapping(s))
+
+
+def _ref_approx_vertex_count(shape) -> int:
+    if shape.geom_type == "Polygon":
+        return len(shape.exterior.coords)
+    if shape.geom_type == "MultiPolygon":
+        return sum(len(p.exterior.coords) for p in shape.geoms)
+    return 0
+
+
+def _ref_fit_overlay(geometry: dict) -> str:
+    shape = _ref_prepare_shape(geometry)
+    start = _starting_tolerance_index(_ref_approx_vertex_count(shape))
+    for tolerance in _TOLERANCES[start:]:
+        encoded = _encode_overlay(_ref_simplify_shape(shape, tolerance))
+        if len(encoded) <= _MAX_OVERLAY_CHARS:
+            return encoded
+    return _encode_overlay(
+        shapely.geometry.mapping(shapely.geometry.box(*shape.bounds))
+    )
+
+
+# ---------------------------------------------------------------------------
+# Synthetic country-scale geometries
+# ---------------------------------------------------------------------------
+
+
+def _ragged_ring(rng, cx, cy, radius, n, roughness=0.08):
+    """Closed ring with a noisy, coastline-like radius profile."""
+    theta = np.linspace(0, 2 * math.pi, n, endpoint=False)
+    noise = np.zeros(n)
+    for k in (3, 7, 19, 53, 151, 401):
+        noise += rng.normal(0, roughness / math.sqrt(k)) * np.sin(
+            k * theta + rng.uniform(0, 2 * math.pi)
+        )
+    noise += rng.normal(0, roughness / 10, n)
+    r = radius * (1 + noise)
+    coords = np.column_stack([cx + r * np.cos(theta), cy + r * np.sin(theta)])
+    return np.vstack([coords, coords[:1]])
+
+
+def _country(seed, cx, cy, radius, mainland_vertices, islands, lakes):
+    rng = np.random.default_rng(seed)
+    mainland = shapely.geometry.Polygon(
+        _ragged_ring(rng, cx, cy, radius, mainland_vertices, 0.03),
+        [
+            _ragged_ring(
+                rng,
+                cx + rng.uniform(-radius / 2, radius / 2),
+                cy + rng.uniform(-radius / 2, radius / 2),
+                radius * rng.uniform(0.005, 0.02),
+                120,
+                0.02,
+            )
+            for _ in range(lakes)
+        ],
+    ).buffer(0)
+    parts = [mainland]
+    for _ in range(islands):
+        angle = rng.uniform(0, 2 * math.pi)
+        dist = radius * rng.uniform(1.1, 1.4)
+        parts.append(
+            shapely.geometry.Polygon(
+                _ragged_ring(
+                    rng,
+                    cx + dist * math.cos(angle),
+                    cy + dist * math.sin(angle),
+                    radius * rng.uniform(0.002, 0.06),
+                    int(rng.integers(20, 200)),
+                )
+            ).buffer(0)
+        )
+    # Round-trip through JSON: the endpoint gets lists from ST_AsGeoJSON.
+    return json.loads(
+        json.dumps(
+            shapely.geometry.mapping(shapely.geometry.MultiPolygon(parts))
+        )
+    )
+
+
+COUNTRIES = {
+    # Canada-like: huge, ragged mainland, many islands and lakes.
+    "canada_like": _country(1, -100, 60, 20, 60_000, 1500, 80),
+    # Indonesia-like: archipelago, several large islands.
+    "archipelago": _country(2, 118, -2, 8, 20_000, 800, 5),
+    # Brazil-like: one big compact mainland.
+    "compact": _country(3, -52, -10, 15, 40_000, 50, 20),
+}
+
+
+@pytest.mark.parametrize("name", sorted(COUNTRIES))
+def test_vectorised_overlay_matches_reference(name):
+    geometry = COUNTRIES[name]
+    assert _fit_overlay(geometry) == _ref_fit_overlay(geometry)
+
+
+@pytest.mark.parametrize("name", sorted(COUNTRIES))
+def test_benchmark_fit_overlay(benchmark, name):
+    benchmark.group = f"fit_overlay[{name}]"
+    encoded = benchmark(_fit_overlay, COUNTRIES[name])
+    assert len(encoded) <= _MAX_OVERLAY_CHARS
+
+
+@pytest.mark.parametrize("name", sorted(COUNTRIES))
+def test_benchmark_fit_overlay_reference(benchmark, name):
+    benchmark.group = f"fit_overlay[{name}]"
+    encoded = benchmark(_ref_fit_overlay, COUNTRIES[name])
+    assert len(encoded) <= _MAX_OVERLAY_CHARS
@@ -544,7 +544,10 @@ class TestMachineUserAPIAuthentication:
             user_data["userType"] == "machine"
         )  # Should be machine user type
 
-        # Verify the API key's last_used_at was updated during authentication
+        # last_used_at is batched; flush the pending write before checking.
+        from src.api.auth.machine_user import last_used_recorder
+
+        assert await last_used_recorder.flush() >= 1
         async with async_session_maker() as session:
             result = await session.execute(
                 select(MachineUserKeyOrm).where(
@@ -554,6 +557,70 @@ class TestMachineUserAPIAuthentication:
             updated_key = result.scalar_one()
             assert updated_key.last_used_at is not None
 
+    async def _machine_token(self, email: str) -> tuple[str, str]:
+        async with async_session_maker() as session:
+            user = await create_machine_user(
+                session=session, name=email, email=email
+            )
+            full_token, api_key = await create_api_key(
+                session=session, user_id=user.id, key_name="cache-key"
+            )
+            return full_token, str(api_key.id)
+
+    @pytest.mark.asyncio
+    async def test_verified_key_skips_bcrypt(self, client):
+        """Repeat calls with a verified key don't re-run bcrypt."""
+        full_token, _ = await self._machine_token("cached@example.com")
+        headers = {"Authorization": f"Bearer {full_token}"}
+
+        with patch(
+            "src.api.auth.machine_user.bcrypt.checkpw",
+            wraps=bcrypt.checkpw,
+        ) as checkpw:
+            for _ in range(3):
+                response = await client.get("/api/auth/me", headers=headers)
+                assert response.status_code == 200
+        assert checkpw.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_wrong_secret_rejected_with_cached_key(self, client):
+        full_token, _ = await self._machine_token("wrong@example.com")
+        await client.get(
+            "/api/auth/me", headers={"Authorization": f"Bearer {full_token}"}
+        )
+
+        bad = full_token.rsplit(":", 1)[0] + ":" + "0" * 32
+        response = await client.get(
+            "/api/auth/me", headers={"Authorization": f"Bearer {bad}"}
+        )
+        assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_revoke_and_rotate_take_effect_immediately(self, client):
+        """A cached verification never outlives a revoke or rotation."""
+        full_token, key_id = await self._machine_token("revoke@example.com")
+        headers = {"Authorization": f"Bearer {full_token}"}
+        assert (
+            await client.get("/api/auth/me", headers=headers)
+        ).status_code == 200
+
+        async with async_session_maker() as session:
+            new_token, _ = await rotate_api_key(session, key_id)
+        assert (
+            await client.get("/api/auth/me", headers=headers)
+        ).status_code == 401
+
+        new_headers = {"Authorization": f"Bearer {new_token}"}
+        assert (
+            await client.get("/api/auth/me", headers=new_headers)
+        ).status_code == 200
+
+        async with async_session_maker() as session:
+            await revoke_api_key(session, key_id)
+        assert (
+            await client.get("/api/auth/me", headers=new_headers)
+        ).status_code == 401
+
 
 class TestUserAdminFunctions:
     """Test user admin management functions."""
@@ -13,9 +13,16 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from src.api.app import app
-from src.api.auth.dependencies import fetch_user_from_rw_api
+from src.api.auth.dependencies import (
+    _resolved_user_cache,
+    _user_info_cache,
+    close_rw_api_client,
+    fetch_user_from_rw_api,
+)
+from src.api.config import APISettings
 from src.api.data_models import Base, ThreadOrm, UserOrm, UserType
 from src.api.schemas import UserModel
+from src.api.services.quota import quota_counters
 from src.shared.database import (
     close_global_pool,
     get_session_from_pool_dependency,
@@ -110,6 +117,9 @@ async def clear_tables():
 async def test_db_session():
     yield engine_test
     await clear_tables()
+    # Tables are wiped, so cached users must go too.
+    _resolved_user_cache.clear()
+    quota_counters.clear()
     await engine_test.dispose()
 
 
@@ -121,6 +131,22 @@ def clear_auth_state():
     app.dependency_overrides.pop(fetch_user_from_rw_api, None)
 
 
+@pytest_asyncio.fixture(scope="function")
+async def rw_api(monkeypatch):
+    """A local RW API stand-in wired into fetch_user_from_rw_api. Register
+    tokens with ``rw_api.users[token] = {...RW user payload...}``."""
+    from tests.api.rw_api_standin import RWAPIStandIn
+
+    standin = RWAPIStandIn(users={}).start()
+    monkeypatch.setattr(APISettings, "rw_api_base_url", standin.base_url)
+    _user_info_cache.clear()
+    yield standin
+    _user_info_cache.clear()
+    # The shared client is bound to this test's event loop.
+    await close_rw_api_client()
+    standin.stop()
+
+
 @pytest_asyncio.fixture(scope="function")
 async def user() -> UserOrm:
     async with async_session_maker() as session:
@@ -0,0 +1,148 @@
+"""
+Load testing for the insight listing endpoint (GET /api/insights).
+
+Each simulated user walks the machine user's insights page by page via the
+X-Next-Cursor header, mostly in summary mode, occasionally opening one
+insight's full payload — the way the insights panel browses a long history.
+
+Seed the machine user with 10k insights first (needs DATABASE_URL, a sync
+SQLAlchemy URL such as postgresql+psycopg://...):
+
+    python insights_locustfile.py seed --count 10000
+
+Then run:
+
+    locust -f insights_locustfile.py --host http://localhost:8000 \
+        --users 20 --spawn-rate 5 -t 5m --headless
+
+Keyset pagination keeps the "deep page" percentiles in line with the first
+page; compare the `insights_first_page` and `insights_deep_page` rows.
+"""
+
+import argparse
+import logging
+import os
+import random
+
+import requests
+from config import LoadTestConfig
+from locust import HttpUser, between, task
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 50
+# Pages walked per browse task; enough to reach well past the first screen.
+MAX_PAGES = 40
+
+
+class InsightsBrowsingUser(HttpUser):
+    """Pages through the insight list and opens the odd insight."""
+
+    host = LoadTestConfig.BASE_URL
+    wait_time = between(1, 3)
+
+    def on_start(self):
+        LoadTestConfig.validate_config()
+        self.headers = LoadTestConfig.get_auth_header()
+        self.seen_ids: list[str] = []
+
+    def _page(self, cursor, name, full=False):
+        params = {"limit": PAGE_SIZE}
+        if cursor:
+            params["cursor"] = cursor
+        if full:
+            params["full"] = "true"
+        with self.client.get(
+            "/api/insights",
+            params=params,
+            headers=self.headers,
+            name=name,
+            catch_response=True,
+        ) as response:
+            if response.status_code != 200:
+                response.failure(f"HTTP {response.status_code}")
+                return [], None
+            items = response.json()
+            self.seen_ids.extend(i["id"] for i in items[:5])
+            return items, response.headers.get("X-Next-Cursor")
+
+    @task(6)
+    def browse_summaries(self):
+        """Walk up to MAX_PAGES summary pages from the newest insight."""
+        items, cursor = self._page(None, "insights_first_page")
+        pages = 1
+        while cursor and pages < MAX_PAGES:
+            items, cursor = self._page(cursor, "insights_deep_page")
+            pages += 1
+
+    @task(1)
+    def browse_full(self):
+        """First page with chart data and codeact parts inlined."""
+        self._page(None, "insights_first_page_full", full=True)
+
+    @task(3)
+    def open_insight(self):
+        """Fetch one insight's full payload, as the detail view does."""
+        if not self.seen_ids:
+            return
+        insight_id = random.choice(self.seen_ids)
+        self.client.get(
+            f"/api/insights/{insight_id}",
+            headers=self.headers,
+            name="insight_detail",
+        )
+
+
+def seed(count: int) -> None:
+    """Insert `count` insights (one chart each) for the machine user."""
+    from sqlalchemy import create_engine, text
+
+    me = requests.get(
+        f"{LoadTestConfig.BASE_URL}/api/auth/me",
+        headers=LoadTestConfig.get_auth_header(),
+        timeout=30,
+    )
+    me.raise_for_status()
+    user_id = me.json()["id"]
+
+    engine = create_engine(os.environ["DATABASE_URL"])
+    with engine.begin() as conn:
+        conn.execute(
+            text("""
+                WITH new AS (
+                    INSERT INTO insights (user_id, thread_id, insight_text,
+                                          codeact_types, codeact_contents,
+                                          created_at)
+                    SELECT :user_id,
+                           'load-thread-' || (i / 20),
+                           'Load-test insight ' || i
+                               || ': tree cover loss changed by '
+                               || (i % 97) || ' percent.',
+                           ARRAY['code_block', 'text_output'],
+                           ARRAY[repeat('cHJpbnQoKQ==', 200),
+                                 repeat('b2s=', 200)],
+                           now() - i * interval '1 minute'
+                    FROM generate_series(1, :count) AS i
+                    RETURNING id
+                )
+                INSERT INTO insight_charts (insight_id, title, chart_type,
+                                            x_axis, y_axis, chart_data)
+                SELECT id, 'Annual tree cover loss', 'bar', 'year', 'loss',
+                       (SELECT jsonb_agg(jsonb_build_object(
+                                   'year', y, 'loss', y * 10))
+                        FROM generate_series(2001, 2024) AS y)
+                FROM new
+            """),
+            {"user_id": user_id, "count": count},
+        )
+    logger.info(f"Seeded {count} insights for {user_id}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    sub = parser.add_subparsers(dest="command", required=True)
+    seed_parser = sub.add_parser("seed", help="Seed insights for the user")
+    seed_parser.add_argument("--count", type=int, default=10_000)
+    args = parser.parse_args()
+    seed(args.count)
@@ -0,0 +1,237 @@
+"""Local stand-in for the WRI and LCL Insights sites.
+
+Serves a synthetic site on a loopback port: a WRI-style sitemap index
+(``/sitemap.xml``) pointing at sub-sitemaps of SITEMAP_SIZE articles with
+their lastmod, an LCL-style listing page (``/insights/``) linking every
+article, and the article pages themselves (``/insights/<slug>``) with the
+meta tags both stores parse. Article pages carry an ``ETag`` and a
+``Last-Modified`` and answer a matching ``If-None-Match`` or
+``If-Modified-Since`` with a 304, unless ``validators`` is off. Requests,
+304s, in-flight peaks and request start times are recorded, and
+``fail[path] = n`` makes the next n requests to a path 503 (with
+``Retry-After: 0``), so the real sync code runs end to end:
+
+    python -m tests.tools.insights_site_standin --articles 2000 --port 8100
+"""
+
+import argparse
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SITEMAP_SIZE = 100
+START = 1_767_225_600  # 2026-01-01T00:00:00Z
+
+_PLACES = ["Brazil", "Indonesia", "Gabon", "Peru", "Congo", "Bolivia"]
+
+
+class InsightsSiteStandIn:
+    def __init__(
+        self,
+        n_articles: int = 20,
+        latency: float = 0.0,
+        validators: bool = True,
+        port: int = 0,
+    ):
+        # slug -> [content version, modified (unix seconds)]
+        self.articles = {
+            f"article-{i:05d}": [1, START + 3600 * i]
+            for i in range(n_articles)
+        }
+        self.latency = latency
+        self.validators = validators
+        self.fail: dict[str, int] = {}
+        self.requests: list[str] = []
+        self.not_modified = 0
+        self.starts: list[float] = []
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(
+            ("127.0.0.1", port), self._handler()
+        )
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, slug: str) -> str:
+        return f"{self.base_url}/insights/{slug}"
+
+    def edit(self, slug: str) -> None:
+        """Change an article's content (and so its lastmod and ETag)."""
+        self.articles[slug][0] += 1
+        self.touch(slug)
+
+    def touch(self, slug: str) -> None:
+        """Move an article's lastmod without changing its content."""
+        self.articles[slug][1] += 86400
+
+    def article_requests(self) -> list[str]:
+        return [
+            p
+            for p in self.requests
+            if p.startswith("/insights/") and p != "/insights/"
+        ]
+
+    def _lastmod(self, slug: str) -> str:
+        modified = self.articles[slug][1]
+        return time.strftime("%Y-%m-%dT%H:%MZ", time.gmtime(modified))
+
+    def sitemap_index(self) -> str:
+        n = -(-len(self.articles) // SITEMAP_SIZE)
+        entries = "".join(
+            f"<sitemap><loc>{self.base_url}/sitemap-{i}.xml</loc></sitemap>"
+            for i in range(n)
+        )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?><sitemapindex '
+            'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+            f"{entries}</sitemapindex>"
+        )
+
+    def sitemap(self, i: int) -> str:
+        slugs = sorted(self.articles)[
+            i * SITEMAP_SIZE : (i + 1) * SITEMAP_SIZE
+        ]
+        entries = "".join(
+            f"<url><loc>{self.url(slug)}</loc>"
+            f"<lastmod>{self._lastmod(slug)}</lastmod></url>"
+            for slug in slugs
+        )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?><urlset '
+            'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+            f"{entries}</urlset>"
+        )
+
+    def listing(self) -> str:
+        links = "".join(
+            f'<li><a href="/insights/{slug}/">{slug}</a></li>'
+            for slug in sorted(self.articles)
+        )
+        return f"<html><body><ul>{links}</ul></body></html>"
+
+    def article(self, slug: str) -> str:
+        version = self.articles[slug][0]
+        n = int(slug.rsplit("-", 1)[-1])
+        place = _PLACES[n % len(_PLACES)]
+        paragraphs = "".join(
+            f"<p>Paragraph {p} of version {version}: forests in {place} "
+            f"store carbon, and monitoring tree cover loss there helps "
+            f"communities, governments and companies act on deforestation "
+            f"before it spreads further across the landscape.</p>"
+            for p in range(1, 5)
+        )
+        return (
+            "<html><head>"
+            f'<meta name="citation_title" content="Forests in {place} {n}" />'
+            f'<meta name="description" content="Why {place} matters." />'
+            '<meta property="og:image" content="https://example.org/a.jpg" />'
+            '<meta property="og:image:alt" content="A forest" />'
+            '<meta property="article:modified_time" '
+            f'content="{self._lastmod(slug)}" />'
+            f"</head><body><article><h1>Forests in {place} {n}</h1>"
+            f"<h2>Background</h2>{paragraphs}</article></body></html>"
+        )
+
+    def respond(self, path: str, headers) -> tuple[int, dict[str, str], str]:
+        if self.fail.get(path):
+            self.fail[path] -= 1
+            return 503, {"Retry-After": "0"}, ""
+        if path == "/sitemap.xml":
+            return 200, {}, self.sitemap_index()
+        if path.startswith("/sitemap-"):
+            i = int(path.removeprefix("/sitemap-").removesuffix(".xml"))
+            return 200, {}, self.sitemap(i)
+        if path == "/insights/":
+            return 200, {}, self.listing()
+        slug = path.removeprefix("/insights/").strip("/")
+        if slug not in self.articles:
+            return 404, {}, ""
+        version, modified = self.articles[slug]
+        if not self.validators:
+            return 200, {}, self.article(slug)
+        etag = f'"{slug}-v{version}"'
+        last_modified = formatdate(modified, usegmt=True)
+        validators = {"ETag": etag, "Last-Modified": last_modified}
+        if_none_match = headers.get("If-None-Match")
+        if_modified_since = headers.get("If-Modified-Since")
+        if (if_none_match and if_none_match == etag) or (
+            not if_none_match
+            and if_modified_since
+            and parsedate_to_datetime(if_modified_since).timestamp()
+            >= modified
+        ):
+            return 304, validators, ""
+        return 200, validators, self.article(slug)
+
+    def _handler(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with standin._lock:
+                    standin.requests.append(self.path)
+                    standin.starts.append(time.monotonic())
+                    standin._in_flight += 1
+                    standin.max_in_flight = max(
+                        standin.max_in_flight, standin._in_flight
+                    )
+                try:
+                    if standin.latency:
+                        time.sleep(standin.latency)
+                    with standin._lock:
+                        status, headers, body = standin.respond(
+                            self.path, self.headers
+                        )
+                        standin.not_modified += status == 304
+                    payload = body.encode()
+                    self.send_response(status)
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.send_header(
+                        "Content-Type", "text/html; charset=utf-8"
+                    )
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                finally:
+                    with standin._lock:
+                        standin._in_flight -= 1
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "InsightsSiteStandIn":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--articles", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+    standin = InsightsSiteStandIn(
+        n_articles=args.articles, latency=args.latency, port=args.port
+    )
+    print(
+        f"Insights site stand-in on {standin.base_url}: "
+        f"{len(standin.articles)} articles"
+    )
+    standin._thread.run()
@@ -10,6 +10,8 @@ from src.agent.subagents.search.blog import (
     _articles_cited_in_text,
     _articles_from_tool_calls,
     grep_articles,
+    read_paragraphs,
+    search_articles,
     search_blogs,
 )
 
@@ -130,7 +132,9 @@ def test_deduplicates_across_multiple_calls():
 
 def test_ignores_non_article_meta_calls():
     msgs = [
-        _AIMessage([{"name": "sgrep", "args": {"query": "peatlands"}}]),
+        _AIMessage(
+            [{"name": "search_articles", "args": {"query": "peatlands"}}]
+        ),
         _AIMessage([{"name": "grep_articles", "args": {"pattern": "peat"}}]),
     ]
     assert _patched(msgs) == []
@@ -388,3 +392,84 @@ def test_grep_articles_respects_max_results(tmp_path):
     _write_corpus(tmp_path)
     result = _patched_grep(tmp_path, "a", max_results=2)
     assert result.count("\n") < 2
+
+
+# --- search_articles (hybrid semantic + keyword) ---
+
+
+def test_search_articles_lists_fused_matches():
+    hits = [
+        {
+            "file": "lcl/article-b.md",
+            "line": 3,
+            "para": 3,
+            "section": "Yuba",
+            "text": "The Yuba watershed covers 15000 acres.",
+            "score": 0.032,
+            "matched": ["semantic", "keyword"],
+        },
+        {
+            "file": "wri/article-c.md",
+            "line": 1,
+            "para": None,
+            "section": None,
+            "text": "WRI works on climate adaptation globally.",
+            "score": 0.016,
+            "matched": ["semantic"],
+        },
+    ]
+    with patch(
+        "src.agent.subagents.search.blog.hybrid_query", return_value=hits
+    ) as query:
+        result = search_articles.invoke({"query": "Yuba watershed", "top": 4})
+
+    assert query.call_args.kwargs == {"k": 4}
+    assert result.splitlines() == [
+        "lcl/article-b.md §3 (semantic+keyword) [Yuba]: "
+        "The Yuba watershed covers 15000 acres.",
+        "wri/article-c.md :1 (semantic): "
+        "WRI works on climate adaptation globally.",
+    ]
+
+
+def test_search_articles_reports_no_matches():
+    with patch(
+        "src.agent.subagents.search.blog.hybrid_query", return_value=[]
+    ):
+        result = search_articles.invoke({"query": "nothing"})
+    assert result == "No matching paragraphs found."
+
+
+# --- read_paragraphs (cached parsed articles) ---
+
+
+def test_read_paragraphs_returns_window_and_sees_edits(tmp_path):
+    path = tmp_path / "lcl" / "article-b.md"
+    path.parent.mkdir()
+    path.write_text(
+        "# Yuba\n\n**URL:** [link](https://landcarbonlab.org/insights/b)\n\n"
+        + _ARTICLE_B
+    )
+    with (
+        patch("src.agent.subagents.search.blog.DATA_DIR", tmp_path),
+        patch(
+            "src.agent.subagents.search.blog._article_index", return_value={}
+        ),
+    ):
+        result = read_paragraphs.invoke(
+            {"slug": "lcl/article-b", "paras": [1], "context": 2}
+        )
+        assert result.splitlines() == [
+            "Yuba",
+            "URL: https://landcarbonlab.org/insights/b",
+            "",
+            "[§1] Forest Resilience Bond raised 4.6 million dollars.",
+            "[...]",
+            "[§3] The Yuba watershed covers 15000 acres.",
+        ]
+
+        path.write_text("# Yuba\n\n[§1] Rewritten.\n")
+        result = read_paragraphs.invoke(
+            {"slug": "lcl/article-b", "paras": [3], "context": 0}
+        )
+    assert result == "lcl/article-b: no such paragraphs (article has §1-§1)"
@@ -0,0 +1,171 @@
+"""Article sync for the WRI and LCL stores, against a local stand-in site."""
+
+import asyncio
+import json
+import re
+
+import pytest
+
+import src.agent.tools.lcl_insights_store as lcl_store
+import src.agent.tools.wri_insights_store as wri_store
+from src.agent.tools.insights_sync import IndexJournal, InsightsFetcher
+from tests.tools.insights_site_standin import InsightsSiteStandIn
+
+N_ARTICLES = 12
+
+
+@pytest.fixture
+def site():
+    standin = InsightsSiteStandIn(n_articles=N_ARTICLES).start()
+    yield standin
+    standin.stop()
+
+
+def _point_at(store, site, tmp_path, monkeypatch):
+    monkeypatch.setattr(store, "_CORPUS_ROOT", tmp_path)
+    monkeypatch.setattr(store, "_DATA_DIR", tmp_path / store._SOURCE)
+    monkeypatch.setattr(store, "_INDEX_PATH", tmp_path / "index.json")
+    monkeypatch.setattr(
+        store,
+        "INSIGHTS_URL_RE",
+        re.compile(rf"^{re.escape(site.base_url)}/insights/[^/]+/?$"),
+    )
+    return store
+
+
+@pytest.fixture
+def wri(site, tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        wri_store, "SITEMAP_INDEX", f"{site.base_url}/sitemap.xml"
+    )
+    return _point_at(wri_store, site, tmp_path, monkeypatch)
+
+
+@pytest.fixture
+def lcl(site, tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        lcl_store, "INSIGHTS_INDEX_URL", f"{site.base_url}/insights/"
+    )
+    return _point_at(lcl_store, site, tmp_path, monkeypatch)
+
+
+def _entries(store) -> dict[str, dict]:
+    data = json.loads(store._INDEX_PATH.read_text(encoding="utf-8"))
+    return {a["slug"]: a for a in data["articles"]}
+
+
+async def test_wri_sync_fetches_only_changed_articles(wri, site):
+    site.latency = 0.05
+    stats = await wri.sync_articles_async(workers=4, delay_s=0)
+
+    assert stats["fetched"] == N_ARTICLES
+    assert 1 < site.max_in_flight <= 4
+    entries = _entries(wri)
+    assert entries["article-00003"]["etag"] == '"article-00003-v1"'
+    assert entries["article-00003"]["last_modified"].endswith("GMT")
+    assert "version 1" in (wri._DATA_DIR / "article-00003.md").read_text()
+    index_mtime = wri._INDEX_PATH.stat().st_mtime_ns
+
+    # nothing changed: sitemaps only, and the index is not rewritten
+    site.requests.clear()
+    stats = await wri.sync_articles_async(workers=4, delay_s=0)
+    assert (stats["fetched"], stats["skipped"]) == (0, N_ARTICLES)
+    assert site.article_requests() == []
+    assert wri._INDEX_PATH.stat().st_mtime_ns == index_mtime
+
+    # a new lastmod on unchanged content costs a 304
+    site.edit("article-00003")
+    site.touch("article-00005")
+    site.requests.clear()
+    stats = await wri.sync_articles_async(workers=4, delay_s=0)
+    assert (stats["fetched"], stats["not_modified"]) == (1, 1)
+    assert sorted(site.article_requests()) == [
+        "/insights/article-00003",
+        "/insights/article-00005",
+    ]
+    entries = _entries(wri)
+    assert entries["article-00003"]["etag"] == '"article-00003-v2"'
+    assert entries["article-00005"]["lastmod"] == site._lastmod(
+        "article-00005"
+    )
+    assert "version 2" in (wri._DATA_DIR / "article-00003.md").read_text()
+    assert len(entries) == N_ARTICLES
+
+
+async def test_wri_sync_retries_server_errors(wri, site):
+    site.fail["/insights/article-00001"] = 2
+    site.fail["/insights/article-00002"] = 10
+
+    stats = await wri.sync_articles_async(workers=2, delay_s=0)
+
+    assert (stats["fetched"], stats["failed"]) == (N_ARTICLES - 1, 1)
+    assert "article-00001" in _entries(wri)
+    assert "article-00002" not in _entries(wri)
+
+
+async def test_lcl_sync_revalidates_stored_articles(lcl, site):
+    stats = await lcl.sync_articles_async(workers=4, delay_s=0)
+    assert stats["fetched"] == N_ARTICLES
+    path = lcl._DATA_DIR / "article-00004.md"
+    file_mtime = path.stat().st_mtime_ns
+    index_mtime = lcl._INDEX_PATH.stat().st_mtime_ns
+
+    stats = await lcl.sync_articles_async(workers=4, delay_s=0)
+    assert (stats["fetched"], stats["not_modified"]) == (0, N_ARTICLES)
+    assert path.stat().st_mtime_ns == file_mtime
+    assert lcl._INDEX_PATH.stat().st_mtime_ns == index_mtime
+
+    site.edit("article-00004")
+    stats = await lcl.sync_articles_async(workers=4, delay_s=0)
+    assert (stats["fetched"], stats["not_modified"]) == (1, N_ARTICLES - 1)
+    assert "version 2" in path.read_text()
+    assert _entries(lcl)["article-00004"]["etag"] == '"article-00004-v2"'
+
+
+async def test_lcl_sync_keeps_articles_of_sites_without_validators(lcl, site):
+    site.validators = False
+    await lcl.sync_articles_async(delay_s=0)
+    assert _entries(lcl)["article-00000"]["etag"] == ""
+
+    site.requests.clear()
+    stats = await lcl.sync_articles_async(delay_s=0)
+    assert (stats["fetched"], stats["skipped"]) == (0, N_ARTICLES)
+    assert site.article_requests() == []
+
+
+async def test_fetcher_spaces_requests_per_host(site):
+    async with InsightsFetcher(concurrency=4, delay_s=0.05) as fetcher:
+        await asyncio.gather(
+            *(fetcher.get(site.url(slug)) for slug in list(site.articles)[:6])
+        )
+
+    # 6 starts 50 ms apart, less the server's scheduling jitter
+    assert site.starts[-1] - site.starts[0] >= 0.2
+
+
+def test_index_journal_merges_interrupted_sync(tmp_path):
+    index_path = tmp_path / "index.json"
+    index_path.write_text(
+        json.dumps(
+            {
+                "articles": [
+                    {"id": "lcl/a", "slug": "a", "title": "LCL"},
+                    {"id": "wri/b", "slug": "b", "title": "Old"},
+                ]
+            }
+        )
+    )
+    journal = IndexJournal(index_path, "wri")
+    journal.append({"id": "wri/b", "slug": "b", "title": "New"})
+    journal.append({"id": "wri/c", "slug": "c", "title": "Added"})
+    with journal.path.open("a") as f:
+        f.write('{"id": "wri/d", "sl')  # torn by the interruption
+
+    assert IndexJournal(index_path, "wri").commit() == 2
+    articles = json.loads(index_path.read_text())["articles"]
+    assert [(a["id"], a["title"]) for a in articles] == [
+        ("lcl/a", "LCL"),
+        ("wri/b", "New"),
+        ("wri/c", "Added"),
+    ]
+    assert not journal.path.exists()
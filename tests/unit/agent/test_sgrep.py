@@ -4,12 +4,27 @@ from unittest.mock import patch
 
 import numpy as np
 
+from src.agent.utils import sgrep, sgrep_bm25, sgrep_ivf
 from src.agent.utils.sgrep import (
     _ROOT,
+    _chunk_hash,
+    _index_stamp,
     _load_index,
     _portable_path,
     _resolve_data_dir,
+    _top_k,
+    build_index,
+    chunks,
     data_status,
+    hybrid_query,
+    keyword_query,
+    load_article,
+    normalize,
+    parse_article,
+    quantize_rows,
+    query_batch,
+    query_index,
+    rank,
 )
 
 ARTICLE = """\
@@ -133,18 +148,470 @@ def test_load_index_reads_files_once(tmp_path: Path) -> None:
     _write_index(index_dir, n_chunks=3)
     _load_index.cache_clear()
 
+    stamp = _index_stamp(index_dir)
     with patch("src.agent.utils.sgrep.np.load", wraps=np.load) as mock_load:
-        _load_index(str(index_dir))
-        _load_index(str(index_dir))
+        _load_index(str(index_dir), stamp)
+        loads = mock_load.call_count
+        _load_index(str(index_dir), stamp)
 
-    assert mock_load.call_count == 1
+    assert mock_load.call_count == loads
 
 
-def test_load_index_returns_float32(tmp_path: Path) -> None:
+def test_load_index_maps_int8_and_per_row_scales(tmp_path: Path) -> None:
     index_dir = tmp_path / "index"
     _write_index(index_dir, n_chunks=2)
     _load_index.cache_clear()
 
-    emb, _, _, _ = _load_index(str(index_dir))
+    ((emb, scales, deleted),), _, _, ivf = _load_index(str(index_dir))
+    assert isinstance(emb, np.memmap) and emb.dtype == np.int8
+    assert scales == 1.0  # legacy single-scale index
+    assert not len(deleted) and ivf is None
 
-    assert emb.dtype == np.float32
+    np.save(index_dir / "scales.npy", np.array([0.5, 2.0], dtype=np.float32))
+    _load_index.cache_clear()
+    ((_, scales, _),), _, _, _ = _load_index(str(index_dir))
+    assert np.array_equal(scales, [0.5, 2.0])
+
+
+def test_rank_int8_matches_float_scoring() -> None:
+    rng = np.random.default_rng(2)
+    vectors = normalize(rng.standard_normal((3000, 64))).astype("float32")
+    q8, scales = quantize_rows(vectors)
+    qvs = normalize(rng.standard_normal((4, 64))).astype("float32")
+
+    hits = rank(q8, scales, qvs, k=10, threshold=-np.inf)
+
+    exact = qvs @ vectors.T
+    for q, row in enumerate(hits):
+        ids = [i for i, _ in row]
+        assert len(set(ids) & set(np.argsort(-exact[q])[:10])) >= 9
+        assert np.allclose([s for _, s in row], exact[q, ids], atol=0.02)
+
+
+def test_data_status_rejects_mismatched_scales(tmp_path: Path) -> None:
+    data_dir = tmp_path / "corpus"
+    index_dir = tmp_path / "index"
+    _write_corpus(data_dir)
+    _write_index(index_dir, n_chunks=2)
+    np.save(index_dir / "scales.npy", np.ones(3, dtype=np.float32))
+
+    ok, detail = data_status(data_dir=data_dir, index_dir=index_dir)
+    assert not ok
+    assert "row scales" in detail
+
+
+def _fake_model(vectors: dict[str, np.ndarray]):
+    class _Model:
+        def encode(self, queries):
+            return np.stack([vectors[q] for q in queries])
+
+    return _Model()
+
+
+def test_top_k_matches_full_sort() -> None:
+    rng = np.random.default_rng(0)
+    scores = rng.standard_normal((3, 1000)).astype("float32")
+
+    for k in (1, 10, 1000, 5000):
+        top = _top_k(scores, k)
+        expected = np.argsort(-scores, axis=-1)[:, :k]
+        assert np.array_equal(top, expected)
+
+
+def test_rank_batches_like_single_queries(monkeypatch) -> None:
+    rng = np.random.default_rng(1)
+    emb = rng.integers(-127, 128, (500, 8), dtype=np.int8)
+    qvs = rng.standard_normal((5, 8)).astype("float32")
+    monkeypatch.setattr("src.agent.utils.sgrep.QUERY_BLOCK", 2)
+    monkeypatch.setattr("src.agent.utils.sgrep.SCORE_BLOCK", 64)
+
+    batched = rank(emb, 0.5, qvs, k=7, threshold=-np.inf)
+
+    for hits, qv in zip(batched, qvs):
+        single = rank(emb, 0.5, qv[None], k=7, threshold=-np.inf)[0]
+        assert [i for i, _ in hits] == [i for i, _ in single]
+        assert np.allclose([s for _, s in hits], [s for _, s in single])
+    assert [len(hits) for hits in batched] == [7] * 5
+    assert all(
+        score >= 1.0
+        for hits in rank(emb, 0.5, qvs, k=7, threshold=1.0)
+        for _, score in hits
+    )
+
+
+def test_query_batch_returns_results_per_query(tmp_path: Path) -> None:
+    data_dir = tmp_path / "corpus"
+    data_dir.mkdir()
+    (data_dir / "a.md").write_text(
+        "[§1] Forests.\n[§2] Rivers.\n", encoding="utf-8"
+    )
+    index_dir = tmp_path / "index"
+    index_dir.mkdir()
+    np.save(
+        index_dir / "embeddings.npy",
+        np.array([[127, 0], [0, 127]], dtype=np.int8),
+    )
+    (index_dir / "meta.jsonl").write_text(
+        "\n".join(
+            json.dumps({"file": "a.md", "line": n, "para": n}) for n in (1, 2)
+        ),
+        encoding="utf-8",
+    )
+    (index_dir / "config.json").write_text(
+        json.dumps({"scale": 1 / 127, "dim": 2, "data_dir": str(data_dir)}),
+        encoding="utf-8",
+    )
+    _load_index.cache_clear()
+    model = _fake_model(
+        {"trees": np.array([1.0, 0.1]), "water": np.array([0.1, 1.0])}
+    )
+
+    with patch("src.agent.utils.sgrep._index_model", return_value=model):
+        batched = query_batch(index_dir, ["trees", "water"], k=1)
+        single = query_index(index_dir, "water", k=1)
+
+    assert [r[0]["text"] for r in batched] == ["Forests.", "Rivers."]
+    assert single == batched[1]
+    assert query_batch(index_dir, []) == []
+
+
+class _HashModel:
+    """Embeds each text to a fixed pseudo-random vector and counts calls."""
+
+    def __init__(self) -> None:
+        self.encoded: list[str] = []
+
+    def encode(self, texts):
+        self.encoded += texts
+        seeds = [int(_chunk_hash(t), 16) for t in texts]
+        return np.array(
+            [np.random.default_rng(seed).standard_normal(8) for seed in seeds]
+        ).reshape(len(texts), 8)
+
+    def save_pretrained(self, path) -> None:
+        Path(path).mkdir(parents=True, exist_ok=True)
+
+
+def _article(*paras: str) -> str:
+    return "# Title\n\n" + "\n".join(
+        f"[§{n}] {text}" for n, text in enumerate(paras, 1)
+    )
+
+
+def _build(data_dir: Path, index_dir: Path, **kw) -> _HashModel:
+    model = _HashModel()
+    with patch("src.agent.utils.sgrep.get_model", return_value=model):
+        build_index(data_dir, index_dir, **kw)
+    return model
+
+
+def _search(index_dir: Path, query: str, k: int = 10, **kw) -> list[dict]:
+    with patch(
+        "src.agent.utils.sgrep._index_model", return_value=_HashModel()
+    ):
+        return query_index(index_dir, query, k=k, threshold=-np.inf, **kw)
+
+
+def test_build_index_only_embeds_new_chunks(tmp_path: Path) -> None:
+    data_dir, index_dir = tmp_path / "corpus", tmp_path / "index"
+    data_dir.mkdir()
+    (data_dir / "a.md").write_text(_article("Forests.", "Rivers."))
+    (data_dir / "b.md").write_text(_article("Peatlands."))
+
+    assert sorted(_build(data_dir, index_dir).encoded) == [
+        "Forests.",
+        "Peatlands.",
+        "Rivers.",
+    ]
+    assert _build(data_dir, index_dir).encoded == []
+
+    (data_dir / "a.md").write_text(_article("Mangroves.", "Forests."))
+    (data_dir / "c.md").write_text(_article("Glaciers."))
+    assert sorted(_build(data_dir, index_dir).encoded) == [
+        "Glaciers.",
+        "Mangroves.",
+    ]
+
+    hits = {r["text"]: r for r in _search(index_dir, "Forests.")}
+    assert set(hits) == {"Forests.", "Mangroves.", "Peatlands.", "Glaciers."}
+    assert hits["Forests."]["para"] == 2  # reused row, updated location
+    assert _search(index_dir, "Forests.", k=1)[0]["text"] == "Forests."
+    (data_dir / "index.json").write_text(json.dumps({"articles": [1, 2, 3]}))
+    ok, detail = data_status(data_dir, index_dir)
+    assert ok and "4 indexed paragraphs" in detail
+
+
+def test_build_index_tombstones_then_compacts(tmp_path: Path) -> None:
+    data_dir, index_dir = tmp_path / "corpus", tmp_path / "index"
+    data_dir.mkdir()
+    for i in range(10):
+        (data_dir / f"{i}.md").write_text(_article(f"Article {i}."))
+    _build(data_dir, index_dir)
+
+    (data_dir / "0.md").unlink()
+    assert _build(data_dir, index_dir).encoded == []
+    config = json.loads((index_dir / "config.json").read_text())
+    meta = (index_dir / config["meta"]).read_text().splitlines()
+    assert meta.count("null") == 1
+    assert "Article 0." not in {r["text"] for r in _search(index_dir, "x")}
+
+    (data_dir / "1.md").unlink()
+    (data_dir / "2.md").unlink()
+    (data_dir / "10.md").write_text(_article("Article 10."))
+    assert _build(data_dir, index_dir).encoded == ["Article 10."]
+    config = json.loads((index_dir / "config.json").read_text())
+    meta = (index_dir / config["meta"]).read_text().splitlines()
+    assert len(config["segments"]) == 1 and "null" not in meta
+    assert sorted(r["text"] for r in _search(index_dir, "x")) == sorted(
+        f"Article {i}." for i in range(3, 11)
+    )
+
+
+def test_build_index_swaps_generations_atomically(tmp_path: Path) -> None:
+    data_dir, index_dir = tmp_path / "corpus", tmp_path / "index"
+    data_dir.mkdir()
+    (data_dir / "a.md").write_text(_article("Forests."))
+    _build(data_dir, index_dir)
+    assert _search(index_dir, "x")[0]["text"] == "Forests."
+
+    for n, text in enumerate(("Rivers.", "Glaciers.", "Deserts."), 2):
+        (data_dir / f"{n}.md").write_text(_article(text))
+        _build(data_dir, index_dir)
+        # a long-lived reader picks up the new generation without a restart
+        assert text in {r["text"] for r in _search(index_dir, "x")}
+
+    config = json.loads((index_dir / "config.json").read_text())
+    assert config["generation"] == 4
+    assert not (index_dir / "config.json.tmp").exists()
+    # the previous generation is kept for in-flight readers, older ones go
+    assert (index_dir / "meta-3.jsonl").exists()
+    assert not (index_dir / "meta-2.jsonl").exists()
+    assert [s["embeddings"] for s in config["segments"]] == [
+        f"seg-{n}.npy" for n in range(1, 5)
+    ]
+
+
+def test_build_index_rebuilds_legacy_layout(tmp_path: Path) -> None:
+    data_dir, index_dir = tmp_path / "corpus", tmp_path / "index"
+    data_dir.mkdir()
+    (data_dir / "a.md").write_text(_article("Forests."))
+    _write_index(index_dir, n_chunks=2)
+
+    assert _build(data_dir, index_dir).encoded == ["Forests."]
+    assert [r["text"] for r in _search(index_dir, "x")] == ["Forests."]
+    _build(data_dir, index_dir)
+    assert not (index_dir / "embeddings.npy").exists()
+
+
+def test_rank_skips_deleted_rows() -> None:
+    emb = np.array([[127, 0], [100, 10], [0, 127]], dtype=np.int8)
+    qv = np.array([[1.0, 0.0]], dtype=np.float32)
+
+    hits = rank(
+        emb, 1 / 127, qv, k=3, threshold=-np.inf, deleted=np.array([0])
+    )
+
+    assert [i for i, _ in hits[0]] == [1, 2]
+
+
+def _clustered(n: int, dim: int = 16, clusters: int = 8, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    centers = normalize(rng.standard_normal((clusters, dim)))
+    points = centers[rng.integers(0, clusters, n)]
+    return normalize(points + 0.1 * rng.standard_normal((n, dim)))
+
+
+def test_ivf_train_separates_clusters() -> None:
+    vectors = _clustered(2000).astype("float32")
+    q8, _ = quantize_rows(vectors)
+
+    centroids = sgrep_ivf.train(q8, 8)
+    labels = sgrep_ivf.assign(q8, centroids)
+    rows, offsets = sgrep_ivf.inverted_lists(labels, len(centroids))
+
+    assert centroids.shape == (8, 16)
+    assert np.allclose(np.linalg.norm(centroids, axis=1), 1, atol=1e-5)
+    assert sorted(rows) == list(range(2000))
+    for lo, hi in zip(offsets[:-1], offsets[1:]):
+        assert (labels[rows[lo:hi]] == labels[rows[lo]]).all()
+    # a query next to a training row finds that row in its nearest list
+    cand = sgrep_ivf.candidates(centroids, rows, offsets, vectors[7], 1)
+    assert 7 in cand and len(cand) < 2000
+
+
+def test_build_index_ivf_matches_brute_force(tmp_path: Path) -> None:
+    data_dir, index_dir = tmp_path / "corpus", tmp_path / "index"
+    data_dir.mkdir()
+    for i in range(40):
+        (data_dir / f"{i}.md").write_text(
+            _article(*(f"Article {i} paragraph {j}." for j in range(5)))
+        )
+    _build(data_dir, index_dir, ivf=True)
+    config = json.loads((index_dir / "config.json").read_text())
+    assert config["ivf"]["lists"] == 14  # sqrt(200)
+
+    exact = _search(index_dir, "Article 3 paragraph 1.", nprobe=1000)
+    assert exact[0]["text"] == "Article 3 paragraph 1."
+    assert _search(index_dir, "Article 3 paragraph 1.", k=1, nprobe=2) == [
+        exact[0]
+    ]
+    assert len(_search(index_dir, "x", k=300, nprobe=1)) < 200
+
+    (data_dir / "0.md").unlink()
+    (data_dir / "new.md").write_text(_article("Brand new paragraph."))
+    _build(data_dir, index_dir)  # stays IVF, keeps its centroids
+    config = json.loads((index_dir / "config.json").read_text())
+    assert config["ivf"]["trained_rows"] == 200
+    hits = _search(index_dir, "Brand new paragraph.", k=1, nprobe=1)
+    assert hits[0]["text"] == "Brand new paragraph."
+    texts = {r["text"] for r in _search(index_dir, "x", k=300, nprobe=1000)}
+    assert "Article 0 paragraph 0." not in texts and len(texts) == 196
+
+    _build(data_dir, index_dir, ivf=False)
+    assert "ivf" not in json.loads((index_dir / "config.json").read_text())
+
+
+def test_bm25_prefers_rare_terms_and_skips_deleted_rows() -> None:
+    texts = [
+        "Forest loss in Gabon and Congo.",
+        "Forest loss worldwide.",
+        "Forest cover and forest loss, forest gain.",
+        "Gabon mangroves.",
+    ]
+    index = sgrep_bm25.build(texts)
+    none = np.empty(0, dtype=np.intp)
+
+    ranked = sgrep_bm25.score([(index, none)], "gabon forest", k=10)
+    assert [row for row, _ in ranked][:2] == [0, 3]
+    assert {row for row, _ in ranked} == {0, 1, 2, 3}
+    assert sgrep_bm25.score([(index, none)], "peat", k=10) == []
+
+    ranked = sgrep_bm25.score([(index, np.array([0]))], "gabon", k=10)
+    assert [row for row, _ in ranked] == [3]
+
+    # two segments score like one, with rows numbered across them
+    split = [
+        (sgrep_bm25.build(texts[:2]), none),
+        (sgrep_bm25.build(texts[2:]), none),
+    ]
+    whole = sgrep_bm25.score([(index, none)], "gabon forest", k=10)
+    parts = sgrep_bm25.score(split, "gabon forest", k=10)
+    assert [r for r, _ in parts] == [r for r, _ in whole]
+    assert np.allclose([s for _, s in parts], [s for _, s in whole])
+
+
+def test_bm25_merge_matches_rebuilt_index() -> None:
+    texts = ["Peat fires in Indonesia.", "Yuba watershed.", "Peat bogs."]
+    extra = ["Indonesia peatlands."]
+    keep = np.array([True, False, True])
+
+    merged = sgrep_bm25.merge(
+        [
+            (sgrep_bm25.build(texts), keep),
+            (sgrep_bm25.build(extra), np.ones(1, dtype=bool)),
+        ]
+    )
+    rebuilt = sgrep_bm25.build([texts[0], texts[2], *extra])
+
+    for name in ("terms", "starts", "lengths"):
+        assert np.array_equal(merged[name], rebuilt[name])
+    assert np.array_equal(merged["postings"], rebuilt["postings"])
+
+
+def test_keyword_and_hybrid_queries(tmp_path: Path) -> None:
+    data_dir, index_dir = tmp_path / "corpus", tmp_path / "index"
+    data_dir.mkdir()
+    (data_dir / "a.md").write_text(
+        _article("Yuba watershed restoration.", "Forest bonds.")
+    )
+    (data_dir / "b.md").write_text(_article("Peat fires in Indonesia."))
+    _build(data_dir, index_dir)
+
+    hits = keyword_query(index_dir, "yuba", k=5)
+    assert [(r["file"], r["para"]) for r in hits] == [("a.md", 1)]
+    assert hits[0]["text"] == "Yuba watershed restoration."
+
+    with patch(
+        "src.agent.utils.sgrep._index_model", return_value=_HashModel()
+    ):
+        fused = hybrid_query(
+            index_dir, "Peat fires in Indonesia.", k=3, threshold=-np.inf
+        )
+    assert fused[0]["text"] == "Peat fires in Indonesia."
+    assert fused[0]["matched"] == ["semantic", "keyword"]
+    assert all(r["matched"] == ["semantic"] for r in fused[1:])
+
+    # tombstoned rows drop out; compaction carries the postings over
+    (data_dir / "a.md").write_text(_article("Forest bonds."))
+    _build(data_dir, index_dir)
+    assert keyword_query(index_dir, "yuba") == []
+    _build(data_dir, index_dir, compact=True)
+    assert [r["text"] for r in keyword_query(index_dir, "bonds")] == [
+        "Forest bonds."
+    ]
+
+
+def test_build_index_reads_crlf_files_as_lf(tmp_path: Path) -> None:
+    data_dir, index_dir = tmp_path / "corpus", tmp_path / "index"
+    data_dir.mkdir()
+    text = _article("Yuba watershed.", "Forest bonds.").replace("\n", "\r\n")
+    (data_dir / "a.md").write_text(text, newline="")
+
+    model = _build(data_dir, index_dir)
+    assert model.encoded == ["Yuba watershed.", "Forest bonds."]
+    sgrep._articles.clear()
+    assert [r["text"] for r in keyword_query(index_dir, "watershed")] == [
+        "Yuba watershed."
+    ]
+    assert load_article(data_dir / "a.md", None).chunks == {
+        1: (3, None, "Yuba watershed."),
+        2: (4, None, "Forest bonds."),
+    }
+
+
+def test_load_article_reparses_edited_files(tmp_path: Path) -> None:
+    path = tmp_path / "a.md"
+    path.write_text(_article("Yuba watershed."))
+    first = load_article(path, None)
+    assert first.title == "Title"
+    assert first.chunks == {1: (3, None, "Yuba watershed.")}
+    assert load_article(path, None) is first
+
+    path.write_text(_article("Yuba watershed.", "Forest bonds."))
+    assert load_article(path, None).chunks[2] == (4, None, "Forest bonds.")
+
+
+def test_load_article_slices_indexed_spans(tmp_path: Path) -> None:
+    data_dir, index_dir = tmp_path / "corpus", tmp_path / "index"
+    data_dir.mkdir()
+    texts = {
+        "a.md": ARTICLE
+        + '[§2 | Section: "Tenure"](https://x#p2) Land rights.\r\n',
+        "b.md": "# Untagged\n\nFirst block\ncontinues.\n\n\nSecond.",
+    }
+    for name, text in texts.items():
+        (data_dir / name).write_text(text, newline="")
+    _build(data_dir, index_dir)
+
+    sgrep._articles.clear()
+    with patch(
+        "src.agent.utils.sgrep._chunk_spans", side_effect=AssertionError
+    ):
+        loaded = {
+            name: load_article(data_dir / name, index_dir) for name in texts
+        }
+    for name, text in texts.items():
+        text = text.replace("\r\n", "\n")  # as read_text() sees it
+        assert loaded[name] == parse_article(text)
+        assert [t for _, _, t in loaded[name].chunks.values()] == [
+            t for _, _, _, t in chunks(text)
+        ]
+    assert loaded["a.md"].chunks[2][2] == "Land rights."
+    assert loaded["a.md"].url == "https://www.wri.org/insights/example-article"
+    assert loaded["b.md"].chunks["L3"] == (3, None, "First block continues.")
+
+    # an edit after the build falls back to parsing the file
+    (data_dir / "b.md").write_text("Rewritten.")
+    assert load_article(data_dir / "b.md", index_dir).chunks == {
+        "L1": (1, None, "Rewritten.")
+    }
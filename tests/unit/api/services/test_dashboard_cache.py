@@ -0,0 +1,69 @@
+import uuid
+from datetime import datetime
+
+from src.api.services.dashboard_cache import DashboardRenderCache
+
+VERSION = datetime(2026, 1, 1)
+
+
+def _put(cache, dashboard_id, **overrides):
+    kwargs = {
+        "version": VERSION,
+        "response": {"id": str(dashboard_id)},
+        "owner_id": "owner",
+        "private_insight_owners": [],
+    }
+    kwargs.update(overrides)
+    cache.put(dashboard_id, **kwargs)
+
+
+def test_put_then_get_is_fresh():
+    cache = DashboardRenderCache(maxsize=8, fresh_seconds=60)
+    dashboard_id = uuid.uuid4()
+    _put(cache, dashboard_id)
+    entry = cache.get(dashboard_id)
+    assert entry.response == {"id": str(dashboard_id)}
+    assert cache.is_fresh(entry)
+
+
+def test_zero_fresh_window_always_revalidates():
+    cache = DashboardRenderCache(maxsize=8, fresh_seconds=0)
+    dashboard_id = uuid.uuid4()
+    _put(cache, dashboard_id)
+    assert not cache.is_fresh(cache.get(dashboard_id))
+
+
+def test_default_settings_revalidate_every_hit():
+    from src.api.config import APISettings
+
+    assert APISettings.dashboard_render_cache_fresh_seconds == 0
+
+
+def test_invalidate_accepts_strings_and_ignores_garbage():
+    cache = DashboardRenderCache(maxsize=8, fresh_seconds=60)
+    a, b = uuid.uuid4(), uuid.uuid4()
+    _put(cache, a)
+    _put(cache, b)
+    cache.invalidate(str(a), b, "not-a-uuid", uuid.uuid4())
+    assert cache.get(a) is None and cache.get(b) is None
+    assert cache.stats.invalidations == 2
+
+
+def test_servable_to_excludes_owner_and_private_insight_owners():
+    cache = DashboardRenderCache(maxsize=8, fresh_seconds=60)
+    dashboard_id = uuid.uuid4()
+    _put(cache, dashboard_id, private_insight_owners=["collaborator"])
+    entry = cache.get(dashboard_id)
+    assert entry.servable_to(None)
+    assert entry.servable_to("someone-else")
+    assert not entry.servable_to("owner")
+    assert not entry.servable_to("collaborator")
+
+
+def test_lru_bound():
+    cache = DashboardRenderCache(maxsize=2, fresh_seconds=60)
+    ids = [uuid.uuid4() for _ in range(3)]
+    for dashboard_id in ids:
+        _put(cache, dashboard_id)
+    assert cache.get(ids[0]) is None
+    assert cache.get(ids[2]) is not None
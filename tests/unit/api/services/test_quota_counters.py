@@ -0,0 +1,148 @@
+import asyncio
+import random
+
+import pytest
+
+from src.api.services.quota import QuotaCounters
+
+QUOTA = 25
+# _add is faked below, so the session is never used.
+SESSION = object()
+
+
+class FakeUsageTable:
+    """Stands in for daily_usage: atomic adds, with a yield to the loop
+    before each one so requests on different workers interleave."""
+
+    def __init__(self):
+        self.counts: dict = {}
+        self.writes = 0
+
+    async def add(self, deltas):
+        await asyncio.sleep(random.random() / 1000)
+        self.writes += 1
+        for key, delta in deltas.items():
+            self.counts[key] = self.counts.get(key, 0) + delta
+        return {key: self.counts[key] for key in deltas}
+
+
+class FakeWorkerCounters(QuotaCounters):
+    def __init__(self, table, tolerance):
+        super().__init__(tolerance=tolerance, flush_interval_seconds=60)
+        self.table = table
+
+    async def _add(self, session, deltas):
+        return await self.table.add(deltas)
+
+
+async def _hammer(workers, requests, flush_every=None):
+    """Fire `requests` concurrent prompts for one user spread across
+    `workers`; return how many were admitted."""
+
+    async def one(i):
+        await asyncio.sleep(random.random() / 100)
+        worker = workers[i % len(workers)]
+        if flush_every and i % flush_every == 0:
+            await worker.flush(session=SESSION)
+        return await worker.reserve("user:u1", QUOTA, session=SESSION) <= QUOTA
+
+    admitted = await asyncio.gather(*(one(i) for i in range(requests)))
+    for worker in workers:
+        await worker.flush(session=SESSION)
+    return sum(admitted)
+
+
+async def test_single_worker_admits_exactly_the_quota():
+    table = FakeUsageTable()
+    worker = FakeWorkerCounters(table, tolerance=3)
+
+    assert await _hammer([worker], 200) == QUOTA
+    # Every prompt is still counted, refused ones included.
+    assert sum(table.counts.values()) == 200
+
+
+async def test_single_worker_batches_writes():
+    table = FakeUsageTable()
+    worker = FakeWorkerCounters(table, tolerance=5)
+
+    for _ in range(10):
+        assert await worker.reserve("user:u1", 100, session=SESSION) <= 100
+
+    # First prompt writes through; the next five ride on it, then a
+    # write carries them plus the seventh; three stay pending.
+    assert table.writes == 2
+    assert worker.pending("user:u1") == 3
+    assert await worker.flush(session=SESSION) == 1
+    assert sum(table.counts.values()) == 10
+    assert worker.pending("user:u1") == 0
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize(
+    "n_workers,tolerance", [(2, 2), (4, 3), (8, 1), (16, 2)]
+)
+async def test_workers_overshoot_at_most_tolerance_each(
+    seed, n_workers, tolerance
+):
+    random.seed(seed)
+    table = FakeUsageTable()
+    workers = [FakeWorkerCounters(table, tolerance) for _ in range(n_workers)]
+
+    admitted = await _hammer(workers, 300, flush_every=7)
+
+    assert QUOTA <= admitted <= QUOTA + n_workers * tolerance
+    assert sum(table.counts.values()) == 300
+
+
+@pytest.mark.parametrize("seed", range(10))
+async def test_zero_tolerance_is_exact_across_workers(seed):
+    random.seed(seed)
+    table = FakeUsageTable()
+    workers = [FakeWorkerCounters(table, tolerance=0) for _ in range(4)]
+
+    assert await _hammer(workers, 200) == QUOTA
+    assert sum(table.counts.values()) == 200
+
+
+async def test_refusals_past_the_limit_skip_the_write():
+    table = FakeUsageTable()
+    worker = FakeWorkerCounters(table, tolerance=2)
+    for _ in range(QUOTA + 1):
+        await worker.reserve("user:u1", QUOTA, session=SESSION)
+    writes, pending = table.writes, worker.pending("user:u1")
+
+    for _ in range(50):
+        assert await worker.reserve("user:u1", QUOTA, session=SESSION) > QUOTA
+
+    assert table.writes == writes
+    assert worker.pending("user:u1") == pending + 50
+
+
+async def test_failed_flush_keeps_counts_for_retry():
+    table = FakeUsageTable()
+    worker = FakeWorkerCounters(table, tolerance=5)
+    for _ in range(4):
+        await worker.reserve("user:u1", 100, session=SESSION)
+
+    async def broken(deltas):
+        raise ConnectionError("db down")
+
+    table.add, working = broken, table.add
+    assert await worker.flush(session=SESSION) == 0
+    assert worker.pending("user:u1") == 3
+
+    table.add = working
+    assert await worker.flush(session=SESSION) == 1
+    assert sum(table.counts.values()) == 4
+
+
+async def test_idle_counters_are_dropped_after_a_flush():
+    table = FakeUsageTable()
+    worker = FakeWorkerCounters(table, tolerance=5)
+    await worker.reserve("user:u1", 100, session=SESSION)
+    await worker.reserve("user:u1", 100, session=SESSION)
+
+    await worker.flush(session=SESSION)  # writes the pending prompt
+    assert worker._counters
+    await worker.flush(session=SESSION)  # idle since the last flush
+    assert not worker._counters
@@ -0,0 +1,71 @@
+import os
+
+from src.api.services.thumbnail_cache import ThumbnailCache, content_key
+
+
+def test_content_key_is_stable_and_order_insensitive_for_dicts():
+    a = {"type": "Point", "coordinates": [1.0, 2.0]}
+    b = {"coordinates": [1.0, 2.0], "type": "Point"}
+    assert content_key("v1", a) == content_key("v1", b)
+    assert content_key("v1", a) != content_key("v2", a)
+
+
+def test_content_key_separates_parts():
+    assert content_key("ab", "c") != content_key("a", "bc")
+
+
+def test_get_missing_returns_none(tmp_path):
+    cache = ThumbnailCache(tmp_path, max_bytes=1024)
+    assert cache.get(content_key("x"), ".png") is None
+
+
+def test_put_then_get_round_trips(tmp_path):
+    cache = ThumbnailCache(tmp_path, max_bytes=1024)
+    key = content_key("x")
+    cache.put(key, ".png", b"png-bytes")
+    cache.put(key, ".overlay", b"overlay")
+    assert cache.get(key, ".png") == b"png-bytes"
+    assert cache.get(key, ".overlay") == b"overlay"
+    assert not list(tmp_path.glob("*/*.tmp"))
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    cache = ThumbnailCache(tmp_path, max_bytes=250)
+    keys = [content_key(i) for i in range(3)]
+    for i, key in enumerate(keys[:2]):
+        cache.put(key, ".png", b"x" * 100)
+        path = cache._path(key, ".png")
+        os.utime(path, (1000 + i, 1000 + i))
+    # Touch the oldest entry so the other one becomes the LRU victim.
+    cache.get(keys[0], ".png")
+
+    cache.put(keys[2], ".png", b"x" * 100)
+
+    assert cache.get(keys[0], ".png") is not None
+    assert cache.get(keys[1], ".png") is None
+    assert cache.get(keys[2], ".png") is not None
+
+
+def test_oversized_entries_are_not_stored(tmp_path):
+    cache = ThumbnailCache(tmp_path, max_bytes=10)
+    key = content_key("big")
+    cache.put(key, ".png", b"x" * 11)
+    assert cache.get(key, ".png") is None
+
+
+def test_size_tracking_picks_up_existing_entries(tmp_path):
+    ThumbnailCache(tmp_path, max_bytes=1000).put(
+        content_key(1), ".png", b"x" * 200
+    )
+    # A second worker (fresh instance) sees the first worker's files.
+    cache = ThumbnailCache(tmp_path, max_bytes=300)
+    cache.put(content_key(2), ".png", b"x" * 200)
+    total = sum(p.stat().st_size for p in tmp_path.glob("*/*"))
+    assert total <= 300
+
+
+def test_clear_removes_everything(tmp_path):
+    cache = ThumbnailCache(tmp_path, max_bytes=1000)
+    cache.put(content_key(1), ".png", b"x")
+    cache.clear()
+    assert cache.get(content_key(1), ".png") is None
@@ -0,0 +1,79 @@
+import asyncio
+import time
+
+import structlog
+
+from src.api.loop_lag import LoopLagMonitor
+
+
+def test_record_counts_stalls_above_threshold():
+    monitor = LoopLagMonitor(interval_seconds=0.1, warn_ms=100)
+    monitor.record(5)
+    monitor.record(150)
+    monitor.record(-1)  # clock jitter can wake us marginally early
+
+    snap = monitor.snapshot()
+    assert snap["samples"] == 3
+    assert snap["stalls"] == 1
+    assert snap["max_lag_ms"] == 150
+    assert snap["last_lag_ms"] == 0
+    assert snap["mean_lag_ms"] == (5 + 150) / 3
+
+
+async def test_monitor_detects_blocking_call():
+    monitor = LoopLagMonitor(interval_seconds=0.02, warn_ms=100)
+    monitor.start()
+    await asyncio.sleep(0.05)
+    time.sleep(0.2)  # block the loop
+    await asyncio.sleep(0.05)
+    await monitor.stop()
+
+    assert monitor.stats.stalls >= 1
+    assert monitor.stats.max_lag_ms >= 100
+
+
+async def test_monitor_quiet_when_work_is_offloaded():
+    monitor = LoopLagMonitor(interval_seconds=0.02, warn_ms=100)
+    monitor.start()
+    await asyncio.to_thread(time.sleep, 0.2)
+    await monitor.stop()
+
+    assert monitor.stats.samples >= 3
+    assert monitor.stats.stalls == 0
+
+
+async def test_stop_is_idempotent():
+    monitor = LoopLagMonitor(interval_seconds=0.02, warn_ms=100)
+    await monitor.stop()
+    monitor.start()
+    await monitor.stop()
+    await monitor.stop()
+
+
+async def test_monitor_logs_a_summary_each_report_interval():
+    monitor = LoopLagMonitor(
+        interval_seconds=0.02, warn_ms=100, report_seconds=0.1
+    )
+    with structlog.testing.capture_logs() as logs:
+        monitor.start()
+        await asyncio.sleep(0.35)
+        await monitor.stop()
+
+    reports = [r for r in logs if r["event"] == "Event loop lag"]
+    assert len(reports) >= 2
+    for record in reports:
+        assert record["log_level"] == "info"
+        assert record["samples"] >= 1
+        assert record["stalls"] == 0
+        assert record["max_lag_ms"] >= record["mean_lag_ms"] >= 0
+    # each report covers only the samples since the previous one
+    assert monitor.stats.samples < sum(r["samples"] for r in reports)
+
+
+def test_report_resets_the_window():
+    monitor = LoopLagMonitor(interval_seconds=0.1, warn_ms=100)
+    monitor.record(40)
+    with structlog.testing.capture_logs() as logs:
+        monitor.report()
+    assert logs[0]["max_lag_ms"] == 40
+    assert monitor.snapshot()["samples"] == 0
@@ -5,7 +5,16 @@ Synthetic fixtures only (no real user text). Focus: NUL-byte sanitization, since
 Postgres text/jsonb reject 0x00 and an unsanitized trace once aborted a batch.
 """
 
-from src.api.services.langfuse.ingest import _strip_nul, build_row
+import json
+from datetime import datetime, timezone
+
+from src.api.services.langfuse.ingest import (
+    _TRACE_COLUMNS,
+    _copy_record,
+    _jsonb,
+    _strip_nul,
+    build_row,
+)
 
 
 def test_strip_nul_scrubs_nested_strings():
@@ -86,3 +95,40 @@ def test_build_row_singleton_without_insight_has_empty_diffs():
     row = build_row({"id": "t1", "environment": "production"})
     assert row["insight_created_this_turn"] is False
     assert row["datasets_analysed_this_turn"] == []
+
+
+def test_build_row_leaves_derived_for_serialization():
+    # The nested payload is scrubbed once, as it is serialized for the write.
+    row = build_row(
+        {"id": "t1", "output": {"messages": [], "language": "e\x00n"}}
+    )
+    assert _jsonb(row["derived"]) is not None
+    assert "\\u0000" not in _jsonb(row["derived"])
+
+
+def test_jsonb_drops_nul_in_keys_and_values():
+    out = _jsonb({"k\x00": ["a\x00b", {"d": "\x00"}], "n": 1})
+    assert json.loads(out) == {"k": ["ab", {"d": ""}], "n": 1}
+
+
+def test_jsonb_keeps_escaped_backslash_before_u0000():
+    # A literal backslash followed by "u0000" is text, not a NUL escape.
+    value = {"code": "print('\\u0000')", "mixed": "\\\x00x"}
+    assert json.loads(_jsonb(value)) == {
+        "code": "print('\\u0000')",
+        "mixed": "\\x",
+    }
+    assert _jsonb(None) is None
+
+
+def test_copy_record_follows_table_columns():
+    ingested_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    row = build_row({"id": "t1", "sessionId": "s1", "latency": 2.5})
+    record = _copy_record(row, ingested_at)
+    values = dict(zip(_TRACE_COLUMNS, record))
+    assert len(record) == len(_TRACE_COLUMNS)
+    assert values["id"] == "t1"
+    assert values["session_id"] == "s1"
+    assert values["latency_seconds"] == 2.5
+    assert values["ingested_at"] == ingested_at
+    assert isinstance(values["derived"], str)
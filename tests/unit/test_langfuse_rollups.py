@@ -0,0 +1,203 @@
+"""Unit tests for the trace-analytics rollup sketches and cell building
+(src/api/services/langfuse/rollups.py) and the rollup filter translation in
+src/api/routers/traces.py."""
+
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from src.api.routers.traces import (
+    TurnAnalyticsFilters,
+    _rollup_ranges,
+    _rollup_where,
+)
+from src.api.services.langfuse.rollups import (
+    LATENCY_HIST,
+    ROLLUP_TURN_CAP,
+    _day_runs,
+    build_cells,
+    hll_estimate,
+    hll_register,
+)
+
+T0 = datetime(2026, 6, 1, tzinfo=timezone.utc)
+
+
+def _row(ts, **kw):
+    return {
+        "trace_timestamp": ts,
+        "environment": "production",
+        "outcome": "answered",
+        "turn_index": 1,
+        "latency_seconds": 1.0,
+        "total_cost": 0.01,
+        "turn_tokens": 100,
+        "turn_tool_calls": 2,
+        "tool_error_count": 0,
+        "aoi_type": "country",
+        "session_id": "s1",
+        "user_id": "u1",
+        **kw,
+    }
+
+
+def _registers(values):
+    regs: dict[int, int] = {}
+    for v in values:
+        idx, rho = hll_register(v)
+        regs[idx] = max(regs.get(idx, 0), rho)
+    return regs
+
+
+@pytest.mark.parametrize("q", [0.5, 0.95])
+def test_histogram_quantile_tracks_percentile_cont(q):
+    rng = np.random.default_rng(0)
+    values = rng.lognormal(mean=2.5, sigma=1.0, size=20_000)
+    counts = Counter(LATENCY_HIST.index(v) for v in values)
+
+    estimate = LATENCY_HIST.quantile(counts, q)
+
+    assert estimate == pytest.approx(np.percentile(values, q * 100), rel=0.03)
+
+
+def test_histogram_merges_by_adding_counts():
+    values = [0.005, 0.2, 3.0, 3.1, 45.0, 1e6]
+    halves = Counter(LATENCY_HIST.index(v) for v in values[:3]) + Counter(
+        LATENCY_HIST.index(v) for v in values[3:]
+    )
+    whole = Counter(LATENCY_HIST.index(v) for v in values)
+
+    assert halves == whole
+    assert LATENCY_HIST.index(1e6) == LATENCY_HIST.buckets - 1
+    assert LATENCY_HIST.quantile({}, 0.5) is None
+
+
+def test_histogram_single_value_stays_in_its_bucket():
+    lo, hi = LATENCY_HIST.bounds(LATENCY_HIST.index(12.5))
+    assert lo < 12.5 <= hi
+    assert (
+        lo <= LATENCY_HIST.quantile({LATENCY_HIST.index(12.5): 1}, 0.95) <= hi
+    )
+
+
+def test_histogram_interpolates_between_sparse_values():
+    # percentile_cont(0.5) of {1, 3} is 2, not a point in either bucket.
+    counts = Counter(LATENCY_HIST.index(v) for v in (1.0, 3.0))
+    assert LATENCY_HIST.quantile(counts, 0.5) == pytest.approx(2.0, rel=0.03)
+
+
+def test_hll_small_counts_are_near_exact():
+    assert hll_estimate({}) == 0
+    for n in (1, 10, 100, 500):
+        assert abs(
+            hll_estimate(_registers(f"s{i}" for i in range(n))) - n
+        ) <= max(1, n // 100)
+
+
+def test_hll_large_counts_and_union():
+    a = _registers(f"s{i}" for i in range(60_000))
+    b = _registers(f"s{i}" for i in range(40_000, 100_000))
+    union = {i: max(a.get(i, 0), b.get(i, 0)) for i in a.keys() | b.keys()}
+
+    assert hll_estimate(a) == pytest.approx(60_000, rel=0.05)
+    assert hll_estimate(union) == pytest.approx(100_000, rel=0.05)
+
+
+def test_build_cells_rolls_each_trace_into_one_hour_and_one_day():
+    rows = [
+        _row(T0 + timedelta(minutes=5)),
+        _row(
+            T0 + timedelta(minutes=50), session_id="s2", latency_seconds=None
+        ),
+        _row(T0 + timedelta(hours=3), outcome="error", tool_error_count=2),
+        _row(None),  # not rolled up
+    ]
+    cells = build_cells(rows)
+
+    hours = [c for c in cells if c["grain"] == "hour"]
+    days = [c for c in cells if c["grain"] == "day"]
+    assert (
+        sum(c["traces"] for c in hours) == sum(c["traces"] for c in days) == 3
+    )
+    assert {c["bucket_start"] for c in days} == {T0}
+    first = next(c for c in hours if c["bucket_start"] == T0)
+    assert first["traces"] == 2 and first["lat_count"] == 1
+    assert first["tok_sum"] == 200 and first["aoi_types"] == {"country": 2}
+    assert (
+        len(first["session_hll_idx"]) == 2 and len(first["user_hll_idx"]) == 1
+    )
+    errors = next(c for c in days if c["outcome"] == "error")
+    assert errors["tool_error_traces"] == 1
+
+
+def test_build_cells_caps_turn_positions_but_keeps_true_range():
+    rows = [
+        _row(T0, turn_index=ROLLUP_TURN_CAP + 3),
+        _row(T0, turn_index=ROLLUP_TURN_CAP + 9),
+        _row(T0, turn_index=None),
+    ]
+    (tail,) = [
+        c
+        for c in build_cells(rows)
+        if c["grain"] == "day" and c["turn_index"] is not None
+    ]
+
+    assert tail["turn_index"] == ROLLUP_TURN_CAP + 1
+    assert (tail["turn_min"], tail["turn_max"]) == (
+        ROLLUP_TURN_CAP + 3,
+        ROLLUP_TURN_CAP + 9,
+    )
+
+
+def test_day_runs_split_gaps_and_long_runs():
+    days = [T0.date() + timedelta(days=i) for i in (0, 1, 2, 5, 6)]
+    assert _day_runs(days, max_days=2) == [
+        (days[0], days[1]),
+        (days[2], days[2]),
+        (days[3], days[4]),
+    ]
+
+
+@pytest.mark.parametrize(
+    "kw",
+    [
+        {"user_id": "u1"},
+        {"start": T0 + timedelta(minutes=30)},
+        {"end": T0 + timedelta(seconds=1)},
+        {"turn_index": ROLLUP_TURN_CAP + 1},
+        {"max_turn_index": ROLLUP_TURN_CAP + 1},
+    ],
+)
+def test_rollup_where_declines_filters_it_cannot_express(kw):
+    assert _rollup_where(TurnAnalyticsFilters(**kw)) is None
+
+
+@pytest.mark.parametrize(
+    "start,end",
+    [
+        (None, None),
+        (T0, T0 + timedelta(days=2)),
+        (T0 + timedelta(hours=5), T0 + timedelta(days=2, hours=7)),
+        (T0 + timedelta(hours=5), T0 + timedelta(hours=9)),
+        (None, T0 + timedelta(days=1, hours=3)),
+        (T0 + timedelta(hours=22), None),
+    ],
+)
+def test_rollup_ranges_select_each_hour_once(start, end):
+    span = [T0 - timedelta(days=1) + timedelta(hours=i) for i in range(5 * 24)]
+    covered = []
+    for grain, lo, hi in _rollup_ranges(start, end):
+        for bucket in span:
+            if grain == "day" and bucket.hour:
+                continue
+            if (lo is None or bucket >= lo) and (hi is None or bucket < hi):
+                width = 24 if grain == "day" else 1
+                covered += [bucket + timedelta(hours=h) for h in range(width)]
+
+    assert sorted(covered) == [
+        h
+        for h in span
+        if (start is None or h >= start) and (end is None or h < end)
+    ]